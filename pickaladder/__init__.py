@@ -37,6 +37,7 @@ from .context_processors import (
     inject_pending_tournament_invites,
     inject_unread_messages_count,
 )
+from .core.entity_cache import get_loader
 from .core.logging import setup_logging
 from .extensions import cache, csrf, executor, login_manager, mail
 from .user.helpers import smart_display_name, wrap_user
@@ -217,10 +218,9 @@ def _register_extensions(app: Flask) -> None:
             id_to_load = impersonate_id
 
         try:
-            db = firestore.client()
-            user_doc = db.collection("users").document(id_to_load).get()
-            if user_doc.exists:
-                return wrap_user(user_doc.to_dict(), uid=id_to_load)
+            user_data = get_loader().load(firestore.client(), "users", id_to_load)
+            if user_data is not None:
+                return wrap_user(user_data, uid=id_to_load)
         except Exception as e:
             current_app.logger.exception(f"Error in user_loader: {e}")
         return None
@@ -25,12 +25,27 @@ from pickaladder.constants.messages import (
     AUTH_MESSAGES,
     COMMON_MESSAGES,
 )
+from pickaladder.core.fanout import get_section_latencies
 from pickaladder.extensions import cache
+from pickaladder.group.services.match_cache import stage_version_bump
+from pickaladder.group.services.standings import (
+    stage_removed_match,
+    update_removed_form,
+)
 from pickaladder.match.models import MatchSubmission
-from pickaladder.match.services import MatchService
+from pickaladder.match.services import (
+    EloReplayService,
+    HeadToHeadService,
+    MatchCommandService,
+    MatchRecordService,
+    MatchService,
+    RankDecayService,
+    StreakService,
+)
 from pickaladder.services.feedback_service import FeedbackService
 from pickaladder.user import UserService
 from pickaladder.user.models import UserSession
+from pickaladder.user.services.stats_summary import stage_deleted_match
 
 from . import bp
 from .services import AdminService
@@ -179,6 +194,32 @@ def toggle_email_verification() -> Response:
     return redirect(url_for(".view_users"))
 
 
+@bp.route("/rank_decay", methods=["POST"])
+@login_required(admin_required=True)
+def run_rank_decay() -> Response:
+    """Start the rank decay job over all users."""
+    try:
+        RankDecayService.schedule(firestore.client())
+        flash(ADMIN_MESSAGES["RANK_DECAY_STARTED"], "success")
+    except Exception as e:
+        flash(COMMON_MESSAGES["GENERIC_ERROR"].format(error=e), "danger")
+    return redirect(url_for(".dashboard"))
+
+
+@bp.route("/rank_decay/status")
+@login_required(admin_required=True)
+def rank_decay_status() -> Response:
+    """Return the progress of the latest rank decay job."""
+    return jsonify(RankDecayService.get_status(firestore.client()) or {})
+
+
+@bp.route("/section_latency")
+@login_required(admin_required=True)
+def section_latency() -> Response:
+    """Return recent p50/p95 latency of each concurrently fetched page section."""
+    return jsonify(get_section_latencies())
+
+
 @bp.route("/matches")
 @login_required(admin_required=True)
 def admin_matches() -> str:
@@ -202,8 +243,30 @@ def admin_delete_match(match_id: str) -> Response:
     """Delete a match document from Firestore."""
     db = firestore.client()
     try:
-        db.collection("matches").document(match_id).delete()
+        match_ref = db.collection("matches").document(match_id)
+        match_doc = match_ref.get()
+        data = (match_doc.to_dict() or {}) if match_doc.exists else {}
+        batch = db.batch()
+        batch.delete(match_ref)
+        MatchRecordService.stage_win_buckets(db, batch, data, -1)
+        stage_deleted_match(db, batch, data)
+        if gid := data.get("groupId"):
+            stage_removed_match(db, batch, gid, match_id, data)
+            stage_version_bump(db, batch, gid)
+        batch.commit()
         AdminService.log_action(db, g.user.uid, match_id, "delete_match")
+        if gid:
+            update_removed_form(db, gid, data)
+        if data:
+            StreakService.recompute_for_match(db, data)
+            HeadToHeadService.rebuild_for_match(db, data)
+            EloReplayService.schedule_replay(
+                db,
+                since=data.get("matchDate"),
+                seeds=EloReplayService.seeds_for_match(data),
+                removed=data,
+            )
+            MatchCommandService.invalidate_cached_views(data)
         flash(ADMIN_MESSAGES["MATCH_DELETE_SUCCESS"], "success")
     except Exception as e:
         flash(COMMON_MESSAGES["GENERIC_ERROR"].format(error=e), "danger")
@@ -8,6 +8,8 @@ from typing import Any
 
 from firebase_admin import firestore
 
+from pickaladder.match.services.leaderboard_index import LeaderboardIndexService
+
 
 class AdminService:
     """Service class for admin-related operations."""
@@ -85,6 +87,7 @@ class AdminService:
         auth.delete_user(user_id)
         # Delete from Firestore
         db.collection("users").document(user_id).delete()
+        LeaderboardIndexService.remove_users(db, [user_id])
 
     @staticmethod
     def delete_user_data(db: firestore.Client, uid: str) -> None:
@@ -93,6 +96,7 @@ class AdminService:
 
         # Delete from Firestore
         db.collection("users").document(uid).delete()
+        LeaderboardIndexService.remove_users(db, [uid])
         # Delete from Firebase Auth
         try:
             auth.delete_user(uid)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from firebase_admin import firestore
-from flask import Blueprint, Response, g, jsonify, render_template
+from flask import Blueprint, Response, g, jsonify, render_template, request
 
 from pickaladder.auth.decorators import login_required
 from pickaladder.core.activity.services import ActivityService
@@ -47,6 +47,25 @@ def recent_matches() -> str:
     )
 
 
+@bp.route("/activity_feed")
+@login_required
+def activity_feed() -> str:
+    """Return a page of the community feed as an HTML fragment."""
+    db = firestore.client()
+    feed, feed_cursor = ActivityService.get_feed_page(
+        db,
+        limit=10,
+        cursor=request.args.get("cursor"),
+    )
+
+    return render_template(
+        "components/_activity_feed_items.html",
+        feed=feed,
+        feed_cursor=feed_cursor,
+        user=g.user,
+    )
+
+
 @bp.route("/activity/<string:activity_id>/react", methods=["POST"])
 @login_required
 def react_to_activity(activity_id: str) -> Response:
@@ -21,6 +21,7 @@ from flask import (
 from flask_login import login_user, logout_user
 
 from pickaladder.constants.messages import AUTH_MESSAGES
+from pickaladder.core.entity_cache import get_loader
 from pickaladder.core.security import rate_limit
 from pickaladder.errors import DuplicateResourceError
 from pickaladder.services.mail_service import EmailError, MailService
@@ -89,19 +90,18 @@ def _cleanup_missing_user_session(is_impersonating: bool) -> None:
     g.is_impersonating = False
 
 
-def _fetch_user_doc(id_to_load: str) -> firestore.DocumentSnapshot:
-    """Fetch user document from Firestore."""
-    db = firestore.client()
-    return db.collection("users").document(id_to_load).get()
+def _fetch_user_doc(id_to_load: str) -> dict[str, Any] | None:
+    """Fetch user document through the request's data loader."""
+    return get_loader().load(firestore.client(), "users", id_to_load)
 
 
 def _populate_g_user(
-    user_doc: firestore.DocumentSnapshot,
+    user_data: dict[str, Any],
     id_to_load: str,
     is_impersonating: bool,
 ) -> None:
     """Populate g.user and sync session admin status."""
-    g.user = wrap_user(user_doc.to_dict(), uid=id_to_load)
+    g.user = wrap_user(user_data, uid=id_to_load)
     if not is_impersonating:
         session["is_admin"] = g.user.is_admin
 
@@ -117,22 +117,22 @@ def _handle_missing_user(id_to_load: str, is_impersonating: bool) -> None:
 def _load_user_document(id_to_load: str, is_impersonating: bool) -> None:
     """Fetch user from Firestore and populate g.user."""
     try:
-        user_doc = _fetch_user_doc(id_to_load)
-        _process_user_doc(user_doc, id_to_load, is_impersonating)
+        user_data = _fetch_user_doc(id_to_load)
+        _process_user_doc(user_data, id_to_load, is_impersonating)
     except Exception as e:
         _handle_load_user_error(id_to_load, is_impersonating, e)
 
 
 def _process_user_doc(
-    user_doc: firestore.DocumentSnapshot,
+    user_data: dict[str, Any] | None,
     id_to_load: str,
     is_impersonating: bool,
 ) -> None:
     """Process the fetched user document."""
-    if not user_doc.exists:
+    if user_data is None:
         _handle_missing_user(id_to_load, is_impersonating)
         return
-    _populate_g_user(user_doc, id_to_load, is_impersonating)
+    _populate_g_user(user_data, id_to_load, is_impersonating)
 
 
 def _handle_load_user_error(
@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING, Any, cast
 
 from firebase_admin import firestore
 
+from pickaladder.core.entity_cache import get_loader
+
 if TYPE_CHECKING:
     from google.cloud.firestore_v1.base_document import DocumentSnapshot
     from google.cloud.firestore_v1.client import Client
@@ -24,16 +26,19 @@ class BaseRepository:
         data["id"] = doc_snap.id
         return data
 
+    @classmethod
+    def forget(cls, doc_id: str) -> None:
+        """Drop a document from the request's loader after writing to it."""
+        get_loader().clear(cls.COLLECTION_NAME, doc_id)
+
     @classmethod
     def get_by_id(cls, db: Client, doc_id: str) -> dict[str, Any] | None:
-        """Fetch a single document by its ID."""
+        """Fetch a single document by its ID, once per request."""
         if not cls.COLLECTION_NAME:
             msg = "COLLECTION_NAME must be defined in subclasses."
             raise NotImplementedError(msg)
 
-        doc_ref = db.collection(cls.COLLECTION_NAME).document(doc_id)
-        doc_snap = cast("DocumentSnapshot", doc_ref.get())
-        return cls._enrich(doc_snap)
+        return get_loader().load(db, cls.COLLECTION_NAME, doc_id)
 
     @classmethod
     def get_all(cls, db: Client, refs: list[DocumentReference]) -> list[dict[str, Any]]:
@@ -41,10 +46,7 @@ class BaseRepository:
         if not refs:
             return []
 
-        snaps = db.get_all(refs)
-        return [
-            enriched for snap in snaps if (enriched := cls._enrich(snap)) is not None
-        ]
+        return get_loader().load_refs(db, refs)
 
     @classmethod
     def create(cls, db: Client, data: dict[str, Any]) -> str:
@@ -56,6 +58,7 @@ class BaseRepository:
         data["createdAt"] = firestore.SERVER_TIMESTAMP
         doc_ref = db.collection(cls.COLLECTION_NAME).document()
         doc_ref.set(data)
+        cls.forget(doc_ref.id)
         return doc_ref.id
 
     @classmethod
@@ -72,6 +75,7 @@ class BaseRepository:
             msg = f"Document not found in {cls.COLLECTION_NAME}: {doc_id}"
             raise ValueError(msg)
         doc_ref.update(data)
+        cls.forget(doc_id)
 
     @classmethod
     def delete(cls, db: Client, doc_id: str) -> None:
@@ -81,3 +85,4 @@ class BaseRepository:
             raise NotImplementedError(msg)
 
         db.collection(cls.COLLECTION_NAME).document(doc_id).delete()
+        cls.forget(doc_id)
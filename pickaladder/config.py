@@ -84,6 +84,12 @@ class Config:
         self.TESTING = get_env_bool("TESTING", "false")
 
         # Caching
-        self.CACHE_TYPE = get_env_str("CACHE_TYPE", "SimpleCache")
+        self.CACHE_TYPE = get_env_str(
+            "CACHE_TYPE",
+            "pickaladder.core.tiered_cache.TieredCache",
+        )
         self.CACHE_DEFAULT_TIMEOUT = int(get_env_str("CACHE_DEFAULT_TIMEOUT", "300"))  # type: ignore
         self.CACHE_REDIS_URL = get_env_str("CACHE_REDIS_URL")
+        self.CACHE_LOCAL_SIZE = int(get_env_str("CACHE_LOCAL_SIZE", "256"))  # type: ignore
+        self.CACHE_LOCAL_TIMEOUT = int(get_env_str("CACHE_LOCAL_TIMEOUT", "60"))  # type: ignore
+        self.CACHE_LOCAL_TRUST = float(get_env_str("CACHE_LOCAL_TRUST", "1"))  # type: ignore
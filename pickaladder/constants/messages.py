@@ -107,6 +107,7 @@ ADMIN_MESSAGES = {
     "ANNOUNCEMENT_UPDATED": "Global announcement updated successfully.",
     "ANNOUNCEMENT_ERROR": "An error occurred while updating the announcement: {error}",
     "EMAIL_VERIFY_TOGGLED": "Email verification requirement has been {status}.",
+    "RANK_DECAY_STARTED": "Rank decay job started.",
     "MATCH_DELETE_SUCCESS": "Match deleted successfully.",
     "USER_DELETED_COUNT": "User {identifier} deleted.",
     "USER_ID_EMAIL_REQUIRED": "User ID or Email is required.",
@@ -11,7 +11,12 @@ from firebase_admin import firestore
 from flask import current_app, g
 
 from .extensions import cache
-from .user import UserService
+from .user.services.badges import (
+    FRIEND_REQUESTS,
+    TOURNAMENT_INVITES,
+    UNREAD_MESSAGES,
+    get_badge_counts,
+)
 
 VERSION_THRESHOLD = 10
 VERSION_SHORT_LENGTH = 7
@@ -96,78 +101,43 @@ def _get_user_uid() -> str | None:
     return user.get("uid") if user else None
 
 
-def _fetch_pending_requests(user_id: str) -> dict[str, Any]:
-    """Fetch pending friend requests for a user."""
-    db = firestore.client()
-    pending_requests = UserService.get_user_pending_requests(db, user_id)
-    return {
-        "incoming_requests_count": len(pending_requests),
-        "pending_friend_requests": pending_requests,
-    }
-
-
 def _log_context_error(domain: str, e: Exception) -> None:
     """Log error if not a RuntimeError."""
     if not isinstance(e, RuntimeError):
         current_app.logger.error(f"Error fetching {domain}: {e}")
 
 
-def _try_fetch_requests(uid: str) -> dict[str, Any]:
-    """Internal helper for requests fetching."""
+def _get_badge_count(field: str, domain: str) -> int:
+    """Read one of the current user's badge counters, or 0 when unavailable.
+
+    The counters come from a single document that is read once per request.
+    """
+    uid = _get_user_uid()
+    if not uid:
+        return 0
     try:
-        return _fetch_pending_requests(uid)
+        return get_badge_counts(firestore.client(), uid)[field]
     except Exception as e:
-        _log_context_error("friend requests", e)
-        return {"incoming_requests_count": 0, "pending_friend_requests": []}
+        _log_context_error(domain, e)
+        return 0
 
 
 def inject_incoming_requests_count() -> dict[str, Any]:
     """Injects incoming friend requests count into the template context."""
-    uid = _get_user_uid()
-    if not uid:
-        return {"incoming_requests_count": 0, "pending_friend_requests": []}
-    return _try_fetch_requests(uid)
-
-
-def _fetch_pending_invites(user_id: str) -> dict[str, Any]:
-    """Fetch pending tournament invites for a user."""
-    db = firestore.client()
-    pending_invites = UserService.get_pending_tournament_invites(db, user_id)
-    return {"pending_tournament_invites": pending_invites}
-
-
-def _try_fetch_invites(uid: str) -> dict[str, Any]:
-    """Internal helper for invites fetching."""
-    try:
-        return _fetch_pending_invites(uid)
-    except Exception as e:
-        _log_context_error("tournament invites", e)
-        return {"pending_tournament_invites": []}
+    count = _get_badge_count(FRIEND_REQUESTS, "friend requests")
+    return {"incoming_requests_count": count}
 
 
 def inject_pending_tournament_invites() -> dict[str, Any]:
-    """Injects pending tournament invites into the template context."""
-    uid = _get_user_uid()
-    if not uid:
-        return {"pending_tournament_invites": []}
-    return _try_fetch_invites(uid)
+    """Injects the pending tournament invites count into the template context."""
+    count = _get_badge_count(TOURNAMENT_INVITES, "tournament invites")
+    return {"pending_tournament_invites_count": count}
 
 
 def inject_unread_messages_count() -> dict[str, Any]:
     """Injects total unread messaging count into the template context."""
-    from pickaladder.messaging.services import MessagingService
-
-    uid = _get_user_uid()
-    if not uid:
-        return {"unread_messages_count": 0}
-
-    try:
-        db = firestore.client()
-        count = MessagingService.get_total_unread_count(db, uid)
-        return {"unread_messages_count": count}
-    except Exception as e:
-        _log_context_error("unread messages count", e)
-        return {"unread_messages_count": 0}
+    count = _get_badge_count(UNREAD_MESSAGES, "unread messages count")
+    return {"unread_messages_count": count}
 
 
 def inject_firebase_api_key() -> dict[str, Any]:
@@ -6,10 +6,46 @@ from typing import TYPE_CHECKING, Any
 
 from firebase_admin import firestore
 
+from pickaladder.core.constants import ACTIVITY_FEED_CACHE_TIMEOUT
+from pickaladder.core.entity_cache import get_entities
+from pickaladder.core.pagination import FirestorePaginator
+from pickaladder.core.tiered_cache import ACTIVITY_FEED_TAG, invalidate_tags, tagged
+from pickaladder.extensions import cache
+
 if TYPE_CHECKING:
     from google.cloud.firestore_v1.client import Client
 
 
+def _load_feed_page(
+    db: Client,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Read one page of activities and attach their actors in one lookup."""
+    query = db.collection(ActivityService.COLLECTION_NAME).order_by(
+        "timestamp",
+        direction=firestore.Query.DESCENDING,
+    )
+    docs, next_cursor = FirestorePaginator.paginate(query, limit, cursor)
+    activities = [(doc.to_dict() or {}) | {"id": doc.id} for doc in docs]
+
+    users = get_entities(db, "users", (a.get("userId") for a in activities))
+    for activity in activities:
+        user_id = activity.get("userId")
+        user = users.get(user_id)  # type: ignore[arg-type]
+        activity["user"] = (
+            user | {"uid": user_id} if user else {"username": "Unknown", "id": user_id}
+        )
+    return activities, next_cursor
+
+
+@tagged(lambda limit: [ACTIVITY_FEED_TAG])
+@cache.memoize(timeout=ACTIVITY_FEED_CACHE_TIMEOUT)
+def _get_first_feed_page(limit: int) -> tuple[list[dict[str, Any]], str | None]:
+    """Return the newest page of the feed, shared briefly by every viewer."""
+    return _load_feed_page(firestore.client(), limit, None)
+
+
 class ActivityService:
     """Handles logging and retrieval of community events."""
 
@@ -32,31 +68,29 @@ class ActivityService:
             "reactions": [],
         }
         activity_ref.set(payload)
+        invalidate_tags(ACTIVITY_FEED_TAG)
         return activity_ref.id
 
+    @staticmethod
+    def get_feed_page(
+        db: Client,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Retrieves a page of activities enriched with user data.
+
+        ``cursor`` is the ID of the last activity of the previous page. The
+        first page is served from a short-lived cache that new activities and
+        reactions clear.
+        """
+        if cursor is None:
+            return _get_first_feed_page(limit)
+        return _load_feed_page(db, limit, cursor)
+
     @staticmethod
     def get_global_feed(db: Client, limit: int = 20) -> list[dict[str, Any]]:
         """Retrieves recent activities enriched with user data."""
-        from pickaladder.user.services import UserService
-
-        query = (
-            db.collection(ActivityService.COLLECTION_NAME)
-            .order_by("timestamp", direction=firestore.Query.DESCENDING)
-            .limit(limit)
-        )
-
-        activities = []
-        for doc in query.stream():
-            data = doc.to_dict()
-            data["id"] = doc.id  # type: ignore
-
-            # Enrich with user profile
-            user = UserService.get_user_by_id(db, data["userId"])  # type: ignore
-            data["user"] = user or {"username": "Unknown", "id": data["userId"]}  # type: ignore
-
-            activities.append(data)
-
-        return activities  # type: ignore
+        return ActivityService.get_feed_page(db, limit)[0]
 
     @staticmethod
     def toggle_reaction(
@@ -93,4 +127,5 @@ class ActivityService:
             activity_ref.update({"reactions": firestore.ArrayUnion([new_reaction])})
             reactions.append(new_reaction)
 
+        invalidate_tags(ACTIVITY_FEED_TAG)
         return reactions
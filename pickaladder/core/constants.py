@@ -52,12 +52,46 @@ MIGRATION_NAME = "migration_name"
 
 # Group-related constants
 RECENT_MATCHES_LIMIT = 5
+# Latest matches listed on a group page
+GROUP_RECENT_MATCHES_LIMIT = 20
 HOT_STREAK_THRESHOLD = 3
+# Matches re-read per player when an edit forces a streak recompute
+STREAK_RECOMPUTE_LIMIT = 20
+# Match IDs kept on a head-to-head pair document for the rivalry list
+H2H_RECENT_MATCHES = 20
+# Seconds a group rivalry matrix stays cached for one match version
+RIVALRY_MATRIX_CACHE_TIMEOUT = 3600
+# Seconds the global leaderboard rows stay cached between match writes
+GLOBAL_LEADERBOARD_CACHE_TIMEOUT = 600
+# Seconds a tournament's standings stay cached between its match writes
+TOURNAMENT_STANDINGS_CACHE_TIMEOUT = 600
+# Groups whose parsed match history is kept in memory per process
+GROUP_MATCH_CACHE_SIZE = 64
+
+# Concurrent page sections (dashboard fan-out)
+FANOUT_MAX_WORKERS = 16
+# Seconds a section may take before its placeholder is rendered
+FANOUT_SECTION_TIMEOUT = 3.0
+# Latency samples kept per section for percentile reporting
+FANOUT_LATENCY_SAMPLES = 500
+
+# Document references per get_all round trip in the request data loader
+ENTITY_GET_ALL_CHUNK = 100
+# Conversations listed per inbox page
+INBOX_PAGE_SIZE = 30
+# Messages loaded per chat page, and at most per polling delta
+CHAT_PAGE_SIZE = 50
+# Recipients per background batch of an announcement broadcast (FCM allows 500)
+BROADCAST_CHUNK_SIZE = 200
+# Seconds the first page of the community activity feed is cached
+ACTIVITY_FEED_CACHE_TIMEOUT = 30
 
 # Leaderboard-related constants
 GLOBAL_LEADERBOARD_MIN_GAMES = 1
 LEADERBOARD_GOLD_THRESHOLD = 60
 LEADERBOARD_SILVER_THRESHOLD = 40
+LEADERBOARD_RANK_CHANGE_DAYS = 7
+LEADERBOARD_TREND_DAYS = 90
 
 # Email-related constants
 SMTP_AUTH_ERROR_CODE = 534
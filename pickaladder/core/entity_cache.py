@@ -0,0 +1,228 @@
+"""Request-scoped loader of Firestore documents fetched by ID.
+
+Services that need related documents (the participants of every conversation,
+the players behind a page of matches, the signed-in user read by both the
+login manager and the request hook) ask the request's ``DataLoader`` instead
+of calling ``get()`` themselves. Keys queued with ``defer`` are resolved
+together by the next load, in chunked ``get_all`` round trips, and every
+document is fetched at most once per request, including documents that
+turned out not to exist. Outside an application context nothing is kept
+between calls.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, cast
+
+from flask import g, has_app_context
+
+from pickaladder.core.constants import ENTITY_GET_ALL_CHUNK
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from google.cloud.firestore_v1.base_document import DocumentSnapshot
+    from google.cloud.firestore_v1.client import Client
+    from google.cloud.firestore_v1.document import DocumentReference
+
+
+def _snapshot_data(snap: DocumentSnapshot, key: str) -> dict[str, Any] | None:
+    """Return a snapshot's data with the ID of ``key``, or None if missing."""
+    if not snap.exists:
+        return None
+    data = snap.to_dict() or {}
+    data["id"] = key.rsplit("/", 1)[-1]
+    return data
+
+
+def _snapshot_keys(
+    chunk: list[str],
+    snaps: Iterable[DocumentSnapshot],
+) -> Iterator[tuple[str, DocumentSnapshot]]:
+    """Pair each snapshot of a ``get_all`` answer with its memo key.
+
+    ``get_all`` may answer out of order, so a snapshot is matched by its own
+    path, then by its ID among the requested keys, and only then by position.
+    """
+    by_id: dict[str, list[str]] = {}
+    for key in chunk:
+        by_id.setdefault(key.rsplit("/", 1)[-1], []).append(key)
+    for requested, snap in zip(chunk, snaps, strict=False):
+        path = getattr(snap.reference, "path", None)
+        if isinstance(path, str):
+            yield path, snap
+        elif isinstance(snap.id, str) and by_id.get(snap.id):
+            yield by_id[snap.id].pop(0), snap
+        else:
+            yield requested, snap
+
+
+class DataLoader:
+    """Coalesce and memoize document reads for the duration of a request.
+
+    Documents are keyed by their path (``"users/abc"``). Callers receive
+    shallow copies, so mutating a returned dict never leaks into the memo.
+    The sections of a fanned-out page share the request's loader: a document
+    another thread is already fetching is waited for, not fetched again.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty memo and nothing queued."""
+        self._docs: dict[str, dict[str, Any] | None] = {}
+        self._pending: dict[str, DocumentReference] = {}
+        self._inflight: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(collection: str, doc_id: str) -> str:
+        """Return the memo key of a document."""
+        return f"{collection}/{doc_id}"
+
+    def defer(self, db: Client, collection: str, doc_ids: Iterable[str]) -> None:
+        """Queue documents to be fetched together with the next load."""
+        with self._lock:
+            for doc_id in doc_ids:
+                key = self._key(collection, doc_id)
+                if doc_id and not self._known(key):
+                    self._pending[key] = db.collection(collection).document(doc_id)
+
+    def _known(self, key: str) -> bool:
+        """Return whether a key is memoized, queued or being fetched."""
+        return key in self._docs or key in self._pending or key in self._inflight
+
+    def dispatch(self, db: Client) -> None:
+        """Fetch every queued document.
+
+        A single queued document is read with ``get()``; larger batches go out
+        in chunks of ``ENTITY_GET_ALL_CHUNK`` references per ``get_all``,
+        whatever collections they belong to.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            done = threading.Event()
+            for key in pending:
+                self._inflight[key] = done
+        fetched: dict[str, dict[str, Any] | None] = {}
+        try:
+            if len(pending) == 1:
+                [(key, ref)] = pending.items()
+                snap = cast("DocumentSnapshot", ref.get())
+                fetched[key] = _snapshot_data(snap, key)
+            else:
+                keys = list(pending)
+                fetched = dict.fromkeys(keys)
+                for offset in range(0, len(keys), ENTITY_GET_ALL_CHUNK):
+                    chunk = keys[offset : offset + ENTITY_GET_ALL_CHUNK]
+                    snaps = db.get_all([pending[key] for key in chunk])
+                    for key, snap in _snapshot_keys(chunk, snaps):
+                        fetched[key] = _snapshot_data(snap, key)
+        finally:
+            # Keys left unfetched by a failure are fetched again by waiters
+            with self._lock:
+                self._docs.update(fetched)
+                for key in pending:
+                    self._inflight.pop(key, None)
+            done.set()
+
+    def _resolve(self, db: Client, refs: dict[str, DocumentReference]) -> None:
+        """Memoize every key of ``refs``, waiting for those fetched elsewhere."""
+        while True:
+            with self._lock:
+                for key, ref in refs.items():
+                    if not self._known(key):
+                        self._pending[key] = ref
+                waits = {self._inflight[k] for k in refs if k in self._inflight}
+                queued = bool(self._pending)
+            if queued:
+                self.dispatch(db)
+            for done in waits:
+                done.wait()
+            with self._lock:
+                if all(key in self._docs for key in refs):
+                    return
+
+    def load(self, db: Client, collection: str, doc_id: str) -> dict[str, Any] | None:
+        """Return one document with its ``id``, or None if it does not exist."""
+        return self.load_many(db, collection, [doc_id]).get(doc_id)
+
+    def load_many(
+        self,
+        db: Client,
+        collection: str,
+        doc_ids: Iterable[str],
+    ) -> dict[str, dict[str, Any]]:
+        """Return the existing documents among ``doc_ids``, keyed by ID."""
+        wanted = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id]
+        self._resolve(
+            db,
+            {
+                key: db.collection(collection).document(doc_id)
+                for doc_id in wanted
+                if (key := self._key(collection, doc_id)) not in self._docs
+            },
+        )
+        return {
+            doc_id: doc.copy()
+            for doc_id in wanted
+            if (doc := self._docs.get(self._key(collection, doc_id))) is not None
+        }
+
+    def load_refs(
+        self,
+        db: Client,
+        refs: Iterable[DocumentReference],
+    ) -> list[dict[str, Any]]:
+        """Return the existing documents behind ``refs``.
+
+        References without a string ``path`` cannot be keyed and are fetched
+        directly on every call, after the keyed ones.
+        """
+        refs = list(refs)
+        keys = [
+            path if isinstance(path := getattr(r, "path", None), str) else None
+            for r in refs
+        ]
+        self._resolve(
+            db,
+            {
+                key: ref
+                for key, ref in zip(keys, refs, strict=True)
+                if key is not None and key not in self._docs
+            },
+        )
+
+        docs = [self._docs.get(key) for key in keys if key is not None]
+        unkeyed = [ref for key, ref in zip(keys, refs, strict=True) if key is None]
+        if unkeyed:
+            snaps = cast("list[DocumentSnapshot]", db.get_all(unkeyed))
+            docs.extend(_snapshot_data(snap, snap.id) for snap in snaps)
+        return [doc.copy() for doc in docs if doc is not None]
+
+    def prime(self, collection: str, doc_id: str, data: dict[str, Any]) -> None:
+        """Store a document the caller already holds."""
+        with self._lock:
+            self._docs[self._key(collection, doc_id)] = {**data, "id": doc_id}
+
+    def clear(self, collection: str, doc_id: str) -> None:
+        """Forget a document so the next load reads it again."""
+        key = self._key(collection, doc_id)
+        with self._lock:
+            self._docs.pop(key, None)
+            self._pending.pop(key, None)
+
+
+def get_loader() -> DataLoader:
+    """Return the current request's loader, or a throwaway one."""
+    if has_app_context():
+        return cast("DataLoader", g.setdefault("_data_loader", DataLoader()))
+    return DataLoader()
+
+
+def get_entities(
+    db: Client,
+    collection: str,
+    doc_ids: Iterable[str],
+) -> dict[str, dict[str, Any]]:
+    """Return the existing documents among ``doc_ids``, keyed by ID."""
+    return get_loader().load_many(db, collection, doc_ids)
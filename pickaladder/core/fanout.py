@@ -0,0 +1,145 @@
+"""Concurrent fan-out of independent page sections with per-section deadlines.
+
+Pages like the dashboard are assembled from several independent Firestore
+reads. ``FanOut`` submits them to a bounded pool of its own, waits for each
+until its own deadline and substitutes the section's placeholder when it
+times out or fails, so a page is as slow as its slowest section rather than
+the sum of them. Each page build has its own pool, so concurrent requests
+never queue behind each other's sections; a section still queued at its
+deadline is cancelled. Sections run with the request's ``g``, sharing its
+data loader and memos. Every section's latency is recorded for percentile
+reporting.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, Callable
+
+from flask import current_app, g, has_app_context
+
+from pickaladder.core.constants import (
+    FANOUT_LATENCY_SAMPLES,
+    FANOUT_MAX_WORKERS,
+    FANOUT_SECTION_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+_latencies: defaultdict[str, deque[float]] = defaultdict(
+    lambda: deque(maxlen=FANOUT_LATENCY_SAMPLES),
+)
+_latency_lock = threading.Lock()
+
+
+def record_latency(section: str, seconds: float) -> None:
+    """Add a latency sample for a section."""
+    with _latency_lock:
+        _latencies[section].append(seconds)
+
+
+def get_section_latencies() -> dict[str, dict[str, float]]:
+    """Return the p50, p95 and sample count of every recorded section, in ms."""
+    with _latency_lock:
+        samples = {name: sorted(values) for name, values in _latencies.items()}
+    return {
+        name: {
+            "p50_ms": values[int(0.50 * (len(values) - 1))] * 1000,
+            "p95_ms": values[int(0.95 * (len(values) - 1))] * 1000,
+            "count": len(values),
+        }
+        for name, values in samples.items()
+        if values
+    }
+
+
+def clear_section_latencies() -> None:
+    """Drop every recorded latency sample."""
+    with _latency_lock:
+        _latencies.clear()
+
+
+class FanOut:
+    """A set of independent sections fetched concurrently for one page.
+
+    Sections are named ``<page>.<section>`` in the latency records. The page
+    keeps the outcome of each section in ``timings`` (milliseconds) and
+    ``degraded`` (sections that fell back to their placeholder).
+    """
+
+    def __init__(self, page: str) -> None:
+        self.page = page
+        self.timings: dict[str, float] = {}
+        self.degraded: list[str] = []
+        self._app = current_app._get_current_object() if has_app_context() else None  # type: ignore[attr-defined]
+        self._globals = g._get_current_object() if has_app_context() else None  # type: ignore[attr-defined]
+        self._pool: ThreadPoolExecutor | None = None
+        self._sections: dict[str, tuple[Future[Any], float, float, Any]] = {}
+        self._finished: dict[str, float] = {}
+
+    def submit(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        placeholder: Any = None,
+        timeout: float = FANOUT_SECTION_TIMEOUT,
+    ) -> None:
+        """Start fetching a section; ``placeholder`` stands in if it fails."""
+        started = time.perf_counter()
+
+        def run() -> Any:
+            try:
+                if self._app is None:
+                    return fetch()
+                ctx = self._app.app_context()
+                ctx.g = self._globals
+                with ctx:
+                    return fetch()
+            finally:
+                self._finished[name] = time.perf_counter()
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=FANOUT_MAX_WORKERS,
+                thread_name_prefix=f"fanout-{self.page}",
+            )
+        future = self._pool.submit(run)
+        self._sections[name] = (future, started, started + timeout, placeholder)
+
+    def collect(self) -> dict[str, Any]:
+        """Wait for every section until its deadline and return the results.
+
+        A section still queued at its deadline is cancelled; one already
+        running is left to finish in the background and its result discarded.
+        """
+        results: dict[str, Any] = {}
+        for name, (future, started, deadline, placeholder) in self._sections.items():
+            try:
+                results[name] = future.result(
+                    timeout=max(0.0, deadline - time.perf_counter()),
+                )
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning("%s.%s timed out; using placeholder", self.page, name)
+                results[name] = placeholder
+                self.degraded.append(name)
+            except Exception:
+                logger.exception("%s.%s failed; using placeholder", self.page, name)
+                results[name] = placeholder
+                self.degraded.append(name)
+            elapsed = min(self._finished.get(name, deadline), deadline) - started
+            self.timings[name] = round(elapsed * 1000, 1)
+            record_latency(f"{self.page}.{name}", elapsed)
+        self._sections.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        return results
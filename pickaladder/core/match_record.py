@@ -0,0 +1,236 @@
+"""Compact, parse-once view of a match document.
+
+Match documents name their players in several ways: reference lists for
+doubles, ``player1Ref``/``player1Id`` for singles, denormalized
+``player_1_data`` and the legacy ``partner``/``opponent2`` fields, with scores
+under either ``player1Score`` or ``team1Score``. ``MatchRecord`` resolves all of
+them once into interned IDs, side sets, scores and the winning side, so loops
+over many matches read plain attributes instead of re-parsing dicts.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
+    from google.cloud.firestore import DocumentSnapshot
+
+_intern = sys.intern
+_set = object.__setattr__
+
+# Side sets repeat across a history (the same singles player, the same doubles
+# pair), so equal sets are shared like interned strings.
+_SIDE_SET_LIMIT = 100_000
+_side_sets: dict[frozenset[str], frozenset[str]] = {}
+_EMPTY_SIDE: frozenset[str] = frozenset()
+
+
+def _intern_side(ids: list[str]) -> frozenset[str]:
+    """Return a shared frozenset equal to ``ids``."""
+    side = frozenset(ids)
+    shared = _side_sets.get(side)
+    if shared is None:
+        if len(_side_sets) >= _SIDE_SET_LIMIT:
+            _side_sets.clear()
+        shared = _side_sets[side] = side
+    return shared
+
+
+# Per side: the member list, the fields naming its first player, the legacy
+# fields naming a doubles partner and the key of the denormalized snapshot.
+_SIDE_FIELDS = {
+    1: (
+        "team1",
+        ("player1Ref", "player1Id"),
+        ("partnerRef", "partnerId"),
+        "player_1_data",
+    ),
+    2: (
+        "team2",
+        ("player2Ref", "player2Id"),
+        ("opponent2Ref", "opponent2Id"),
+        "player_2_data",
+    ),
+}
+
+
+def ref_id(value: object) -> str | None:
+    """Return the interned ID held by a reference, dict or string, if any."""
+    if isinstance(value, str):
+        return _intern(value) if value else None
+    value = (
+        value.get("id") or value.get("uid")
+        if isinstance(value, dict)
+        else getattr(value, "id", None)
+    )
+    if isinstance(value, str):
+        return _intern(value) if value else None
+    return value or None  # type: ignore[return-value]
+
+
+def _optional_id(value: object) -> str | None:
+    """Return ``ref_id(value)``, skipping the call for empty fields."""
+    return ref_id(value) if value else None
+
+
+def _side_ids(data: Mapping[str, Any], side: int) -> tuple[frozenset[str], str | None]:
+    """Return the member IDs of one side and the ID of its first player."""
+    team_key, player_fields, partner_fields, snapshot_key = _SIDE_FIELDS[side]
+    get = data.get
+    ids: list[str] = []
+    for field in player_fields:
+        if (value := get(field)) and (uid := ref_id(value)):
+            ids.append(uid)
+    first = ids[0] if ids else None
+    for field in partner_fields:
+        if (value := get(field)) and (uid := ref_id(value)):
+            ids.append(uid)
+    members = get(team_key)
+    if isinstance(members, list):
+        ids.extend(uid for uid in map(ref_id, members) if uid)
+    snapshot = get(snapshot_key)
+    if isinstance(snapshot, dict) and (uid := ref_id(snapshot.get("uid"))):
+        ids.append(uid)
+    if not ids:
+        return _EMPTY_SIDE, None
+    if first is None:
+        first = ids[0]
+    return _intern_side(ids), first
+
+
+class MatchRecord:
+    """The resolved fields of one match, read-only once built.
+
+    ``team1``/``team2`` hold the user IDs on each side, ``player1_id`` and
+    ``player2_id`` the first player of each side, ``team1_id``/``team2_id`` the
+    team documents of a doubles match and ``winner_side`` is 1, 2 or 0 for a
+    draw. ``winners``/``losers`` are None unless the document stores them.
+    """
+
+    __slots__ = (
+        "created_at",
+        "date",
+        "group_id",
+        "id",
+        "losers",
+        "match_type",
+        "p1_score",
+        "p2_score",
+        "player1_id",
+        "player2_id",
+        "status",
+        "team1",
+        "team1_id",
+        "team2",
+        "team2_id",
+        "tournament_id",
+        "winner_id",
+        "winner_side",
+        "winners",
+    )
+
+    id: str
+    match_type: str
+    date: datetime | None
+    created_at: datetime | None
+    group_id: str | None
+    tournament_id: str | None
+    status: str | None
+    team1: frozenset[str]
+    team2: frozenset[str]
+    player1_id: str | None
+    player2_id: str | None
+    team1_id: str | None
+    team2_id: str | None
+    p1_score: int
+    p2_score: int
+    winner_side: int
+    winner_id: str | None
+    winners: frozenset[str] | None
+    losers: frozenset[str] | None
+
+    def __init__(self, data: Mapping[str, Any], match_id: str = "") -> None:
+        get = data.get
+        match_type = get("matchType") or "singles"
+        team1, player1_id = _side_ids(data, 1)
+        team2, player2_id = _side_ids(data, 2)
+        if not team1 and not team2 and match_type != "doubles":
+            # Some documents only carry the flat participants list.
+            participants = [
+                uid for uid in map(ref_id, get("participants") or []) if uid
+            ]
+            if len(participants) == 2:
+                player1_id, player2_id = participants
+                team1, team2 = _intern_side([player1_id]), _intern_side([player2_id])
+
+        s1 = get("player1Score")
+        s2 = get("player2Score")
+        p1_score = int((get("team1Score") if s1 is None else s1) or 0)
+        p2_score = int((get("team2Score") if s2 is None else s2) or 0)
+        if p1_score != p2_score:
+            winner_side = 1 if p1_score > p2_score else 2
+        else:
+            winner_side = {"team1": 1, "team2": 2}.get(get("winner"), 0)
+
+        winners = get("winners")
+        losers = get("losers")
+        _set(self, "id", match_id)
+        _set(self, "match_type", match_type)
+        _set(self, "date", get("matchDate"))
+        _set(self, "created_at", get("createdAt"))
+        _set(self, "group_id", get("groupId"))
+        _set(self, "tournament_id", get("tournamentId"))
+        _set(self, "status", get("status"))
+        _set(self, "team1", team1)
+        _set(self, "team2", team2)
+        _set(self, "player1_id", player1_id)
+        _set(self, "player2_id", player2_id)
+        _set(self, "team1_id", _optional_id(get("team1Id") or get("team1Ref")))
+        _set(self, "team2_id", _optional_id(get("team2Id") or get("team2Ref")))
+        _set(self, "p1_score", p1_score)
+        _set(self, "p2_score", p2_score)
+        _set(self, "winner_side", winner_side)
+        _set(self, "winner_id", _optional_id(get("winnerId")))
+        _set(
+            self,
+            "winners",
+            None if winners is None else frozenset(filter(None, map(ref_id, winners))),
+        )
+        _set(
+            self,
+            "losers",
+            None if losers is None else frozenset(filter(None, map(ref_id, losers))),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        msg = f"{type(self).__name__} is read-only"
+        raise AttributeError(msg)
+
+    @classmethod
+    def from_snapshot(cls, snap: DocumentSnapshot) -> MatchRecord:
+        """Build a record from a match document snapshot."""
+        return cls(snap.to_dict() or {}, snap.id)
+
+    def side_of(self, user_id: str) -> int:
+        """Return 1 or 2 for the side a user played on, or 0 if absent."""
+        if user_id in self.team1:
+            return 1
+        if user_id in self.team2:
+            return 2
+        return 0
+
+    def won_lost(self, user_id: str) -> tuple[bool, bool]:
+        """Return whether a user won and whether they lost; draws are neither."""
+        if self.winners is not None and self.losers is not None:
+            return user_id in self.winners, user_id in self.losers
+        if self.p1_score == self.p2_score:
+            return False, False
+        side = self.side_of(user_id)
+        if not side:
+            return False, False
+        won = side == (1 if self.p1_score > self.p2_score else 2)
+        return won, not won
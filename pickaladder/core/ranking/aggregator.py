@@ -3,7 +3,13 @@
 from __future__ import annotations
 
 import collections
-from typing import Any
+from array import array
+from typing import TYPE_CHECKING, Any
+
+from pickaladder.core.match_record import MatchRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 H2H_LEVEL = 1
 PD_LEVEL = 2
@@ -17,7 +23,79 @@ REASONS = {
     PF_LEVEL: "PF",
 }
 
-SINGLES_PARTICIPANT_COUNT = 2
+
+class _MatchTable:
+    """Completed matches normalized once into participant-index arrays.
+
+    Columns hold participant indices (-1 when a side is outside the pool) and
+    scores. Head-to-head wins and point differential are accumulated into N x N
+    matrices up front, so every tie-break level reads slices of them instead of
+    rescanning the raw match list.
+    """
+
+    __slots__ = ("h2h_pd", "h2h_wins", "index", "p1", "p2", "s1", "s2", "stray", "w")
+
+    def __init__(
+        self,
+        uids: list[str],
+        matches: Iterable[MatchRecord | dict[str, Any]],
+    ) -> None:
+        self.index = {uid: i for i, uid in enumerate(uids)}
+        n = len(uids)
+        self.p1 = array("i")
+        self.p2 = array("i")
+        self.w = array("i")
+        self.s1 = array("q")
+        self.s2 = array("q")
+        # h2h_wins[i][j]: wins of i over j; h2h_pd[i][j]: points of i minus j.
+        self.h2h_wins = [[0] * n for _ in range(n)]
+        self.h2h_pd = [[0] * n for _ in range(n)]
+        # Head-to-head matches whose recorded winner is neither side.
+        self.stray: list[tuple[int, int, int]] = []
+
+        for match in matches:
+            if isinstance(match, MatchRecord):
+                m = match
+            elif match.get("status") == "COMPLETED":
+                m = MatchRecord(match)
+            else:
+                continue
+            if m.status != "COMPLETED":
+                continue
+            i1 = self.index.get(m.player1_id, -1)  # type: ignore[arg-type]
+            i2 = self.index.get(m.player2_id, -1)  # type: ignore[arg-type]
+            iw = self.index.get(m.winner_id, -1)  # type: ignore[arg-type]
+            s1 = m.p1_score
+            s2 = m.p2_score
+            self.p1.append(i1)
+            self.p2.append(i2)
+            self.w.append(iw)
+            self.s1.append(s1)
+            self.s2.append(s2)
+
+            if i1 < 0 or i2 < 0 or i1 == i2:
+                continue
+            self.h2h_pd[i1][i2] += s1 - s2
+            self.h2h_pd[i2][i1] += s2 - s1
+            if iw == i1:
+                self.h2h_wins[i1][i2] += 1
+            elif iw == i2:
+                self.h2h_wins[i2][i1] += 1
+            elif iw >= 0:
+                self.stray.append((i1, i2, iw))
+
+    def h2h_wins_among(self, members: list[int]) -> dict[int, int]:
+        """Head-to-head wins of each member against the other members."""
+        member_set = set(members)
+        wins = {i: sum(self.h2h_wins[i][j] for j in members) for i in members}
+        for i1, i2, iw in self.stray:
+            if i1 in member_set and i2 in member_set and iw in member_set:
+                wins[iw] += 1
+        return wins
+
+    def h2h_pd_among(self, members: list[int]) -> dict[int, int]:
+        """Head-to-head point differential of each member within the group."""
+        return {i: sum(self.h2h_pd[i][j] for j in members) for i in members}
 
 
 class StandingAggregator:
@@ -26,17 +104,17 @@ class StandingAggregator:
     @staticmethod
     def aggregate(
         participant_ids: list[str],
-        matches: list[dict[str, Any]],
+        matches: Iterable[MatchRecord | dict[str, Any]],
     ) -> list[dict[str, Any]]:
         """
         Main entry point. Aggregates stats and resolves ties.
+        Matches may be raw documents or prebuilt ``MatchRecord`` objects.
         Returns a sorted list of stats dicts.
         """
-        # 1. Calculate basic stats for all participants
-        basic_stats = StandingAggregator._calculate_basic_stats(
-            participant_ids,
-            list(matches),
-        )
+        # 1. Normalize the match list once and derive basic stats from it
+        uids = list(dict.fromkeys(participant_ids))
+        table = _MatchTable(uids, matches)
+        basic_stats = StandingAggregator._calculate_basic_stats(uids, table)
 
         # 2. Group by matches won
         groups = collections.defaultdict(list)
@@ -49,7 +127,7 @@ class StandingAggregator:
         for wins in sorted(groups.keys(), reverse=True):
             tied_group = groups[wins]
             if len(tied_group) > 1:
-                resolved = StandingAggregator._resolve_ties(tied_group, list(matches))
+                resolved = StandingAggregator._resolve_ties(tied_group, table)
                 sorted_standings.extend(resolved)
             else:
                 sorted_standings.append(tied_group[0])
@@ -59,11 +137,11 @@ class StandingAggregator:
     @staticmethod
     def _calculate_basic_stats(
         participant_ids: list[str],
-        matches: list[dict[str, Any]],
+        table: _MatchTable,
     ) -> dict[str, dict[str, Any]]:
         """Compute wins, losses, PF, PA, PD for each player."""
-        stats = {
-            uid: {
+        stats = [
+            {
                 "uid": uid,
                 "wins": 0,
                 "losses": 0,
@@ -73,48 +151,42 @@ class StandingAggregator:
                 "tie_break_reason": None,
             }
             for uid in participant_ids
-        }
-
-        for m in matches:
-            if m.get("status") != "COMPLETED":
-                continue
-
-            # Robust winner detection
-            w_id = StandingAggregator._get_w_id(m)
-            p1_id = StandingAggregator._get_p_id(m, 1)
-            p2_id = StandingAggregator._get_p_id(m, 2)
-
-            s1 = int(m.get("player1Score", 0))
-            s2 = int(m.get("player2Score", 0))
-
+        ]
+
+        for i1, i2, iw, s1, s2 in zip(
+            table.p1,
+            table.p2,
+            table.w,
+            table.s1,
+            table.s2,
+        ):
             # Record stats
-            for uid in [p1_id, p2_id]:
-                if uid and uid in stats:
-                    stats[uid]["matches_played"] += 1  # type: ignore
-                    if uid == w_id:
-                        stats[uid]["wins"] += 1  # type: ignore
-                    else:
-                        stats[uid]["losses"] += 1  # type: ignore
-
-                    if uid == p1_id:
-                        stats[uid]["points_for"] += s1  # type: ignore
-                        stats[uid]["points_against"] += s2  # type: ignore
-                    else:
-                        stats[uid]["points_for"] += s2  # type: ignore
-                        stats[uid]["points_against"] += s1  # type: ignore
+            # A self-match counts twice from player 1's perspective, as before.
+            side2 = (i2, s2, s1) if i2 != i1 else (i2, s1, s2)
+            for idx, pf, pa in ((i1, s1, s2), side2):
+                if idx < 0:
+                    continue
+                s = stats[idx]
+                s["matches_played"] += 1  # type: ignore
+                if idx == iw:
+                    s["wins"] += 1  # type: ignore
+                else:
+                    s["losses"] += 1  # type: ignore
+                s["points_for"] += pf  # type: ignore
+                s["points_against"] += pa  # type: ignore
 
         # Calculate final PD and win %
-        for s in stats.values():
+        for s in stats:
             s["point_diff"] = s["points_for"] - s["points_against"]  # type: ignore
             total = s["wins"] + s["losses"]  # type: ignore
             s["win_percentage"] = (s["wins"] / total * 100) if total > 0 else 0  # type: ignore
 
-        return stats
+        return {s["uid"]: s for s in stats}
 
     @staticmethod
     def _resolve_ties(
         tied_players: list[dict[str, Any]],
-        matches: list[dict[str, Any]],
+        table: _MatchTable,
         hierarchy_level: int = H2H_LEVEL,
     ) -> list[dict[str, Any]]:
         """Recursive tie-breaker."""
@@ -123,40 +195,40 @@ class StandingAggregator:
 
         # 1. H2H (Wins among tied players)
         if hierarchy_level == H2H_LEVEL:
-            h2h_wins = StandingAggregator._calculate_h2h_wins(tied_players, matches)
+            h2h_wins = StandingAggregator._calculate_h2h_wins(tied_players, table)
             groups = collections.defaultdict(list)
             for p in tied_players:
                 groups[h2h_wins[p["uid"]]].append(p)
-            return StandingAggregator._process_groups(groups, matches, hierarchy_level)
+            return StandingAggregator._process_groups(groups, table, hierarchy_level)
 
         # 2. Point Differential (All Games)
         if hierarchy_level == PD_LEVEL:
             groups = collections.defaultdict(list)
             for p in tied_players:
                 groups[p["point_diff"]].append(p)
-            return StandingAggregator._process_groups(groups, matches, hierarchy_level)
+            return StandingAggregator._process_groups(groups, table, hierarchy_level)
 
         # 3. H2H Point Differential
         if hierarchy_level == H2H_PD_LEVEL:
-            h2h_pd = StandingAggregator._calculate_h2h_pd(tied_players, matches)
+            h2h_pd = StandingAggregator._calculate_h2h_pd(tied_players, table)
             groups = collections.defaultdict(list)
             for p in tied_players:
                 groups[h2h_pd[p["uid"]]].append(p)
-            return StandingAggregator._process_groups(groups, matches, hierarchy_level)
+            return StandingAggregator._process_groups(groups, table, hierarchy_level)
 
         # 4. Total Points Scored
         if hierarchy_level == PF_LEVEL:
             groups = collections.defaultdict(list)
             for p in tied_players:
                 groups[p["points_for"]].append(p)
-            return StandingAggregator._process_groups(groups, matches, hierarchy_level)
+            return StandingAggregator._process_groups(groups, table, hierarchy_level)
 
         return tied_players
 
     @staticmethod
     def _process_groups(
         groups: dict[Any, list[dict[str, Any]]],
-        matches: list[dict[str, Any]],
+        table: _MatchTable,
         current_level: int,
     ) -> list[dict[str, Any]]:
         """Helper to iterate through grouped ties and recurse or move to next level."""
@@ -164,7 +236,7 @@ class StandingAggregator:
         if len(groups) == 1:
             return StandingAggregator._resolve_ties(
                 next(iter(groups.values())),
-                matches,
+                table,
                 hierarchy_level=current_level + 1,
             )
 
@@ -185,7 +257,7 @@ class StandingAggregator:
                 sorted_result.extend(
                     StandingAggregator._resolve_ties(
                         sub_group,
-                        matches,
+                        table,
                         hierarchy_level=H2H_LEVEL,
                     ),
                 )
@@ -193,87 +265,20 @@ class StandingAggregator:
                 sorted_result.append(sub_group[0])
         return sorted_result
 
-    @staticmethod
-    def _get_w_id(m: dict[str, Any]) -> str | None:
-        w_id = m.get("winnerId")
-        if not w_id:
-            return None
-        if isinstance(w_id, str):
-            return w_id
-        if hasattr(w_id, "id"):
-            return w_id.id
-        return None
-
-    @staticmethod
-    def _get_p_id(m: dict[str, Any], index: int) -> str | None:
-        # Check Participants list (highest reliability in mocks/E2E)
-        p_ids = m.get("participants") or []
-        if len(p_ids) >= index:
-            val = p_ids[index - 1]
-            if isinstance(val, str):
-                return val
-            if hasattr(val, "id"):
-                return val.id
-
-        ref_key = f"player{index}Ref"
-        id_key = f"player{index}Id"
-        ref = m.get(ref_key)
-
-        if isinstance(ref, str):
-            return ref
-        if ref and hasattr(ref, "id") and isinstance(ref.id, str):
-            return ref.id
-        uid = m.get(id_key)
-        if uid and isinstance(uid, str):
-            return uid
-
-        return None
-
     @staticmethod
     def _calculate_h2h_wins(
         players: list[dict[str, Any]],
-        matches: list[dict[str, Any]],
+        table: _MatchTable,
     ) -> dict[str, int]:
-        uids = {p["uid"] for p in players}
-        wins = dict.fromkeys(uids, 0)
-        for m in matches:
-            if m.get("status") != "COMPLETED":
-                continue
-
-            w_id = StandingAggregator._get_w_id(m)
-            p1 = StandingAggregator._get_p_id(m, 1)
-            p2 = StandingAggregator._get_p_id(m, 2)
-
-            match_parts = {p1, p2}
-            if (
-                match_parts.issubset(uids)
-                and len(match_parts) == SINGLES_PARTICIPANT_COUNT
-            ) and w_id in wins:
-                wins[w_id] += 1
-        return wins
+        members = [table.index[p["uid"]] for p in players]
+        wins = table.h2h_wins_among(members)
+        return {p["uid"]: wins[table.index[p["uid"]]] for p in players}
 
     @staticmethod
     def _calculate_h2h_pd(
         players: list[dict[str, Any]],
-        matches: list[dict[str, Any]],
+        table: _MatchTable,
     ) -> dict[str, int]:
-        uids = {p["uid"] for p in players}
-        pd = dict.fromkeys(uids, 0)
-        for m in matches:
-            if m.get("status") != "COMPLETED":
-                continue
-            p1 = StandingAggregator._get_p_id(m, 1)
-            p2 = StandingAggregator._get_p_id(m, 2)
-
-            match_parts = {p1, p2}
-            if (
-                match_parts.issubset(uids)
-                and len(match_parts) == SINGLES_PARTICIPANT_COUNT
-            ):
-                s1 = int(m.get("player1Score", 0))
-                s2 = int(m.get("player2Score", 0))
-                if p1 in pd:
-                    pd[p1] += s1 - s2
-                if p2 in pd:
-                    pd[p2] += s2 - s1
-        return pd
+        members = [table.index[p["uid"]] for p in players]
+        pd = table.h2h_pd_among(members)
+        return {p["uid"]: pd[table.index[p["uid"]]] for p in players}
@@ -0,0 +1,356 @@
+"""Two-tier application cache with tag-based invalidation.
+
+Each worker keeps a small LRU of recent entries in front of a backend shared
+by every worker: Redis when ``CACHE_REDIS_URL`` is set, otherwise an
+in-process ``SimpleCache``. Entries may carry tags such as ``group:<id>``,
+``user:<id>``, ``tournament:<id>`` or a global tag like ``RANKINGS_TAG``, so
+one call drops every entry that depends on the data a write changed.
+
+A tag is a version token kept in the shared backend. Entries are stored with
+the tokens that were current when their value was computed and are only
+served while those tokens still are; invalidating a tag replaces its token.
+An evicted token can only make entries miss, never revive them.
+
+A local copy is served without asking the shared backend for
+``CACHE_LOCAL_TRUST`` seconds after it was last checked, and is checked
+against the shared tokens on the first read after that. An invalidation or
+delete is immediate in the worker that made it and reaches the other workers
+within that window. Outside it a local hit costs one small ``get_many`` of
+tokens instead of fetching and decoding the entry; Flask-Caching's memoize
+adds its own version-key lookup on top, which the local tier absorbs too.
+
+Every entry also carries a token for its own key, rewritten on each ``set``
+with the entry's timeout, so replacing or deleting a key retires the copies
+other workers hold without leaving a token behind for every key ever set.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from flask import has_app_context
+from flask_caching.backends.base import BaseCache
+from flask_caching.backends.simplecache import SimpleCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from flask import Flask
+
+F = TypeVar("F", bound="Callable[..., Any]")
+
+# Tag versions captured by the tagged calls in progress, by the key each stores
+_active_stamps: contextvars.ContextVar[dict[str, dict[str, str]]] = (
+    contextvars.ContextVar("tiered_cache_stamps", default={})
+)
+
+
+# Tag of the entries ranking every player, such as the global leaderboard
+RANKINGS_TAG = "rankings"
+# Tag of the Rising Stars entries, built from the recent daily win buckets
+RISING_STARS_TAG = "rising_stars"
+# Tag of the cached first page of the global activity feed
+ACTIVITY_FEED_TAG = "activity_feed"
+
+
+def group_tag(group_id: str) -> str:
+    """Return the tag of entries derived from a group's data."""
+    return f"group:{group_id}"
+
+
+def user_tag(user_id: str) -> str:
+    """Return the tag of entries derived from a user's data."""
+    return f"user:{user_id}"
+
+
+def tournament_tag(tournament_id: str) -> str:
+    """Return the tag of entries derived from a tournament's data."""
+    return f"tournament:{tournament_id}"
+
+
+def _key_tag(key: str) -> str:
+    """Return the implicit tag every entry carries for its own key."""
+    return f"key:{key}"
+
+
+def _version_key(tag: str) -> str:
+    """Return the shared key holding a tag's current version token."""
+    return f"tag-version:{tag}"
+
+
+@dataclass
+class _LocalEntry:
+    """A worker's copy of an entry and when it was last checked."""
+
+    expires: float
+    payload: bytes
+    stamps: dict[str, str]
+    checked: float
+
+
+class TieredCache(BaseCache):
+    """Flask-Caching backend with a per-process LRU over a shared backend.
+
+    Select it with ``CACHE_TYPE = "pickaladder.core.tiered_cache.TieredCache"``.
+    ``CACHE_LOCAL_SIZE`` bounds the local LRU, ``CACHE_LOCAL_TIMEOUT`` caps
+    how long a local copy is kept and ``CACHE_LOCAL_TRUST`` is how long it is
+    served without checking the shared tokens.
+    """
+
+    def __init__(
+        self,
+        shared: BaseCache,
+        local_size: int = 256,
+        local_timeout: int = 60,
+        local_trust: float = 1.0,
+        default_timeout: int = 300,
+    ) -> None:
+        """Wrap ``shared`` with a local LRU of ``local_size`` entries."""
+        super().__init__(default_timeout=default_timeout)
+        self.shared = shared
+        self.local_size = local_size
+        self.local_timeout = local_timeout
+        self.local_trust = local_trust
+        self._local: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def factory(
+        cls,
+        app: Flask,
+        config: dict[str, Any],
+        args: list[Any],
+        kwargs: dict[str, Any],
+    ) -> TieredCache:
+        """Build the cache from the Flask-Caching configuration."""
+        if config.get("CACHE_REDIS_URL"):
+            from flask_caching.backends.rediscache import RedisCache
+
+            shared: BaseCache = RedisCache.factory(app, config, args, dict(kwargs))
+        else:
+            shared = SimpleCache(**kwargs)
+        return cls(
+            shared,
+            local_size=int(config.get("CACHE_LOCAL_SIZE", 256)),
+            local_timeout=int(config.get("CACHE_LOCAL_TIMEOUT", 60)),
+            local_trust=float(config.get("CACHE_LOCAL_TRUST", 1.0)),
+            **kwargs,
+        )
+
+    # Tag versions
+
+    def current_versions(self, tags: Iterable[str]) -> dict[str, str]:
+        """Return the version token of each tag, creating missing ones."""
+        tags = list(dict.fromkeys(tags))
+        tokens = self.shared.get_many(*[_version_key(tag) for tag in tags])
+        return {
+            tag: token if token is not None else self._create_version(tag)
+            for tag, token in zip(tags, tokens, strict=True)
+        }
+
+    def _create_version(self, tag: str) -> str:
+        """Give a tag its first version token, keeping one set concurrently."""
+        self.shared.add(_version_key(tag), uuid.uuid4().hex, timeout=0)
+        return str(self.shared.get(_version_key(tag)))
+
+    def _renew_key_version(self, key: str, timeout: int | None) -> str:
+        """Give a key a fresh token that expires with the entry stored under it."""
+        token = uuid.uuid4().hex
+        self.shared.set(_version_key(_key_tag(key)), token, timeout=timeout)
+        return token
+
+    def _is_current(self, stamps: dict[str, str]) -> bool:
+        """Return whether every tag of an entry still has its stamped version."""
+        tags = list(stamps)
+        tokens = self.shared.get_many(*[_version_key(tag) for tag in tags])
+        return all(
+            token is not None and token == stamps[tag]
+            for tag, token in zip(tags, tokens, strict=True)
+        )
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry carrying any of ``tags``, in all workers."""
+        for tag in dict.fromkeys(tags):
+            self.shared.set(_version_key(tag), uuid.uuid4().hex, timeout=0)
+        dropped = set(tags)
+        with self._lock:
+            for key in [k for k, e in self._local.items() if dropped & set(e.stamps)]:
+                del self._local[key]
+
+    # Local tier
+
+    def _remember(
+        self,
+        key: str,
+        payload: bytes,
+        stamps: dict[str, str],
+        timeout: int | None = None,
+        checked: bool = True,
+    ) -> None:
+        """Keep a local copy of an entry, evicting the least recently used.
+
+        Copies not known to be current are checked on their first read.
+        """
+        ttl = self.local_timeout
+        if timeout:
+            ttl = min(ttl, timeout)
+        now = time.monotonic()
+        last_checked = now if checked else float("-inf")
+        with self._lock:
+            self._local[key] = _LocalEntry(now + ttl, payload, stamps, last_checked)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _recall(self, key: str) -> _LocalEntry | None:
+        """Return an unexpired local copy of an entry."""
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _forget(self, key: str) -> None:
+        """Drop the local copy of an entry."""
+        with self._lock:
+            self._local.pop(key, None)
+
+    # BaseCache interface
+
+    def get(self, key: str) -> Any:
+        """Return a current entry, preferring the local copy."""
+        local = self._recall(key)
+        if local is not None:
+            now = time.monotonic()
+            if now - local.checked < self.local_trust:
+                return pickle.loads(local.payload)
+            if not self._is_current(local.stamps):
+                self._forget(key)
+                return None
+            local.checked = now
+            return pickle.loads(local.payload)
+
+        entry = self.shared.get(key)
+        if entry is None:
+            return None
+        payload, stamps = entry
+        if not self._is_current(stamps):
+            return None
+        self._remember(key, payload, stamps)
+        return pickle.loads(payload)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: int | None = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """Store an entry under ``tags`` and those of a tagged call storing it.
+
+        Versions captured by ``tagged`` when its call began take precedence,
+        so a value computed from data invalidated meanwhile is stored stale
+        and never served.
+        """
+        active = _active_stamps.get().get(key, {})
+        stamps = self.current_versions(t for t in tags if t not in active) | active
+        stamps[_key_tag(key)] = self._renew_key_version(key, timeout)
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if not self.shared.set(key, (payload, stamps), timeout=timeout):
+            return False
+        # Versions captured earlier may have been retired while computing
+        self._remember(key, payload, stamps, timeout, checked=not active)
+        return True
+
+    def add(self, key: str, value: Any, timeout: int | None = None) -> bool:
+        """Store an entry only if no current one exists."""
+        if self.get(key) is not None:
+            return False
+        return self.set(key, value, timeout)
+
+    def has(self, key: str) -> bool:
+        """Return whether a current entry exists."""
+        return self.get(key) is not None
+
+    def delete(self, key: str) -> bool:
+        """Delete an entry here and retire its local copies in other workers."""
+        self._forget(key)
+        self.shared.delete(_version_key(_key_tag(key)))
+        return bool(self.shared.delete(key))
+
+    def delete_many(self, *keys: str) -> list[str]:
+        """Delete several entries."""
+        return [key for key in keys if self.delete(key)]
+
+    def clear(self) -> bool:
+        """Drop every entry, including every tag version."""
+        with self._lock:
+            self._local.clear()
+        return bool(self.shared.clear())
+
+
+def _backend() -> BaseCache | None:
+    """Return the application's cache backend, if there is an app context."""
+    if not has_app_context():
+        return None
+    from pickaladder.extensions import cache
+
+    return cache.cache
+
+
+def tagged(tags: Callable[..., Iterable[str]]) -> Callable[[F], F]:
+    """Tag the entry a memoized call stores with ``tags(*args, **kwargs)``.
+
+    Place it above ``cache.memoize``. The tag versions are read before the
+    wrapped call runs and apply only to the result of that call, never to
+    memoize's own version keys or to entries stored by nested cached calls.
+    """
+
+    def decorator(func: F) -> F:
+        if not hasattr(func, "make_cache_key") or not hasattr(func, "uncached"):
+            msg = "tagged must be applied to a cache.memoize function."
+            raise TypeError(msg)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            backend = _backend()
+            if not isinstance(backend, TieredCache):
+                return func(*args, **kwargs)
+            versions = backend.current_versions(tags(*args, **kwargs))
+            key = func.make_cache_key(func.uncached, *args, **kwargs)
+            token = _active_stamps.set({**_active_stamps.get(), key: versions})
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _active_stamps.reset(token)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Drop every cached entry carrying any of ``tags``.
+
+    Backends without tag support are cleared entirely. Outside an application
+    context there is no cache to invalidate.
+    """
+    backend = _backend()
+    if backend is None or not tags:
+        return
+    if isinstance(backend, TieredCache):
+        backend.invalidate_tags(*tags)
+    else:
+        backend.clear()
@@ -5,6 +5,7 @@ from flask import Blueprint
 from .models import Group, Member
 from .services.group_service import AccessDenied, GroupNotFound, GroupService
 from .services.leaderboard import get_group_leaderboard, get_leaderboard_trend_data
+from .services.rivalry_matrix import get_rivalry_matrix
 from .services.stats import (
     get_head_to_head_stats,
     get_partnership_stats,
@@ -25,6 +26,7 @@ __all__ = [
     "get_head_to_head_stats",
     "get_leaderboard_trend_data",
     "get_partnership_stats",
+    "get_rivalry_matrix",
     "get_user_group_stats",
     "routes",
 ]
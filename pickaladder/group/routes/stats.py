@@ -11,8 +11,11 @@ from pickaladder.auth.decorators import login_required
 from pickaladder.constants.messages import GROUP_MESSAGES
 from pickaladder.group import bp
 from pickaladder.group.services.leaderboard import get_leaderboard_trend_data
-from pickaladder.group.services.stats import get_head_to_head_stats
-from pickaladder.group.utils import get_user_group_stats
+from pickaladder.group.services.rivalry_matrix import get_rivalry_matrix, lookup_pair
+from pickaladder.group.services.stats import (
+    get_head_to_head_stats,
+    get_user_group_stats,
+)
 
 
 @bp.route("/<string:group_id>/leaderboard-trend")
@@ -62,6 +65,21 @@ def get_rivalry_stats(group_id: str) -> Response | str | dict[str, Any]:
     }
 
 
+@bp.route("/<string:group_id>/stats/rivalry-matrix", methods=["GET"])
+@login_required
+def get_rivalry_matrix_data(group_id: str) -> Response | str | dict[str, Any]:
+    """Return the group's member rivalry matrices, or one pair from them."""
+    matrix = get_rivalry_matrix(group_id)
+    if matrix is None:
+        return {"error": GROUP_MESSAGES["NOT_FOUND"]}, 404  # type: ignore
+
+    playerA_id = request.args.get("playerA_id")
+    playerB_id = request.args.get("playerB_id")
+    if playerA_id and playerB_id:
+        return lookup_pair(matrix, playerA_id, playerB_id)
+    return matrix
+
+
 @bp.route("/<string:group_id>/user-trend/<string:user_id>")
 @login_required
 def get_user_group_trend(
@@ -7,19 +7,26 @@ import secrets
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from google.cloud.firestore import (
         Client,
         DocumentReference,
         DocumentSnapshot,
     )
 
+    from pickaladder.group.services.leaderboard_engine import ParsedMatch
+
 from firebase_admin import firestore, storage
 from flask import current_app, url_for
 from werkzeug.utils import secure_filename
 
+from pickaladder.core.constants import GROUP_RECENT_MATCHES_LIMIT
+from pickaladder.core.entity_cache import get_loader
 from pickaladder.group.membership_repository import MembershipRequestRepository
 from pickaladder.group.repository import GroupRepository
 from pickaladder.group.services.leaderboard import get_group_leaderboard
+from pickaladder.group.services.leaderboard_engine import parse_matches
 from pickaladder.group.services.match_parser import (
     _get_match_scores,
     _resolve_team_document_ids,
@@ -307,7 +314,7 @@ class GroupService:
 
         # Fetch leaderboard and matches
         leaderboard = get_group_leaderboard(group_id, member_docs=member_snaps)
-        recent_matches_docs, recent_matches = GroupService._fetch_recent_matches(
+        recent_records, recent_matches = GroupService._fetch_recent_matches(
             db,
             group_id,
         )
@@ -315,7 +322,7 @@ class GroupService:
             db,
             group_id,
             member_ids,
-            recent_matches_docs,
+            recent_records,
         )
 
         # Fetch Pending Invites using Repository
@@ -382,28 +389,29 @@ class GroupService:
     def _fetch_recent_matches(
         db: Client,
         group_id: str,
-    ) -> tuple[list[DocumentSnapshot], list[dict[str, Any]]]:
-        """Fetch and enrich recent matches for a group."""
-        matches_ref = db.collection("matches")
-        matches_query = (
-            matches_ref.where(filter=firestore.FieldFilter("groupId", "==", group_id))
+    ) -> tuple[list[ParsedMatch], list[dict[str, Any]]]:
+        """Fetch and enrich the latest matches of a group."""
+        snaps = list(
+            db.collection("matches")
+            .where(filter=firestore.FieldFilter("groupId", "==", group_id))
             .order_by("matchDate", direction=firestore.Query.DESCENDING)
-            .limit(20)
+            .limit(GROUP_RECENT_MATCHES_LIMIT)
+            .stream(),
         )
-        recent_matches_docs = list(matches_query.stream())
+        recent_records = [rec for rec in reversed(parse_matches(snaps)) if rec.date]
 
         # Collect and fetch associated entities
         team_refs, player_refs = GroupService._collect_refs_from_matches(
-            recent_matches_docs,
+            recent_records,
         )
         teams_map = GroupService._batch_fetch_entities(db, team_refs)
         players_map = GroupService._batch_fetch_entities(db, player_refs)
 
         # Enrich match data
         recent_matches = []
-        for match_doc in recent_matches_docs:
+        for rec in recent_records:
             match_data = GroupService._enrich_single_match(
-                match_doc,
+                rec,
                 teams_map,
                 players_map,
             )
@@ -411,11 +419,11 @@ class GroupService:
 
         GroupService._calculate_giant_slayer_upsets(recent_matches)
 
-        return recent_matches_docs, recent_matches
+        return recent_records, recent_matches
 
     @staticmethod
     def _extract_single_match_refs(
-        data: dict[str, Any],
+        data: Mapping[str, Any],
         team_refs: list[DocumentReference],
         player_refs: list[DocumentReference],
     ) -> None:
@@ -445,15 +453,15 @@ class GroupService:
 
     @staticmethod
     def _collect_refs_from_matches(
-        matches_docs: list[DocumentSnapshot],
+        records: list[ParsedMatch],
     ) -> tuple[list[DocumentReference], list[DocumentReference]]:
-        """Extract team and player references from match documents."""
+        """Extract team and player references from parsed matches."""
         team_refs: list[DocumentReference] = []
         player_refs: list[DocumentReference] = []
 
-        for doc in matches_docs:
+        for rec in records:
             GroupService._extract_single_match_refs(
-                doc.to_dict() or {},
+                rec.data,
                 team_refs,
                 player_refs,
             )
@@ -475,22 +483,17 @@ class GroupService:
         if not unique_refs:
             return {}
 
-        docs = db.get_all(unique_refs)
-        return {
-            doc.id: {**(doc.to_dict() or {}), "id": doc.id}
-            for doc in docs
-            if doc.exists
-        }
+        return {doc["id"]: doc for doc in get_loader().load_refs(db, unique_refs)}
 
     @staticmethod
     def _enrich_single_match(
-        match_doc: DocumentSnapshot,
+        rec: ParsedMatch,
         teams_map: dict[str, Any],
         players_map: dict[str, Any],
     ) -> dict[str, Any]:
-        """Attach team and player data to a single match dictionary."""
-        match_data = match_doc.to_dict() or {}
-        match_data["id"] = match_doc.id
+        """Attach team and player data to a copy of a match's data."""
+        match_data = dict(rec.data)
+        match_data["id"] = rec.id
 
         # Attach Teams
         for field in ["team1", "team2"]:
@@ -555,10 +558,10 @@ class GroupService:
         db: Client,
         group_id: str,
         member_ids: set[str],
-        recent_matches_docs: list[DocumentSnapshot],
+        recent_records: list[ParsedMatch],
     ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
         """Calculate team leaderboard and best buds for a group."""
-        team_stats = GroupService._calculate_team_stats(recent_matches_docs)
+        team_stats = GroupService._calculate_team_stats(recent_records)
         if not team_stats:
             return [], None
 
@@ -593,7 +596,7 @@ class GroupService:
 
     @staticmethod
     def _process_team_match_outcome(
-        data: dict[str, Any],
+        data: Mapping[str, Any],
         stats: dict[str, Any],
     ) -> None:
         """Update wins/losses for teams based on a single match outcome."""
@@ -618,14 +621,13 @@ class GroupService:
 
     @staticmethod
     def _calculate_team_stats(
-        recent_matches_docs: list[DocumentSnapshot],
+        records: list[ParsedMatch],
     ) -> dict[str, Any]:
         """Aggregate wins/losses per team from match history."""
         stats: dict[str, Any] = {}
-        for doc in recent_matches_docs:
-            data = doc.to_dict() or {}
-            if data.get("matchType") == "doubles":
-                GroupService._process_team_match_outcome(data, stats)
+        for rec in records:
+            if rec.match_type == "doubles":
+                GroupService._process_team_match_outcome(rec.data, stats)
         return stats
 
     @staticmethod
@@ -3,32 +3,59 @@
 from __future__ import annotations
 
 import operator
-from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from google.cloud.firestore import (
         Client,
         DocumentReference,
         DocumentSnapshot,
     )
+    from google.cloud.firestore_v1.batch import WriteBatch
+
+    from pickaladder.group.services.leaderboard_engine import ParsedMatch
 
 from firebase_admin import firestore
-from google.cloud.firestore import FieldFilter
 
 from pickaladder.core.constants import (
+    FIRESTORE_BATCH_LIMIT,
     HOT_STREAK_THRESHOLD,
+    LEADERBOARD_RANK_CHANGE_DAYS,
+    LEADERBOARD_TREND_DAYS,
     RECENT_MATCHES_LIMIT,
 )
+from pickaladder.core.tiered_cache import group_tag, tagged
 from pickaladder.extensions import cache
-from pickaladder.group.services.match_parser import _extract_team_ids, _get_match_scores
+from pickaladder.group.services.leaderboard_engine import (
+    _trend_dataset,
+    parse_matches,
+    run_leaderboard_engine,
+)
+from pickaladder.group.services.match_cache import get_group_matches
+from pickaladder.group.services.snapshots import (
+    build_snapshot,
+    day_key,
+    days_ago_key,
+    get_snapshot_as_of,
+    get_snapshot_ref,
+    get_snapshots_since,
+)
+from pickaladder.group.services.standings import (
+    apply_match,
+    apply_standings_to_stats,
+    get_group_standings,
+    get_many_group_standings,
+    read_group_standings,
+)
 from pickaladder.user.helpers import smart_display_name
 
 
-def _initialize_stats(
+def _fetch_player_docs(
     players: list[DocumentReference] | list[DocumentSnapshot] | Any,
-) -> dict[str, dict[str, Any]]:
-    """Initialize the stats dictionary for each player using batch fetch."""
+) -> list[DocumentSnapshot]:
+    """Resolve member references to snapshots using a single batch fetch."""
     # Handle generators or other iterables
     player_list = list(players) if players else []
 
@@ -46,11 +73,15 @@ def _initialize_stats(
     ):
         # Likely references
         db = firestore.client()
-        player_docs = db.get_all(player_list)
-    else:
-        # Already snapshots
-        player_docs = player_list
+        return list(db.get_all(player_list))
+    # Already snapshots
+    return player_list
+
 
+def _initialize_stats(
+    players: list[DocumentReference] | list[DocumentSnapshot] | Any,
+) -> dict[str, dict[str, Any]]:
+    """Initialize the stats dictionary for each player using batch fetch."""
     return {
         doc.id: {
             "wins": 0,
@@ -60,49 +91,10 @@ def _initialize_stats(
             "user_data": doc,
             "match_results": [],
         }
-        for doc in player_docs
+        for doc in _fetch_player_docs(players)
     }
 
 
-def _update_player_stats(
-    stats: dict[str, dict[str, Any]],
-    player_id: str,
-    score: int,
-    won: bool,
-    is_draw: bool,
-) -> None:
-    """Update individual player statistics in the stats dictionary."""
-    if player_id not in stats:
-        return
-    s = stats[player_id]
-    s["games"] += 1
-    s["total_score"] += score
-    if won:
-        s["wins"] += 1
-    elif not is_draw:
-        s["losses"] += 1
-    s["match_results"].append("win" if won else "loss")
-
-
-def _process_single_match(
-    stats: dict[str, dict[str, Any]],
-    match: DocumentSnapshot,
-) -> None:
-    """Update raw stats and records match outcomes for players in a single match."""
-    data = match.to_dict() or {}
-    p1_score, p2_score = _get_match_scores(data)
-
-    p1_wins = p1_score > p2_score
-    p2_wins = p2_score > p1_score
-    is_draw = p1_score == p2_score
-
-    team1_ids, team2_ids = _extract_team_ids(data)
-    for uid in team1_ids:
-        _update_player_stats(stats, uid, p1_score, p1_wins, is_draw)
-    for uid in team2_ids:
-        _update_player_stats(stats, uid, p2_score, p2_wins, is_draw)
-
-
 def _calculate_derived_stats(stats: dict[str, dict[str, Any]]) -> None:
     """Calculate 'Win Rate %', 'Average Score', and 'Form' (last 5 games)."""
     for s in stats.values():
@@ -156,24 +148,6 @@ def _sort_leaderboard(stats: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
     return leaderboard
 
 
-def _calculate_leaderboard_from_matches(
-    matches: list[DocumentSnapshot],
-    players: list[DocumentSnapshot],
-) -> list[dict[str, Any]]:
-    """Calculate the leaderboard from a list of matches using a pipeline of helpers."""
-    matches.sort(
-        key=lambda m: (m.to_dict() or {}).get("matchDate") or datetime.min,
-        reverse=True,
-    )
-
-    stats = _initialize_stats(players)
-    for match in matches:
-        _process_single_match(stats, match)
-
-    _calculate_derived_stats(stats)
-    return _sort_leaderboard(stats)
-
-
 def _calculate_rank_changes(
     current_leaderboard: list[dict[str, Any]],
     previous_leaderboard: list[dict[str, Any]],
@@ -192,67 +166,71 @@ def _calculate_rank_changes(
             player["rank_change"] = "new"
 
 
-def _map_matches_to_users(
-    matches: list[DocumentSnapshot],
-    member_refs: list[DocumentSnapshot],
-) -> dict[str, list[dict[str, Any]]]:
-    """Map matches to each user for efficient lookup."""
-    user_matches_map: dict[str, list[dict[str, Any]]] = {
-        ref.id: [] for ref in member_refs
-    }
-    for match in matches:
-        data = match.to_dict() or {}
-        team1_ids, team2_ids = _extract_team_ids(data)
-        for uid in team1_ids.union(team2_ids):
-            if uid in user_matches_map:
-                user_matches_map[uid].append(data)
-    return user_matches_map
-
-
-def _is_match_won(user_id: str, data: dict[str, Any]) -> bool:
-    """Determine if a player won a specific match."""
-    p1_score, p2_score = _get_match_scores(data)
-    team1_ids, team2_ids = _extract_team_ids(data)
-    if user_id in team1_ids:
-        return p1_score > p2_score
-    if user_id in team2_ids:
-        return p2_score > p1_score
-    return False
-
-
-def _calculate_player_winning_streak(
-    user_id: str,
-    matches_data: list[dict[str, Any]],
-) -> int:
-    """Calculate the current winning streak for a single player."""
-    streak = 0
-    for data in matches_data:
-        p1_score, p2_score = _get_match_scores(data)
-        if p1_score == p2_score:
-            break
-
-        if _is_match_won(user_id, data):
-            streak += 1
-        else:
-            break
-    return streak
+def _leaderboard_from_engine(windows: dict[str, Any]) -> list[dict[str, Any]]:
+    """Turn the engine's windows into the ranked leaderboard with movement."""
+    current, previous = windows["current"], windows["previous"]
+    _calculate_derived_stats(current)
+    _calculate_derived_stats(previous)
+    current_leaderboard = _sort_leaderboard(current)
+    _calculate_rank_changes(current_leaderboard, _sort_leaderboard(previous))
 
+    for player in current_leaderboard:
+        player["streak"] = windows["streaks"].get(player["id"], 0)
+        player["is_on_fire"] = player["streak"] >= HOT_STREAK_THRESHOLD
+    return current_leaderboard
 
-def _calculate_winning_streaks(
-    leaderboard: list[dict[str, Any]],
-    matches: list[DocumentSnapshot],
-    member_refs: list[DocumentSnapshot],
-) -> None:
-    """Calculate winning streaks for players in the leaderboard."""
-    user_matches_map = _map_matches_to_users(matches, member_refs)
+
+def _calculate_leaderboard_from_standings(
+    standings: dict[str, dict[str, Any]],
+    players: list[DocumentReference] | list[DocumentSnapshot] | Any,
+) -> list[dict[str, Any]]:
+    """Build the leaderboard from the group standings projection."""
+    stats = _initialize_stats(players)
+    apply_standings_to_stats(stats, standings)
+    _calculate_derived_stats(stats)
+    leaderboard = _sort_leaderboard(stats)
 
     for player in leaderboard:
-        user_id = player["id"]
-        matches_data = user_matches_map.get(user_id, [])
-        player["streak"] = _calculate_player_winning_streak(user_id, matches_data)
+        player["streak"] = stats[player["id"]]["streak"]
         player["is_on_fire"] = player["streak"] >= HOT_STREAK_THRESHOLD
+    return leaderboard
+
+
+def _leaderboard_from_standings_with_movement(
+    db: Client,
+    group_id: str,
+    standings: dict[str, dict[str, Any]],
+    players: list[DocumentReference] | list[DocumentSnapshot] | Any,
+) -> list[dict[str, Any]]:
+    """Build the leaderboard from the projection, moved against last week's ranks."""
+    leaderboard = _calculate_leaderboard_from_standings(standings, players)
+    last_week = days_ago_key(LEADERBOARD_RANK_CHANGE_DAYS)
+    _apply_snapshot_rank_changes(
+        leaderboard,
+        get_snapshot_as_of(db, group_id, last_week),
+    )
+    return leaderboard
 
 
+def _resolve_member_refs(
+    db: Client,
+    group_id: str,
+    member_docs: list[DocumentSnapshot] | None,
+) -> list[Any]:
+    """Return the member references or snapshots of a group."""
+    if member_docs is not None:
+        # If member_docs are provided, they could be snapshots or dicts.
+        # _fetch_player_docs handles snapshots.
+        # For leaderboard calculation, we primarily need snapshots.
+        return member_docs
+    group = db.collection("groups").document(group_id).get()
+    if not group.exists:
+        return []
+    group_data = group.to_dict() or {}
+    return group_data.get("members", [])
+
+
+@tagged(lambda group_id, *args, **kwargs: [group_tag(group_id)])
 @cache.memoize(timeout=600)
 def get_group_leaderboard(
     group_id: str,
@@ -262,78 +240,86 @@ def get_group_leaderboard(
     """Calculate the leaderboard for a specific group using Firestore."""
     db = firestore.client()
 
-    if member_docs is None:
-        group_ref = db.collection("groups").document(group_id)
-        group = group_ref.get()
-        if not group.exists:
-            return []
-        group_data = group.to_dict() or {} or {}
-        member_refs = group_data.get("members", [])
-    else:
-        # If member_docs are provided, they could be snapshots or dicts.
-        # _initialize_stats handles snapshots.
-        # For leaderboard calculation, we primarily need snapshots.
-        member_refs = member_docs
-
+    member_refs = _resolve_member_refs(db, group_id, member_docs)
     if not member_refs:
         return []
 
     if all_matches is None:
-        all_matches_stream = (
-            db.collection("matches")
-            .where(filter=FieldFilter("groupId", "==", group_id))
-            .stream()
-        )
-        all_matches = list(all_matches_stream)
-
-    current_leaderboard = _calculate_leaderboard_from_matches(all_matches, member_refs)
-
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    matches_last_week = []
-    for m in all_matches:
-        d = m.to_dict() or {}
-        dt = d.get("matchDate")
-        if dt and dt < one_week_ago:
-            matches_last_week.append(m)
+        standings = get_group_standings(db, group_id)
+        if standings is not None:
+            return _leaderboard_from_standings_with_movement(
+                db,
+                group_id,
+                standings,
+                member_refs,
+            )
+        records: Sequence[ParsedMatch] = get_group_matches(db, group_id)
+    else:
+        records = parse_matches(all_matches)
 
-    last_week_leaderboard = _calculate_leaderboard_from_matches(
-        matches_last_week,
-        member_refs,
-    )
+    windows = run_leaderboard_engine(records, _fetch_player_docs(member_refs))
+    return _leaderboard_from_engine(windows)
 
-    _calculate_rank_changes(current_leaderboard, last_week_leaderboard)
 
-    all_matches.sort(
-        key=lambda m: (m.to_dict() or {}).get("matchDate") or datetime.min,
-        reverse=True,
+def get_group_leaderboards(
+    db: Client,
+    groups: dict[str, dict[str, Any]],
+) -> dict[str, list[dict[str, Any]]]:
+    """Build the current leaderboards of several groups, keyed by group ID.
+
+    ``groups`` maps group IDs to their documents. Standings projections are
+    read in one ``get_all`` and the distinct members of those groups in
+    another; groups without a projection yet use ``get_group_leaderboard``.
+    Rank movement is not computed.
+    """
+    standings = get_many_group_standings(db, list(groups))
+    member_refs = {
+        ref.id: ref
+        for group_id in standings
+        for ref in groups[group_id].get("members") or []
+    }
+    member_docs = (
+        {doc.id: doc for doc in db.get_all(list(member_refs.values()))}
+        if member_refs
+        else {}
     )
-    _calculate_winning_streaks(current_leaderboard, all_matches, member_refs)
-
-    return current_leaderboard
-
 
-def _collect_match_player_refs(data: dict[str, Any], all_player_refs: set) -> None:
-    """Collect player references from a single match data dictionary."""
-    if data.get("matchType", "singles") == "doubles":
-        all_player_refs.update(data.get("team1", []))
-        all_player_refs.update(data.get("team2", []))
-    else:
-        if data.get("player1Ref"):
-            all_player_refs.add(data.get("player1Ref"))
-        if data.get("player2Ref"):
-            all_player_refs.add(data.get("player2Ref"))
+    leaderboards = {}
+    for group_id, group_data in groups.items():
+        if group_id not in standings:
+            leaderboards[group_id] = get_group_leaderboard(group_id)
+            continue
+        members = [
+            member_docs[ref.id]
+            for ref in group_data.get("members") or []
+            if ref.id in member_docs
+        ]
+        leaderboards[group_id] = (
+            _calculate_leaderboard_from_standings(standings[group_id], members)
+            if members
+            else []
+        )
+    return leaderboards
 
 
 def _get_involved_player_data(
     db: Client,
-    matches: list[DocumentSnapshot],
+    records: Sequence[ParsedMatch],
 ) -> dict[str, dict[str, Any]]:
-    """Get profile data for all players involved in matches."""
+    """Get profile data for all players involved in dated matches."""
     all_player_refs: set[DocumentReference] = set()
-    for match in matches:
-        _collect_match_player_refs(match.to_dict() or {}, all_player_refs)
+    for rec in records:
+        if rec.date:
+            all_player_refs.update(rec.player_refs)
+    return _load_trend_players(db, all_player_refs)
 
-    player_docs = db.get_all(list(all_player_refs))
+
+def _load_trend_players(
+    db: Client,
+    player_refs: set[DocumentReference],
+) -> dict[str, dict[str, Any]]:
+    """Fetch the names and pictures shown on the trend chart."""
+    player_docs = db.get_all(list(player_refs))
     players_data = {}
     for doc in player_docs:
         if doc.exists:
@@ -345,108 +331,194 @@ def _get_involved_player_data(
     return players_data
 
 
-def _record_trend_averages(
-    player_stats: dict[str, Any],
-    datasets: dict[str, Any],
-) -> None:
-    """Calculate and record current average scores for all players in trend datasets."""
-    for pid, stats in player_stats.items():
-        avg = stats["total_score"] / stats["games"] if stats["games"] > 0 else None
-        datasets[pid]["data"].append(avg)
-
+def get_leaderboard_trend_data(group_id: str) -> dict[str, Any]:
+    """Generate data for a leaderboard trend chart."""
+    db = firestore.client()
+    trend = _trend_from_snapshots(db, group_id)
+    if trend is not None:
+        return trend
 
-def _calculate_trend_points(
-    matches: list[DocumentSnapshot],
-    players_data: dict[str, Any],
-    unique_dates: list[str],
-) -> dict[str, dict[str, Any]]:
-    """Calculate average score trend points for each player."""
-    player_stats = {pid: {"total_score": 0, "games": 0} for pid in players_data}
-    datasets = {
-        pid: {
-            "id": pid,
-            "label": info["name"],
-            "data": [],
-            "fill": False,
-            "profilePictureUrl": info["profilePictureUrl"],
-        }
-        for pid, info in players_data.items()
-    }
+    records = get_group_matches(db, group_id)
+    if not any(rec.date for rec in records):
+        return {"labels": [], "datasets": []}
 
-    date_idx = 0
-    for i, match in enumerate(matches):
-        data = match.to_dict() or {}
-        dt = data.get("matchDate")
-        if not dt:
-            continue
-        match_date = dt.strftime("%Y-%m-%d")
+    windows = run_leaderboard_engine(
+        records,
+        [],
+        trend_players=_get_involved_player_data(db, records),
+    )
+    return windows["trend"]
 
-        while date_idx < len(unique_dates) and unique_dates[date_idx] < match_date:
-            _record_trend_averages(player_stats, datasets)
-            date_idx += 1
 
-        _update_trend_player_stats(player_stats, data)
+def get_group_leaderboard_with_trend(
+    group_id: str,
+    member_docs: list[DocumentSnapshot] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Build a group's leaderboard and trend chart.
 
-        is_last_match = i == len(matches) - 1
-        is_date_change = False
-        if not is_last_match:
-            next_data = matches[i + 1].to_dict() or {}
-            next_date_val = next_data.get("matchDate")
-            if next_date_val:
-                is_date_change = next_date_val.strftime("%Y-%m-%d") != match_date
+    Groups with daily snapshots are served from the standings projection and
+    the snapshot store; older groups fall back to the cached match history.
+    """
+    db = firestore.client()
+    trend = _trend_from_snapshots(db, group_id)
+    if trend is not None:
+        return get_group_leaderboard(group_id, member_docs), trend
+
+    records = get_group_matches(db, group_id)
+    member_refs = _resolve_member_refs(db, group_id, member_docs)
+
+    has_trend = any(rec.date for rec in records)
+    windows = run_leaderboard_engine(
+        records,
+        _fetch_player_docs(member_refs) if member_refs else [],
+        trend_players=_get_involved_player_data(db, records) if has_trend else {},
+    )
+    leaderboard = _leaderboard_from_engine(windows) if member_refs else []
+    trend = windows["trend"] if has_trend else {"labels": [], "datasets": []}
+    return leaderboard, trend
 
-        if is_last_match or is_date_change:
-            _record_trend_averages(player_stats, datasets)
-            date_idx += 1
 
-    return datasets
+def _apply_snapshot_rank_changes(
+    leaderboard: list[dict[str, Any]],
+    snapshot: dict[str, Any] | None,
+) -> None:
+    """Set rank movement against the ranks stored in an older snapshot."""
+    players = snapshot["players"] if snapshot else None
+    for current_rank, player in enumerate(leaderboard, start=1):
+        if players is None:
+            # No history recorded yet, so there is no movement to report.
+            player["rank_change"] = 0
+            continue
+        last_rank = (players.get(player["id"]) or {}).get("rank")
+        if last_rank is not None:
+            player["rank_change"] = last_rank - current_rank
+        else:
+            player["rank_change"] = "new"
 
 
-def _update_trend_player_stats(
-    player_stats: dict[str, Any],
-    match_data: dict[str, Any],
-) -> None:
-    """Update running totals for trend calculation from a single match."""
-    p1_score, p2_score = _get_match_scores(match_data)
-    team1_ids, team2_ids = _extract_team_ids(match_data)
+def _trend_from_snapshots(db: Client, group_id: str) -> dict[str, Any] | None:
+    """Build the trend chart from daily snapshots, or None if there are none."""
+    snapshots = get_snapshots_since(
+        db,
+        group_id,
+        days_ago_key(LEADERBOARD_TREND_DAYS),
+    )
+    if not snapshots:
+        latest = get_snapshot_as_of(db, group_id, days_ago_key(0))
+        if latest is None:
+            return None
+        snapshots = [latest]
+
+    # Only days on which the standings moved become points on the chart.
+    points: list[tuple[str, dict[str, Any]]] = []
+    last_count = 0
+    for snap in snapshots:
+        count = snap.get("matchCount", 0)
+        if count != last_count:
+            points.append((snap["day"], snap["players"]))
+            last_count = count
+
+    current = read_group_standings(db, group_id)
+    if current is not None and current[1] != last_count:
+        today = days_ago_key(0)
+        if points and points[-1][0] == today:
+            points.pop()
+        players = {
+            uid: {
+                "games": p["games"],
+                "avg_score": p["total_score"] / p["games"] if p["games"] else 0.0,
+            }
+            for uid, p in current[0].items()
+        }
+        points.append((today, players))
 
-    for uid in team1_ids:
-        if uid in player_stats:
-            player_stats[uid]["total_score"] += p1_score
-            player_stats[uid]["games"] += 1
-    for uid in team2_ids:
-        if uid in player_stats:
-            player_stats[uid]["total_score"] += p2_score
-            player_stats[uid]["games"] += 1
+    uids = {uid for _, players in points for uid in players}
+    profiles = _load_trend_players(
+        db,
+        {db.collection("users").document(uid) for uid in uids},
+    )
+    datasets = [_trend_dataset(pid, info) for pid, info in profiles.items()]
+    for _, players in points:
+        for ds in datasets:
+            entry = players.get(ds["id"]) or {}
+            ds["data"].append(entry["avg_score"] if entry.get("games") else None)
+    return {"labels": [day for day, _ in points], "datasets": datasets}
 
 
-def get_leaderboard_trend_data(group_id: str) -> dict[str, Any]:
-    """Generate data for a leaderboard trend chart."""
-    db = firestore.client()
-    matches_query = db.collection("matches").where(
-        filter=FieldFilter("groupId", "==", group_id),
+def take_daily_snapshot(
+    db: Client,
+    group_id: str,
+    day: str | None = None,
+    batch: WriteBatch | None = None,
+) -> dict[str, Any] | None:
+    """Persist a group's standings as the closing snapshot of ``day``.
+
+    ``day`` defaults to yesterday (UTC). The write is queued on ``batch`` when
+    one is given. Returns None if the group has no standings projection yet.
+    """
+    current = read_group_standings(db, group_id)
+    if current is None:
+        return None
+    players, match_count = current
+    leaderboard = _calculate_leaderboard_from_standings(
+        players,
+        _resolve_member_refs(db, group_id, None),
     )
-    matches = [
-        m for m in matches_query.stream() if (m.to_dict() or {}).get("matchDate")
-    ]
-    matches.sort(key=lambda x: x.to_dict().get("matchDate"))
-    if not matches:
-        return {"labels": [], "datasets": []}
+    day = day or days_ago_key(1)
+    doc = build_snapshot(group_id, day, leaderboard, players, match_count)
+    ref = get_snapshot_ref(db, group_id, day)
+    if batch is None:
+        ref.set(doc)
+    else:
+        batch.set(ref, doc)
+    return doc
 
-    players_data = _get_involved_player_data(db, matches)
 
-    unique_dates_set = set()
-    for m in matches:
-        d = m.to_dict() or {}
-        dt = d.get("matchDate")
-        if dt:
-            unique_dates_set.add(dt.strftime("%Y-%m-%d"))
-    unique_dates = sorted(unique_dates_set)
+def stage_daily_snapshot(db: Client, batch: WriteBatch, group_id: str) -> None:
+    """Queue yesterday's snapshot on the first match a group records today."""
+    day = days_ago_key(1)
+    if get_snapshot_ref(db, group_id, day).get().exists:
+        return
+    take_daily_snapshot(db, group_id, day, batch=batch)
 
-    datasets_dict = _calculate_trend_points(matches, players_data, unique_dates)
 
-    for ds in datasets_dict.values():
-        while len(ds["data"]) < len(unique_dates):
-            ds["data"].append(ds["data"][-1] if ds["data"] else None)
+def backfill_group_snapshots(db: Client, group_id: str) -> int:
+    """Replay a group's history and write a snapshot for every match day.
 
-    return {"labels": unique_dates, "datasets": list(datasets_dict.values())}
+    Historical ranks are ordered by the players' current ELO, as past ratings
+    are not stored. Returns the number of snapshots written.
+    """
+    member_docs = _fetch_player_docs(_resolve_member_refs(db, group_id, None))
+    matches = [
+        (rec.id, dict(rec.data))
+        for rec in sorted(
+            get_group_matches(db, group_id),
+            key=lambda rec: (rec.date is not None, rec.date or 0),
+        )
+    ]
+
+    players: dict[str, dict[str, Any]] = {}
+    batch = db.batch()
+    pending = 0
+    written = 0
+    for idx, (match_id, data) in enumerate(matches):
+        apply_match(players, match_id, data)
+        if not data.get("matchDate"):
+            continue
+        day = day_key(data["matchDate"])
+        if idx + 1 < len(matches) and day_key(matches[idx + 1][1]["matchDate"]) == day:
+            continue
+        leaderboard = _calculate_leaderboard_from_standings(players, member_docs)
+        batch.set(
+            get_snapshot_ref(db, group_id, day),
+            build_snapshot(group_id, day, leaderboard, players, idx + 1),
+        )
+        written += 1
+        pending += 1
+        if pending >= FIRESTORE_BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+    if pending:
+        batch.commit()
+    return written
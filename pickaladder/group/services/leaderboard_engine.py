@@ -0,0 +1,176 @@
+"""Single-pass leaderboard engine over a group's match history.
+
+The engine parses every match snapshot exactly once, orders the parsed records
+once, and walks them oldest to newest. On the way it produces the current
+standings, the standings as of ``window_days`` ago (for rank change), each
+player's current winning streak and the daily average-score trend series.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from pickaladder.core.constants import LEADERBOARD_RANK_CHANGE_DAYS
+from pickaladder.core.match_record import MatchRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from google.cloud.firestore import DocumentSnapshot
+
+_set = object.__setattr__
+
+
+class ParsedMatch(MatchRecord):
+    """A match record plus the fields the group statistics read.
+
+    Records are shared between requests by the group match cache, so they are
+    read-only once built; ``data`` is a read-only view of the raw document.
+    """
+
+    __slots__ = ("data", "day", "order", "player_refs")
+
+    data: Mapping[str, Any]
+    day: str | None
+    order: int
+    player_refs: tuple[Any, ...]
+
+    def __init__(self, order: int, data: dict[str, Any], match_id: str = "") -> None:
+        super().__init__(data, match_id)
+        if self.match_type == "doubles":
+            refs = [*data.get("team1", []), *data.get("team2", [])]
+        else:
+            refs = [data.get("player1Ref"), data.get("player2Ref")]
+        _set(self, "data", MappingProxyType(data))
+        _set(self, "day", self.date.isoformat()[:10] if self.date else None)
+        _set(self, "order", order)
+        _set(self, "player_refs", tuple(r for r in refs if r))
+
+    def sort_key(self) -> tuple[Any, ...]:
+        """Oldest first; undated matches sort before everything else.
+
+        Among equal dates the later snapshot comes first, so walking the list
+        backwards reproduces a stable newest-first sort of the original input.
+        """
+        if self.date is None:
+            return (False, 0, -self.order)
+        return (True, self.date, -self.order)
+
+
+def parse_matches(matches: list[DocumentSnapshot]) -> list[ParsedMatch]:
+    """Parse match snapshots once and order them oldest to newest."""
+    parsed = [ParsedMatch(i, m.to_dict() or {}, m.id) for i, m in enumerate(matches)]
+    parsed.sort(key=ParsedMatch.sort_key)
+    return parsed
+
+
+def _new_stats(doc: Any) -> dict[str, Any]:
+    """Return an empty stats record matching the leaderboard pipeline."""
+    return {
+        "wins": 0,
+        "losses": 0,
+        "games": 0,
+        "total_score": 0,
+        "user_data": doc,
+        "match_results": [],
+    }
+
+
+def _record_result(
+    s: dict[str, Any],
+    score: int,
+    won: bool,
+    is_draw: bool,
+) -> None:
+    """Fold a single result into a stats record."""
+    s["games"] += 1
+    s["total_score"] += score
+    if won:
+        s["wins"] += 1
+    elif not is_draw:
+        s["losses"] += 1
+
+
+def _trend_dataset(pid: str, info: dict[str, Any]) -> dict[str, Any]:
+    """Return an empty chart dataset for a player."""
+    return {
+        "id": pid,
+        "label": info["name"],
+        "data": [],
+        "fill": False,
+        "profilePictureUrl": info["profilePictureUrl"],
+    }
+
+
+def run_leaderboard_engine(
+    records: Sequence[ParsedMatch],
+    player_docs: list[DocumentSnapshot],
+    window_days: int = LEADERBOARD_RANK_CHANGE_DAYS,
+    trend_players: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Compute every leaderboard view of a group in one pass over parsed records.
+
+    Returns ``current`` and ``previous`` stats (keyed by player ID, in the
+    shape the leaderboard sorters expect, with ``match_results`` newest first),
+    ``streaks`` for each player and, when ``trend_players`` is given, a
+    ``trend`` chart payload with ``labels`` and ``datasets``.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
+
+    current = {doc.id: _new_stats(doc) for doc in player_docs}
+    previous = {doc.id: _new_stats(doc) for doc in player_docs}
+    streaks = dict.fromkeys(current, 0)
+
+    trend_totals = {pid: [0, 0] for pid in trend_players or {}}
+    datasets = {pid: _trend_dataset(pid, i) for pid, i in (trend_players or {}).items()}
+    labels: list[str] = []
+
+    for idx, rec in enumerate(records):
+        is_draw = rec.p1_score == rec.p2_score
+        in_previous = rec.date is not None and rec.date < cutoff
+        # Side 2 is folded first so that, once results are reversed to newest
+        # first, side 1 precedes side 2 exactly as in a per-match replay.
+        sides = (
+            (rec.team2, rec.p2_score, rec.p2_score > rec.p1_score),
+            (rec.team1, rec.p1_score, rec.p1_score > rec.p2_score),
+        )
+        for team, score, won in sides:
+            for uid in team:
+                if uid in current:
+                    _record_result(current[uid], score, won, is_draw)
+                    current[uid]["match_results"].append("win" if won else "loss")
+                    if in_previous:
+                        _record_result(previous[uid], score, won, is_draw)
+                if rec.day is not None and uid in trend_totals:
+                    trend_totals[uid][0] += score
+                    trend_totals[uid][1] += 1
+        for uid in rec.team1 | rec.team2:
+            if uid in streaks:
+                won = (
+                    rec.p1_score > rec.p2_score
+                    if uid in rec.team1
+                    else rec.p2_score > rec.p1_score
+                )
+                streaks[uid] = streaks[uid] + 1 if won else 0
+
+        # Close the trend day after its last match.
+        if trend_players is not None and rec.day is not None:
+            nxt = records[idx + 1] if idx + 1 < len(records) else None
+            if nxt is None or nxt.day != rec.day:
+                labels.append(rec.day)
+                for pid, (total, games) in trend_totals.items():
+                    datasets[pid]["data"].append(total / games if games else None)
+
+    for s in current.values():
+        s["match_results"].reverse()
+
+    result: dict[str, Any] = {
+        "current": current,
+        "previous": previous,
+        "streaks": streaks,
+    }
+    if trend_players is not None:
+        result["trend"] = {"labels": labels, "datasets": list(datasets.values())}
+    return result
@@ -0,0 +1,84 @@
+"""Per-process cache of each group's parsed match history.
+
+Every match write to a group bumps the group's ``matchesVersion``. The parsed,
+date-ordered records of a group are cached under ``(group_id, version)``, so
+all of a group's statistics share one match query per version and a stale
+history is never served once the version has moved.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from firebase_admin import firestore
+from google.cloud.firestore import FieldFilter
+
+from pickaladder.core.constants import GROUP_MATCH_CACHE_SIZE
+from pickaladder.group.services.leaderboard_engine import ParsedMatch, parse_matches
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import Client
+    from google.cloud.firestore_v1.batch import WriteBatch
+
+# Group document field counting match writes, used as the cache key
+GROUP_VERSION_FIELD = "matchesVersion"
+
+_cache: OrderedDict[tuple[str, int], tuple[ParsedMatch, ...]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def stage_version_bump(db: Client, batch: WriteBatch, group_id: str) -> None:
+    """Queue an increment of a group's match version on a batch."""
+    batch.update(
+        db.collection("groups").document(group_id),
+        {GROUP_VERSION_FIELD: firestore.Increment(1)},
+    )
+
+
+def get_group_version(db: Client, group_id: str) -> int | None:
+    """Return a group's match version, or None if the group does not exist."""
+    snap = db.collection("groups").document(group_id).get()
+    if not snap.exists:
+        return None
+    return int((snap.to_dict() or {}).get(GROUP_VERSION_FIELD) or 0)
+
+
+def get_group_matches(
+    db: Client,
+    group_id: str,
+    version: int | None = None,
+) -> tuple[ParsedMatch, ...]:
+    """Return a group's parsed matches, oldest first, querying once per version.
+
+    Pass ``version`` when the group document has already been read.
+    """
+    if version is None:
+        version = get_group_version(db, group_id) or 0
+    key = (group_id, version)
+    with _lock:
+        records = _cache.get(key)
+        if records is not None:
+            _cache.move_to_end(key)
+            return records
+
+    snaps = list(
+        db.collection("matches")
+        .where(filter=FieldFilter("groupId", "==", group_id))
+        .stream(),
+    )
+    records = tuple(parse_matches(snaps))
+    with _lock:
+        for stale in [k for k in _cache if k[0] == group_id]:
+            del _cache[stale]
+        _cache[key] = records
+        while len(_cache) > GROUP_MATCH_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return records
+
+
+def clear_group_match_cache() -> None:
+    """Drop every cached group history."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,138 @@
+"""Member-by-member rivalry and partnership matrices for a group.
+
+The matrices are built from one pass over the group's cached match history
+and cached under the group's match version, which every match write bumps.
+Heatmaps and single pair lookups are then served from the cached matrix.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+
+from pickaladder.core.constants import RIVALRY_MATRIX_CACHE_TIMEOUT
+from pickaladder.core.tiered_cache import group_tag, tagged
+from pickaladder.extensions import cache
+from pickaladder.group.services.match_cache import get_group_matches, get_group_version
+from pickaladder.user.helpers import smart_display_name
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import Client
+
+# Square matrices of the result, indexed by position in ``players``
+MATRIX_FIELDS = ("matches", "wins", "points", "partner_wins", "partner_losses")
+
+
+def _member_names(db: Client, group_id: str) -> dict[str, str]:
+    """Return display names of a group's members keyed by user ID, in order."""
+    group = db.collection("groups").document(group_id).get()
+    member_refs = (group.to_dict() or {}).get("members", []) if group.exists else []
+    snaps = {s.id: s for s in db.get_all(member_refs)} if member_refs else {}
+    return {
+        ref.id: smart_display_name(snaps[ref.id].to_dict() or {})
+        for ref in member_refs
+        if ref.id in snaps and snaps[ref.id].exists
+    }
+
+
+def build_rivalry_matrix(
+    db: Client,
+    group_id: str,
+    version: int | None = None,
+) -> dict[str, Any]:
+    """Build the rivalry and partnership matrices of a group in one pass.
+
+    ``wins[i][j]`` counts wins of player ``i`` against player ``j`` and
+    ``points[i][j]`` the points ``i`` scored in those meetings; the
+    partnership matrices are symmetric.
+    """
+    names = _member_names(db, group_id)
+    players: list[str] = []
+    index: dict[str, int] = {}
+    matrix: dict[str, list[list[int]]] = {field: [] for field in MATRIX_FIELDS}
+
+    def _slot(uid: str) -> int:
+        if uid not in index:
+            # Former members still appear in the group's history.
+            index[uid] = len(players)
+            players.append(uid)
+            for rows in matrix.values():
+                for row in rows:
+                    row.append(0)
+                rows.append([0] * len(players))
+        return index[uid]
+
+    for uid in names:
+        _slot(uid)
+
+    for rec in get_group_matches(db, group_id, version):
+        sides = [
+            ([_slot(u) for u in sorted(rec.team1)], rec.p1_score),
+            ([_slot(u) for u in sorted(rec.team2)], rec.p2_score),
+        ]
+        for (own, own_score), (opponents, other_score) in (
+            (sides[0], sides[1]),
+            (sides[1], sides[0]),
+        ):
+            won, lost = int(own_score > other_score), int(own_score < other_score)
+            for i in own:
+                for j in opponents:
+                    matrix["matches"][i][j] += 1
+                    matrix["wins"][i][j] += won
+                    matrix["points"][i][j] += own_score
+                for j in own:
+                    if i != j:
+                        matrix["partner_wins"][i][j] += won
+                        matrix["partner_losses"][i][j] += lost
+
+    return {
+        "group_id": group_id,
+        "players": [{"id": uid, "name": names.get(uid, uid)} for uid in players],
+        **matrix,
+    }
+
+
+@tagged(lambda group_id, version: [group_tag(group_id)])
+@cache.memoize(timeout=RIVALRY_MATRIX_CACHE_TIMEOUT)
+def _cached_rivalry_matrix(group_id: str, version: int) -> dict[str, Any]:
+    """Return the matrix of a group at a match version, building it once."""
+    matrix = build_rivalry_matrix(firestore.client(), group_id, version)
+    matrix["version"] = version
+    return matrix
+
+
+def get_rivalry_matrix(group_id: str) -> dict[str, Any] | None:
+    """Return the cached rivalry matrix of a group, or None if it is missing."""
+    version = get_group_version(firestore.client(), group_id)
+    if version is None:
+        return None
+    return _cached_rivalry_matrix(group_id, version)
+
+
+def lookup_pair(
+    matrix: dict[str, Any],
+    playerA_id: str,
+    playerB_id: str,
+) -> dict[str, Any]:
+    """Return the rivalry of two players from a group matrix."""
+    ids = [p["id"] for p in matrix["players"]]
+    if playerA_id not in ids or playerB_id not in ids:
+        return {
+            "wins": 0,
+            "losses": 0,
+            "matches": 0,
+            "point_diff": 0,
+            "partnership_record": {"wins": 0, "losses": 0},
+        }
+    a, b = ids.index(playerA_id), ids.index(playerB_id)
+    return {
+        "wins": matrix["wins"][a][b],
+        "losses": matrix["wins"][b][a],
+        "matches": matrix["matches"][a][b],
+        "point_diff": matrix["points"][a][b] - matrix["points"][b][a],
+        "partnership_record": {
+            "wins": matrix["partner_wins"][a][b],
+            "losses": matrix["partner_losses"][a][b],
+        },
+    }
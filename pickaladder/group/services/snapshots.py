@@ -0,0 +1,119 @@
+"""Persisted daily leaderboard snapshots per group.
+
+Each ``group_leaderboard_snapshots/{group_id}_{day}`` document holds the closing
+standings of a group on ``day``: the rank, ELO, average score and game counts of
+every player. Rank movement and the trend chart read a handful of these
+documents instead of replaying the group's whole match history.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+from google.cloud.firestore import FieldFilter
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import Client, DocumentReference, DocumentSnapshot
+
+SNAPSHOTS_COLLECTION = "group_leaderboard_snapshots"
+
+
+def day_key(moment: datetime) -> str:
+    """Return the ``YYYY-MM-DD`` key used to label a snapshot day."""
+    return moment.strftime("%Y-%m-%d")
+
+
+def days_ago_key(days: int) -> str:
+    """Return the day key of ``days`` days before today (UTC)."""
+    return day_key(datetime.now(timezone.utc) - timedelta(days=days))
+
+
+def get_snapshot_ref(db: Client, group_id: str, day: str) -> DocumentReference:
+    """Return the reference of a group's snapshot for a given day."""
+    return db.collection(SNAPSHOTS_COLLECTION).document(f"{group_id}_{day}")
+
+
+def build_snapshot(
+    group_id: str,
+    day: str,
+    leaderboard: list[dict[str, Any]],
+    players: dict[str, dict[str, Any]],
+    match_count: int,
+) -> dict[str, Any]:
+    """Assemble a snapshot from a ranked leaderboard and the standings players.
+
+    Every player in the standings gets an entry so the trend chart can plot
+    non-members; only ranked members carry ``rank`` and ``elo``.
+    """
+    entries: dict[str, dict[str, Any]] = {}
+    for uid, p in players.items():
+        games = p.get("games", 0)
+        entries[uid] = {
+            "rank": None,
+            "elo": None,
+            "avg_score": p.get("total_score", 0) / games if games else 0.0,
+            "games": games,
+            "wins": p.get("wins", 0),
+            "losses": p.get("losses", 0),
+        }
+    for rank, row in enumerate(leaderboard, start=1):
+        entry = entries.setdefault(
+            row["id"],
+            {
+                "avg_score": row["avg_score"],
+                "games": row["games_played"],
+                "wins": row["wins"],
+                "losses": row["losses"],
+            },
+        )
+        entry["rank"] = rank
+        entry["elo"] = row["elo"]
+    return {
+        "groupId": group_id,
+        "day": day,
+        "matchCount": match_count,
+        "players": entries,
+        "createdAt": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def _read_snapshot(snap: DocumentSnapshot) -> dict[str, Any] | None:
+    """Return the snapshot payload, or None if the document is not usable."""
+    if not snap.exists:
+        return None
+    data = snap.to_dict()
+    if not isinstance(data, dict) or not isinstance(data.get("players"), dict):
+        return None
+    return data
+
+
+def get_snapshot_as_of(db: Client, group_id: str, day: str) -> dict[str, Any] | None:
+    """Return the latest snapshot of a group taken on or before ``day``."""
+    query = (
+        db.collection(SNAPSHOTS_COLLECTION)
+        .where(filter=FieldFilter("groupId", "==", group_id))
+        .where(filter=FieldFilter("day", "<=", day))
+        .order_by("day", direction=firestore.Query.DESCENDING)
+        .limit(1)
+    )
+    for snap in query.stream():
+        return _read_snapshot(snap)
+    return None
+
+
+def get_snapshots_since(db: Client, group_id: str, day: str) -> list[dict[str, Any]]:
+    """Return a group's snapshots from ``day`` onwards, oldest first."""
+    query = (
+        db.collection(SNAPSHOTS_COLLECTION)
+        .where(filter=FieldFilter("groupId", "==", group_id))
+        .where(filter=FieldFilter("day", ">=", day))
+        .order_by("day")
+    )
+    snapshots = []
+    for snap in query.stream():
+        data = _read_snapshot(snap)
+        if data is not None:
+            snapshots.append(data)
+    return snapshots
@@ -0,0 +1,470 @@
+"""Incrementally maintained per-group standings projection.
+
+Each group has a single ``group_standings/{group_id}`` document holding the raw
+counters the leaderboard needs for every player who has played in the group.
+Match writes update it inside the same batch, so reading a leaderboard costs one
+document read instead of a scan over every match in the group.
+
+Only the players of a match are written, field by field. Counters are
+increments staged in the match batch, so concurrent matches in a group all
+count. The form and streaks depend on the values read, so they are written
+once the match is committed, conditional on the projection being unchanged
+since it was read and retried otherwise. A missing projection is built from
+history before the match batch and created only if no other write beat it.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+from typing import TYPE_CHECKING, Any, Callable
+
+from firebase_admin import firestore
+from google.api_core.exceptions import Conflict, FailedPrecondition
+
+from pickaladder.core.constants import RECENT_MATCHES_LIMIT
+from pickaladder.group.services.match_cache import get_group_matches
+from pickaladder.group.services.match_parser import _extract_team_ids, _get_match_scores
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import Client, DocumentReference, DocumentSnapshot
+    from google.cloud.firestore_v1.batch import WriteBatch
+
+logger = logging.getLogger(__name__)
+
+STANDINGS_COLLECTION = "group_standings"
+# Per-player fields kept exact under concurrent writes with increments
+_COUNTER_FIELDS = ("wins", "losses", "games", "total_score")
+# Per-player fields rewritten from the values read, under a precondition
+_FORM_FIELDS = ("form", "streak", "best_streak")
+# Times a form update is retried after losing a race with another write
+FORM_UPDATE_ATTEMPTS = 5
+
+
+def get_standings_ref(db: Client, group_id: str) -> DocumentReference:
+    """Return the reference of the standings projection for a group."""
+    return db.collection(STANDINGS_COLLECTION).document(group_id)
+
+
+def _new_player_entry() -> dict[str, Any]:
+    """Return an empty standings entry for a player."""
+    return {
+        "wins": 0,
+        "losses": 0,
+        "games": 0,
+        "total_score": 0,
+        "form": [],
+        "streak": 0,
+        "best_streak": 0,
+    }
+
+
+def _count_leading_wins(form: list[dict[str, Any]]) -> int:
+    """Count consecutive wins at the head of a newest-first form buffer."""
+    count = 0
+    for item in form:
+        if item.get("result") != "win":
+            break
+        count += 1
+    return count
+
+
+def _iter_match_sides(
+    data: dict[str, Any],
+    p1_score: int,
+    p2_score: int,
+) -> list[tuple[str, int, bool]]:
+    """Return (uid, score, won) for every participant of a match."""
+    team1_ids, team2_ids = _extract_team_ids(data)
+    sides = [(uid, p1_score, p1_score > p2_score) for uid in team1_ids]
+    sides.extend((uid, p2_score, p2_score > p1_score) for uid in team2_ids)
+    return sides
+
+
+def _adjust_counters(
+    entry: dict[str, Any],
+    score: int,
+    won: bool,
+    is_draw: bool,
+    sign: int,
+) -> None:
+    """Add (sign=1) or remove (sign=-1) a single result from the counters."""
+    entry["games"] = max(0, entry["games"] + sign)
+    entry["total_score"] = max(0, entry["total_score"] + sign * score)
+    if won:
+        entry["wins"] = max(0, entry["wins"] + sign)
+    elif not is_draw:
+        entry["losses"] = max(0, entry["losses"] + sign)
+
+
+def apply_match(
+    players: dict[str, dict[str, Any]],
+    match_id: str,
+    data: dict[str, Any],
+) -> None:
+    """Fold a newly recorded match into the standings players map."""
+    p1_score, p2_score = _get_match_scores(data)
+    is_draw = p1_score == p2_score
+    for uid, score, won in _iter_match_sides(data, p1_score, p2_score):
+        entry = players.setdefault(uid, _new_player_entry())
+        _adjust_counters(entry, score, won, is_draw, 1)
+        result = "win" if won else "loss"
+        entry["form"] = [{"matchId": match_id, "result": result}, *entry["form"]][
+            :RECENT_MATCHES_LIMIT
+        ]
+        entry["streak"] = entry["streak"] + 1 if won else 0
+        entry["best_streak"] = max(entry.get("best_streak", 0), entry["streak"])
+
+
+def replace_match(
+    players: dict[str, dict[str, Any]],
+    match_id: str,
+    old_data: dict[str, Any],
+    new_data: dict[str, Any],
+) -> None:
+    """Swap the result of an already-counted match for its edited result.
+
+    Counters are exact. Form and streak are only adjusted when the match is
+    still inside the form buffer; older edits leave them untouched.
+    """
+    o1, o2 = _get_match_scores(old_data)
+    for uid, score, won in _iter_match_sides(old_data, o1, o2):
+        if uid in players:
+            _adjust_counters(players[uid], score, won, o1 == o2, -1)
+
+    n1, n2 = _get_match_scores(new_data)
+    for uid, score, won in _iter_match_sides(new_data, n1, n2):
+        entry = players.setdefault(uid, _new_player_entry())
+        _adjust_counters(entry, score, won, n1 == n2, 1)
+        result = "win" if won else "loss"
+        for item in entry["form"]:
+            if item.get("matchId") == match_id:
+                item["result"] = result
+                leading = _count_leading_wins(entry["form"])
+                if leading < len(entry["form"]):
+                    entry["streak"] = leading
+                else:
+                    entry["streak"] = max(entry["streak"], leading)
+                entry["best_streak"] = max(
+                    entry.get("best_streak", 0),
+                    entry["streak"],
+                )
+                break
+
+
+def remove_match(
+    players: dict[str, dict[str, Any]],
+    match_id: str,
+    data: dict[str, Any],
+) -> None:
+    """Take a deleted match out of the counters and form of its players.
+
+    The streaks are left as they are; ``update_removed_form`` replays them.
+    """
+    p1_score, p2_score = _get_match_scores(data)
+    for uid, score, won in _iter_match_sides(data, p1_score, p2_score):
+        if (entry := players.get(uid)) is None:
+            continue
+        _adjust_counters(entry, score, won, p1_score == p2_score, -1)
+        entry["form"] = [
+            item for item in entry["form"] if item.get("matchId") != match_id
+        ]
+
+
+def _build_document(
+    group_id: str,
+    players: dict[str, dict[str, Any]],
+    match_count: int,
+) -> dict[str, Any]:
+    """Assemble the standings document payload."""
+    return {
+        "groupId": group_id,
+        "players": players,
+        "matchCount": max(0, match_count),
+        "updatedAt": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def _read_players(snap: DocumentSnapshot | None) -> tuple[dict[str, Any], int] | None:
+    """Extract the players map and match count from a standings snapshot."""
+    if snap is None or not snap.exists:
+        return None
+    data = snap.to_dict()
+    if not isinstance(data, dict) or not isinstance(data.get("players"), dict):
+        return None
+    return data["players"], int(data.get("matchCount") or 0)
+
+
+def _stage_counter_changes(
+    batch: WriteBatch,
+    ref: DocumentReference,
+    before: dict[str, dict[str, Any]],
+    after: dict[str, dict[str, Any]],
+    match_delta: int,
+) -> None:
+    """Queue the counter increments turning the ``before`` players into ``after``."""
+    upd: dict[str, Any] = {}
+    for uid, entry in after.items():
+        new = uid not in before
+        old = before.get(uid) or _new_player_entry()
+        for field in _COUNTER_FIELDS:
+            delta = entry[field] - old.get(field, 0)
+            # A new player gets every counter, even one this match leaves at zero
+            if delta or new:
+                upd[f"players.{uid}.{field}"] = firestore.Increment(delta)
+    if match_delta:
+        upd["matchCount"] = firestore.Increment(match_delta)
+    upd["updatedAt"] = firestore.SERVER_TIMESTAMP
+    batch.update(ref, upd)
+
+
+def _ensure_players(
+    db: Client,
+    ref: DocumentReference,
+    group_id: str,
+) -> dict[str, dict[str, Any]]:
+    """Return the projected players, creating the projection from history first.
+
+    The projection is created outside the match batch and only if it still
+    does not exist, so of two first matches in a group one bootstrap lands and
+    both matches count through their increments.
+    """
+    current = _read_players(ref.get())
+    if current is not None:
+        return current[0]
+    players, match_count = _scan_group_matches(db, group_id)
+    try:
+        ref.create(_build_document(group_id, players, match_count))
+    except Conflict:
+        current = _read_players(ref.get())
+        if current is not None:
+            return current[0]
+    return players
+
+
+def stage_recorded_match(
+    db: Client,
+    batch: WriteBatch,
+    group_id: str,
+    match_id: str,
+    match_data: dict[str, Any],
+) -> None:
+    """Queue the standings counters of a new match on an existing batch.
+
+    Call ``update_recorded_form`` once the batch is committed.
+    """
+    ref = get_standings_ref(db, group_id)
+    before = _ensure_players(db, ref, group_id)
+    after = _touched_players(before, match_data)
+    apply_match(after, match_id, match_data)
+    _stage_counter_changes(batch, ref, before, after, 1)
+
+
+def stage_edited_match(
+    db: Client,
+    batch: WriteBatch,
+    group_id: str,
+    match_id: str,
+    *,
+    old_data: dict[str, Any],
+    new_data: dict[str, Any],
+) -> None:
+    """Queue the standings counters of an edited match score on a batch.
+
+    Call ``update_edited_form`` once the batch is committed.
+    """
+    ref = get_standings_ref(db, group_id)
+    before = _ensure_players(db, ref, group_id)
+    after = _touched_players(before, old_data, new_data)
+    replace_match(after, match_id, old_data, new_data)
+    _stage_counter_changes(batch, ref, before, after, 0)
+
+
+def stage_removed_match(
+    db: Client,
+    batch: WriteBatch,
+    group_id: str,
+    match_id: str,
+    match_data: dict[str, Any],
+) -> None:
+    """Queue the standings counters of a deleted match on an existing batch.
+
+    Call ``update_removed_form`` once the batch is committed.
+    """
+    ref = get_standings_ref(db, group_id)
+    before = _ensure_players(db, ref, group_id)
+    after = _touched_players(before, match_data)
+    remove_match(after, match_id, match_data)
+    _stage_counter_changes(batch, ref, before, after, -1)
+
+
+def _update_form(
+    db: Client,
+    group_id: str,
+    matches: tuple[dict[str, Any], ...],
+    change: Callable[[dict[str, dict[str, Any]]], None],
+) -> None:
+    """Rewrite the form and streaks ``change`` gives the players of ``matches``.
+
+    Each write is conditional on the projection being unchanged since it was
+    read; a lost race reads it again.
+    """
+    ref = get_standings_ref(db, group_id)
+    for _ in range(FORM_UPDATE_ATTEMPTS):
+        snap = ref.get()
+        current = _read_players(snap)
+        if current is None:
+            return
+        before = current[0]
+        after = _touched_players(before, *matches)
+        change(after)
+        upd = {
+            f"players.{uid}.{field}": entry[field]
+            for uid, entry in after.items()
+            for field in _FORM_FIELDS
+            if entry[field] != (before.get(uid) or {}).get(field)
+        }
+        if not upd:
+            return
+        try:
+            ref.update(upd, option=db.write_option(last_update_time=snap.update_time))
+            return
+        except FailedPrecondition:
+            continue
+    logger.warning(f"Gave up updating the standings form of group {group_id}")
+
+
+def update_recorded_form(
+    db: Client,
+    group_id: str,
+    match_id: str,
+    match_data: dict[str, Any],
+) -> None:
+    """Add a committed match to the form and streaks of its players."""
+    _update_form(
+        db,
+        group_id,
+        (match_data,),
+        lambda players: apply_match(players, match_id, match_data),
+    )
+
+
+def update_edited_form(
+    db: Client,
+    group_id: str,
+    match_id: str,
+    old_data: dict[str, Any],
+    new_data: dict[str, Any],
+) -> None:
+    """Move an edited match's result in the form and streaks of its players."""
+    _update_form(
+        db,
+        group_id,
+        (old_data, new_data),
+        lambda players: replace_match(players, match_id, old_data, new_data),
+    )
+
+
+def update_removed_form(
+    db: Client,
+    group_id: str,
+    match_data: dict[str, Any],
+) -> None:
+    """Replay the form and streaks of a deleted match's players from history.
+
+    A deleted match can end a streak or leave room in the form buffer for an
+    older result, so the remaining matches are replayed on every attempt.
+    """
+
+    def replay(players: dict[str, dict[str, Any]]) -> None:
+        history, _ = _scan_group_matches(db, group_id)
+        for uid, entry in players.items():
+            replayed = history.get(uid) or _new_player_entry()
+            for field in _FORM_FIELDS:
+                entry[field] = replayed[field]
+
+    _update_form(db, group_id, (match_data,), replay)
+
+
+def _touched_players(
+    players: dict[str, dict[str, Any]],
+    *matches: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
+    """Return copies of the entries of every player in ``matches``."""
+    touched: dict[str, dict[str, Any]] = {}
+    for data in matches:
+        team1_ids, team2_ids = _extract_team_ids(data)
+        for uid in team1_ids | team2_ids:
+            # Entries whose form is not written yet start from empty fields
+            touched[uid] = {
+                **_new_player_entry(),
+                **copy.deepcopy(players.get(uid, {})),
+            }
+    return touched
+
+
+def _scan_group_matches(
+    db: Client,
+    group_id: str,
+) -> tuple[dict[str, dict[str, Any]], int]:
+    """Rebuild the players map by replaying every match of a group."""
+    records = get_group_matches(db, group_id)
+    players: dict[str, dict[str, Any]] = {}
+    for rec in records:
+        apply_match(players, rec.id, dict(rec.data))
+    return players, len(records)
+
+
+def rebuild_group_standings(db: Client, group_id: str) -> dict[str, Any]:
+    """Recompute and overwrite the standings projection of a group."""
+    players, match_count = _scan_group_matches(db, group_id)
+    doc = _build_document(group_id, players, match_count)
+    get_standings_ref(db, group_id).set(doc)
+    return doc
+
+
+def read_group_standings(
+    db: Client,
+    group_id: str,
+) -> tuple[dict[str, dict[str, Any]], int] | None:
+    """Return the projected players map and match count of a group."""
+    return _read_players(get_standings_ref(db, group_id).get())
+
+
+def get_group_standings(db: Client, group_id: str) -> dict[str, dict[str, Any]] | None:
+    """Return the projected players map of a group, or None if not built yet."""
+    current = read_group_standings(db, group_id)
+    return current[0] if current is not None else None
+
+
+def get_many_group_standings(
+    db: Client,
+    group_ids: list[str],
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Return the projected players maps of several groups in one read.
+
+    Groups whose projection has not been built yet are left out.
+    """
+    if not group_ids:
+        return {}
+    refs = [get_standings_ref(db, group_id) for group_id in group_ids]
+    standings = {}
+    for snap in db.get_all(refs):
+        if (current := _read_players(snap)) is not None:
+            standings[snap.id] = current[0]
+    return standings
+
+
+def apply_standings_to_stats(
+    stats: dict[str, dict[str, Any]],
+    standings: dict[str, dict[str, Any]],
+) -> None:
+    """Fill initialized leaderboard stats from the projected standings."""
+    for uid, s in stats.items():
+        entry = standings.get(uid) or {}
+        s["wins"] = entry.get("wins", 0)
+        s["losses"] = entry.get("losses", 0)
+        s["games"] = entry.get("games", 0)
+        s["total_score"] = entry.get("total_score", 0)
+        s["match_results"] = [item.get("result") for item in entry.get("form", [])]
+        s["streak"] = entry.get("streak", 0)
@@ -5,50 +5,48 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from google.cloud.firestore import DocumentReference, DocumentSnapshot
+    from collections.abc import Iterable
+
+    from pickaladder.group.services.leaderboard_engine import ParsedMatch
 
 from firebase_admin import firestore
-from google.cloud.firestore import FieldFilter
 
-from pickaladder.group.services.match_parser import _extract_team_ids, _get_match_scores
+from pickaladder.group.services.match_cache import get_group_matches
 
 
 def _check_partnership_win(
-    data: dict[str, Any],
+    rec: ParsedMatch,
     playerA_id: str,
     playerB_id: str,
     wins: int,
     losses: int,
 ) -> tuple[int, int]:
     """Determine if a partnership won or lost a specific match."""
-    team1_ids, team2_ids = _extract_team_ids(data)
-    p1_score, p2_score = _get_match_scores(data)
     partners = {playerA_id, playerB_id}
 
-    if partners.issubset(team1_ids):
-        wins += 1 if p1_score > p2_score else 0
-        losses += 1 if p2_score > p1_score else 0
-    elif partners.issubset(team2_ids):
-        wins += 1 if p2_score > p1_score else 0
-        losses += 1 if p1_score > p2_score else 0
+    if partners.issubset(rec.team1):
+        wins += 1 if rec.p1_score > rec.p2_score else 0
+        losses += 1 if rec.p2_score > rec.p1_score else 0
+    elif partners.issubset(rec.team2):
+        wins += 1 if rec.p2_score > rec.p1_score else 0
+        losses += 1 if rec.p1_score > rec.p2_score else 0
     return wins, losses
 
 
 def get_partnership_stats(
     playerA_id: str,
     playerB_id: str,
-    all_matches_in_group: list[Any],
+    records: Iterable[ParsedMatch],
 ) -> dict[str, int]:
     """Calculates the win/loss record for two players when they are partners."""
     wins = 0
     losses = 0
 
-    for match_doc in all_matches_in_group:
-        data = match_doc.to_dict() or {}
-        if data.get("matchType") != "doubles":
+    for rec in records:
+        if rec.match_type != "doubles":
             continue
         wins, losses = _check_partnership_win(
-            data,
+            rec,
             playerA_id,
             playerB_id,
             wins,
@@ -58,46 +56,21 @@ def get_partnership_stats(
     return {"wins": wins, "losses": losses}
 
 
-def _process_h2h_match(
-    match_doc: DocumentSnapshot,
-    playerA_id: str,
-    playerB_id: str,
-    stats: dict[str, Any],
-) -> None:
-    """Process a single match for head-to-head statistics."""
-    data = match_doc.to_dict() or {}
-    team1_ids, team2_ids = _extract_team_ids(data)
-
-    player_a_is_t1 = playerA_id in team1_ids
-    player_b_is_t2 = playerB_id in team2_ids
-    player_a_is_t2 = playerA_id in team2_ids
-    player_b_is_t1 = playerB_id in team1_ids
-
-    if (player_a_is_t1 and player_b_is_t2) or (player_a_is_t2 and player_b_is_t1):
-        match_display_data = data.copy()
-        match_display_data["id"] = match_doc.id
-        match_display_data["team1_ids"] = list(team1_ids)
-        match_display_data["team2_ids"] = list(team2_ids)
-        stats["matches"].append(match_display_data)
-
-        p1_score, p2_score = _get_match_scores(data)
-
-        if player_a_is_t1:
-            diff, a_pts, b_pts = p1_score - p2_score, p1_score, p2_score
-            won = p1_score > p2_score
-            lost = p2_score > p1_score
-        else:
-            diff, a_pts, b_pts = p2_score - p1_score, p2_score, p1_score
-            won = p2_score > p1_score
-            lost = p1_score > p2_score
+def _match_display_data(rec: ParsedMatch) -> dict[str, Any]:
+    """Return a match's data with its ID and resolved team member IDs."""
+    return {
+        **rec.data,
+        "id": rec.id,
+        "team1_ids": list(rec.team1),
+        "team2_ids": list(rec.team2),
+    }
 
-        stats["point_diff"] += diff
-        stats["playerA_total_points"] += a_pts
-        stats["playerB_total_points"] += b_pts
-        if won:
-            stats["wins"] += 1
-        elif lost:
-            stats["losses"] += 1
+
+def _is_meeting(rec: ParsedMatch, playerA_id: str, playerB_id: str) -> bool:
+    """Return whether two players were on opposite sides of a match."""
+    return (playerA_id in rec.team1 and playerB_id in rec.team2) or (
+        playerA_id in rec.team2 and playerB_id in rec.team1
+    )
 
 
 def get_head_to_head_stats(
@@ -105,62 +78,52 @@ def get_head_to_head_stats(
     playerA_id: str,
     playerB_id: str,
 ) -> dict[str, Any]:
-    """Calculates head-to-head statistics for two players in doubles matches."""
-    db = firestore.client()
-    query = db.collection("matches").where(
-        filter=FieldFilter("groupId", "==", group_id),
-    )
-    all_matches_in_group = list(query.stream())
+    """Return the rivalry of two players in a group from the pair index.
 
-    h2h_stats: dict[str, Any] = {
-        "wins": 0,
-        "losses": 0,
-        "point_diff": 0,
-        "playerA_total_points": 0,
-        "playerB_total_points": 0,
-        "matches": [],
-    }
+    Every meeting is listed, newest first, from the group's cached history;
+    the pair document only keeps the latest few.
+    """
+    from pickaladder.match.services.head_to_head import HeadToHeadService
+
+    db = firestore.client()
+    record = HeadToHeadService.get_record(db, playerA_id, playerB_id, group_id)
 
-    for match_doc in all_matches_in_group:
-        _process_h2h_match(match_doc, playerA_id, playerB_id, h2h_stats)
+    matches = [
+        _match_display_data(rec)
+        for rec in reversed(get_group_matches(db, group_id))
+        if _is_meeting(rec, playerA_id, playerB_id)
+    ]
 
-    num_matches = len(h2h_stats["matches"])
-    avg_A = h2h_stats["playerA_total_points"] / num_matches if num_matches > 0 else 0
-    avg_B = h2h_stats["playerB_total_points"] / num_matches if num_matches > 0 else 0
+    num_matches = record["matches"]
+    avg_A = record["points_for"] / num_matches if num_matches > 0 else 0
+    avg_B = record["points_against"] / num_matches if num_matches > 0 else 0
 
     return {
-        "wins": h2h_stats["wins"],
-        "losses": h2h_stats["losses"],
-        "matches": h2h_stats["matches"],
-        "point_diff": h2h_stats["point_diff"],
+        "wins": record["wins"],
+        "losses": record["losses"],
+        "matches": matches,
+        "point_diff": record["point_diff"],
         "avg_points_scored": {"playerA": avg_A, "playerB": avg_B},
-        "partnership_record": get_partnership_stats(
-            playerA_id,
-            playerB_id,
-            all_matches_in_group,
-        ),
+        "partnership_record": record["partnership_record"],
     }
 
 
 def _update_all_time_streak(
-    data: dict[str, Any],
+    rec: ParsedMatch,
     user_id: str,
     current: int,
     longest: int,
 ) -> tuple[int, int]:
     """Update current and longest winning streaks based on a single match."""
-    p1_score, p2_score = _get_match_scores(data)
-    team1_ids, team2_ids = _extract_team_ids(data)
-
     user_participated = False
     user_won = False
 
-    if user_id in team1_ids:
+    if user_id in rec.team1:
         user_participated = True
-        user_won = p1_score > p2_score
-    elif user_id in team2_ids:
+        user_won = rec.p1_score > rec.p2_score
+    elif user_id in rec.team2:
         user_participated = True
-        user_won = p2_score > p1_score
+        user_won = rec.p2_score > rec.p1_score
 
     if user_participated:
         if user_won:
@@ -172,19 +135,13 @@ def _update_all_time_streak(
 
 
 def _calculate_all_time_streaks(
-    matches: list[Any],
-    user_ref: DocumentReference,
+    records: Iterable[ParsedMatch],
+    user_id: str,
 ) -> tuple[int, int]:
-    """Calculate current and longest winning streaks for a user."""
-    from datetime import datetime
-
-    matches.sort(key=lambda x: (x.to_dict() or {}).get("matchDate") or datetime.min)
+    """Calculate current and longest winning streaks over oldest-first records."""
     current = longest = 0
-
-    for match in matches:
-        data = match.to_dict() or {}
-        current, longest = _update_all_time_streak(data, user_ref.id, current, longest)
-
+    for rec in records:
+        current, longest = _update_all_time_streak(rec, user_id, current, longest)
     return current, max(longest, current)
 
 
@@ -209,13 +166,10 @@ def get_user_group_stats(group_id: str, user_id: str) -> dict[str, Any]:
         stats["wins"] = user_data.get("wins", 0)
         stats["losses"] = user_data.get("losses", 0)
 
-    matches_query = db.collection("matches").where(
-        filter=FieldFilter("groupId", "==", group_id),
+    curr, long = _calculate_all_time_streaks(
+        get_group_matches(db, group_id),
+        user_id,
     )
-    all_matches = list(matches_query.stream())
-    user_ref = db.collection("users").document(user_id)
-
-    curr, long = _calculate_all_time_streaks(all_matches, user_ref)
     stats["win_streak"] = curr
     stats["longest_streak"] = long
 
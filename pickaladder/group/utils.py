@@ -26,7 +26,11 @@ from pickaladder.core.constants import (
     JOKES,
     RECENT_MATCHES_LIMIT,
 )
+from pickaladder.group.services.leaderboard import (
+    _leaderboard_from_standings_with_movement,
+)
 from pickaladder.group.services.match_parser import _extract_team_ids, _get_match_scores
+from pickaladder.group.services.standings import get_group_standings
 from pickaladder.services.mail_service import MailService
 from pickaladder.user.helpers import smart_display_name
 
@@ -288,6 +292,15 @@ def get_group_leaderboard(group_id: str) -> list[dict[str, Any]]:
     if not member_refs:
         return []
 
+    standings = get_group_standings(db, group_id)
+    if standings is not None:
+        return _leaderboard_from_standings_with_movement(
+            db,
+            group_id,
+            standings,
+            member_refs,
+        )
+
     stream = (
         db.collection("matches")
         .where(filter=FieldFilter("groupId", "==", group_id))
@@ -23,12 +23,15 @@ from pickaladder.core.constants import (
     LEADERBOARD_SILVER_THRESHOLD,
 )
 from pickaladder.core.security import rate_limit
-from pickaladder.extensions import cache
 
 from . import bp
 from .forms import MatchForm
 from .models import MatchSubmission
-from .services import MatchCommandService, MatchQueryService
+from .services import (
+    LeaderboardIndexService,
+    MatchCommandService,
+    MatchQueryService,
+)
 
 
 @bp.route("/edit/<string:match_id>", methods=["GET", "POST"])
@@ -257,19 +260,25 @@ def get_match_history() -> Response:
     return jsonify({"matches": matches, "next_cursor": next_cursor})
 
 
+@bp.route("/leaderboard/rank")
+@login_required
+def leaderboard_rank() -> Response:
+    """Return the current user's position on the global leaderboard."""
+    rank = LeaderboardIndexService.get_cached_user_rank(g.user.uid)
+    return jsonify({"rank": rank})
+
+
 @bp.route("/leaderboard")
 @login_required
-@cache.cached(timeout=600, key_prefix="global_leaderboard")
 def leaderboard() -> Response:
     """Display a global leaderboard.
 
-    Note: This is a simplified, non-scalable implementation. A production-ready
-    leaderboard on Firestore would likely require denormalization and Cloud Functions.
+    The rows come from the materialized ``leaderboard_global`` index and are
+    cached for every user; friend statuses are read per request.
     """
     db = firestore.client()
     try:
-        # Exclude players with 0 games and sort by Win Percentage
-        players = MatchQueryService.get_leaderboard_data(db, min_games=1)
+        players = LeaderboardIndexService.get_cached_top_players()
     except Exception as e:
         players = []
         flash(MATCH_MESSAGES["LEADERBOARD_ERROR"].format(error=e), "danger")
@@ -303,7 +312,7 @@ def leaderboard() -> Response:
     }
 
     latest_matches = MatchQueryService.get_latest_matches(db)
-    rising_stars = MatchQueryService.get_rising_stars(db)
+    rising_stars = MatchQueryService.get_cached_rising_stars()
 
     return render_template(  # type: ignore
         "leaderboard.html",
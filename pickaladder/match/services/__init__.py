@@ -4,9 +4,14 @@ from firebase_admin import firestore
 
 from .calculator import MatchStatsCalculator
 from .command import MatchCommandService
+from .elo_replay import EloReplayService
 from .formatting import MatchFormatter
+from .head_to_head import HeadToHeadService
+from .leaderboard_index import LeaderboardIndexService
 from .query import MatchQueryService
+from .rank_decay import RankDecayService
 from .record_service import MatchRecordService
+from .streaks import StreakService
 
 
 # Backward compatibility alias
@@ -15,11 +20,16 @@ class MatchService(MatchQueryService, MatchCommandService):  # type: ignore
 
 
 __all__ = [
+    "EloReplayService",
+    "HeadToHeadService",
+    "LeaderboardIndexService",
     "MatchCommandService",
     "MatchFormatter",
     "MatchQueryService",
     "MatchRecordService",
     "MatchService",
     "MatchStatsCalculator",
+    "RankDecayService",
+    "StreakService",
     "firestore",
 ]
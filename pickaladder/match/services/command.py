@@ -9,10 +9,19 @@ from pickaladder.core.activity.services import ActivityService
 from pickaladder.match.models import MatchResult, MatchSubmission
 from pickaladder.teams.services import TeamService
 from pickaladder.user.services.core import get_avatar_url, smart_display_name
+from pickaladder.user.services.stats_summary import (
+    stage_edited_match as stage_summary_edit,
+)
+from pickaladder.user.services.stats_summary import (
+    stage_recorded_match as stage_summary_match,
+)
 
 from .calculator import MatchStatsCalculator
+from .head_to_head import HeadToHeadService
 from .match_stats_updater import MatchStatsUpdater
 from .match_validation import MatchValidationService
+from .record_service import MatchRecordService
+from .streaks import StreakService
 
 if TYPE_CHECKING:
     from google.cloud.firestore_v1.base_document import DocumentSnapshot
@@ -69,6 +78,11 @@ class MatchCommandService(BaseRepository):
         )
         batch.commit()
 
+        if gid := match_doc_data.get("groupId"):
+            from pickaladder.group.services.standings import update_recorded_form
+
+            update_recorded_form(db, gid, new_match_ref.id, match_doc_data)
+
         # Phase 19: Challenge Resolution
         if sub.match_type == "singles" and match_doc_data.get("winnerId"):
             from pickaladder.match.services.challenge_service import ChallengeService
@@ -81,6 +95,16 @@ class MatchCommandService(BaseRepository):
                 match_doc_data["winnerId"],
             )
 
+        from .elo_replay import CHECKPOINT_FIELD, EloReplayService
+
+        # Matches already played after this one counted ratings without it
+        if CHECKPOINT_FIELD not in match_doc_data:
+            EloReplayService.schedule_replay(
+                db,
+                since=match_doc_data["matchDate"],
+                seeds=EloReplayService.seeds_for_match(match_doc_data),
+            )
+
         # Log community activity
         ActivityService.log_activity(
             db,
@@ -109,17 +133,44 @@ class MatchCommandService(BaseRepository):
                 match_doc_data["winnerId"],
             )
 
-        # Invalidate leaderboards cache
-        from pickaladder.extensions import cache
+        # Keep the global ranking index in step with the new stats
+        from .leaderboard_index import LeaderboardIndexService
 
-        cache.delete("global_leaderboard")
-        if sub.group_id:
-            from pickaladder.group.services.leaderboard import get_group_leaderboard
+        LeaderboardIndexService.refresh_users(
+            db, match_doc_data.get("participants") or []
+        )
 
-            cache.delete_memoized(get_group_leaderboard, sub.group_id)
+        cls.invalidate_cached_views(match_doc_data)
 
         return cls._build_match_result(new_match_ref.id, match_doc_data)
 
+    @staticmethod
+    def invalidate_cached_views(*matches: dict[str, Any]) -> None:
+        """Drop the cached rankings and every cached view the matches feed.
+
+        That is the views of the matches' groups, tournaments and players.
+        Every write that adds, edits, deletes or reassigns matches calls this
+        once its changes are committed.
+        """
+        from pickaladder.core.tiered_cache import (
+            RANKINGS_TAG,
+            group_tag,
+            invalidate_tags,
+            tournament_tag,
+            user_tag,
+        )
+
+        group_ids = {m["groupId"] for m in matches if m.get("groupId")}
+        tournament_ids = {m["tournamentId"] for m in matches if m.get("tournamentId")}
+        user_ids = {uid for m in matches for uid in m.get("participants") or [] if uid}
+        invalidate_tags(
+            RANKINGS_TAG,
+            *(group_tag(gid) for gid in sorted(group_ids)),
+            *(tournament_tag(tid) for tid in sorted(tournament_ids)),
+            *(user_tag(uid) for uid in sorted(user_ids)),
+        )
+        MatchRecordService.forget_rising_stars(*matches)
+
     @staticmethod
     def _parse_match_date(date_input: str | datetime.datetime) -> datetime.datetime:
         """Parse match date input into a timezone-aware datetime."""
@@ -299,9 +350,18 @@ class MatchCommandService(BaseRepository):
         ):
             match_data["is_upset"] = True
 
+        # Ratings before this match let a later ELO replay start from it
+        if cls._is_latest_for_players(db, match_data):
+            from .elo_replay import CHECKPOINT_FIELD
+
+            match_data[CHECKPOINT_FIELD] = cls._rating_checkpoint(
+                match_data, match_type, (p1_ref.id, p2_ref.id), snaps
+            )
+
         batch.set(match_ref, match_data)
         batch.update(p1_ref, p1_upd)
         batch.update(p2_ref, p2_upd)
+        MatchRecordService.stage_win_buckets(db, batch, match_data)
 
         # Update Named Teams if present
         if nt1_id or nt2_id:
@@ -328,19 +388,97 @@ class MatchCommandService(BaseRepository):
                 outcome["winner"],
             )
 
-        # Update last match info for the recorder and all participants
+        # Update last match info for the recorder and all participants. Playing
+        # clears any rank decay, so the stored decayed ELO is the rating itself.
         batch.update(user_ref, {"lastMatchRecordedType": match_type})
+        new_elo = {}
+        if match_type == "singles":
+            new_elo = {p1_ref.id: p1_upd["stats.elo"], p2_ref.id: p2_upd["stats.elo"]}
         for pid in participant_ids:
+            p_snap = snaps.get(pid)
+            elo = new_elo.get(pid)
+            if elo is None:
+                p_data = (p_snap.to_dict() if p_snap else None) or {}
+                elo = MatchRecordService.base_elo(p_data)
             batch.update(
                 db.collection("users").document(pid),
-                {"last_match_date": firestore.SERVER_TIMESTAMP},
+                {
+                    "last_match_date": firestore.SERVER_TIMESTAMP,
+                    "is_inactive": False,
+                    "stats.decayed_elo": elo,
+                },
             )
 
+        StreakService.stage_match(db, batch, match_data, snaps)
+        stage_summary_match(db, batch, match_data)
+        HeadToHeadService.stage_recorded_match(db, batch, match_ref.id, match_data)
+
         if gid := match_data.get("groupId"):
+            from pickaladder.group.services.leaderboard import stage_daily_snapshot
+            from pickaladder.group.services.match_cache import stage_version_bump
+            from pickaladder.group.services.standings import stage_recorded_match
+
             batch.update(
                 db.collection("groups").document(gid),
                 {"updatedAt": firestore.SERVER_TIMESTAMP},
             )
+            stage_version_bump(db, batch, gid)
+            # Close out yesterday's standings before this match moves them.
+            stage_daily_snapshot(db, batch, gid)
+            stage_recorded_match(db, batch, gid, match_ref.id, match_data)
+
+    @classmethod
+    def _is_latest_for_players(cls, db: Client, match_data: dict[str, Any]) -> bool:
+        """Return whether no match of the participants is dated after this one."""
+        from firebase_admin import firestore
+
+        participants = match_data.get("participants") or []
+        if not participants:
+            return True
+        later = (
+            db.collection(cls.COLLECTION_NAME)
+            .where(
+                filter=firestore.FieldFilter(
+                    "participants",
+                    "array_contains_any",
+                    participants,
+                ),
+            )
+            .where(
+                filter=firestore.FieldFilter("matchDate", ">", match_data["matchDate"])
+            )
+            .limit(1)
+        )
+        return not list(later.stream())
+
+    @staticmethod
+    def _rating_checkpoint(
+        match_data: dict[str, Any],
+        match_type: str,
+        side_ids: tuple[str, str],
+        snaps: dict[str, DocumentSnapshot],
+    ) -> dict[str, list[Any]]:
+        """Return the [elo, wins, losses] each rated entity held before a match."""
+        from .elo_replay import checkpoint_entry, entity_key
+
+        side = "teams" if match_type == "doubles" else "users"
+        entities = [(side, side_ids[0]), (side, side_ids[1])]
+        if match_type == "doubles":
+            entities += [("users", pid) for pid in match_data.get("participants") or []]
+        entities += [
+            ("teams", team_id)
+            for team_id in (
+                match_data.get("namedTeam1Id"),
+                match_data.get("namedTeam2Id"),
+            )
+            if team_id
+        ]
+        return {
+            entity_key(collection, doc_id): checkpoint_entry(
+                snaps[doc_id].to_dict() if doc_id in snaps else None
+            )
+            for collection, doc_id in entities
+        }
 
     @staticmethod
     def _denormalize_singles_players(
@@ -454,10 +592,52 @@ class MatchCommandService(BaseRepository):
 
         batch = db.batch()
         cls._perform_stats_update(data, s1, s2, batch)
+        upd = cls._get_match_updates(data, s1, s2)
+        if upd["winners"] != data.get("winners"):
+            MatchRecordService.stage_win_buckets(db, batch, data, -1)
+            MatchRecordService.stage_win_buckets(db, batch, {**data, **upd})
+        stage_summary_edit(db, batch, data, {**data, **upd})
+        HeadToHeadService.stage_edited_match(db, batch, data, {**data, **upd})
+        if gid := data.get("groupId"):
+            from pickaladder.group.services.match_cache import stage_version_bump
+            from pickaladder.group.services.standings import stage_edited_match
+
+            stage_edited_match(
+                db,
+                batch,
+                gid,
+                match_id,
+                old_data=data,
+                new_data={**data, **upd},
+            )
+            stage_version_bump(db, batch, gid)
+        # The edit lands with the version bump so no reader can cache the old
+        # score under the new group version.
+        upd["updatedAt"] = firestore.SERVER_TIMESTAMP
+        batch.update(db.collection(cls.COLLECTION_NAME).document(match_id), upd)
         batch.commit()
+        cls.forget(match_id)
 
-        upd = cls._get_match_updates(data, s1, s2)
-        cls.update(db, match_id, upd)
+        if gid := data.get("groupId"):
+            from pickaladder.group.services.standings import update_edited_form
+
+            update_edited_form(db, gid, match_id, data, {**data, **upd})
+
+        from .leaderboard_index import LeaderboardIndexService
+
+        LeaderboardIndexService.refresh_users(db, upd["participants"] or [])
+        StreakService.recompute_for_match(db, {**data, **upd})
+
+        # Ratings after this match depend on its result; replay them.
+        from .elo_replay import EloReplayService
+
+        EloReplayService.schedule_replay(
+            db,
+            since=data.get("matchDate"),
+            seeds=EloReplayService.seeds_for_match(data),
+        )
+
+        cls.invalidate_cached_views(data, {**data, **upd})
 
         # Phase 10: Tournament Progression
         if t_id := data.get("tournamentId"):
@@ -0,0 +1,719 @@
+"""Batch ELO replay over a compact, date-ordered match table.
+
+Every match stores the ratings and win/loss counters its players and teams
+had before it was played, keyed by ``entity_key``. A replay from a point in
+history therefore only reads the matches played since then: each entity
+starts from the checkpoint of its first replayed match, and the checkpoints
+of the replayed matches are rewritten with the new values. A missing
+checkpoint (history recorded before they existed, or a match recorded out of
+date order) falls back to replaying the whole history, which backfills them.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+from google.api_core.exceptions import FailedPrecondition
+
+from pickaladder.core.constants import FIRESTORE_BATCH_LIMIT
+
+from .record_service import MatchRecordService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from google.cloud.firestore_v1.client import Client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ELO = 1200.0
+ELO_K_FACTOR = 32
+# Match field holding each entity's [elo, wins, losses] before the match
+CHECKPOINT_FIELD = "ratingsBefore"
+# Times a replay is run again after losing a write race with a rating update
+REPLAY_ATTEMPTS = 3
+
+# Fields the replay reads from each match; everything else stays on the server.
+REPLAY_FIELDS = [
+    "matchType",
+    "matchDate",
+    "createdAt",
+    "status",
+    "winner",
+    "player1Score",
+    "player2Score",
+    "player1Ref",
+    "player2Ref",
+    "team1Ref",
+    "team2Ref",
+    "team1",
+    "team2",
+    "namedTeam1Id",
+    "namedTeam2Id",
+    CHECKPOINT_FIELD,
+]
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value: Any) -> datetime:
+    """Return a comparable aware datetime for a stored timestamp."""
+    if not isinstance(value, datetime):
+        return _EPOCH
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def entity_key(collection: str, doc_id: str) -> str:
+    """Return the checkpoint key of a rated user or team."""
+    return f"{collection}/{doc_id}"
+
+
+def checkpoint_entry(data: dict[str, Any] | None) -> list[Any]:
+    """Return the [elo, wins, losses] checkpoint of a user or team document."""
+    stats = (data or {}).get("stats") or {}
+    return [
+        float(stats.get("elo", DEFAULT_ELO)),
+        int(stats.get("wins", 0)),
+        int(stats.get("losses", 0)),
+    ]
+
+
+def _same_checkpoint(a: list[Any] | None, b: list[Any] | None) -> bool:
+    """Return whether two checkpoints hold the same values."""
+    if a is None or b is None:
+        return a is b
+    return abs(float(a[0]) - float(b[0])) <= 1e-6 and list(a[1:]) == list(b[1:])
+
+
+class MissingCheckpointError(LookupError):
+    """A replayed match lacks the checkpoint of an entity it involves."""
+
+
+class ReplayTable:
+    """Matches in date order, stored as parallel integer columns.
+
+    Every rated entity (users for singles, teams for doubles, named teams) and
+    every doubles member is interned to a dense index, so the replay loop only
+    reads and writes flat arrays.
+    """
+
+    __slots__ = (
+        "_index",
+        "checkpoints",
+        "created",
+        "dates",
+        "keys",
+        "loaded_through",
+        "match_ids",
+        "members1",
+        "members2",
+        "named1",
+        "named2",
+        "rated",
+        "side1",
+        "side2",
+        "won1",
+    )
+
+    def __init__(self) -> None:
+        self._index: dict[tuple[str, str], int] = {}
+        self.keys: list[tuple[str, str]] = []
+        self.rated = bytearray()
+        self.dates: list[datetime] = []
+        self.created: list[datetime] = []
+        self.match_ids: list[str | None] = []
+        self.checkpoints: list[dict[str, list[Any]]] = []
+        self.side1 = array("l")
+        self.side2 = array("l")
+        self.won1 = array("b")
+        self.named1 = array("l")
+        self.named2 = array("l")
+        self.members1: list[tuple[int, ...]] = []
+        self.members2: list[tuple[int, ...]] = []
+        # Matches created after this time are not in the table
+        self.loaded_through = _EPOCH
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _intern(self, collection: str, doc_id: str, rated: bool) -> int:
+        """Return the dense index of an entity, registering it if new."""
+        key = (collection, doc_id)
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self._index[key] = len(self.keys)
+            self.keys.append(key)
+            self.rated.append(0)
+        if rated:
+            self.rated[idx] = 1
+        return idx
+
+    @staticmethod
+    def _row(data: dict[str, Any]) -> tuple[Any, ...] | None:
+        """Extract the rated sides of a completed match, or None to skip it."""
+        status = data.get("status")
+        if status and str(status).upper() != "COMPLETED":
+            return None
+        if data.get("matchType", "singles") == "doubles":
+            r1, r2 = data.get("team1Ref"), data.get("team2Ref")
+            members = (data.get("team1") or [], data.get("team2") or [])
+        else:
+            r1, r2 = data.get("player1Ref"), data.get("player2Ref")
+            members = ([], [])
+        if not (r1 and r2):
+            return None
+        winner = data.get("winner")
+        if winner not in ("team1", "team2"):
+            s1, s2 = data.get("player1Score", 0), data.get("player2Score", 0)
+            winner = "team1" if s1 > s2 else "team2"
+        date = _as_utc(data.get("matchDate") or data.get("createdAt"))
+        return (date, _as_utc(data.get("createdAt")), r1, r2, winner, members, data)
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[dict[str, Any]]) -> ReplayTable:
+        """Build the table from match dicts in any order."""
+        rows = [row for data in matches if (row := cls._row(data)) is not None]
+        rows.sort(key=lambda r: (r[0], r[1]))
+
+        table = cls()
+        for date, _, r1, r2, winner, (m1, m2), data in rows:
+            doubles = data.get("matchType", "singles") == "doubles"
+            collection = "teams" if doubles else "users"
+            table.dates.append(date)
+            table.created.append(_as_utc(data.get("createdAt")))
+            table.match_ids.append(data.get("id"))
+            table.checkpoints.append(data.get(CHECKPOINT_FIELD) or {})
+            table.side1.append(table._intern(collection, r1.id, True))
+            table.side2.append(table._intern(collection, r2.id, True))
+            table.won1.append(1 if winner == "team1" else 0)
+            table.members1.append(
+                tuple(table._intern("users", r.id, False) for r in m1 if r),
+            )
+            table.members2.append(
+                tuple(table._intern("users", r.id, False) for r in m2 if r),
+            )
+            nt1, nt2 = data.get("namedTeam1Id"), data.get("namedTeam2Id")
+            table.named1.append(table._intern("teams", nt1, True) if nt1 else -1)
+            table.named2.append(table._intern("teams", nt2, True) if nt2 else -1)
+        return table
+
+    def first_index_at(self, since: datetime | None) -> int:
+        """Return the position of the first match played at or after ``since``."""
+        if since is None:
+            return 0
+        return bisect_left(self.dates, _as_utc(since))
+
+    def involved(self, i: int) -> tuple[int, ...]:
+        """Return the entities whose stats match ``i`` changes."""
+        involved = (self.side1[i], self.side2[i], *self.members1[i], *self.members2[i])
+        if self.named1[i] >= 0:
+            involved += (self.named1[i],)
+        if self.named2[i] >= 0:
+            involved += (self.named2[i],)
+        return involved
+
+    def checkpoint(
+        self,
+        i: int,
+        elo: array,
+        wins: array,
+        losses: array,
+    ) -> dict[str, list[Any]]:
+        """Return the checkpoint of match ``i`` from the values before it."""
+        return {
+            entity_key(*self.keys[e]): [elo[e], wins[e], losses[e]]
+            for e in self.involved(i)
+        }
+
+
+def _play(
+    table: ReplayTable,
+    i: int,
+    elo: array,
+    wins: array,
+    losses: array,
+    *,
+    k: float,
+) -> None:
+    """Apply match ``i`` to the per-entity values."""
+    a, b, w = table.side1[i], table.side2[i], table.won1[i]
+    ra, rb = elo[a], elo[b]
+    delta = k * (w - 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0)))
+    elo[a] = ra + delta
+    elo[b] = rb - delta
+    wins[a] += w
+    losses[a] += 1 - w
+    wins[b] += 1 - w
+    losses[b] += w
+    for u in table.members1[i]:
+        wins[u] += w
+        losses[u] += 1 - w
+    for u in table.members2[i]:
+        wins[u] += 1 - w
+        losses[u] += w
+
+    na, nb = table.named1[i], table.named2[i]
+    if na >= 0 or nb >= 0:
+        # A missing named side is rated as a fresh 1200 team, as on record.
+        ra = elo[na] if na >= 0 else DEFAULT_ELO
+        rb = elo[nb] if nb >= 0 else DEFAULT_ELO
+        delta = k * (w - 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0)))
+        if na >= 0:
+            elo[na] = ra + delta
+            wins[na] += w
+            losses[na] += 1 - w
+        if nb >= 0:
+            elo[nb] = rb - delta
+            wins[nb] += 1 - w
+            losses[nb] += w
+
+
+def replay_ratings(
+    table: ReplayTable,
+    start: int = 0,
+    seeds: Iterable[str] | None = None,
+    k: float = ELO_K_FACTOR,
+    checkpoints: list[dict[str, list[Any]]] | None = None,
+) -> tuple[array, array, array, bytearray]:
+    """Replay every match and return (elo, wins, losses, dirty) per entity.
+
+    ``dirty`` flags the entities whose values may differ because of a change
+    at position ``start``: with ``seeds`` it spreads outwards from the seeded
+    IDs through later opponents, otherwise everyone playing from ``start``
+    onwards is flagged. The checkpoint of every match is appended to
+    ``checkpoints`` when a list is given.
+    """
+    n = len(table.keys)
+    elo = array("d", [DEFAULT_ELO]) * n
+    wins = array("l", [0]) * n
+    losses = array("l", [0]) * n
+    dirty = bytearray(n)
+    seeded = seeds is not None
+    if seeded:
+        wanted = set(seeds)
+        for idx, (_, doc_id) in enumerate(table.keys):
+            if doc_id in wanted:
+                dirty[idx] = 1
+
+    for i in range(len(table)):
+        if checkpoints is not None:
+            checkpoints.append(table.checkpoint(i, elo, wins, losses))
+        _play(table, i, elo, wins, losses, k=k)
+        if i < start:
+            continue
+        involved = table.involved(i)
+        if not seeded or any(dirty[e] for e in involved):
+            for e in involved:
+                dirty[e] = 1
+    return elo, wins, losses, dirty
+
+
+def _removed_baseline(
+    removed: dict[str, Any] | None,
+    k: float,
+) -> tuple[tuple[datetime, datetime] | None, dict[str, tuple[list, list]]]:
+    """Return where a deleted match sat and its entities' (before, after) values."""
+    if not removed:
+        return None, {}
+    table = ReplayTable.from_matches([removed])
+    if not len(table):
+        return None, {}
+    before = table.checkpoints[0]
+    n = len(table.keys)
+    elo, wins, losses = array("d", [0.0]) * n, array("l", [0]) * n, array("l", [0]) * n
+    for e, key in enumerate(table.keys):
+        if (value := before.get(entity_key(*key))) is None:
+            return None, {}
+        elo[e], wins[e], losses[e] = float(value[0]), int(value[1]), int(value[2])
+    _play(table, 0, elo, wins, losses, k=k)
+    after = table.checkpoint(0, elo, wins, losses)
+    baseline = {key: (before[key], after[key]) for key in after}
+    return (table.dates[0], table.created[0]), baseline
+
+
+def replay_from_checkpoints(
+    table: ReplayTable,
+    seeds: Iterable[str],
+    removed: dict[str, Any] | None = None,
+    k: float = ELO_K_FACTOR,
+) -> tuple[array, array, array, bytearray, dict[int, dict[str, list[Any]]]]:
+    """Replay a table holding only recent matches from their checkpoints.
+
+    Only matches involving a seeded entity, or an entity one of them has
+    played since, are replayed. Returns (elo, wins, losses, dirty) like
+    ``replay_ratings``, flagging the entities of the replayed matches, plus
+    the new checkpoint of every replayed match.
+
+    ``removed`` is a match deleted at the start of the table: its entities
+    start from its own checkpoint wherever the next one still counts it.
+    Raises ``MissingCheckpointError`` when an entity cannot be started.
+    """
+    n = len(table.keys)
+    elo = array("d", [DEFAULT_ELO]) * n
+    wins = array("l", [0]) * n
+    losses = array("l", [0]) * n
+    dirty = bytearray(n)
+    started = bytearray(n)
+    wanted = set(seeds)
+    for idx, (_, doc_id) in enumerate(table.keys):
+        if doc_id in wanted:
+            dirty[idx] = 1
+    removed_at, baseline = _removed_baseline(removed, k)
+
+    checkpoints: dict[int, dict[str, list[Any]]] = {}
+    for i in range(len(table)):
+        involved = table.involved(i)
+        if not any(dirty[e] for e in involved):
+            continue
+        stored = table.checkpoints[i]
+        after_removed = removed_at is not None and (
+            (table.dates[i], table.created[i]) > removed_at
+        )
+        for e in involved:
+            if started[e]:
+                continue
+            key = entity_key(*table.keys[e])
+            value = stored.get(key)
+            base = baseline.get(key)
+            if after_removed and base and _same_checkpoint(value, base[1]):
+                value = base[0]
+            if value is None:
+                msg = f"Match {table.match_ids[i]} has no checkpoint for {key}"
+                raise MissingCheckpointError(msg)
+            elo[e], wins[e], losses[e] = float(value[0]), int(value[1]), int(value[2])
+            started[e] = 1
+        checkpoints[i] = table.checkpoint(i, elo, wins, losses)
+        _play(table, i, elo, wins, losses, k=k)
+        for e in involved:
+            dirty[e] = 1
+    return elo, wins, losses, started, checkpoints
+
+
+def _check_no_new_matches(db: Client, table: ReplayTable) -> None:
+    """Raise ``FailedPrecondition`` if a match was recorded after the table.
+
+    Its rating change is already in the stored stats, which pass the write
+    preconditions, but not in the replayed values that would overwrite them.
+    """
+    newer = list(
+        db.collection("matches")
+        .where(filter=firestore.FieldFilter("createdAt", ">", table.loaded_through))
+        .limit(1)
+        .stream(),
+    )
+    if newer:
+        msg = "A match was recorded after the replayed history was read"
+        raise FailedPrecondition(msg)
+
+
+class EloReplayService:
+    """Recomputes stored ratings by replaying match history in memory.
+
+    Match edits, deletions and account merges change history that incremental
+    ELO updates cannot undo. Replays are queued in ``elo_replays`` and run on
+    the background executor. A replay from a date reads only the matches
+    played since then, writes back the entities whose stored ``stats`` differ
+    in chunked batches, and is run again if one of them changed meanwhile.
+    """
+
+    QUEUE_COLLECTION = "elo_replays"
+    _drain_lock = threading.Lock()
+
+    @staticmethod
+    def load_table(db: Client, since: datetime | None = None) -> ReplayTable:
+        """Stream the match fields the replay needs into a table.
+
+        With ``since`` only the matches played at or after it are read.
+        """
+        started = datetime.now(timezone.utc)
+        query = db.collection("matches").select(REPLAY_FIELDS)
+        if since is not None:
+            query = query.where(filter=firestore.FieldFilter("matchDate", ">=", since))
+        table = ReplayTable.from_matches(
+            {**(snap.to_dict() or {}), "id": snap.id} for snap in query.stream()
+        )
+        # Matches created once the read started may be missing from it
+        table.loaded_through = max([*table.created, started])
+        return table
+
+    @classmethod
+    def replay(
+        cls,
+        db: Client,
+        since: datetime | None = None,
+        seeds: Iterable[str] | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        removed: dict[str, Any] | None = None,
+    ) -> int:
+        """Replay history and persist changed ratings; return docs updated.
+
+        ``since`` and ``seeds`` narrow the replay to the entities a change at
+        that point in history can reach, and ``removed`` is the match deleted
+        there, if any. ``progress`` is called with (processed, total) after
+        every committed chunk.
+        """
+        seed_list = list(seeds) if seeds is not None else None
+        attempt = 1
+        while True:
+            try:
+                return cls._replay_once(db, since, seed_list, progress, removed)
+            except FailedPrecondition:
+                if attempt >= REPLAY_ATTEMPTS:
+                    raise
+                attempt += 1
+                logger.info("Ratings changed during the ELO replay; replaying again")
+
+    @classmethod
+    def _replay_once(
+        cls,
+        db: Client,
+        since: datetime | None,
+        seeds: list[str] | None,
+        progress: Callable[[int, int], None] | None,
+        removed: dict[str, Any] | None,
+    ) -> int:
+        """Replay from checkpoints when possible, otherwise the whole history."""
+        _, baseline = _removed_baseline(removed, ELO_K_FACTOR)
+        if since is not None and seeds is not None:
+            table = cls.load_table(db, since)
+            try:
+                elo, wins, losses, dirty, checkpoints = replay_from_checkpoints(
+                    table, seeds, removed
+                )
+            except MissingCheckpointError as e:
+                logger.info(f"{e}; replaying the full ELO history")
+            else:
+                # Entities of a deleted match that have not played since
+                extra = {
+                    key: (before, after)
+                    for key, (before, after) in baseline.items()
+                    if tuple(key.split("/", 1)) not in table._index
+                }
+                cls._write_checkpoints(db, table, checkpoints)
+                return cls._write_back(
+                    db,
+                    table,
+                    dirty,
+                    (elo, wins, losses),
+                    progress=progress,
+                    extra=extra,
+                )
+
+        table = cls.load_table(db)
+        full: list[dict[str, list[Any]]] = []
+        elo, wins, losses, dirty = replay_ratings(
+            table, table.first_index_at(since), seeds, checkpoints=full
+        )
+        cls._write_checkpoints(db, table, dict(enumerate(full)))
+        # Entities left without any match start over
+        extra = {
+            key: ([DEFAULT_ELO, 0, 0], None)
+            for key in baseline
+            if tuple(key.split("/", 1)) not in table._index
+        }
+        return cls._write_back(
+            db, table, dirty, (elo, wins, losses), progress=progress, extra=extra
+        )
+
+    @staticmethod
+    def _write_checkpoints(
+        db: Client,
+        table: ReplayTable,
+        checkpoints: dict[int, dict[str, list[Any]]],
+    ) -> None:
+        """Rewrite the checkpoints of replayed matches that changed."""
+        changed = [
+            (match_id, checkpoint)
+            for i, checkpoint in checkpoints.items()
+            if (match_id := table.match_ids[i])
+            and (
+                checkpoint.keys() != table.checkpoints[i].keys()
+                or not all(
+                    _same_checkpoint(value, table.checkpoints[i][key])
+                    for key, value in checkpoint.items()
+                )
+            )
+        ]
+        for offset in range(0, len(changed), FIRESTORE_BATCH_LIMIT):
+            batch = db.batch()
+            for match_id, checkpoint in changed[
+                offset : offset + FIRESTORE_BATCH_LIMIT
+            ]:
+                batch.update(
+                    db.collection("matches").document(match_id),
+                    {CHECKPOINT_FIELD: checkpoint},
+                )
+            batch.commit()
+
+    @staticmethod
+    def _write_back(  # noqa: PLR0913
+        db: Client,
+        table: ReplayTable,
+        dirty: bytearray,
+        values: tuple[array, array, array],
+        *,
+        progress: Callable[[int, int], None] | None,
+        extra: dict[str, tuple[list[Any], list[Any] | None]],
+    ) -> int:
+        """Write changed stats for the target entities in chunked batches.
+
+        ``extra`` maps entities outside the table to their new values and the
+        values they must still hold to be rewritten. Each update is
+        conditional on the document being unchanged since it was read, so a
+        concurrent rating update fails the commit with ``FailedPrecondition``.
+        A match recorded after the table was loaded but before the documents
+        were read raises ``FailedPrecondition`` too.
+        """
+        elo, wins, losses = values
+        targets: list[tuple[tuple[str, str], list[Any], bool, list[Any] | None]] = [
+            (table.keys[i], [elo[i], wins[i], losses[i]], bool(table.rated[i]), None)
+            for i in range(len(table.keys))
+            if dirty[i]
+        ]
+        for key, (value, expected) in extra.items():
+            collection, doc_id = key.split("/", 1)
+            targets.append(((collection, doc_id), value, True, expected))
+
+        updated = 0
+        changed_users: list[str] = []
+        for offset in range(0, len(targets), FIRESTORE_BATCH_LIMIT):
+            chunk = targets[offset : offset + FIRESTORE_BATCH_LIMIT]
+            snaps = {}
+            for collection in ("users", "teams"):
+                refs = [
+                    db.collection(collection).document(key[1])
+                    for key, *_ in chunk
+                    if key[0] == collection
+                ]
+                if refs:
+                    snaps.update({(collection, s.id): s for s in db.get_all(refs)})
+            _check_no_new_matches(db, table)
+            batch = db.batch()
+            pending = 0
+            for key, (new_elo, new_wins, new_losses), rated, expected in chunk:
+                snap = snaps.get(key)
+                if snap is None or not snap.exists:
+                    continue
+                data = snap.to_dict() or {}
+                if expected is not None and not _same_checkpoint(
+                    checkpoint_entry(data), expected
+                ):
+                    continue
+                stats = data.get("stats") or {}
+                upd: dict[str, Any] = {}
+                if stats.get("wins", 0) != new_wins:
+                    upd["stats.wins"] = new_wins
+                if stats.get("losses", 0) != new_losses:
+                    upd["stats.losses"] = new_losses
+                current_elo = float(stats.get("elo", DEFAULT_ELO))
+                if rated and abs(current_elo - new_elo) > 1e-6:
+                    upd["stats.elo"] = new_elo
+                    if key[0] == "users":
+                        # Keep the stored decay on the replayed rating.
+                        decayed, _ = MatchRecordService.compute_decay(
+                            {**data, "stats": {**stats, "elo": new_elo}},
+                        )
+                        upd["stats.decayed_elo"] = decayed
+                if not upd:
+                    continue
+                batch.update(
+                    snap.reference,
+                    upd,
+                    option=db.write_option(last_update_time=snap.update_time),
+                )
+                pending += 1
+                if key[0] == "users":
+                    changed_users.append(key[1])
+            if pending:
+                batch.commit()
+                updated += pending
+            if progress is not None:
+                progress(min(offset + len(chunk), len(targets)), len(targets))
+
+        if changed_users:
+            from .leaderboard_index import LeaderboardIndexService
+
+            LeaderboardIndexService.refresh_users(db, changed_users)
+        return updated
+
+    @staticmethod
+    def seeds_for_match(data: dict[str, Any]) -> list[str]:
+        """Return the user and team IDs whose ratings a match feeds into."""
+        seeds = list(data.get("participants") or [])
+        for field in ("player1Ref", "player2Ref", "team1Ref", "team2Ref"):
+            if ref := data.get(field):
+                seeds.append(ref.id)
+        for field in ("namedTeam1Id", "namedTeam2Id"):
+            if team_id := data.get(field):
+                seeds.append(team_id)
+        return seeds
+
+    @classmethod
+    def schedule_replay(
+        cls,
+        db: Client,
+        since: datetime | None = None,
+        seeds: Iterable[str] | None = None,
+        removed: dict[str, Any] | None = None,
+    ) -> None:
+        """Queue a replay and drain the queue on the background executor.
+
+        Replays never run in the request that asks for them. Without an
+        executor the replay stays queued for the next drain, or for
+        ``scripts/replay_elo.py --pending``.
+        """
+        from pickaladder.extensions import executor
+
+        db.collection(cls.QUEUE_COLLECTION).document().set(
+            {
+                "since": since,
+                "seeds": list(seeds) if seeds is not None else None,
+                "removed": {f: removed[f] for f in REPLAY_FIELDS if f in removed}
+                if removed
+                else None,
+                "queuedAt": datetime.now(timezone.utc),
+            },
+        )
+        try:
+            executor.run_async(cls.run_pending, db)
+        except RuntimeError:
+            logger.info("Task executor unavailable; ELO replay left queued")
+
+    @classmethod
+    def run_pending(cls, db: Client) -> int:
+        """Run queued replays in the order they were requested; return how many.
+
+        A replay that fails stays queued and stops the drain. One drain runs
+        per process at a time; the others return at once.
+        """
+        if not cls._drain_lock.acquire(blocking=False):
+            return 0
+        done = 0
+        try:
+            while True:
+                queued = list(
+                    db.collection(cls.QUEUE_COLLECTION)
+                    .order_by("queuedAt")
+                    .limit(FIRESTORE_BATCH_LIMIT)
+                    .stream(),
+                )
+                if not queued:
+                    return done
+                for snap in queued:
+                    request = snap.to_dict() or {}
+                    cls.replay(
+                        db,
+                        since=request.get("since"),
+                        seeds=request.get("seeds"),
+                        removed=request.get("removed"),
+                    )
+                    snap.reference.delete()
+                    done += 1
+        finally:
+            cls._drain_lock.release()
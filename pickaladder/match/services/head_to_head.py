@@ -0,0 +1,383 @@
+"""Pairwise head-to-head index maintained on match write."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+from google.api_core.exceptions import Conflict, FailedPrecondition
+
+from pickaladder.core.constants import H2H_RECENT_MATCHES
+from pickaladder.core.match_record import MatchRecord
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1.batch import WriteBatch
+    from google.cloud.firestore_v1.client import Client
+    from google.cloud.firestore_v1.document import DocumentReference
+
+logger = logging.getLogger(__name__)
+
+# Counter fields of a pair document, oriented to its sorted ``players``.
+COUNTER_FIELDS = (
+    "matches",
+    "wins_a",
+    "wins_b",
+    "points_a",
+    "points_b",
+    "partner_matches",
+    "partner_wins",
+    "partner_losses",
+)
+# Times a pair rebuild is retried after losing a race with another write
+REBUILD_ATTEMPTS = 5
+
+
+def pair_key(user_id_1: str, user_id_2: str) -> tuple[str, str]:
+    """Return the two user IDs in the order used to key their pair."""
+    return (user_id_1, user_id_2) if user_id_1 <= user_id_2 else (user_id_2, user_id_1)
+
+
+def _pair_counters(data: dict[str, Any]) -> dict[tuple[str, str], dict[str, int]]:
+    """Return the counters a match adds to every pair of its players.
+
+    Opponents get results and points; teammates in doubles get a
+    partnership record.
+    """
+    record = MatchRecord(data)
+    team1, team2 = record.team1, record.team2
+    s1, s2 = record.p1_score, record.p2_score
+    pairs: dict[tuple[str, str], dict[str, int]] = {}
+    for u1 in team1:
+        for u2 in team2:
+            if u1 == u2:
+                continue
+            a, b = pair_key(u1, u2)
+            pa, pb = (s1, s2) if a == u1 else (s2, s1)
+            pairs[(a, b)] = {
+                "matches": 1,
+                "wins_a": int(pa > pb),
+                "wins_b": int(pb > pa),
+                "points_a": pa,
+                "points_b": pb,
+            }
+    for team, (own, other) in ((team1, (s1, s2)), (team2, (s2, s1))):
+        members = sorted(team)
+        for i, u1 in enumerate(members):
+            for u2 in members[i + 1 :]:
+                pairs[(u1, u2)] = {
+                    "partner_matches": 1,
+                    "partner_wins": int(own > other),
+                    "partner_losses": int(other > own),
+                }
+    return pairs
+
+
+def _new_pair(a: str, b: str, group_id: str | None) -> dict[str, Any]:
+    """Return an empty pair document."""
+    return {
+        "players": [a, b],
+        "groupId": group_id,
+        **dict.fromkeys(COUNTER_FIELDS, 0),
+        "lastMatchId": None,
+        "lastMatchDate": None,
+        "recentMatchIds": [],
+    }
+
+
+def _apply(
+    doc: dict[str, Any],
+    counters: dict[str, int],
+    match_id: str,
+    data: dict[str, Any],
+) -> None:
+    """Fold one match into an in-memory pair document, oldest first."""
+    for field, value in counters.items():
+        doc[field] = doc.get(field, 0) + value
+    if counters.get("matches"):
+        doc["lastMatchId"] = match_id
+        doc["lastMatchDate"] = data.get("matchDate")
+        doc["recentMatchIds"] = [match_id, *doc.get("recentMatchIds", [])][
+            :H2H_RECENT_MATCHES
+        ]
+
+
+def _is_newer(match_date: Any, last_date: Any) -> bool:
+    """Return whether a match is dated after the pair's latest meeting."""
+    if not isinstance(last_date, datetime.datetime):
+        return True
+    if not isinstance(match_date, datetime.datetime):
+        return False
+    if (match_date.tzinfo is None) != (last_date.tzinfo is None):
+        match_date = match_date.replace(tzinfo=datetime.timezone.utc)
+        last_date = last_date.replace(tzinfo=datetime.timezone.utc)
+    return match_date >= last_date
+
+
+class HeadToHeadService:
+    """Maintains the ``head_to_head`` pair index.
+
+    One document per pair of players, keyed by their sorted IDs, holds the
+    rivalry record, points, partnership record and pointers to their latest
+    meetings. A second document per group scopes the same record to that
+    group. Reading a rivalry is a single document read.
+    """
+
+    COLLECTION_NAME = "head_to_head"
+
+    @classmethod
+    def pair_ref(
+        cls,
+        db: Client,
+        a: str,
+        b: str,
+        group_id: str | None = None,
+    ) -> DocumentReference:
+        """Return the reference of a pair document, optionally group-scoped."""
+        doc_id = f"{a}_{b}_{group_id}" if group_id else f"{a}_{b}"
+        return db.collection(cls.COLLECTION_NAME).document(doc_id)
+
+    @classmethod
+    def _scan_pair(
+        cls,
+        db: Client,
+        a: str,
+        b: str,
+        group_id: str | None,
+    ) -> dict[str, Any]:
+        """Build a pair document by replaying the matches the two played."""
+        if group_id:
+            query = db.collection("matches").where(
+                filter=firestore.FieldFilter("groupId", "==", group_id),
+            )
+        else:
+            query = db.collection("matches").where(
+                filter=firestore.FieldFilter("participants", "array_contains", a),
+            )
+        matches = []
+        for snap in query.stream():
+            data = snap.to_dict() or {}
+            record = MatchRecord(data)
+            if {a, b} <= record.team1 | record.team2:
+                matches.append((snap.id, data))
+        matches.sort(key=lambda m: m[1].get("matchDate") or datetime.datetime.min)
+        doc = _new_pair(a, b, group_id)
+        for match_id, data in matches:
+            if counters := _pair_counters(data).get((a, b)):
+                _apply(doc, counters, match_id, data)
+        return doc
+
+    @classmethod
+    def _create_from_history(
+        cls,
+        db: Client,
+        ref: DocumentReference,
+        pair: tuple[str, str],
+        group_id: str | None,
+        *,
+        keep_empty: bool,
+    ) -> dict[str, Any]:
+        """Build a missing pair document and create it unless another write won.
+
+        Returns the stored document. An empty history is only stored when
+        ``keep_empty`` is set, so a match about to be staged has a document to
+        increment.
+        """
+        doc = cls._scan_pair(db, *pair, group_id)
+        if not (keep_empty or doc["matches"] or doc["partner_matches"]):
+            return doc
+        try:
+            ref.create(doc)
+        except Conflict:
+            snap = ref.get()
+            stored = snap.to_dict() if snap.exists else None
+            if isinstance(stored, dict):
+                return stored
+        return doc
+
+    @classmethod
+    def _stored_pairs(
+        cls,
+        db: Client,
+        targets: list[tuple[tuple[str, str], str | None, DocumentReference]],
+    ) -> dict[str, dict[str, Any]]:
+        """Return the stored pair documents of a match, creating missing ones.
+
+        Missing pairs are built from history before the match batch commits,
+        so their first read cannot overwrite the match's increments.
+        """
+        snaps = {s.id: s for s in db.get_all([t[2] for t in targets])}
+        stored = {}
+        for pair, scope, ref in targets:
+            snap = snaps.get(ref.id)
+            doc = snap.to_dict() if snap is not None and snap.exists else None
+            if not isinstance(doc, dict):
+                doc = cls._create_from_history(db, ref, pair, scope, keep_empty=True)
+            stored[ref.id] = doc
+        return stored
+
+    @classmethod
+    def _pair_refs(
+        cls,
+        db: Client,
+        data: dict[str, Any],
+    ) -> list[tuple[tuple[str, str], str | None, DocumentReference]]:
+        """Return (pair, group, reference) for every pair document of a match."""
+        group_id = data.get("groupId")
+        scopes = [None, group_id] if group_id else [None]
+        return [
+            (pair, scope, cls.pair_ref(db, *pair, scope))
+            for pair in _pair_counters(data)
+            for scope in scopes
+        ]
+
+    @classmethod
+    def stage_recorded_match(
+        cls,
+        db: Client,
+        batch: WriteBatch,
+        match_id: str,
+        data: dict[str, Any],
+    ) -> None:
+        """Queue pair updates for a newly recorded match on a batch."""
+        counters = _pair_counters(data)
+        targets = cls._pair_refs(db, data)
+        if not targets:
+            return
+        match_date = data.get("matchDate")
+        stored_pairs = cls._stored_pairs(db, targets)
+        for pair, _, ref in targets:
+            upd: dict[str, Any] = {
+                field: firestore.Increment(value)
+                for field, value in counters[pair].items()
+                if value
+            }
+            stored = stored_pairs[ref.id]
+            # A backdated match counts but is not the pair's latest meeting
+            if counters[pair].get("matches") and _is_newer(
+                match_date,
+                stored.get("lastMatchDate"),
+            ):
+                recent = stored.get("recentMatchIds") or []
+                upd["lastMatchId"] = match_id
+                upd["lastMatchDate"] = match_date
+                upd["recentMatchIds"] = [match_id, *recent][:H2H_RECENT_MATCHES]
+            if upd:
+                batch.update(ref, upd)
+
+    @classmethod
+    def stage_edited_match(
+        cls,
+        db: Client,
+        batch: WriteBatch,
+        old_data: dict[str, Any],
+        new_data: dict[str, Any],
+    ) -> None:
+        """Queue the counter swap for an edited match score on a batch."""
+        old = _pair_counters(old_data)
+        new = _pair_counters(new_data)
+        targets = cls._pair_refs(db, new_data)
+        if not targets:
+            return
+        # Bootstrapped from the stored match, so the edit is a plain swap
+        cls._stored_pairs(db, targets)
+        for pair, _, ref in targets:
+            before, after = old.get(pair, {}), new.get(pair, {})
+            upd = {
+                field: firestore.Increment(after.get(field, 0) - before.get(field, 0))
+                for field in COUNTER_FIELDS
+                if after.get(field, 0) != before.get(field, 0)
+            }
+            if upd:
+                batch.update(ref, upd)
+
+    @classmethod
+    def _rebuild(
+        cls,
+        db: Client,
+        ref: DocumentReference,
+        pair: tuple[str, str],
+        group_id: str | None,
+    ) -> None:
+        """Overwrite a pair document from history, dropping it if now empty.
+
+        Each write is conditional on the document being unchanged since it
+        was read; a lost race replays the history again.
+        """
+        for _ in range(REBUILD_ATTEMPTS):
+            snap = ref.get()
+            doc = cls._scan_pair(db, *pair, group_id)
+            keep = doc["matches"] or doc["partner_matches"]
+            try:
+                if not snap.exists:
+                    if keep:
+                        ref.create(doc)
+                    return
+                option = db.write_option(last_update_time=snap.update_time)
+                if keep:
+                    ref.update(doc, option=option)
+                else:
+                    ref.delete(option=option)
+                return
+            except (Conflict, FailedPrecondition):
+                continue
+        logger.warning(f"Gave up rebuilding head-to-head pair {ref.id}")
+
+    @classmethod
+    def rebuild_for_match(cls, db: Client, data: dict[str, Any]) -> None:
+        """Rebuild every pair document of a match, e.g. after it is deleted."""
+        for pair, scope, ref in cls._pair_refs(db, data):
+            cls._rebuild(db, ref, pair, scope)
+
+    @classmethod
+    def rebuild_for_user(cls, db: Client, user_id: str) -> int:
+        """Rebuild every pair document of a user; return documents visited."""
+        query = db.collection(cls.COLLECTION_NAME).where(
+            filter=firestore.FieldFilter("players", "array_contains", user_id),
+        )
+        visited = 0
+        for snap in query.stream():
+            data = snap.to_dict() or {}
+            a, b = data.get("players") or ("", "")
+            cls._rebuild(db, snap.reference, (a, b), data.get("groupId"))
+            visited += 1
+        return visited
+
+    @classmethod
+    def get_record(
+        cls,
+        db: Client,
+        user_id: str,
+        opponent_id: str,
+        group_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Return the rivalry record of ``user_id`` against ``opponent_id``.
+
+        The pair document is built from history on first read, and stored
+        only if the two have played together or against each other.
+        """
+        a, b = pair_key(user_id, opponent_id)
+        ref = cls.pair_ref(db, a, b, group_id)
+        snap = ref.get()
+        doc = snap.to_dict() if snap.exists else None
+        if not isinstance(doc, dict):
+            doc = cls._create_from_history(db, ref, (a, b), group_id, keep_empty=False)
+
+        mine, theirs = ("a", "b") if user_id == a else ("b", "a")
+        points_for = doc.get(f"points_{mine}", 0)
+        points_against = doc.get(f"points_{theirs}", 0)
+        return {
+            "wins": doc.get(f"wins_{mine}", 0),
+            "losses": doc.get(f"wins_{theirs}", 0),
+            "matches": doc.get("matches", 0),
+            "point_diff": points_for - points_against,
+            "points_for": points_for,
+            "points_against": points_against,
+            "partnership_record": {
+                "wins": doc.get("partner_wins", 0),
+                "losses": doc.get("partner_losses", 0),
+            },
+            "last_match_id": doc.get("lastMatchId"),
+            "recent_match_ids": doc.get("recentMatchIds") or [],
+        }
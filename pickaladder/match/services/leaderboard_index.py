@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+
+from pickaladder.core.constants import (
+    FIRESTORE_BATCH_LIMIT,
+    GLOBAL_LEADERBOARD_CACHE_TIMEOUT,
+    GLOBAL_LEADERBOARD_MIN_GAMES,
+)
+from pickaladder.core.tiered_cache import (
+    RANKINGS_TAG,
+    invalidate_tags,
+    tagged,
+    user_tag,
+)
+from pickaladder.extensions import cache
+
+from .record_service import MatchRecordService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from google.cloud.firestore_v1.base_document import DocumentSnapshot
+    from google.cloud.firestore_v1.client import Client
+
+logger = logging.getLogger(__name__)
+
+# Fields read by the leaderboard page; everything else stays on the server.
+LEADERBOARD_FIELDS = [
+    "name",
+    "username",
+    "profilePictureUrl",
+    "profilePictureThumbnailUrl",
+    "wins",
+    "losses",
+    "games_played",
+    "win_percentage",
+    "elo",
+    "is_inactive",
+]
+
+
+class LeaderboardIndexService:
+    """Maintains the materialized ``leaderboard_global`` ranking index.
+
+    One document per eligible user, keyed by user ID, carrying the decayed ELO
+    used for ordering. Entries are refreshed when a user's stats change and by
+    ``RankDecayService``, so the leaderboard page never streams ``users``.
+    """
+
+    COLLECTION_NAME = "leaderboard_global"
+
+    @staticmethod
+    def build_entry(user_data: dict[str, Any]) -> dict[str, Any] | None:
+        """Build an index entry for a user, or None if they are not eligible."""
+        row = MatchRecordService.build_leaderboard_stats(user_data)
+        if row["games_played"] < GLOBAL_LEADERBOARD_MIN_GAMES:
+            return None
+        return {
+            "name": user_data.get("name"),
+            "username": user_data.get("username"),
+            "profilePictureUrl": user_data.get("profilePictureUrl"),
+            "profilePictureThumbnailUrl": user_data.get("profilePictureThumbnailUrl"),
+            "wins": row["wins"],
+            "losses": row["losses"],
+            "games_played": row["games_played"],
+            "win_percentage": row["win_percentage"],
+            "elo": row["base_elo"],
+            "decayed_elo": row["elo"],
+            "is_inactive": row["is_inactive"],
+            "last_match_date": user_data.get("last_match_date"),
+        }
+
+    @classmethod
+    def _write_entries(
+        cls,
+        db: Client,
+        snaps: Iterable[DocumentSnapshot],
+        prune: bool = True,
+    ) -> int:
+        """Write index entries for user snapshots, pruning ineligible users."""
+        rows = ((s.id, (s.to_dict() or {}) if s.exists else None) for s in snaps)
+        return cls.write_user_entries(db, rows, prune)
+
+    @classmethod
+    def write_user_entries(
+        cls,
+        db: Client,
+        rows: Iterable[tuple[str, dict[str, Any] | None]],
+        prune: bool = True,
+    ) -> int:
+        """Write index entries for (user ID, user data) pairs already in hand.
+
+        A ``None`` payload marks a deleted user, whose entry is pruned.
+        """
+        batch = db.batch()
+        pending = 0
+        written = 0
+        for uid, user_data in rows:
+            entry = cls.build_entry(user_data) if user_data is not None else None
+            if entry is None and not prune:
+                continue
+            ref = db.collection(cls.COLLECTION_NAME).document(uid)
+            if entry is None:
+                batch.delete(ref)
+            else:
+                batch.set(ref, entry)
+                written += 1
+            pending += 1
+            if pending >= FIRESTORE_BATCH_LIMIT:
+                batch.commit()
+                batch = db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+        return written
+
+    @classmethod
+    def refresh_users(cls, db: Client, user_ids: Iterable[str]) -> None:
+        """Re-index the given users after their stats have changed."""
+        refs = [db.collection("users").document(uid) for uid in set(user_ids) if uid]
+        if not refs:
+            return
+        try:
+            cls._write_entries(db, db.get_all(refs))
+        except Exception as e:
+            # The index is derived data; a stale row must never fail a match write.
+            logger.warning(f"Failed to refresh leaderboard index: {e}")
+
+    @classmethod
+    def remove_users(cls, db: Client, user_ids: Iterable[str]) -> None:
+        """Drop the rows of deleted users so they stop counting towards ranks."""
+        removed = sorted({uid for uid in user_ids if uid})
+        cls.write_user_entries(db, ((uid, None) for uid in removed))
+        invalidate_tags(RANKINGS_TAG, *(user_tag(uid) for uid in removed))
+
+    @classmethod
+    def rebuild(cls, db: Client) -> int:
+        """Rebuild the whole index from the users collection.
+
+        Rows of users that were deleted, merged away or are no longer eligible
+        are pruned, so they stop counting towards anyone's rank.
+        """
+        eligible: set[str] = set()
+
+        def _rows() -> Iterable[tuple[str, dict[str, Any]]]:
+            for snap in db.collection("users").stream():
+                data = snap.to_dict() or {}
+                if cls.build_entry(data) is not None:
+                    eligible.add(snap.id)
+                yield snap.id, data
+
+        written = cls.write_user_entries(db, _rows(), prune=False)
+        stale = [
+            (snap.id, None)
+            for snap in db.collection(cls.COLLECTION_NAME).stream()
+            if snap.id not in eligible
+        ]
+        if stale:
+            cls.write_user_entries(db, stale)
+        return written
+
+    @classmethod
+    def get_top_players(cls, db: Client, limit: int = 50) -> list[dict[str, Any]]:
+        """Read the top N rows of the index with a field mask."""
+        query = (
+            db.collection(cls.COLLECTION_NAME)
+            .order_by("decayed_elo", direction=firestore.Query.DESCENDING)
+            .order_by("win_percentage", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+            .select([*LEADERBOARD_FIELDS, "decayed_elo"])
+        )
+        players = []
+        for snap in query.stream():
+            data = snap.to_dict() or {}
+            data["id"] = snap.id
+            # Callers expect "elo" to be the ranking value, as in the scan path.
+            data["elo"] = data.pop("decayed_elo", data.get("elo"))
+            players.append(data)
+        return players
+
+    @staticmethod
+    def get_cached_top_players() -> list[dict[str, Any]]:
+        """Return the global leaderboard rows, cached until a match write.
+
+        Falls back to scanning users while the index has not been backfilled.
+        """
+        return _cached_top_players()
+
+    @staticmethod
+    def get_cached_user_rank(user_id: str) -> dict[str, Any] | None:
+        """Return a user's global rank, cached until rankings or the user change."""
+        return _cached_user_rank(user_id)
+
+    @classmethod
+    def get_user_rank(cls, db: Client, user_id: str) -> dict[str, Any] | None:
+        """Return the 1-based global rank and entry of a user.
+
+        Players ahead are counted in the leaderboard's own order: a higher
+        decayed ELO, or the same one with a higher win percentage. Players
+        tied on both share a rank. Uses count aggregations over the
+        leaderboard index, so the cost does not grow with a scan of every user.
+        """
+        snap = db.collection(cls.COLLECTION_NAME).document(user_id).get()
+        if not snap.exists:
+            return None
+        entry = snap.to_dict() or {}
+        decayed = entry.get("decayed_elo", 0.0)
+        win_percentage = entry.get("win_percentage", 0.0)
+        index = db.collection(cls.COLLECTION_NAME)
+        higher = (
+            index.where(filter=firestore.FieldFilter("decayed_elo", ">", decayed))
+            .count()
+            .get()
+        )
+        tied_better = (
+            index.where(filter=firestore.FieldFilter("decayed_elo", "==", decayed))
+            .where(
+                filter=firestore.FieldFilter("win_percentage", ">", win_percentage),
+            )
+            .count()
+            .get()
+        )
+        ahead = int(higher[0][0].value) + int(tied_better[0][0].value)
+        return {
+            "rank": ahead + 1,
+            "elo": decayed,
+            "games_played": entry.get("games_played", 0),
+            "win_percentage": win_percentage,
+        }
+
+
+@tagged(lambda: [RANKINGS_TAG])
+@cache.memoize(timeout=GLOBAL_LEADERBOARD_CACHE_TIMEOUT)
+def _cached_top_players() -> list[dict[str, Any]]:
+    """Compute the global leaderboard rows for the cache."""
+    db = firestore.client()
+    players = LeaderboardIndexService.get_top_players(db)
+    if not players:
+        players = MatchRecordService.get_leaderboard_data(db, min_games=1)
+    return players
+
+
+@tagged(lambda user_id: [RANKINGS_TAG, user_tag(user_id)])
+@cache.memoize(timeout=GLOBAL_LEADERBOARD_CACHE_TIMEOUT)
+def _cached_user_rank(user_id: str) -> dict[str, Any] | None:
+    """Compute a user's global rank for the cache."""
+    return LeaderboardIndexService.get_user_rank(firestore.client(), user_id)
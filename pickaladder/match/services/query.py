@@ -115,15 +115,14 @@ class MatchQueryService(
         player_refs: set[DocumentReference],
     ) -> dict[str, str]:
         """Fetch names for a set of player references."""
-        players: dict[str, str] = {}
-        if player_refs:
-            player_docs = db.get_all(list(player_refs))
-            for doc in player_docs:
-                d_snap = cast("DocumentSnapshot", doc)
-                if d_snap.exists:
-                    d_data = d_snap.to_dict() or {}
-                    players[d_snap.id] = d_data.get("name", "N/A")
-        return players
+        from pickaladder.core.entity_cache import get_loader
+
+        if not player_refs:
+            return {}
+        return {
+            doc["id"]: doc.get("name", "N/A")
+            for doc in get_loader().load_refs(db, player_refs)
+        }
 
     @staticmethod
     def get_matches_for_user(
@@ -152,14 +151,10 @@ class MatchQueryService(
     @staticmethod
     def get_player_names(db: Client, uids: Iterable[str]) -> dict[str, str]:
         """Fetch a mapping of UIDs to names."""
-        names: dict[str, str] = {}
-        if uids:
-            u_refs = [db.collection("users").document(uid) for uid in uids]
-            for doc in db.get_all(u_refs):
-                d_snap = cast("DocumentSnapshot", doc)
-                if d_snap.exists:
-                    names[d_snap.id] = (d_snap.to_dict() or {}).get("name", d_snap.id)
-        return names
+        from pickaladder.core.entity_cache import get_loader
+
+        users = get_loader().load_many(db, "users", uids)
+        return {uid: user.get("name", uid) for uid, user in users.items()}
 
     @staticmethod
     def get_tournament_name(db: Client, tournament_id: str) -> str | None:
@@ -0,0 +1,227 @@
+"""Scheduled rank decay pass over the users collection."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+from google.api_core.exceptions import FailedPrecondition
+
+from pickaladder.core.constants import FIRESTORE_BATCH_LIMIT
+
+from .leaderboard_index import LEADERBOARD_FIELDS, LeaderboardIndexService
+from .record_service import MatchRecordService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
+
+    from google.cloud.firestore_v1.base_document import DocumentSnapshot
+    from google.cloud.firestore_v1.client import Client
+
+logger = logging.getLogger(__name__)
+
+# Fields the decay pass reads: the rating inputs plus what the index shows.
+DECAY_FIELDS = [
+    *LEADERBOARD_FIELDS,
+    "stats",
+    "last_match_date",
+    "duprRating",
+    "dupr_rating",
+]
+
+
+class RankDecayService:
+    """Precomputes inactivity decay onto user documents.
+
+    Ranking reads take ``stats.decayed_elo`` and ``is_inactive`` as stored, so
+    ordering stays on an indexed field. Decay moves in whole days, and this
+    pass rewrites only the users whose day bucket has changed since the last
+    run, processing the collection in pages on a small thread pool.
+    """
+
+    JOB_COLLECTION = "jobs"
+    JOB_ID = "rank_decay"
+
+    @staticmethod
+    def pending_update(user_data: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the decay fields to write for a user, or None if current."""
+        decayed, is_inactive = MatchRecordService.compute_decay(user_data)
+        stats = user_data.get("stats") or {}
+        if (
+            stats.get("decayed_elo") == decayed
+            and user_data.get("is_inactive") == is_inactive
+        ):
+            return None
+        return {"stats.decayed_elo": decayed, "is_inactive": is_inactive}
+
+    @classmethod
+    def _process_page(cls, db: Client, page: list[DocumentSnapshot]) -> int:
+        """Write changed decay for one page of users and mirror it to the index.
+
+        Each update requires the user to be unchanged since the page was read.
+        If one was written meanwhile, such as by a match recording, the page
+        is retried user by user and that user is left to the next pass.
+        """
+        batch = db.batch()
+        changed: list[tuple[DocumentSnapshot, dict[str, Any], dict[str, Any]]] = []
+        for snap in page:
+            data = snap.to_dict() or {}
+            upd = cls.pending_update(data)
+            if upd is None:
+                continue
+            option = db.write_option(last_update_time=snap.update_time)
+            batch.update(snap.reference, upd, option=option)
+            data["stats"] = {
+                **(data.get("stats") or {}),
+                "decayed_elo": upd["stats.decayed_elo"],
+            }
+            data["is_inactive"] = upd["is_inactive"]
+            changed.append((snap, upd, data))
+        if not changed:
+            return 0
+        try:
+            batch.commit()
+            written = [(snap.id, data) for snap, _, data in changed]
+        except FailedPrecondition:
+            written = cls._write_unchanged(db, changed)
+        if written:
+            LeaderboardIndexService.write_user_entries(db, written)
+        return len(written)
+
+    @staticmethod
+    def _write_unchanged(
+        db: Client,
+        changed: list[tuple[DocumentSnapshot, dict[str, Any], dict[str, Any]]],
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Write decay one user at a time, skipping users changed since read."""
+        written = []
+        for snap, upd, data in changed:
+            option = db.write_option(last_update_time=snap.update_time)
+            try:
+                snap.reference.update(upd, option=option)
+            except FailedPrecondition:
+                logger.info(f"User {snap.id} changed during rank decay; skipped")
+                continue
+            written.append((snap.id, data))
+        return written
+
+    @classmethod
+    def run(
+        cls,
+        db: Client,
+        workers: int = 4,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> dict[str, int]:
+        """Apply decay to every user; return scanned and updated counts.
+
+        Pages of ``FIRESTORE_BATCH_LIMIT`` users are read in document order and
+        handed to ``workers`` threads, each committing its own batch. At most
+        two pages per worker are held at once: reading the next page waits for
+        the oldest one to be written.
+        ``progress`` is called with (scanned, updated) as pages finish.
+        """
+        query = (
+            db.collection("users")
+            .select(DECAY_FIELDS)
+            .limit(
+                FIRESTORE_BATCH_LIMIT,
+            )
+        )
+        totals = {"scanned": 0, "updated": 0}
+        lock = threading.Lock()
+
+        def _page_done(size: int, updated: int) -> None:
+            with lock:
+                totals["scanned"] += size
+                totals["updated"] += updated
+                if progress is not None:
+                    progress(totals["scanned"], totals["updated"])
+
+        def _work(page: list[DocumentSnapshot]) -> None:
+            _page_done(len(page), cls._process_page(db, page))
+
+        workers = max(1, workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Pages read but not yet written, oldest first
+            in_flight: deque[Future[None]] = deque()
+            last = None
+            while True:
+                # Wait for the oldest page so at most two per worker are held
+                if len(in_flight) >= workers * 2:
+                    in_flight.popleft().result()
+                page = list((query.start_after(last) if last else query).stream())
+                if not page:
+                    break
+                in_flight.append(pool.submit(_work, page))
+                if len(page) < FIRESTORE_BATCH_LIMIT:
+                    break
+                last = page[-1]
+            while in_flight:
+                in_flight.popleft().result()
+        return totals
+
+    @classmethod
+    def run_tracked(cls, db: Client, workers: int = 4) -> dict[str, int]:
+        """Run the pass while recording its progress on the job document."""
+        job_ref = db.collection(cls.JOB_COLLECTION).document(cls.JOB_ID)
+        job_ref.set(
+            {
+                "status": "running",
+                "scanned": 0,
+                "updated": 0,
+                "startedAt": firestore.SERVER_TIMESTAMP,
+                "updatedAt": firestore.SERVER_TIMESTAMP,
+            },
+        )
+
+        def _report(scanned: int, updated: int) -> None:
+            job_ref.update(
+                {
+                    "scanned": scanned,
+                    "updated": updated,
+                    "updatedAt": firestore.SERVER_TIMESTAMP,
+                },
+            )
+
+        try:
+            totals = cls.run(db, workers, _report)
+        except Exception as e:
+            logger.error(f"Rank decay job failed: {e}")
+            job_ref.update(
+                {
+                    "status": "failed",
+                    "error": str(e),
+                    "updatedAt": firestore.SERVER_TIMESTAMP,
+                },
+            )
+            raise
+        job_ref.update(
+            {
+                **totals,
+                "status": "done",
+                "updatedAt": firestore.SERVER_TIMESTAMP,
+            },
+        )
+        return totals
+
+    @classmethod
+    def schedule(cls, db: Client) -> None:
+        """Start a tracked run on the background executor, or inline without one."""
+        from pickaladder.extensions import executor
+
+        try:
+            executor.run_async(cls.run_tracked, db)
+        except RuntimeError:
+            logger.info("Task executor unavailable; applying rank decay inline")
+            cls.run_tracked(db)
+
+    @classmethod
+    def get_status(cls, db: Client) -> dict[str, Any] | None:
+        """Return the progress document of the latest run, if any."""
+        snap = db.collection(cls.JOB_COLLECTION).document(cls.JOB_ID).get()
+        return snap.to_dict() if snap.exists else None
@@ -1,20 +1,43 @@
 from __future__ import annotations
 
+import heapq
 import logging
+import operator
+import random
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any, cast
 
 from firebase_admin import firestore
+from google.api_core.exceptions import Conflict, FailedPrecondition
 
 from pickaladder.core.constants import GLOBAL_LEADERBOARD_MIN_GAMES
+from pickaladder.core.match_record import MatchRecord
+from pickaladder.core.tiered_cache import RISING_STARS_TAG, invalidate_tags, tagged
+from pickaladder.extensions import cache
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from google.cloud.firestore_v1.batch import WriteBatch
     from google.cloud.firestore_v1.client import Client
 
     from pickaladder.user.models import User
 
 logger = logging.getLogger(__name__)
 
+# Daily per-user win counters, split over WIN_BUCKET_SHARDS documents per UTC
+# day keyed "YYYY-MM-DD_<shard>"; a day's wins are the sum of its shards.
+WIN_BUCKETS_COLLECTION = "win_buckets"
+WIN_BUCKET_SHARDS = 10
+# The top win counts of an older day, keyed "YYYY-MM-DD", compacted from its
+# shards on first read; a backdated match marks it stale to be compacted again.
+WIN_BUCKET_TOPS_COLLECTION = "win_bucket_tops"
+WIN_BUCKET_TOP_K = 50
+# Days, today included, whose shards are summed instead of compacted; matches
+# staged just before midnight may commit after it
+LIVE_BUCKET_DAYS = 2
+RISING_STARS_DAYS = 7
+
 
 class MatchRecordService:
     @staticmethod
@@ -78,16 +101,7 @@ class MatchRecordService:
     @staticmethod
     def _is_user_on_team1(data: dict[str, Any], uid: str) -> bool:
         """Determine if a user is on the Team 1 side of a match."""
-        if data.get("matchType") == "doubles":
-            team1_refs = data.get("team1", [])
-            return any(
-                (r.id if r is not None and hasattr(r, "id") else "") == uid
-                for r in team1_refs
-            )
-        p1_ref = data.get("player1Ref")
-        return (
-            p1_ref.id if p1_ref is not None and hasattr(p1_ref, "id") else ""
-        ) == uid
+        return MatchRecord(data).side_of(uid) == 1
 
     @staticmethod
     def _get_rolling_window_start(days: int = 7) -> datetime:
@@ -115,17 +129,209 @@ class MatchRecordService:
         return win_counts
 
     @staticmethod
-    def get_rising_stars(db: Client, limit: int = 3) -> list[dict[str, Any]]:
-        """Identify players with the most wins in the last 7 days."""
-        start_date = MatchRecordService._get_rolling_window_start(7)
-        win_counts = MatchRecordService._calculate_performance_metrics(db, start_date)
+    def _win_bucket_day(moment: datetime) -> str:
+        """Return the UTC day key of the win bucket a moment falls into."""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc).strftime("%Y-%m-%d")
 
-        if not win_counts:
-            return []
+    @staticmethod
+    def _win_bucket_refs(db: Client, day: str) -> list[Any]:
+        """Return the references of every shard of a day's win bucket."""
+        return [
+            db.collection(WIN_BUCKETS_COLLECTION).document(f"{day}_{shard}")
+            for shard in range(WIN_BUCKET_SHARDS)
+        ]
+
+    @staticmethod
+    def stage_win_buckets(
+        db: Client,
+        batch: WriteBatch,
+        match_data: dict[str, Any],
+        delta: int = 1,
+    ) -> None:
+        """Queue the daily win-counter change for a match's winners.
 
-        sorted_uids = sorted(win_counts.items(), key=lambda x: x[1], reverse=True)[
-            :limit
+        Each change lands on a random shard of the day, so matches recorded
+        together do not contend on one document; a removal may land on a
+        different shard than the win it cancels, which the sum absorbs.
+        """
+        winners = [uid for uid in match_data.get("winners") or [] if uid]
+        match_date = match_data.get("matchDate")
+        if not winners or not isinstance(match_date, datetime):
+            return
+        day = MatchRecordService._win_bucket_day(match_date)
+        shard = random.randrange(WIN_BUCKET_SHARDS)  # nosec B311
+        batch.set(
+            db.collection(WIN_BUCKETS_COLLECTION).document(f"{day}_{shard}"),
+            {
+                "day": day,
+                "wins": {uid: firestore.Increment(delta) for uid in winners},
+            },
+            merge=True,
+        )
+        if day < MatchRecordService._win_bucket_day(datetime.now(timezone.utc)):
+            MatchRecordService._stage_stale_top(db, batch, day)
+
+    @staticmethod
+    def _stage_stale_top(db: Client, batch: WriteBatch, day: str) -> None:
+        """Queue marking a day's compacted top stale, so its next read redoes it."""
+        batch.set(
+            db.collection(WIN_BUCKET_TOPS_COLLECTION).document(day),
+            {"day": day, "stale": True},
+        )
+
+    @staticmethod
+    def _window_days(today: str, days: int) -> list[str]:
+        """Return the keys of ``today`` and the bucket days before it, newest first."""
+        start = datetime.strptime(today, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return [
+            MatchRecordService._win_bucket_day(start - timedelta(days=offset))
+            for offset in range(days)
         ]
+
+    @staticmethod
+    def _sum_shards(snaps: Iterable[Any]) -> dict[str, int] | None:
+        """Sum the win counts of bucket shards, or None if none exist."""
+        totals: dict[str, int] = {}
+        found = False
+        for snap in snaps:
+            if snap is None or not snap.exists:
+                continue
+            found = True
+            for uid, count in ((snap.to_dict() or {}).get("wins") or {}).items():
+                totals[uid] = totals.get(uid, 0) + int(count)
+        return totals if found else None
+
+    @staticmethod
+    def _compact_day(db: Client, day: str, top_snap: Any) -> dict[str, int] | None:
+        """Sum an older day's shards and store its top counts.
+
+        The top is stored only if its document is unchanged since ``top_snap``
+        was read, so a backdated match marking it stale in between wins.
+        """
+        totals = MatchRecordService._sum_shards(
+            db.get_all(MatchRecordService._win_bucket_refs(db, day)),
+        )
+        if totals is None:
+            return None
+        top = dict(
+            heapq.nlargest(WIN_BUCKET_TOP_K, totals.items(), key=operator.itemgetter(1))
+        )
+        ref = db.collection(WIN_BUCKET_TOPS_COLLECTION).document(day)
+        doc = {"day": day, "top": top, "stale": False}
+        try:
+            if top_snap is not None and top_snap.exists:
+                option = db.write_option(last_update_time=top_snap.update_time)
+                ref.update(doc, option=option)
+            else:
+                ref.create(doc)
+        except (Conflict, FailedPrecondition):
+            # Compacted again on the next read
+            pass
+        return top
+
+    @staticmethod
+    def _sum_win_buckets(db: Client, days: int, today: str) -> dict[str, int] | None:
+        """Sum the wins of the window ending with ``today``, or None if none exist.
+
+        The live days' shards are summed; each older day contributes its
+        compacted top counts, so a read costs a few dozen documents.
+        """
+        window = MatchRecordService._window_days(today, days)
+        live, older = window[:LIVE_BUCKET_DAYS], window[LIVE_BUCKET_DAYS:]
+        shard_refs = [
+            ref for day in live for ref in MatchRecordService._win_bucket_refs(db, day)
+        ]
+        top_refs = [
+            db.collection(WIN_BUCKET_TOPS_COLLECTION).document(day) for day in older
+        ]
+        snaps = {snap.id: snap for snap in db.get_all([*shard_refs, *top_refs])}
+
+        totals = MatchRecordService._sum_shards(snaps.get(r.id) for r in shard_refs)
+        found = totals is not None
+        totals = totals or {}
+        for day, ref in zip(older, top_refs):
+            snap = snaps.get(ref.id)
+            data = (snap.to_dict() or {}) if snap is not None and snap.exists else {}
+            top = data.get("top") if not data.get("stale") else None
+            if not isinstance(top, dict):
+                top = MatchRecordService._compact_day(db, day, snap)
+            if top is None:
+                continue
+            found = True
+            for uid, count in top.items():
+                totals[uid] = totals.get(uid, 0) + int(count)
+        return totals if found else None
+
+    @staticmethod
+    def rebuild_win_buckets(db: Client, days: int = RISING_STARS_DAYS) -> int:
+        """Recount the daily win buckets of the window from match history."""
+        start = MatchRecordService._get_rolling_window_start(days + 1)
+        query = db.collection("matches").where(
+            filter=firestore.FieldFilter("matchDate", ">=", start),
+        )
+        buckets: dict[str, dict[str, int]] = {}
+        for snap in query.stream():
+            data = snap.to_dict() or {}
+            match_date = data.get("matchDate")
+            if not isinstance(match_date, datetime):
+                continue
+            wins = buckets.setdefault(
+                MatchRecordService._win_bucket_day(match_date), {}
+            )
+            for uid in data.get("winners") or []:
+                if isinstance(uid, str):
+                    wins[uid] = wins.get(uid, 0) + 1
+
+        batch = db.batch()
+        for day, wins in buckets.items():
+            # The recount goes to the first shard and empties the others
+            first, *rest = MatchRecordService._win_bucket_refs(db, day)
+            batch.set(first, {"day": day, "wins": wins})
+            for ref in rest:
+                batch.set(ref, {"day": day, "wins": {}})
+            MatchRecordService._stage_stale_top(db, batch, day)
+        batch.commit()
+        return len(buckets)
+
+    @staticmethod
+    def get_rising_stars(
+        db: Client,
+        limit: int = 3,
+        today: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Identify players with the most wins over the last 7 days, today included.
+
+        Sums the daily win buckets of ``today`` (a bucket day key, the current
+        one by default) and the days before it; before any bucket exists the
+        matches since the window's first midnight are scanned instead.
+        """
+        if today is None:
+            today = MatchRecordService._win_bucket_day(datetime.now(timezone.utc))
+        win_counts = MatchRecordService._sum_win_buckets(
+            db,
+            RISING_STARS_DAYS,
+            today,
+        )
+        if win_counts is None:
+            first_day = MatchRecordService._window_days(today, RISING_STARS_DAYS)[-1]
+            start_date = datetime.strptime(first_day, "%Y-%m-%d").replace(
+                tzinfo=timezone.utc,
+            )
+            win_counts = MatchRecordService._calculate_performance_metrics(
+                db,
+                start_date,
+            )
+
+        sorted_uids = heapq.nlargest(
+            limit,
+            ((uid, n) for uid, n in win_counts.items() if n > 0),
+            key=operator.itemgetter(1),
+        )
+        if not sorted_uids:
+            return []
+
         top_uids = [u for u, _ in sorted_uids]
         top_counts = dict(sorted_uids)
 
@@ -148,6 +354,24 @@ class MatchRecordService:
         results.sort(key=lambda x: x["weekly_wins"], reverse=True)
         return results
 
+    @staticmethod
+    def get_cached_rising_stars(limit: int = 3) -> list[dict[str, Any]]:
+        """Return Rising Stars, cached until a window match or the day changes."""
+        today = MatchRecordService._win_bucket_day(datetime.now(timezone.utc))
+        return _cached_rising_stars(today, limit)
+
+    @staticmethod
+    def forget_rising_stars(*matches: dict[str, Any]) -> None:
+        """Drop cached Rising Stars when a match changes a day of the window."""
+        today = MatchRecordService._win_bucket_day(datetime.now(timezone.utc))
+        window = set(MatchRecordService._window_days(today, RISING_STARS_DAYS))
+        if any(
+            isinstance(d := m.get("matchDate"), datetime)
+            and MatchRecordService._win_bucket_day(d) in window
+            for m in matches
+        ):
+            invalidate_tags(RISING_STARS_TAG)
+
     @staticmethod
     def get_leaderboard_data(
         db: Client,
@@ -162,34 +386,16 @@ class MatchRecordService:
             user_data = cast("dict[str, Any]", u_snap.to_dict() or {})
             user_data["id"] = u_snap.id
 
-            stats = user_data.get("stats", {})
-            wins = stats.get("wins", 0)
-            losses = stats.get("losses", 0)
-            # Use elo, fallback to DUPR, then default to 1200.0
-            elo = stats.get("elo")
-            if elo is None:
-                elo = (
-                    user_data.get("duprRating")
-                    or user_data.get("dupr_rating")
-                    or 1200.0
-                )
-
-            # Apply rank decay penalty
-            penalty = MatchRecordService.calculate_rank_decay(user_data)
-            elo = max(100.0, float(elo) - penalty)
-            user_data["is_inactive"] = penalty > 0
-
-            games = wins + losses
-            if games >= min_games:
+            row = MatchRecordService.build_leaderboard_stats(user_data)
+            user_data["is_inactive"] = row["is_inactive"]
+            if row["games_played"] >= min_games:
                 user_data.update(
                     {
-                        "wins": wins,
-                        "losses": losses,
-                        "games_played": games,
-                        "elo": float(elo),
-                        "win_percentage": float((wins / games) * 100)
-                        if games > 0
-                        else 0.0,
+                        "wins": row["wins"],
+                        "losses": row["losses"],
+                        "games_played": row["games_played"],
+                        "elo": row["elo"],
+                        "win_percentage": row["win_percentage"],
                     },
                 )
                 players.append(cast("User", user_data))
@@ -200,3 +406,50 @@ class MatchRecordService:
             reverse=True,
         )
         return players[:limit]
+
+    @staticmethod
+    def base_elo(user_data: dict[str, Any]) -> float:
+        """Return a user's undecayed rating: ELO, then DUPR, then 1200."""
+        elo = (user_data.get("stats") or {}).get("elo")
+        if elo is None:
+            elo = user_data.get("duprRating") or user_data.get("dupr_rating") or 1200.0
+        return float(elo)
+
+    @staticmethod
+    def compute_decay(user_data: dict[str, Any]) -> tuple[float, bool]:
+        """Return the (decayed_elo, is_inactive) pair for a user right now."""
+        penalty = MatchRecordService.calculate_rank_decay(user_data)
+        decayed = max(100.0, MatchRecordService.base_elo(user_data) - penalty)
+        return decayed, penalty > 0
+
+    @staticmethod
+    def build_leaderboard_stats(user_data: dict[str, Any]) -> dict[str, Any]:
+        """Derive the decayed ELO and record used to rank a user globally."""
+        stats = user_data.get("stats", {})
+        wins = stats.get("wins", 0)
+        losses = stats.get("losses", 0)
+        elo = MatchRecordService.base_elo(user_data)
+
+        # Prefer the decay written by the scheduled job; compute it otherwise.
+        decayed = stats.get("decayed_elo")
+        if decayed is not None:
+            is_inactive = bool(user_data.get("is_inactive"))
+        else:
+            decayed, is_inactive = MatchRecordService.compute_decay(user_data)
+        games = wins + losses
+        return {
+            "wins": wins,
+            "losses": losses,
+            "games_played": games,
+            "base_elo": elo,
+            "elo": float(decayed),
+            "is_inactive": is_inactive,
+            "win_percentage": float((wins / games) * 100) if games > 0 else 0.0,
+        }
+
+
+@tagged(lambda bucket_day, limit: [RISING_STARS_TAG])
+@cache.memoize(timeout=24 * 60 * 60)
+def _cached_rising_stars(bucket_day: str, limit: int) -> list[dict[str, Any]]:
+    """Compute Rising Stars from the window ending with ``bucket_day``."""
+    return MatchRecordService.get_rising_stars(firestore.client(), limit, bucket_day)
@@ -0,0 +1,191 @@
+"""Persistent streak counters for users and teams."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+
+from pickaladder.core.constants import STREAK_RECOMPUTE_LIMIT
+from pickaladder.user.services.stats_utils import _get_user_match_won_lost
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from google.cloud.firestore_v1.base_document import DocumentSnapshot
+    from google.cloud.firestore_v1.batch import WriteBatch
+    from google.cloud.firestore_v1.client import Client
+
+logger = logging.getLogger(__name__)
+
+# Match fields that point at a team, for team streak lookups.
+TEAM_MATCH_FIELDS = ("team1Id", "team2Id", "namedTeam1Id", "namedTeam2Id")
+
+
+def advance_streak(state: dict[str, Any] | None, won: bool) -> dict[str, Any]:
+    """Return the streak state after one more result.
+
+    ``type`` is "W" or "L", ``length`` the size of the current run and
+    ``best`` the longest winning run on record.
+    """
+    state = state or {}
+    result = "W" if won else "L"
+    length = state.get("length", 0) + 1 if state.get("type") == result else 1
+    best = max(state.get("best", 0), length if won else 0)
+    return {"type": result, "length": length, "best": best}
+
+
+def streak_from_results(results: list[bool], best: int = 0) -> dict[str, Any]:
+    """Build a streak state from newest-first results and a known best."""
+    state: dict[str, Any] = {"type": None, "length": 0, "best": best}
+    for won in reversed(results):
+        state = advance_streak(state, won)
+    return state
+
+
+def read_streak(data: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Return the stored streak state of a user or team document, if any."""
+    streak = ((data or {}).get("stats") or {}).get("streak")
+    return streak if isinstance(streak, dict) else None
+
+
+class StreakService:
+    """Keeps ``stats.streak`` current on user and team documents.
+
+    Recording a match advances the stored state inside the record batch.
+    Edits and deletions re-derive it from the latest
+    ``STREAK_RECOMPUTE_LIMIT`` matches of each affected player or team.
+    """
+
+    @staticmethod
+    def stage_match(
+        db: Client,
+        batch: WriteBatch,
+        match_data: dict[str, Any],
+        snaps: dict[str, DocumentSnapshot],
+    ) -> None:
+        """Queue streak updates for everyone in a newly recorded match."""
+        winners = set(match_data.get("winners") or [])
+        for uid in match_data.get("participants") or []:
+            snap = snaps.get(uid)
+            state = read_streak(snap.to_dict() if snap else None)
+            batch.update(
+                db.collection("users").document(uid),
+                {"stats.streak": advance_streak(state, uid in winners)},
+            )
+
+        team1_won = match_data.get("winner") == "team1"
+        seen = set()
+        for field in TEAM_MATCH_FIELDS:
+            team_id = match_data.get(field)
+            snap = snaps.get(team_id) if team_id else None
+            if snap is None or team_id in seen:
+                continue
+            seen.add(team_id)
+            state = read_streak(snap.to_dict())
+            won = team1_won if field.endswith("1Id") else not team1_won
+            batch.update(
+                db.collection("teams").document(team_id),
+                {"stats.streak": advance_streak(state, won)},
+            )
+
+    @staticmethod
+    def _recent_matches(
+        db: Client,
+        filters: Iterable[tuple[str, str, str]],
+    ) -> list[dict[str, Any]]:
+        """Return the latest matches matching any filter, newest first."""
+        found: dict[str, dict[str, Any]] = {}
+        for field, op, value in filters:
+            query = (
+                db.collection("matches")
+                .where(filter=firestore.FieldFilter(field, op, value))
+                .order_by("matchDate", direction=firestore.Query.DESCENDING)
+                .limit(STREAK_RECOMPUTE_LIMIT)
+            )
+            for snap in query.stream():
+                found[snap.id] = snap.to_dict() or {}
+        matches = sorted(
+            found.values(),
+            key=lambda m: m.get("matchDate") or datetime.min,
+            reverse=True,
+        )
+        return matches[:STREAK_RECOMPUTE_LIMIT]
+
+    @classmethod
+    def _user_results(cls, db: Client, uid: str) -> list[bool]:
+        """Return a user's latest decided results, newest first."""
+        results = []
+        for data in cls._recent_matches(db, [("participants", "array_contains", uid)]):
+            won, lost = _get_user_match_won_lost(data, uid)
+            if won or lost:
+                results.append(won)
+        return results
+
+    @classmethod
+    def _team_results(cls, db: Client, team_id: str) -> list[bool]:
+        """Return a team's latest results, newest first."""
+        matches = cls._recent_matches(
+            db,
+            [(field, "==", team_id) for field in TEAM_MATCH_FIELDS],
+        )
+        results = []
+        for data in matches:
+            side1 = team_id in (data.get("team1Id"), data.get("namedTeam1Id"))
+            results.append((data.get("winner") == "team1") == side1)
+        return results
+
+    @classmethod
+    def recompute(
+        cls,
+        db: Client,
+        user_ids: Iterable[str] = (),
+        team_ids: Iterable[str] = (),
+    ) -> int:
+        """Re-derive stored streaks after an edit; return documents updated.
+
+        The best streak can only grow here: a run older than the recompute
+        window is not visible, so the stored best is kept as a floor.
+        """
+        from pickaladder.user.services.stats_summary import get_summary_ref
+
+        targets = [("users", uid, cls._user_results) for uid in set(user_ids) if uid]
+        targets += [
+            ("teams", team_id, cls._team_results)
+            for team_id in set(team_ids)
+            if team_id
+        ]
+        batch = db.batch()
+        updated = 0
+        for collection, doc_id, load in targets:
+            ref = db.collection(collection).document(doc_id)
+            snap = ref.get()
+            if not snap.exists:
+                continue
+            current = read_streak(snap.to_dict()) or {}
+            state = streak_from_results(load(db, doc_id), current.get("best", 0))
+            if state != current:
+                batch.update(ref, {"stats.streak": state})
+                updated += 1
+                summary_ref = get_summary_ref(db, doc_id)
+                if collection == "users" and summary_ref.get().exists:
+                    batch.update(summary_ref, {"streak": state})
+        if updated:
+            batch.commit()
+        return updated
+
+    @classmethod
+    def recompute_for_match(cls, db: Client, data: dict[str, Any]) -> None:
+        """Recompute the streaks of every player and team in a match."""
+        team_ids = [data.get(field) for field in TEAM_MATCH_FIELDS]
+        try:
+            cls.recompute(
+                db,
+                data.get("participants") or [],
+                [team_id for team_id in team_ids if team_id],
+            )
+        except Exception as e:
+            # Streaks are derived data; a failed refresh must not fail the edit.
+            logger.warning(f"Failed to recompute streaks: {e}")
@@ -0,0 +1,153 @@
+"""Background fan-out of group announcement broadcasts."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+
+from pickaladder.core.constants import BROADCAST_CHUNK_SIZE
+from pickaladder.core.entity_cache import get_entities
+from pickaladder.services.notification_service import NotificationService
+
+from .repository import MessagingRepository
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1.client import Client
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastService:
+    """Posts announcements and delivers them to members in chunked batches.
+
+    The message is written while the request waits; the unread counters and
+    push notifications of the recipients follow on the task executor, one
+    chunk of ``BROADCAST_CHUNK_SIZE`` members at a time. Each chunk's unread
+    counters are committed together with the job's ``delivered`` offset, so
+    the sender can follow the delivery and a rerun resumes after the last
+    counted chunk instead of counting it twice.
+    """
+
+    JOB_COLLECTION = "broadcast_jobs"
+
+    @classmethod
+    def post(
+        cls,
+        db: Client,
+        conversation_id: str,
+        sender_id: str,
+        content: str,
+        title: str = "New announcement",
+    ) -> str:
+        """Persist an announcement, schedule its delivery and return the job ID."""
+        conv = MessagingRepository.get_by_id(db, conversation_id) or {}
+        recipients = [p for p in conv.get("participants", []) if p != sender_id]
+
+        msg_data = {"senderId": sender_id, "content": content, "read": False}
+        message_id = MessagingRepository.add_message(
+            db,
+            conversation_id,
+            msg_data,
+            count_unread=False,
+        )
+
+        db.collection(cls.JOB_COLLECTION).document(message_id).set(
+            {
+                "status": "queued",
+                "conversationId": conversation_id,
+                "senderId": sender_id,
+                "title": title,
+                "body": content[:100],
+                "recipients": recipients,
+                "total": len(recipients),
+                "delivered": 0,
+                "notified": 0,
+                "createdAt": firestore.SERVER_TIMESTAMP,
+                "updatedAt": firestore.SERVER_TIMESTAMP,
+            },
+        )
+        cls.schedule(db, message_id)
+        return message_id
+
+    @classmethod
+    def schedule(cls, db: Client, job_id: str) -> None:
+        """Deliver on the background executor, or inline without one."""
+        from pickaladder.extensions import executor
+
+        try:
+            executor.run_async(cls.deliver, db, job_id)
+        except RuntimeError:
+            logger.info("Task executor unavailable; delivering broadcast inline")
+            cls.deliver(db, job_id)
+
+    @classmethod
+    def deliver(cls, db: Client, job_id: str) -> dict[str, Any]:
+        """Fan a broadcast out to its recipients, recording progress per chunk.
+
+        Delivery starts at the job's stored ``delivered`` offset, so a failed
+        or interrupted broadcast can be delivered again.
+        """
+        job_ref = db.collection(cls.JOB_COLLECTION).document(job_id)
+        job = job_ref.get().to_dict() or {}
+        recipients: list[str] = job.get("recipients", [])
+        conversation_id = job["conversationId"]
+        progress = {
+            "delivered": int(job.get("delivered") or 0),
+            "notified": int(job.get("notified") or 0),
+        }
+        if job.get("status") == "done":
+            return progress
+        job_ref.update({"status": "running", "updatedAt": firestore.SERVER_TIMESTAMP})
+
+        try:
+            start = progress["delivered"]
+            for offset in range(start, len(recipients), BROADCAST_CHUNK_SIZE):
+                chunk = recipients[offset : offset + BROADCAST_CHUNK_SIZE]
+                batch = db.batch()
+                MessagingRepository.stage_unread(db, batch, conversation_id, chunk)
+                batch.update(
+                    job_ref,
+                    {
+                        "delivered": offset + len(chunk),
+                        "updatedAt": firestore.SERVER_TIMESTAMP,
+                    },
+                )
+                batch.commit()
+                MessagingRepository.forget(conversation_id)
+                progress["delivered"] = offset + len(chunk)
+
+                users = get_entities(db, "users", chunk)
+                tokens = [t for u in users.values() if (t := u.get("fcmToken"))]
+                progress["notified"] += NotificationService.send_multicast_now(
+                    tokens,
+                    job.get("title", ""),
+                    job.get("body", ""),
+                    {"conversationId": conversation_id},
+                )
+                job_ref.update(
+                    {
+                        "notified": progress["notified"],
+                        "updatedAt": firestore.SERVER_TIMESTAMP,
+                    },
+                )
+        except Exception as e:
+            logger.error(f"Broadcast {job_id} failed: {e}")
+            job_ref.update(
+                {
+                    "status": "failed",
+                    "error": str(e),
+                    "updatedAt": firestore.SERVER_TIMESTAMP,
+                },
+            )
+            raise
+
+        job_ref.update({"status": "done", "updatedAt": firestore.SERVER_TIMESTAMP})
+        return progress
+
+    @classmethod
+    def get_status(cls, db: Client, job_id: str) -> dict[str, Any] | None:
+        """Return the delivery progress of a broadcast, if it exists."""
+        snap = db.collection(cls.JOB_COLLECTION).document(job_id).get()
+        return snap.to_dict() if snap.exists else None
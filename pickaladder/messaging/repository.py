@@ -8,14 +8,22 @@ from typing import TYPE_CHECKING, Any
 from firebase_admin import firestore
 
 from pickaladder.base.repository import BaseRepository
+from pickaladder.core.constants import CHAT_PAGE_SIZE
+from pickaladder.core.pagination import FirestorePaginator
+from pickaladder.user.services.badges import UNREAD_MESSAGES, stage_badge_change
 
 if TYPE_CHECKING:
+    from google.cloud.firestore_v1.batch import WriteBatch
     from google.cloud.firestore_v1.client import Client
+    from google.cloud.firestore_v1.document import DocumentReference
+    from google.cloud.firestore_v1.transaction import Transaction
 
 logger = logging.getLogger(__name__)
 
 
 DIRECT_CONVERSATION_PARTICIPANTS = 2
+# One document per pair of users, keyed by their sorted IDs
+DIRECT_LOOKUP_COLLECTION = "direct_conversations"
 
 
 class MessagingRepository(BaseRepository):
@@ -42,6 +50,47 @@ class MessagingRepository(BaseRepository):
             logger.error(f"Error fetching user conversations: {e}")
             return []
 
+    @classmethod
+    def get_user_conversations_page(
+        cls,
+        db: Client,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Fetch one page of a user's conversations, most recent activity first.
+
+        ``updatedAt`` is stamped on creation and by every message, so it orders
+        conversations by their last message. ``cursor`` is the ID of the last
+        conversation of the previous page.
+        """
+        query = (
+            db.collection(cls.COLLECTION_NAME)
+            .where(
+                filter=firestore.FieldFilter("participants", "array_contains", user_id),
+            )
+            .order_by("updatedAt", direction=firestore.Query.DESCENDING)
+        )
+        docs, next_cursor = FirestorePaginator.paginate(query, limit, cursor)
+        return [(doc.to_dict() or {}) | {"id": doc.id} for doc in docs], next_cursor
+
+    @staticmethod
+    def direct_pair_key(user_id1: str, user_id2: str) -> str:
+        """Return the order-independent key of a pair of users."""
+        return ":".join(sorted((user_id1, user_id2)))
+
+    @classmethod
+    def _get_direct_lookup_ref(
+        cls,
+        db: Client,
+        user_id1: str,
+        user_id2: str,
+    ) -> DocumentReference:
+        """Return the lookup document of the pair's direct conversation."""
+        return db.collection(DIRECT_LOOKUP_COLLECTION).document(
+            cls.direct_pair_key(user_id1, user_id2),
+        )
+
     @classmethod
     def find_direct_conversation(
         cls,
@@ -50,37 +99,138 @@ class MessagingRepository(BaseRepository):
         user_id2: str,
     ) -> dict[str, Any] | None:
         """Find an existing 1-on-1 conversation between two users."""
-        # Note: Firestore doesn't support array-equals with order-independence.
+        lookup = cls._get_direct_lookup_ref(db, user_id1, user_id2).get()
+        if not lookup.exists:
+            return None
+        return cls.get_by_id(db, (lookup.to_dict() or {})["conversationId"])
+
+    @classmethod
+    def find_unindexed_direct_conversation(
+        cls,
+        db: Client,
+        user_id1: str,
+        user_id2: str,
+    ) -> dict[str, Any] | None:
+        """Scan for a 1-on-1 conversation created before the pair lookup."""
+        # Firestore doesn't support array-equals with order-independence.
         # We query for user1 participant and filter in-memory for user2.
         query = db.collection(cls.COLLECTION_NAME).where(
             filter=firestore.FieldFilter("participants", "array_contains", user_id1),
         )
 
         for doc in query.stream():
-            data = doc.to_dict()
-            parts = data.get("participants", [])  # type: ignore
-            if len(parts) == DIRECT_CONVERSATION_PARTICIPANTS and user_id2 in parts:
-                return data | {"id": doc.id}  # type: ignore
+            data = doc.to_dict() or {}
+            parts = data.get("participants", [])
+            if (
+                len(parts) == DIRECT_CONVERSATION_PARTICIPANTS
+                and user_id2 in parts
+                and data.get("type") != "group_announcement"
+            ):
+                return data | {"id": doc.id}
 
         return None
 
+    @classmethod
+    def get_or_create_direct_conversation(
+        cls,
+        db: Client,
+        user_id1: str,
+        user_id2: str,
+        payload: dict[str, Any],
+    ) -> str:
+        """Return the pair's conversation ID, creating it from ``payload`` once.
+
+        The pair's lookup document is read and claimed in one transaction, so
+        concurrent calls for the same pair retry and settle on the conversation
+        the first one created. A pair whose
+        conversation predates the lookup is found once by a scan and indexed.
+        """
+        lookup_ref = cls._get_direct_lookup_ref(db, user_id1, user_id2)
+        lookup = lookup_ref.get()
+        if lookup.exists:
+            return str((lookup.to_dict() or {})["conversationId"])
+
+        pair_key = lookup_ref.id
+        legacy = cls.find_unindexed_direct_conversation(db, user_id1, user_id2)
+        conv_ref = db.collection(cls.COLLECTION_NAME).document(
+            legacy["id"] if legacy else None,
+        )
+
+        @firestore.transactional
+        def _tx(tx: Transaction, ref: DocumentReference) -> str:
+            snap = ref.get(transaction=tx)
+            if snap.exists:
+                return str((snap.to_dict() or {})["conversationId"])
+            tx.set(
+                ref,
+                {
+                    "conversationId": conv_ref.id,
+                    "participants": sorted((user_id1, user_id2)),
+                },
+            )
+            if legacy:
+                tx.update(conv_ref, {"pairKey": pair_key})
+            else:
+                tx.set(
+                    conv_ref,
+                    payload
+                    | {"pairKey": pair_key, "createdAt": firestore.SERVER_TIMESTAMP},
+                )
+            return conv_ref.id
+
+        conversation_id = _tx(db.transaction(), lookup_ref)
+        cls.forget(conversation_id)
+        return conversation_id
+
     @classmethod
     def get_messages(
         cls,
         db: Client,
         conversation_id: str,
-        limit: int = 50,
-    ) -> list[dict[str, Any]]:
-        """Fetch message history for a conversation."""
+        limit: int = CHAT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Fetch one page of message history, newest first.
+
+        ``cursor`` is the ID of the oldest message of the previous page; the
+        returned cursor continues further back in the conversation.
+        """
         query = (
             db.collection(cls.COLLECTION_NAME)
             .document(conversation_id)
             .collection("messages")
-            .order_by("timestamp", direction=firestore.Query.ASCENDING)
-            .limit(limit)
+            .order_by("timestamp", direction=firestore.Query.DESCENDING)
         )
+        docs, next_cursor = FirestorePaginator.paginate(query, limit, cursor)
+        return [(doc.to_dict() or {}) | {"id": doc.id} for doc in docs], next_cursor
+
+    @classmethod
+    def get_messages_after(
+        cls,
+        db: Client,
+        conversation_id: str,
+        cursor: str,
+        limit: int = CHAT_PAGE_SIZE,
+    ) -> list[dict[str, Any]]:
+        """Fetch the messages sent after the ``cursor`` message, oldest first.
 
-        return [doc.to_dict() | {"id": doc.id} for doc in query.stream()]
+        Polling clients pass the newest message they have, so each poll reads
+        only what is new. An unknown cursor returns nothing.
+        """
+        messages_ref = (
+            db.collection(cls.COLLECTION_NAME)
+            .document(conversation_id)
+            .collection("messages")
+        )
+        cursor_doc = messages_ref.document(cursor).get()
+        if not cursor_doc.exists:
+            return []
+        query = (
+            messages_ref.order_by("timestamp", direction=firestore.Query.ASCENDING)
+            .start_after(cursor_doc)
+            .limit(min(max(1, limit), FirestorePaginator.MAX_LIMIT))
+        )
+        return [(doc.to_dict() or {}) | {"id": doc.id} for doc in query.stream()]
 
     @classmethod
     def add_message(
@@ -88,15 +238,22 @@ class MessagingRepository(BaseRepository):
         db: Client,
         conversation_id: str,
         message_data: dict[str, Any],
+        count_unread: bool = True,
     ) -> str:
-        """Append a message to a conversation and update metadata."""
+        """Append a message to a conversation and update metadata.
+
+        With ``count_unread`` off the participants' unread counters are left to
+        the caller, as broadcasts fan them out in background batches.
+        """
         conv_ref = db.collection(cls.COLLECTION_NAME).document(conversation_id)
 
         # Fetch participants to handle unread counts
-        conv_doc = conv_ref.get()
-        participants = (
-            conv_doc.to_dict().get("participants", []) if conv_doc.exists else []  # type: ignore
-        )
+        participants = []
+        if count_unread:
+            conv_doc = conv_ref.get()
+            participants = (
+                conv_doc.to_dict().get("participants", []) if conv_doc.exists else []  # type: ignore
+            )
 
         sender_id = message_data.get("senderId")
 
@@ -114,14 +271,64 @@ class MessagingRepository(BaseRepository):
         for participant_id in participants:
             if participant_id != sender_id:
                 updates[f"unreadCount.{participant_id}"] = firestore.Increment(1)
+                stage_badge_change(db, batch, participant_id, UNREAD_MESSAGES, 1)
 
         batch.update(conv_ref, updates)
         batch.commit()
+        cls.forget(conversation_id)
 
         return msg_ref.id
 
+    @classmethod
+    def add_unread(cls, db: Client, conversation_id: str, user_ids: list[str]) -> None:
+        """Count one more unread message in a conversation for each user."""
+        if not user_ids:
+            return
+        batch = db.batch()
+        cls.stage_unread(db, batch, conversation_id, user_ids)
+        batch.commit()
+        cls.forget(conversation_id)
+
+    @classmethod
+    def stage_unread(
+        cls,
+        db: Client,
+        batch: WriteBatch,
+        conversation_id: str,
+        user_ids: list[str],
+    ) -> None:
+        """Queue one more unread message for each user on an existing batch.
+
+        The caller commits the batch and then forgets the conversation.
+        """
+        conv_ref = db.collection(cls.COLLECTION_NAME).document(conversation_id)
+        batch.update(
+            conv_ref,
+            {f"unreadCount.{uid}": firestore.Increment(1) for uid in user_ids},
+        )
+        for uid in user_ids:
+            stage_badge_change(db, batch, uid, UNREAD_MESSAGES, 1)
+
     @classmethod
     def mark_as_read(cls, db: Client, conversation_id: str, user_id: str) -> None:
-        """Reset unread count for a user in a conversation."""
+        """Reset unread count for a user in a conversation.
+
+        The conversation's count is read and cleared in one transaction with the
+        matching decrement of the user's total, so a message arriving meanwhile
+        is either cleared with it or counted on both.
+        """
         conv_ref = db.collection(cls.COLLECTION_NAME).document(conversation_id)
-        conv_ref.update({f"unreadCount.{user_id}": 0})
+
+        @firestore.transactional
+        def _tx(tx: Transaction, ref: DocumentReference) -> None:
+            conv_doc = ref.get(transaction=tx)
+            if not conv_doc.exists:
+                return
+            unread = (conv_doc.to_dict() or {}).get("unreadCount", {}).get(user_id, 0)
+            if not unread:
+                return
+            tx.update(ref, {f"unreadCount.{user_id}": 0})
+            stage_badge_change(db, tx, user_id, UNREAD_MESSAGES, -unread)
+
+        _tx(db.transaction(), conv_ref)
+        cls.forget(conversation_id)
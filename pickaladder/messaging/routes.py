@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from firebase_admin import firestore
-from flask import Response, flash, g, redirect, render_template, request, url_for
+from flask import (
+    Response,
+    flash,
+    g,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 
 from pickaladder.auth.decorators import login_required
 
 from . import bp
+from .broadcast import BroadcastService
 from .repository import MessagingRepository
 from .services import MessagingService
 
@@ -17,9 +29,28 @@ from .services import MessagingService
 def inbox() -> str:
     """Display user's messaging inbox."""
     db = firestore.client()
-    conversations = MessagingService.get_inbox(db, g.user.uid)
+    conversations, next_cursor = MessagingService.get_inbox(
+        db,
+        g.user.uid,
+        cursor=request.args.get("cursor"),
+    )
+
+    return render_template(
+        "messaging/inbox.html",
+        conversations=conversations,
+        next_cursor=next_cursor,
+    )
+
 
-    return render_template("messaging/inbox.html", conversations=conversations)
+def _serialize_message(msg: dict[str, Any]) -> dict[str, Any]:
+    """Convert a message to JSON-safe fields for the chat client."""
+    timestamp = msg.get("timestamp")
+    return {
+        "id": msg["id"],
+        "senderId": msg.get("senderId"),
+        "content": msg.get("content", ""),
+        "timestamp": timestamp.isoformat() if hasattr(timestamp, "isoformat") else None,
+    }
 
 
 @bp.route("/chat/<string:conversation_id>")
@@ -27,7 +58,6 @@ def inbox() -> str:
 def chat(conversation_id: str) -> Response | str:
     """View individual conversation."""
     db = firestore.client()
-    messages = MessagingRepository.get_messages(db, conversation_id)
 
     # Verify participant (Quick check, should ideally be in Security Rules)
     conv = MessagingRepository.get_by_id(db, conversation_id)
@@ -35,10 +65,51 @@ def chat(conversation_id: str) -> Response | str:
         flash("You do not have access to this conversation.", "danger")
         return redirect(url_for(".inbox"))  # type: ignore
 
+    messages, older_cursor = MessagingRepository.get_messages(db, conversation_id)
+    messages.reverse()
+
     # Mark as read
     MessagingService.mark_as_read(db, conversation_id, g.user.uid)
 
-    return render_template("messaging/chat.html", conversation=conv, messages=messages)
+    return render_template(
+        "messaging/chat.html",
+        conversation=conv,
+        messages=messages,
+        older_cursor=older_cursor,
+    )
+
+
+@bp.route("/chat/<string:conversation_id>/messages")
+@login_required
+def messages(conversation_id: str) -> Response | tuple[Response, int]:
+    """Return chat messages as JSON for incremental loading.
+
+    ``?before=<id>`` pages back through history (newest first) and
+    ``?after=<id>`` returns only messages newer than ``id`` (oldest first).
+    """
+    db = firestore.client()
+    conv = MessagingRepository.get_by_id(db, conversation_id)
+    if not conv or g.user.uid not in conv.get("participants", []):
+        return jsonify({"error": "Forbidden"}), 403
+
+    after = request.args.get("after")
+    if after:
+        newer = MessagingRepository.get_messages_after(db, conversation_id, after)
+        if newer:
+            MessagingService.mark_as_read(db, conversation_id, g.user.uid)
+        return jsonify({"messages": [_serialize_message(m) for m in newer]})
+
+    older, next_cursor = MessagingRepository.get_messages(
+        db,
+        conversation_id,
+        cursor=request.args.get("before"),
+    )
+    return jsonify(
+        {
+            "messages": [_serialize_message(m) for m in older],
+            "next_cursor": next_cursor,
+        },
+    )
 
 
 @bp.route("/start/<string:other_user_id>")
@@ -107,9 +178,24 @@ def broadcast(group_id: str) -> Response:
             member_ids,
         )
 
-        # Send the message
-        MessagingService.send_message(db, conversation_id, g.user.uid, content)
+        # Persist the message; members are notified in background batches
+        BroadcastService.post(db, conversation_id, g.user.uid, content)
 
         flash("Announcement broadcasted successfully!", "success")
 
     return redirect(url_for("group.manage_group", group_id=group_id))  # type: ignore
+
+
+@bp.route("/broadcast/status/<string:job_id>")
+@login_required
+def broadcast_status(job_id: str) -> Response | tuple[Response, int]:
+    """Return the delivery progress of a broadcast to its sender."""
+    status = BroadcastService.get_status(firestore.client(), job_id)
+    if not status or status.get("senderId") != g.user.uid:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(
+        {
+            key: status.get(key)
+            for key in ("status", "total", "delivered", "notified", "error")
+        },
+    )
@@ -6,6 +6,10 @@ from typing import TYPE_CHECKING, Any
 
 from firebase_admin import firestore
 
+from pickaladder.core.constants import INBOX_PAGE_SIZE
+from pickaladder.core.entity_cache import get_loader
+from pickaladder.user.services.badges import UNREAD_MESSAGES, get_badge_counts
+
 from .repository import MessagingRepository
 
 if TYPE_CHECKING:
@@ -18,18 +22,18 @@ class MessagingService:
     @staticmethod
     def get_or_create_conversation(db: Client, user_id1: str, user_id2: str) -> str:
         """Finds or initializes a 1-on-1 conversation."""
-        existing = MessagingRepository.find_direct_conversation(db, user_id1, user_id2)
-        if existing:
-            return existing["id"]
-
-        # Create new
         payload = {
             "participants": [user_id1, user_id2],
             "lastMessage": "",
             "updatedAt": firestore.SERVER_TIMESTAMP,
             "unreadCount": {user_id1: 0, user_id2: 0},
         }
-        return MessagingRepository.create(db, payload)
+        return MessagingRepository.get_or_create_direct_conversation(
+            db,
+            user_id1,
+            user_id2,
+            payload,
+        )
 
     @staticmethod
     def get_or_create_group_announcement(
@@ -82,28 +86,50 @@ class MessagingService:
         MessagingRepository.mark_as_read(db, conversation_id, user_id)
 
     @staticmethod
-    def get_inbox(db: Client, user_id: str) -> list[dict[str, Any]]:
-        """Retrieves the user's conversation list with enriched participant names."""
-        from pickaladder.group.repository import GroupRepository
-        from pickaladder.user.services import UserService
+    def get_inbox(
+        db: Client,
+        user_id: str,
+        limit: int = INBOX_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Retrieves a page of the user's conversations with display names.
+
+        The other participants and announcement groups of the whole page are
+        resolved together rather than one lookup per conversation.
+        """
+        conversations, next_cursor = MessagingRepository.get_user_conversations_page(
+            db,
+            user_id,
+            limit,
+            cursor,
+        )
 
-        conversations = MessagingRepository.get_user_conversations(db, user_id)
+        group_ids = []
+        other_ids = {}
+        for conv in conversations:
+            if conv.get("type") == "group_announcement":
+                group_ids.append(conv.get("groupId"))
+            else:
+                # Find the OTHER participant
+                other_ids[conv["id"]] = next(
+                    (p for p in conv.get("participants", []) if p != user_id),
+                    user_id,
+                )
+        loader = get_loader()
+        loader.defer(db, "users", other_ids.values())
+        groups = loader.load_many(db, "groups", group_ids)
+        users = loader.load_many(db, "users", other_ids.values())
 
         for conv in conversations:
             if conv.get("type") == "group_announcement":
-                group = GroupRepository.get_by_id(db, conv["groupId"])
+                group = groups.get(conv.get("groupId"))  # type: ignore[arg-type]
                 group_name = (
                     group.get("name", "Unknown Group") if group else "Deleted Group"
                 )
                 conv["display_name"] = f"{group_name} (Announcements)"
                 conv["display_avatar"] = None  # Or a group icon if we have one
             else:
-                # Find the OTHER participant
-                other_uid = next(
-                    (p for p in conv["participants"] if p != user_id),
-                    user_id,
-                )
-                other_user = UserService.get_user_by_id(db, other_uid)
+                other_user = users.get(other_ids[conv["id"]])
                 conv["display_name"] = (
                     other_user.get("username", "Unknown User")
                     if other_user
@@ -113,14 +139,13 @@ class MessagingService:
                     other_user.get("profilePictureUrl") if other_user else None
                 )
 
-        return conversations
+        return conversations, next_cursor
 
     @staticmethod
     def get_total_unread_count(db: Client, user_id: str) -> int:
-        """Sum the unread counts for a user across all their conversations."""
-        conversations = MessagingRepository.get_user_conversations(db, user_id)
-        total = 0
-        for conv in conversations:
-            unread_dict = conv.get("unreadCount", {})
-            total += unread_dict.get(user_id, 0)
-        return total
+        """Return the user's unread total across all their conversations.
+
+        The total is a counter kept by ``add_message`` and ``mark_as_read``, so
+        reading it costs one document however large the inbox is.
+        """
+        return get_badge_counts(db, user_id)[UNREAD_MESSAGES]
@@ -38,6 +38,37 @@ class NotificationService:
             current_app.logger.exception(f"Error sending FCM message: {e!s}")
             return None
 
+    @staticmethod
+    def send_multicast_now(
+        tokens: list[str],
+        title: str,
+        body: str,
+        data: dict[str, str] | None = None,
+    ) -> int:
+        """Send one notification to many tokens and return how many succeeded.
+
+        This method should be called within a background thread.
+        """
+        if not tokens:
+            return 0
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(
+                title=title,
+                body=body,
+            ),
+            data=data or {},
+            tokens=tokens,
+        )
+        try:
+            response = messaging.send_each_for_multicast(message)
+            current_app.logger.info(
+                f"Sent FCM multicast: {response.success_count}/{len(tokens)} delivered",
+            )
+            return response.success_count
+        except Exception as e:
+            current_app.logger.exception(f"Error sending FCM multicast: {e!s}")
+            return 0
+
     @staticmethod
     def send_push_notification(
         token: str,
@@ -1,87 +1,43 @@
 /**
- * Real-time Chat Listener for Pickaladder
+ * Incremental chat loader for Pickaladder
+ *
+ * The server renders the newest page of messages. Older pages are fetched
+ * when the user scrolls to the top, and new messages are polled with the
+ * ID of the newest rendered message so each poll only returns what is new.
  */
 document.addEventListener('DOMContentLoaded', function() {
     const container = document.getElementById('message-container');
     if (!container) return;
 
-    const cid = container.getAttribute('data-conversation-id');
+    const messagesUrl = container.getAttribute('data-messages-url');
     const currentUserId = container.getAttribute('data-current-user-id');
 
-    if (!cid || !currentUserId) {
+    if (!messagesUrl || !currentUserId) {
         console.warn('Chat metadata missing from container');
         return;
     }
 
-    // Ensure Firebase is initialized
-    if (typeof firebase === 'undefined') {
-        console.error('Firebase SDK not loaded');
-        return;
-    }
-
-    const db = firebase.firestore();
-    const messagesRef = db.collection('conversations').doc(cid).collection('messages');
-
-    const renderedMessages = new Set();
-    let firstSnapshot = true;
-
-    // Listen for real-time updates
-    messagesRef.orderBy('timestamp', 'asc').onSnapshot((snapshot) => {
-        if (firstSnapshot) {
-            container.innerHTML = '';
-            firstSnapshot = false;
-        }
+    const POLL_INTERVAL_MS = 5000;
 
-        if (snapshot.empty && renderedMessages.size === 0) {
-            container.innerHTML = '<div class="flex-grow-1 d-flex align-items-center justify-content-center text-muted"><small>Say hello! 👋</small></div>';
-            return;
-        }
-
-        snapshot.docChanges().forEach((change) => {
-            if (change.type === "added") {
-                const msg = change.doc.data();
-                const msgId = change.doc.id;
-                
-                if (!renderedMessages.has(msgId)) {
-                    // Remove placeholder if it exists
-                    const placeholder = container.querySelector('.text-muted');
-                    if (placeholder && (placeholder.textContent.includes('Say hello') || placeholder.textContent.includes('Loading'))) {
-                        placeholder.parentElement.remove();
-                    }
-                    
-                    renderMessage(msg, msgId);
-                    renderedMessages.add(msgId);
-                }
-            }
-        });
-        
-        scrollToBottom();
-    }, (error) => {
-        console.error("Error listening for messages:", error);
-        if (error.code === 'permission-denied') {
-            container.innerHTML = '<div class="alert alert-danger m-3">You do not have permission to view this chat.</div>';
-        }
-    });
+    let olderCursor = container.getAttribute('data-older-cursor') || null;
+    let latestId = container.getAttribute('data-latest-id') || null;
+    let loadingOlder = false;
+    let polling = false;
 
     /**
-     * Renders a single message bubble
+     * Builds a single message bubble
      */
-    function renderMessage(msg, id) {
+    function buildMessage(msg) {
         const isMe = msg.senderId === currentUserId;
         const bubble = document.createElement('div');
         bubble.className = `chat-bubble-container d-flex ${isMe ? 'justify-content-end' : ''} mb-3`;
-        
-        let timeStr = '';
-        if (msg.timestamp) {
-            const date = msg.timestamp.toDate ? msg.timestamp.toDate() : new Date(msg.timestamp.seconds * 1000);
-            timeStr = date.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
-        } else {
-            // Local optimistic timestamp if server hasn't set it yet
-            timeStr = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
-        }
+        bubble.setAttribute('data-message-id', msg.id);
+
+        const date = msg.timestamp ? new Date(msg.timestamp) : new Date();
+        const timeStr = date.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
 
         bubble.innerHTML = `
-            <div class="chat-bubble px-3 py-2 rounded shadow-sm ${isMe ? 'bg-volt text-dark' : 'bg-secondary text-white'}" 
+            <div class="chat-bubble px-3 py-2 rounded shadow-sm ${isMe ? 'bg-volt text-dark' : 'bg-secondary text-white'}"
                  style="max-width: 75%; overflow-wrap: break-word; position: relative;">
                 <div class="message-content" style="font-size: 0.9rem;">${escapeHtml(msg.content)}</div>
                 <div class="message-time mt-1 ${isMe ? 'text-dark-50' : 'text-muted'}" style="font-size: 0.65rem; text-align: right;">
@@ -89,7 +45,74 @@ document.addEventListener('DOMContentLoaded', function() {
                 </div>
             </div>
         `;
-        container.appendChild(bubble);
+        return bubble;
+    }
+
+    function isRendered(id) {
+        return container.querySelector(`[data-message-id="${CSS.escape(id)}"]`) !== null;
+    }
+
+    function removePlaceholder() {
+        const placeholder = container.querySelector('.text-muted small');
+        if (placeholder && placeholder.textContent.includes('Say hello')) {
+            placeholder.parentElement.remove();
+        }
+    }
+
+    /**
+     * Appends messages given oldest first
+     */
+    function appendMessages(messages) {
+        const nearBottom = container.scrollHeight - container.scrollTop - container.clientHeight < 80;
+        messages.forEach((msg) => {
+            if (!isRendered(msg.id)) {
+                removePlaceholder();
+                container.appendChild(buildMessage(msg));
+            }
+            latestId = msg.id;
+        });
+        if (nearBottom) scrollToBottom();
+    }
+
+    /**
+     * Prepends messages given newest first, keeping the visible position
+     */
+    function prependMessages(messages) {
+        const previousHeight = container.scrollHeight;
+        messages.forEach((msg) => {
+            if (!isRendered(msg.id)) {
+                container.insertBefore(buildMessage(msg), container.firstChild);
+            }
+        });
+        container.scrollTop += container.scrollHeight - previousHeight;
+    }
+
+    function loadOlder() {
+        if (!olderCursor || loadingOlder) return;
+        loadingOlder = true;
+        fetch(`${messagesUrl}?before=${encodeURIComponent(olderCursor)}`)
+            .then(response => response.json())
+            .then(data => {
+                prependMessages(data.messages || []);
+                olderCursor = data.next_cursor || null;
+            })
+            .catch(error => console.error('Error loading older messages:', error))
+            .finally(() => { loadingOlder = false; });
+    }
+
+    function pollNewer() {
+        if (polling || document.hidden) return;
+        polling = true;
+        const query = latestId ? `?after=${encodeURIComponent(latestId)}` : '';
+        fetch(`${messagesUrl}${query}`)
+            .then(response => response.json())
+            .then(data => {
+                const messages = data.messages || [];
+                // Without a cursor the server returns its newest page, newest first
+                appendMessages(latestId ? messages : messages.reverse());
+            })
+            .catch(error => console.error('Error polling messages:', error))
+            .finally(() => { polling = false; });
     }
 
     /**
@@ -108,6 +131,12 @@ document.addEventListener('DOMContentLoaded', function() {
         return div.innerHTML;
     }
 
+    container.addEventListener('scroll', function() {
+        if (container.scrollTop < 50) loadOlder();
+    });
+    setInterval(pollNewer, POLL_INTERVAL_MS);
+    scrollToBottom();
+
     // Intercept form submission for "instant" feel
     const chatForm = container.closest('.card').querySelector('form');
     if (chatForm) {
@@ -239,10 +239,15 @@ class TeamService:
         total_games = wins + losses
         win_percentage = (wins / total_games) * 100 if total_games > 0 else 0
 
-        # Calculate streak from sorted matches (newest to oldest)
+        # Prefer the stored streak; otherwise derive it from the recent matches
+        # (sorted newest to oldest).
         streak = 0
         streak_type = None
-        if matches:
+        stored = stats.get("streak")
+        if isinstance(stored, dict):
+            streak = stored.get("length", 0)
+            streak_type = stored.get("type")
+        elif matches:
             last_match = matches[0]
             winner = last_match.get("winner")
             is_team1 = last_match.get("team1Id") == team_id
@@ -3,6 +3,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, cast
 
 from pickaladder.user.helpers import smart_display_name
+from pickaladder.user.services.badges import (
+    TOURNAMENT_INVITES,
+    apply_badge_change,
+    stage_badge_change,
+)
 
 from .base import TournamentBase
 
@@ -82,6 +87,7 @@ class TournamentInvites(TournamentBase):
                 "participant_ids": firestore.ArrayUnion([invited_uid]),
             },
         )
+        apply_badge_change(db, invited_uid, TOURNAMENT_INVITES, 1)
 
     @staticmethod
     def _validate_group_invite(
@@ -151,6 +157,8 @@ class TournamentInvites(TournamentBase):
                     "participant_ids": firestore.ArrayUnion(n_ids),
                 },
             )
+            for n_id in n_ids:
+                stage_badge_change(db, batch, n_id, TOURNAMENT_INVITES, 1)
             batch.commit()
         return len(new_p)
 
@@ -187,6 +195,7 @@ class TournamentInvites(TournamentBase):
             parts = snap.get("participants")
             if TournamentInvites._update_status(parts, uid, "accepted"):
                 tx.update(t_ref, {"participants": parts})
+                stage_badge_change(db, tx, uid, TOURNAMENT_INVITES, -1)
                 return True
             return False
 
@@ -224,6 +233,7 @@ class TournamentInvites(TournamentBase):
             if len(new_p) < len(parts):
                 new_ids = [i for i in ids if i != uid]
                 tx.update(t_ref, {"participants": new_p, "participant_ids": new_ids})
+                stage_badge_change(db, tx, uid, TOURNAMENT_INVITES, -1)
                 return True
             return False
 
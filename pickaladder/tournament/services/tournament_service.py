@@ -713,7 +713,7 @@ class TournamentService(TournamentInvites, TournamentTeams, TournamentBase):
         """Fetch full tournament details including participants and standings."""
         from firebase_admin import firestore
 
-        from pickaladder.tournament.utils import get_tournament_standings
+        from pickaladder.tournament.utils import get_cached_tournament_standings
         from pickaladder.user import UserService
 
         db = db or firestore.client()
@@ -727,7 +727,7 @@ class TournamentService(TournamentInvites, TournamentTeams, TournamentBase):
 
         parts = data.get("participants", [])
         resolved_parts = TournamentService._resolve_participants(db, parts)
-        stands = get_tournament_standings(db, t_id, data.get("matchType", "singles"))
+        stands = get_cached_tournament_standings(t_id, data.get("matchType", "singles"))
         c_ids = TournamentService._extract_participant_ids(parts)
         t_stat, pend = TournamentService._get_team_status_for_user(db, t_id, uid)
 
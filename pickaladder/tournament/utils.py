@@ -6,6 +6,10 @@ from typing import Any, cast
 
 from firebase_admin import firestore
 
+from pickaladder.core.constants import TOURNAMENT_STANDINGS_CACHE_TIMEOUT
+from pickaladder.core.match_record import MatchRecord
+from pickaladder.core.tiered_cache import tagged, tournament_tag
+from pickaladder.extensions import cache
 from pickaladder.user.helpers import smart_display_name
 
 
@@ -24,17 +28,13 @@ def fetch_tournament_matches(
 
 
 def _get_match_participant_ids(
-    data: dict[str, Any],
+    record: MatchRecord,
     match_type: str,
 ) -> tuple[str | None, str | None]:
-    """Resolve player/team IDs from match data."""
+    """Resolve player/team IDs from a match record."""
     if match_type == "doubles":
-        return data.get("team1Id"), data.get("team2Id")
-    p1_ref = data.get("player1Ref")
-    p2_ref = data.get("player2Ref")
-    id1 = p1_ref.id if p1_ref else None
-    id2 = p2_ref.id if p2_ref else None
-    return id1, id2
+        return record.team1_id, record.team2_id
+    return record.player1_id, record.player2_id
 
 
 def _record_match_result(standings: dict, id1: str, id2: str, s1: int, s2: int) -> None:
@@ -71,10 +71,10 @@ def aggregate_match_data(matches: Any, match_type: str) -> dict[str, dict[str, A
         data = cast("dict[str, Any]", match.to_dict())
         if not data:
             continue
-        id1, id2 = _get_match_participant_ids(data, match_type)
+        record = MatchRecord(data)
+        id1, id2 = _get_match_participant_ids(record, match_type)
         if id1 and id2:
-            s1, s2 = data.get("player1Score", 0), data.get("player2Score", 0)
-            _record_match_result(standings, id1, id2, s1, s2)
+            _record_match_result(standings, id1, id2, record.p1_score, record.p2_score)
     return standings
 
 
@@ -169,3 +169,13 @@ def get_tournament_standings(
     matches = fetch_tournament_matches(db, tournament_id, pool_id=pool_id)
     raw = aggregate_match_data(matches, match_type)
     return sort_and_format_standings(db, raw, match_type)
+
+
+@tagged(lambda tournament_id, *args, **kwargs: [tournament_tag(tournament_id)])
+@cache.memoize(timeout=TOURNAMENT_STANDINGS_CACHE_TIMEOUT)
+def get_cached_tournament_standings(
+    tournament_id: str,
+    match_type: str,
+) -> list[dict[str, Any]]:
+    """Return a tournament's standings, cached until one of its matches changes."""
+    return get_tournament_standings(firestore.client(), tournament_id, match_type)
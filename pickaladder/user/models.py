@@ -52,6 +52,10 @@ class UserStats(TypedDict, total=False):
     win_rate: float
     current_streak: int
     streak_type: str
+    singles: dict[str, int]
+    doubles: dict[str, int]
+    points_for: int
+    points_against: int
     processed_matches: list[dict[str, Any]]
 
 
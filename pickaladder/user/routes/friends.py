@@ -45,6 +45,7 @@ def view_community() -> str:
         search_term=search_term,
         user=g.user,
         incoming_requests=incoming_requests,
+        pending_friend_requests=incoming_requests,
         outgoing_requests=outgoing_requests,
         **filtered_data,
     )
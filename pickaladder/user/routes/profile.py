@@ -17,8 +17,7 @@ from pickaladder.auth.decorators import login_required
 from pickaladder.constants.messages import USER_MESSAGES
 from pickaladder.core.activity.services import ActivityService
 from pickaladder.core.constants import DUPR_PROFILE_BASE_URL
-from pickaladder.group.services.group_service import GroupService
-from pickaladder.group.services.leaderboard import get_leaderboard_trend_data
+from pickaladder.group.services.leaderboard import get_group_leaderboard_with_trend
 from pickaladder.season.analytics import AnalyticsService
 from pickaladder.user import bp
 from pickaladder.user.forms import SettingsForm, UpdateUserForm
@@ -105,7 +104,7 @@ def dashboard() -> str:
     data = UserService.get_dashboard_data(db, user_id)
 
     # Fetch community activity feed
-    feed = ActivityService.get_global_feed(db, limit=10)
+    feed, feed_cursor = ActivityService.get_feed_page(db, limit=10)
 
     # Check for first login to show welcome modal
     from flask import session
@@ -119,6 +118,7 @@ def dashboard() -> str:
         "user_dashboard.html",
         user=g.user,
         feed=feed,
+        feed_cursor=feed_cursor,
         show_welcome=show_welcome,
         **data,
     )
@@ -176,10 +176,8 @@ def share_brag(user_id: str, group_id: str) -> Response | str:
     group_data = group_doc.to_dict() or {}
     group_data["id"] = group_id
 
-    # Fetch leaderboard to get rank and streak
-    # We use user_id as the requester since this is public
-    details = GroupService.get_group_details(db, group_id, user_id)
-    leaderboard = details.get("leaderboard", [])
+    # Rank, streak and trend all come from one pass over the group's matches
+    leaderboard, trend_data_all = get_group_leaderboard_with_trend(group_id)
 
     user_stats = next((p for p in leaderboard if p["id"] == user_id), None)
     if not user_stats:
@@ -189,8 +187,6 @@ def share_brag(user_id: str, group_id: str) -> Response | str:
     rank = next((i + 1 for i, p in enumerate(leaderboard) if p["id"] == user_id), 0)
     streak = user_stats.get("streak", 0)
 
-    # Fetch trend data
-    trend_data_all = get_leaderboard_trend_data(group_id)
     user_dataset = next(  # type: ignore
         (ds for ds in trend_data_all["datasets"] if ds.get("id") == user_id),
         {"data": []},
@@ -161,25 +161,51 @@ def get_user_groups(db: Client, user_id: str) -> list[dict[str, Any]]:
 
 
 def get_group_rankings(db: Client, user_id: str) -> list[dict[str, Any]]:
-    """Fetch group rankings for a user."""
-    from pickaladder.group.utils import get_group_leaderboard
+    """Fetch the user's rank in each of their groups.
+
+    Leaderboards for all of the groups are built together from their standings
+    projections rather than one full leaderboard build per group.
+    """
+    from pickaladder.group.services.leaderboard import get_group_leaderboards
 
     user_ref = db.collection("users").document(user_id)
-    group_rankings = []
     my_groups_query = (
         db.collection("groups")
         .where(filter=firestore.FieldFilter("members", "array_contains", user_ref))
         .stream()
     )
-    for group_doc in my_groups_query:
-        group_data = group_doc.to_dict()
-        if group_data is None:
-            continue
-        leaderboard = get_group_leaderboard(group_doc.id)
-        group_rankings.append(
-            _calculate_user_ranking(user_id, leaderboard, group_doc.id, group_data),
+    groups = {
+        group_doc.id: group_data
+        for group_doc in my_groups_query
+        if (group_data := group_doc.to_dict()) is not None
+    }
+    leaderboards = get_group_leaderboards(db, groups)
+    return [
+        _calculate_user_ranking(
+            user_id,
+            _sort_by_points(leaderboards[group_id]),
+            group_id,
+            group_data,
         )
-    return group_rankings
+        for group_id, group_data in groups.items()
+    ]
+
+
+def _sort_by_points(leaderboard: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Order a leaderboard by the points the dashboard shows, not by ELO.
+
+    Ranks and the points to overtake the player above are both in average
+    score, so they have to come from the same ordering.
+    """
+    return sorted(
+        leaderboard,
+        key=lambda p: (
+            p.get("avg_score", 0),
+            p.get("wins", 0),
+            p.get("games_played", 0),
+        ),
+        reverse=True,
+    )
 
 
 def _fetch_profile_stats(
@@ -187,13 +213,11 @@ def _fetch_profile_stats(
     target_user_id: str,
     profile_user_data: dict[str, Any],
 ) -> tuple[dict[str, Any], list[Any]]:
-    """Fetch matches and calculate statistics for user profile."""
-    from .match_stats import calculate_stats, get_user_matches
-
-    all_matches = get_user_matches(db, target_user_id)
-    stats = calculate_stats(all_matches, target_user_id)
+    """Read profile statistics and fetch the recent matches to list."""
+    from .match_stats import get_user_matches
+    from .stats_summary import get_user_stats_summary
 
-    # Fetch limited matches for recent activity feed
+    stats = get_user_stats_summary(db, target_user_id)
     recent_matches = get_user_matches(db, target_user_id, limit=20)
 
     return stats, recent_matches
@@ -257,6 +281,7 @@ def _filter_community_list(
 
 def get_community_data(db: Client, user_id: str, search_term: str) -> dict[str, Any]:
     """Fetch and filter community hub data."""
+    from .badges import FRIEND_REQUESTS, TOURNAMENT_INVITES, reconcile_badge_count
     from .core import get_all_users
     from .friendship import (
         get_user_friends,
@@ -274,6 +299,8 @@ def get_community_data(db: Client, user_id: str, search_term: str) -> dict[str,
     users, _ = get_all_users(db, exclude, limit=20)
     groups = get_public_groups(db, limit=10)
     invites = get_pending_tournament_invites(db, user_id)
+    reconcile_badge_count(db, user_id, FRIEND_REQUESTS, len(inc))
+    reconcile_badge_count(db, user_id, TOURNAMENT_INVITES, len(invites))
 
     term = search_term.lower() if search_term else ""
     u_fields = ["username", "name", "email"]
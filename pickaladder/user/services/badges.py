@@ -0,0 +1,119 @@
+"""Per-user badge counters shown in the navigation bar.
+
+Each ``user_badges/{user_id}`` document holds how many friend requests and
+tournament invites are waiting for a user and how many messages they have not
+read. The write paths that create or resolve those items adjust the counters,
+so a page render reads one document instead of querying every source; the full
+lists are only loaded by the pages that show them, which also correct any
+counter that has drifted.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+from flask import g, has_app_context
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1.batch import WriteBatch
+    from google.cloud.firestore_v1.client import Client
+    from google.cloud.firestore_v1.document import DocumentReference
+    from google.cloud.firestore_v1.transaction import Transaction
+
+BADGES_COLLECTION = "user_badges"
+
+FRIEND_REQUESTS = "friendRequests"
+TOURNAMENT_INVITES = "tournamentInvites"
+UNREAD_MESSAGES = "unreadMessages"
+BADGE_FIELDS = (FRIEND_REQUESTS, TOURNAMENT_INVITES, UNREAD_MESSAGES)
+
+
+def get_badges_ref(db: Client, user_id: str) -> DocumentReference:
+    """Return the reference of a user's badge counters."""
+    return db.collection(BADGES_COLLECTION).document(user_id)
+
+
+def stage_badge_change(
+    db: Client,
+    batch: WriteBatch | Transaction,
+    user_id: str,
+    field: str,
+    delta: int,
+) -> None:
+    """Queue an adjustment of a badge counter on a batch or transaction."""
+    batch.set(
+        get_badges_ref(db, user_id),
+        {field: firestore.Increment(delta)},
+        merge=True,
+    )
+
+
+def apply_badge_change(db: Client, user_id: str, field: str, delta: int) -> None:
+    """Adjust one of a user's badge counters immediately."""
+    get_badges_ref(db, user_id).set({field: firestore.Increment(delta)}, merge=True)
+
+
+def _count_pending_requests(db: Client, user_id: str) -> int:
+    """Count the friend requests waiting for a user's answer."""
+    query = (
+        db.collection("users")
+        .document(user_id)
+        .collection("friends")
+        .where(filter=firestore.FieldFilter("status", "==", "pending"))
+        .where(filter=firestore.FieldFilter("initiator", "==", False))
+    )
+    return sum(1 for _ in query.stream())
+
+
+def _count_unread_messages(db: Client, user_id: str) -> int:
+    """Sum a user's unread messages over all of their conversations."""
+    from pickaladder.messaging.repository import MessagingRepository
+
+    return sum(
+        (conv.get("unreadCount") or {}).get(user_id, 0)
+        for conv in MessagingRepository.get_user_conversations(db, user_id)
+    )
+
+
+def rebuild_badge_counts(db: Client, user_id: str) -> dict[str, int]:
+    """Recount a user's badges from their sources and store the result."""
+    from .user_tournament_service import get_pending_tournament_invites
+
+    counts = {
+        FRIEND_REQUESTS: _count_pending_requests(db, user_id),
+        TOURNAMENT_INVITES: len(get_pending_tournament_invites(db, user_id)),
+        UNREAD_MESSAGES: _count_unread_messages(db, user_id),
+    }
+    get_badges_ref(db, user_id).set(counts)
+    return counts
+
+
+def reconcile_badge_count(db: Client, user_id: str, field: str, actual: int) -> None:
+    """Correct a stored counter from a freshly loaded list, if they differ."""
+    counts = get_badge_counts(db, user_id)
+    if counts[field] != actual:
+        get_badges_ref(db, user_id).set({field: actual}, merge=True)
+        counts[field] = actual
+
+
+def get_badge_counts(db: Client, user_id: str) -> dict[str, int]:
+    """Return a user's badge counters, building them on first read.
+
+    The counters are read once per request and shared by every caller.
+    """
+    memo: dict[str, dict[str, int]] | None = None
+    if has_app_context():
+        memo = g.setdefault("_badge_counts", {})
+        if user_id in memo:
+            return memo[user_id]
+
+    snap = get_badges_ref(db, user_id).get()
+    data: Any = snap.to_dict() if snap.exists else None
+    if not isinstance(data, dict) or any(f not in data for f in BADGE_FIELDS):
+        data = rebuild_badge_counts(db, user_id)
+    # Drifted counters may briefly go negative before a list page corrects them.
+    counts = {field: max(0, int(data.get(field) or 0)) for field in BADGE_FIELDS}
+    if memo is not None:
+        memo[user_id] = counts
+    return counts
@@ -5,11 +5,13 @@ from typing import TYPE_CHECKING, Any, cast
 
 from firebase_admin import firestore
 
+from pickaladder.core.entity_cache import get_loader
 from pickaladder.core.pagination import FirestorePaginator
 from pickaladder.user.helpers import smart_display_name as _smart_display_name
 
 from .profile import (
     check_username_availability,
+    refresh_leaderboard_row,
     update_email_address,
     upload_profile_picture,
 )
@@ -64,18 +66,15 @@ def update_user_profile(db: Client, user_id: str, update_data: dict[str, Any]) -
     """Update a user's profile in Firestore."""
     user_ref = db.collection("users").document(user_id)
     user_ref.update(update_data)
+    get_loader().clear("users", user_id)
+    refresh_leaderboard_row(db, user_id, update_data)
 
 
 def get_user_by_id(db: Client, user_id: str) -> dict[str, Any] | None:
     """Fetch a user by their ID."""
-    user_ref = db.collection("users").document(user_id)
-    user_doc = cast("DocumentSnapshot", user_ref.get())
-    if not user_doc.exists:
-        return None
-    data = user_doc.to_dict()
+    data = get_loader().load(db, "users", user_id)
     if data is None:
         return None
-    data["id"] = user_id
     data["uid"] = user_id
     return data
 
@@ -420,6 +419,7 @@ def update_fcm_token(db: Client, user_id: str, token: str) -> None:
     db.collection("users").document(user_id).update(
         {"fcmToken": token, "updatedAt": firestore.SERVER_TIMESTAMP},
     )
+    get_loader().clear("users", user_id)
 
 
 def search_users_json(
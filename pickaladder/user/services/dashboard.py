@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
+from pickaladder.core.fanout import FanOut
+from pickaladder.match.services.streaks import read_streak
 from pickaladder.teams.services import TeamService
 from pickaladder.user.services.activity import (
     get_group_rankings,
     get_top_groups,
 )
+from pickaladder.user.services.badges import (
+    FRIEND_REQUESTS,
+    TOURNAMENT_INVITES,
+    reconcile_badge_count,
+)
 from pickaladder.user.services.core import get_user_by_id
 from pickaladder.user.services.friendship import (
     get_user_friends,
@@ -22,6 +29,10 @@ from pickaladder.user.services.match_stats import (
     get_recent_opponents,
     get_user_matches,
 )
+from pickaladder.user.services.stats_summary import (
+    get_user_stats_summary,
+    summary_to_stats,
+)
 from pickaladder.user.services.user_tournament_service import (
     get_active_tournaments,
     get_past_tournaments,
@@ -40,33 +51,44 @@ def get_dashboard_data(
     """Aggregate all data required for the user dashboard."""
     from pickaladder.user.helpers import calculate_onboarding_progress
 
-    # 1. Fetch user and vanity stats (Keep synchronous as they are fast)
-    user_data, vanity_metrics = _fetch_vanity_stats(db, user_id)
-
-    # 2. Fetch match activity (Fast path: just check if matches exist for onboarding)
-    total_matches = vanity_metrics.get("total_games", 0)
-
-    match_data = (
-        _fetch_recent_activity(db, user_id)
-        if include_activity
-        else {
-            "matches": [],
-            "next_cursor": None,
-            "current_streak": 0,
-            "streak_type": "",
-            "recent_opponents": [],
-        }
+    # 1. Start the user/vanity stats and match activity sections concurrently
+    sections = FanOut("dashboard")
+    sections.submit(
+        "vanity",
+        lambda: _fetch_vanity_stats(db, user_id),
+        placeholder=({}, summary_to_stats({})),
     )
+    if include_activity:
+        sections.submit(
+            "activity",
+            lambda: _fetch_recent_activity(db, user_id),
+            placeholder=_empty_activity(),
+        )
 
-    # 3. Fetch social and tournament data
+    # 2. Fetch social and tournament data (fanned out while the above run)
     social_data = _fetch_social_and_tournaments(db, user_id)
 
-    # 4. Calculate Onboarding Progress
-    onboarding_progress = calculate_onboarding_progress(
-        user_data,
-        total_matches,
-        len(social_data["group_rankings"]),
-        len(social_data["friends"]),
+    # 3. Join the sections; the stored streak wins over the recent-match fallback
+    results = sections.collect()
+    user_data, vanity_metrics = results["vanity"]
+    total_matches = vanity_metrics.get("total_games", 0)
+    match_data = results.get("activity") or _empty_activity()
+    if stored_streak := read_streak(user_data):
+        match_data["current_streak"] = stored_streak.get("length", 0)
+        match_data["streak_type"] = stored_streak.get("type") or ""
+
+    # 4. Calculate Onboarding Progress, unless a section it counts fell back
+    # to its placeholder and would show finished steps as still to do
+    degraded = {*sections.degraded, *social_data.pop("section_degraded", [])}
+    onboarding_progress = (
+        None
+        if degraded & {"vanity", "group_rankings", "friends"}
+        else calculate_onboarding_progress(
+            user_data,
+            total_matches,
+            len(social_data["group_rankings"]),
+            len(social_data["friends"]),
+        )
     )
 
     # Assemble final stats object
@@ -87,6 +109,10 @@ def get_dashboard_data(
         "stats": stats,
         "current_streak": match_data["current_streak"],
         "recent_opponents": match_data["recent_opponents"],
+        "section_timings": {
+            **sections.timings,
+            **social_data.pop("section_timings", {}),
+        },
         **social_data,
     }
 
@@ -95,18 +121,22 @@ def _fetch_vanity_stats(
     db: Client,
     user_id: str,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
-    """Fetch user document and calculate vanity metrics."""
-    from pickaladder.user.services.match_stats import calculate_stats, get_user_matches
-
+    """Fetch user document and read vanity metrics from the stats summary."""
     user_data = get_user_by_id(db, user_id) or {}
-    all_matches = get_user_matches(db, user_id)
-    vanity_metrics = calculate_stats(all_matches, user_id)
+    vanity_metrics = get_user_stats_summary(db, user_id)
 
     return user_data, vanity_metrics
 
 
-def _fetch_recent_activity(db: Client, user_id: str) -> dict[str, Any]:
-    """Fetch recent matches and calculate engagement stats."""
+def _fetch_recent_activity(
+    db: Client,
+    user_id: str,
+) -> dict[str, Any]:
+    """Fetch recent matches and calculate engagement stats.
+
+    The streak is derived from the recent matches; callers holding the user
+    document prefer its stored streak.
+    """
     from pickaladder.user.helpers import extract_match_results_for_streak
 
     recent_docs = get_user_matches(db, user_id, limit=20)
@@ -127,15 +157,49 @@ def _fetch_recent_activity(db: Client, user_id: str) -> dict[str, Any]:
     }
 
 
+def _empty_activity() -> dict[str, Any]:
+    """Return the match activity section shown when it is skipped or fails."""
+    return {
+        "recent_docs": [],
+        "matches": [],
+        "next_cursor": None,
+        "current_streak": 0,
+        "streak_type": "",
+        "recent_opponents": [],
+    }
+
+
 def _fetch_social_and_tournaments(db: Client, user_id: str) -> dict[str, Any]:
-    """Fetch social relations and tournament participation data."""
+    """Fetch social relations and tournament participation data concurrently.
+
+    Each list is its own section; one that fails or misses its deadline is
+    rendered empty instead of failing the dashboard.
+    """
+    sections = FanOut("dashboard")
+    fetchers: dict[str, Callable[[], Any]] = {
+        "friends": lambda: get_user_friends(db, user_id),
+        "requests": lambda: get_user_pending_requests(db, user_id),
+        "group_rankings": lambda: get_group_rankings(db, user_id),
+        "top_groups": lambda: get_top_groups(db, limit=3),
+        "top_teams": lambda: TeamService.get_top_teams(db, limit=3),
+        "pending_tournament_invites": lambda: get_pending_tournament_invites(
+            db,
+            user_id,
+        ),
+        "active_tournaments": lambda: get_active_tournaments(db, user_id),
+        "past_tournaments": lambda: get_past_tournaments(db, user_id),
+    }
+    for name, fetch in fetchers.items():
+        sections.submit(name, fetch, placeholder=[])
+    results = sections.collect()
+    for field, name in (
+        (FRIEND_REQUESTS, "requests"),
+        (TOURNAMENT_INVITES, "pending_tournament_invites"),
+    ):
+        if name not in sections.degraded:
+            reconcile_badge_count(db, user_id, field, len(results[name]))
     return {
-        "friends": get_user_friends(db, user_id),
-        "requests": get_user_pending_requests(db, user_id),
-        "group_rankings": get_group_rankings(db, user_id),
-        "top_groups": get_top_groups(db, limit=3),
-        "top_teams": TeamService.get_top_teams(db, limit=3),
-        "pending_tournament_invites": get_pending_tournament_invites(db, user_id),
-        "active_tournaments": get_active_tournaments(db, user_id),
-        "past_tournaments": get_past_tournaments(db, user_id),
+        **results,
+        "section_timings": sections.timings,
+        "section_degraded": sections.degraded,
     }
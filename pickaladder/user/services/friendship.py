@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Any, cast
 from firebase_admin import firestore
 from flask import current_app
 
+from .badges import FRIEND_REQUESTS, stage_badge_change
 from .core import _sanitize_user_data
 
 if TYPE_CHECKING:
@@ -111,10 +112,19 @@ def get_user_sent_requests(db: Client, user_id: str) -> list[dict[str, Any]]:
     return _fetch_users_by_ids(db, request_ids)
 
 
+def _is_pending_request_for(db: Client, user_id: str, other_id: str) -> bool:
+    """Return whether ``user_id`` holds an unanswered request from ``other_id``."""
+    doc = cast("DocumentSnapshot", _get_friendship_ref(db, user_id, other_id).get())
+    data = (doc.to_dict() or {}) if doc.exists else {}
+    return data.get("status") == "pending" and data.get("initiator") is False
+
+
 def accept_friend_request(db: Client, user_id: str, requester_id: str) -> bool:
     """Accept a friend request and ensure reciprocal status."""
     try:
         batch = db.batch()
+        if _is_pending_request_for(db, user_id, requester_id):
+            stage_badge_change(db, batch, user_id, FRIEND_REQUESTS, -1)
         for uid, friend_id in [(user_id, requester_id), (requester_id, user_id)]:
             ref = (
                 db.collection("users")
@@ -134,6 +144,9 @@ def cancel_friend_request(db: Client, user_id: str, target_user_id: str) -> bool
     """Cancel or decline a friend request for both users."""
     try:
         batch = db.batch()
+        for recipient, sender in [(user_id, target_user_id), (target_user_id, user_id)]:
+            if _is_pending_request_for(db, recipient, sender):
+                stage_badge_change(db, batch, recipient, FRIEND_REQUESTS, -1)
         for uid, tid in [(user_id, target_user_id), (target_user_id, user_id)]:
             ref = (
                 db.collection("users").document(uid).collection("friends").document(tid)
@@ -165,6 +178,8 @@ def send_friend_request(db: Client, user_id: str, friend_id: str) -> bool:
             .collection("friends")
             .document(user_id)
         )
+        if not _is_pending_request_for(db, friend_id, user_id):
+            stage_badge_change(db, batch, friend_id, FRIEND_REQUESTS, 1)
         batch.set(their_ref, {"status": "pending", "initiator": False})
         batch.commit()
         return True
@@ -4,7 +4,6 @@ import datetime
 from typing import TYPE_CHECKING, Any, cast
 
 from .stats_utils import (
-    _get_team_ids_from_match,
     _get_user_match_won_lost,
 )
 
@@ -228,62 +227,14 @@ def calculate_stats(matches: list[DocumentSnapshot], user_id: str) -> dict[str,
     return _format_stats_response(wins, losses, processed)
 
 
-def _get_h2h_match_data(
-    data: dict[str, Any],
-) -> tuple[tuple[int, int], tuple[set[str], set[str]]]:
-    """Extract scores and team IDs from match data."""
-    scores = (int(data.get("player1Score", 0)), int(data.get("player2Score", 0)))
-    team_ids = _get_team_ids_from_match(data)
-    return scores, team_ids
-
-
-def _calculate_h2h_delta(
-    u1: str,
-    u2: str,
-    teams: tuple[set[str], set[str]],
-    scores: tuple[int, int],
-) -> tuple[int, int, int]:
-    """Calculate win, loss, and point delta for user 1 in a specific matchup."""
-    t1, t2 = teams
-    s1, s2 = scores
-    if u1 in t1 and u2 in t2:
-        return (1 if s1 > s2 else 0), (1 if s1 < s2 else 0), (s1 - s2)
-    if u1 in t2 and u2 in t1:
-        return (1 if s2 > s1 else 0), (1 if s2 < s1 else 0), (s2 - s1)
-    return 0, 0, 0
-
-
-def _process_h2h_match(
-    data: dict[str, Any] | None,
-    user_id_1: str,
-    user_id_2: str,
-) -> tuple[int, int, int]:
-    """Process a single match for H2H stats."""
-    if not data or user_id_2 not in data.get("participants", []):
-        return 0, 0, 0
-
-    scores, team_ids = _get_h2h_match_data(data)
-    if scores[0] == scores[1]:
-        return 0, 0, 0
-
-    return _calculate_h2h_delta(user_id_1, user_id_2, team_ids, scores)
-
-
 def get_h2h_stats(db: Client, user_id_1: str, user_id_2: str) -> dict[str, Any] | None:
-    """Fetch head-to-head statistics between two users."""
-    from firebase_admin import firestore
-
-    wins = losses = points = 0
-    query = db.collection("matches").where(
-        filter=firestore.FieldFilter("participants", "array_contains", user_id_1),
-    )
-
-    for match in query.stream():
-        w, l_count, p_diff = _process_h2h_match(match.to_dict(), user_id_1, user_id_2)
-        wins, losses, points = wins + w, losses + l_count, points + p_diff
+    """Fetch head-to-head statistics between two users from the pair index."""
+    from pickaladder.match.services.head_to_head import HeadToHeadService
 
+    record = HeadToHeadService.get_record(db, user_id_1, user_id_2)
+    wins, losses = record["wins"], record["losses"]
     return (
-        {"wins": wins, "losses": losses, "point_diff": points}
+        {"wins": wins, "losses": losses, "point_diff": record["point_diff"]}
         if (wins > 0 or losses > 0)
         else None
     )
@@ -37,15 +37,67 @@ def merge_ghost_user(db: Client, real_user_ref: DocumentReference, email: str) -
 
 def merge_users(db: Client, source_id: str, target_id: str) -> None:
     """Perform a deep merge of two user accounts. Source is deleted."""
+    from pickaladder.group.services.leaderboard import (  # noqa: PLC0415
+        backfill_group_snapshots,
+    )
+    from pickaladder.group.services.match_cache import (  # noqa: PLC0415
+        stage_version_bump,
+    )
+    from pickaladder.group.services.standings import (  # noqa: PLC0415
+        rebuild_group_standings,
+    )
+    from pickaladder.match.services.command import (  # noqa: PLC0415
+        MatchCommandService,
+    )
+    from pickaladder.match.services.elo_replay import (  # noqa: PLC0415
+        EloReplayService,
+    )
+    from pickaladder.match.services.head_to_head import (  # noqa: PLC0415
+        HeadToHeadService,
+    )
+    from pickaladder.match.services.leaderboard_index import (  # noqa: PLC0415
+        LeaderboardIndexService,
+    )
+    from pickaladder.match.services.streaks import (  # noqa: PLC0415
+        StreakService,
+    )
     from pickaladder.teams.services import TeamService  # noqa: PLC0415
 
+    from .stats_summary import (  # noqa: PLC0415
+        get_summary_ref,
+        rebuild_user_summary,
+    )
+
     source_ref = db.collection("users").document(source_id)
     target_ref = db.collection("users").document(target_id)
     batch = db.batch()
-    _migrate_user_references(db, batch, source_ref, target_ref)  # type: ignore
+    matches = _migrate_user_references(db, batch, source_ref, target_ref)  # type: ignore
     TeamService.migrate_user_teams(db, batch, source_id, target_id)
+    group_ids = sorted({m["groupId"] for m in matches if m.get("groupId")})
+    # Cached group histories must not outlive the matches moved to the target
+    for group_id in group_ids:
+        stage_version_bump(db, batch, group_id)
     batch.delete(source_ref)
+    # The source's ranking row would otherwise keep counting towards ranks
+    batch.delete(
+        db.collection(LeaderboardIndexService.COLLECTION_NAME).document(source_id),
+    )
     batch.commit()
+    MatchCommandService.invalidate_cached_views(*matches)
+
+    # Group standings and snapshots still rank the source as its own player.
+    for group_id in group_ids:
+        rebuild_group_standings(db, group_id)
+        backfill_group_snapshots(db, group_id)
+
+    # The target now owns the source's matches, so its ratings must be replayed.
+    EloReplayService.schedule_replay(db, seeds=[target_id])
+    get_summary_ref(db, source_id).delete()
+    rebuild_user_summary(db, target_id)
+    # The stored streak still only reflects the target's own matches
+    StreakService.recompute(db, [target_id])
+    HeadToHeadService.rebuild_for_user(db, source_id)
+    HeadToHeadService.rebuild_for_user(db, target_id)
 
 
 def _migrate_user_references(
@@ -53,12 +105,16 @@ def _migrate_user_references(
     batch: _firestore.WriteBatch,
     ghost_ref: DocumentReference,
     real_user_ref: DocumentReference,
-) -> None:
-    """Orchestrate the migration of all user references."""
-    _migrate_singles_matches(db, batch, ghost_ref, real_user_ref)
-    _migrate_doubles_matches(db, batch, ghost_ref, real_user_ref)
+) -> list[dict[str, Any]]:
+    """Orchestrate the migration of all user references.
+
+    Returns the data of the migrated matches, as read before the migration.
+    """
+    matches = _migrate_singles_matches(db, batch, ghost_ref, real_user_ref)
+    matches += _migrate_doubles_matches(db, batch, ghost_ref, real_user_ref)
     _migrate_groups(db, batch, ghost_ref, real_user_ref)
     _migrate_tournaments(db, batch, ghost_ref, real_user_ref)
+    return matches
 
 
 def _migrate_singles_matches(
@@ -66,17 +122,49 @@ def _migrate_singles_matches(
     batch: _firestore.WriteBatch,
     ghost_ref: DocumentReference,
     real_user_ref: DocumentReference,
-) -> None:
-    """Update singles matches where the user is player 1 or 2."""
+) -> list[dict[str, Any]]:
+    """Update singles matches where the user is player 1 or 2.
+
+    Returns the data of the updated matches.
+    """
     match_updates: dict[str, dict[str, Any]] = {}
     for field in ["player1Ref", "player2Ref"]:
         for match in db.collection("matches").where(field, "==", ghost_ref).stream():
             if match.id not in match_updates:
-                match_updates[match.id] = {"ref": match.reference, "data": {}}
+                match_updates[match.id] = {
+                    "ref": match.reference,
+                    "match": match.to_dict() or {},
+                    "data": {},
+                }
             match_updates[match.id]["data"][field] = real_user_ref
 
     for update in match_updates.values():
+        update["data"].update(
+            _replace_user_ids(update["match"], ghost_ref.id, real_user_ref.id),
+        )
         batch.update(update["ref"], update["data"])
+    return [update["match"] for update in match_updates.values()]
+
+
+def _replace_user_ids(
+    data: dict[str, Any],
+    ghost_id: str,
+    real_id: str,
+) -> dict[str, Any]:
+    """Return the updates moving a match's denormalized user IDs to the real user."""
+    updates: dict[str, Any] = {}
+    for field in ("participants", "winners", "losers"):
+        ids = data.get(field)
+        if isinstance(ids, list) and ghost_id in ids:
+            updates[field] = [real_id if uid == ghost_id else uid for uid in ids]
+    for field in ("winnerId", "loserId"):
+        if data.get(field) == ghost_id:
+            updates[field] = real_id
+    for field in ("player_1_data", "player_2_data"):
+        snapshot = data.get(field)
+        if isinstance(snapshot, dict) and snapshot.get("uid") == ghost_id:
+            updates[f"{field}.uid"] = real_id
+    return updates
 
 
 def _update_doubles_match_team(
@@ -129,12 +217,19 @@ def _apply_doubles_migration_batch(
     docs: list[DocumentSnapshot],
     field: str,
     refs: tuple[DocumentReference, DocumentReference],
-) -> None:
-    """Prepare and apply batch updates for doubles matches."""
+) -> list[dict[str, Any]]:
+    """Prepare and apply batch updates for doubles matches.
+
+    Returns the data of the updated matches.
+    """
     match_updates: dict[str, dict[str, Any]] = {}
     for match in docs:
         if match.id not in match_updates:
-            match_updates[match.id] = {"ref": match.reference, "updates": {}}
+            match_updates[match.id] = {
+                "ref": match.reference,
+                "match": match.to_dict() or {},
+                "updates": {},
+            }
         _update_doubles_match_team(
             db,
             match,
@@ -142,10 +237,19 @@ def _apply_doubles_migration_batch(
             refs,
             match_updates[match.id]["updates"],
         )
+        if match_updates[match.id]["updates"]:
+            match_updates[match.id]["updates"].update(
+                _replace_user_ids(
+                    match_updates[match.id]["match"],
+                    refs[0].id,
+                    refs[1].id,
+                ),
+            )
 
-    for update in match_updates.values():
-        if update["updates"]:
-            batch.update(update["ref"], update["updates"])
+    updated = [u for u in match_updates.values() if u["updates"]]
+    for update in updated:
+        batch.update(update["ref"], update["updates"])
+    return [update["match"] for update in updated]
 
 
 def _migrate_doubles_matches(
@@ -153,12 +257,17 @@ def _migrate_doubles_matches(
     batch: _firestore.WriteBatch,
     ghost_ref: DocumentReference,
     real_user_ref: DocumentReference,
-) -> None:
-    """Update doubles matches where the user is in a team array."""
+) -> list[dict[str, Any]]:
+    """Update doubles matches where the user is in a team array.
+
+    Returns the data of the updated matches.
+    """
     refs = (ghost_ref, real_user_ref)
+    migrated: list[dict[str, Any]] = []
     for field in ["team1", "team2"]:
         matches = _fetch_doubles_matches_to_migrate(db, field, ghost_ref)
-        _apply_doubles_migration_batch(db, batch, matches, field, refs)
+        migrated += _apply_doubles_migration_batch(db, batch, matches, field, refs)
+    return migrated
 
 
 def _migrate_groups(
@@ -19,6 +19,35 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# User fields copied onto the user's global leaderboard index row
+LEADERBOARD_PROFILE_FIELDS = (
+    "name",
+    "username",
+    "profilePictureUrl",
+    "profilePictureThumbnailUrl",
+)
+
+
+def refresh_leaderboard_row(
+    db: Client,
+    user_id: str,
+    update_data: dict[str, Any],
+) -> None:
+    """Re-index a user whose name or avatar changed, if they are ranked."""
+    if not any(field in update_data for field in LEADERBOARD_PROFILE_FIELDS):
+        return
+    from pickaladder.core.tiered_cache import (  # noqa: PLC0415
+        RANKINGS_TAG,
+        invalidate_tags,
+        user_tag,
+    )
+    from pickaladder.match.services.leaderboard_index import (  # noqa: PLC0415
+        LeaderboardIndexService,
+    )
+
+    LeaderboardIndexService.refresh_users(db, [user_id])
+    invalidate_tags(RANKINGS_TAG, user_tag(user_id))
+
 
 def sync_dupr_rating(db: Client, user_id: str) -> bool:
     """Synchronize a user's DUPR rating from the DUPR API."""
@@ -78,6 +107,7 @@ def update_email_address(
         update_data["email"] = new_email
         update_data["email_verified"] = False
         db.collection("users").document(user_id).update(update_data)
+        refresh_leaderboard_row(db, user_id, update_data)
 
         try:
             MailService.send_email(
@@ -165,12 +195,12 @@ def reset_profile_picture(db: Client, user_id: str) -> bool:
 
         # 2. Update Firestore
         user_ref = db.collection("users").document(user_id)
-        user_ref.update(
-            {
-                "profilePictureUrl": "default",
-                "profilePictureThumbnailUrl": firestore.DELETE_FIELD,
-            },
-        )
+        update_data = {
+            "profilePictureUrl": "default",
+            "profilePictureThumbnailUrl": firestore.DELETE_FIELD,
+        }
+        user_ref.update(update_data)
+        refresh_leaderboard_row(db, user_id, update_data)
         return True
     except Exception as e:
         logger.exception(f"Error resetting profile picture for user {user_id}: {e}")
@@ -0,0 +1,235 @@
+"""Incrementally maintained per-user match statistics.
+
+Each ``user_stats_summary/{user_id}`` document holds a player's totals, win
+rate inputs, singles/doubles splits, points for and against, and current
+streak. Match writes keep it current, so the dashboard and profile read one
+document instead of streaming the user's whole match history.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any
+
+from firebase_admin import firestore
+from google.api_core.exceptions import Conflict
+
+from pickaladder.match.services.streaks import advance_streak
+
+from .stats_utils import _get_team_ids_from_match, _get_user_match_won_lost
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1.batch import WriteBatch
+    from google.cloud.firestore_v1.client import Client
+    from google.cloud.firestore_v1.document import DocumentReference
+
+SUMMARY_COLLECTION = "user_stats_summary"
+
+
+def get_summary_ref(db: Client, user_id: str) -> DocumentReference:
+    """Return the reference of a user's stats summary."""
+    return db.collection(SUMMARY_COLLECTION).document(user_id)
+
+
+def _new_summary() -> dict[str, Any]:
+    """Return an empty stats summary."""
+    return {
+        "wins": 0,
+        "losses": 0,
+        "singles": {"wins": 0, "losses": 0},
+        "doubles": {"wins": 0, "losses": 0},
+        "points_for": 0,
+        "points_against": 0,
+        "streak": None,
+    }
+
+
+def _match_counters(data: dict[str, Any], user_id: str) -> dict[str, int]:
+    """Return the summary counters one match contributes for a user.
+
+    Keys are the dotted field paths of the summary document.
+    """
+    won, lost = _get_user_match_won_lost(data, user_id)
+    kind = "doubles" if data.get("matchType") == "doubles" else "singles"
+    s1, s2 = int(data.get("player1Score") or 0), int(data.get("player2Score") or 0)
+    team1_ids, _ = _get_team_ids_from_match(data)
+    points_for, points_against = (s1, s2) if user_id in team1_ids else (s2, s1)
+    return {
+        "wins": int(won),
+        "losses": int(lost),
+        f"{kind}.wins": int(won),
+        f"{kind}.losses": int(lost),
+        "points_for": points_for,
+        "points_against": points_against,
+    }
+
+
+def apply_match(summary: dict[str, Any], data: dict[str, Any], user_id: str) -> None:
+    """Fold a match into an in-memory summary, oldest matches first."""
+    for path, value in _match_counters(data, user_id).items():
+        head, _, leaf = path.partition(".")
+        if leaf:
+            summary[head][leaf] += value
+        else:
+            summary[head] += value
+    won, lost = _get_user_match_won_lost(data, user_id)
+    if won or lost:
+        summary["streak"] = advance_streak(summary["streak"], won)
+
+
+def _scan_user_matches(db: Client, user_id: str) -> dict[str, Any]:
+    """Build a summary by replaying every match of a user."""
+    matches = [
+        snap.to_dict() or {}
+        for snap in db.collection("matches")
+        .where(filter=firestore.FieldFilter("participants", "array_contains", user_id))
+        .stream()
+    ]
+    matches.sort(key=lambda m: m.get("matchDate") or datetime.datetime.min)
+    summary = _new_summary()
+    for data in matches:
+        apply_match(summary, data, user_id)
+    return summary
+
+
+def rebuild_user_summary(db: Client, user_id: str) -> dict[str, Any]:
+    """Recompute and overwrite the stats summary of a user."""
+    summary = _scan_user_matches(db, user_id)
+    get_summary_ref(db, user_id).set(
+        {**summary, "updatedAt": firestore.SERVER_TIMESTAMP},
+    )
+    return summary
+
+
+def _create_from_history(db: Client, user_id: str) -> dict[str, Any]:
+    """Build a missing summary and create it unless another write beat it.
+
+    On a conflict the stored summary is read again, so matches counted by
+    the other write's increments are kept.
+    """
+    summary = _scan_user_matches(db, user_id)
+    ref = get_summary_ref(db, user_id)
+    try:
+        ref.create({**summary, "updatedAt": firestore.SERVER_TIMESTAMP})
+    except Conflict:
+        snap = ref.get()
+        stored = snap.to_dict() if snap.exists else None
+        if isinstance(stored, dict):
+            return stored
+    return summary
+
+
+def _ensure_summaries(db: Client, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Return the stored summaries of users, creating missing ones from history.
+
+    Missing summaries are created before the match batch commits, so the
+    batch only ever increments existing documents.
+    """
+    refs = [get_summary_ref(db, uid) for uid in user_ids]
+    summaries = {}
+    for snap in db.get_all(refs) if refs else []:
+        summary = snap.to_dict() if snap.exists else None
+        if not isinstance(summary, dict):
+            summary = _create_from_history(db, snap.id)
+        summaries[snap.id] = summary
+    return summaries
+
+
+def _stage_counter_changes(
+    db: Client,
+    batch: WriteBatch,
+    user_ids: list[str],
+    counters: dict[str, dict[str, int]],
+) -> None:
+    """Queue counter increments on the summaries of users."""
+    for uid in _ensure_summaries(db, user_ids):
+        upd: dict[str, Any] = {
+            path: firestore.Increment(value)
+            for path, value in counters[uid].items()
+            if value
+        }
+        upd["updatedAt"] = firestore.SERVER_TIMESTAMP
+        batch.update(get_summary_ref(db, uid), upd)
+
+
+def stage_recorded_match(
+    db: Client,
+    batch: WriteBatch,
+    match_data: dict[str, Any],
+) -> None:
+    """Queue summary updates for everyone in a newly recorded match."""
+    user_ids = list(dict.fromkeys(match_data.get("participants") or []))
+    for uid, summary in _ensure_summaries(db, user_ids).items():
+        upd: dict[str, Any] = {
+            path: firestore.Increment(value)
+            for path, value in _match_counters(match_data, uid).items()
+            if value
+        }
+        won, lost = _get_user_match_won_lost(match_data, uid)
+        if won or lost:
+            upd["streak"] = advance_streak(summary.get("streak"), won)
+        upd["updatedAt"] = firestore.SERVER_TIMESTAMP
+        batch.update(get_summary_ref(db, uid), upd)
+
+
+def stage_edited_match(
+    db: Client,
+    batch: WriteBatch,
+    old_data: dict[str, Any],
+    new_data: dict[str, Any],
+) -> None:
+    """Queue the counter swap for an edited match score.
+
+    Streaks are re-derived afterwards by ``StreakService.recompute``.
+    """
+    user_ids = list(dict.fromkeys(new_data.get("participants") or []))
+    counters = {}
+    for uid in user_ids:
+        old = _match_counters(old_data, uid)
+        new = _match_counters(new_data, uid)
+        counters[uid] = {path: new[path] - old.get(path, 0) for path in new}
+    _stage_counter_changes(db, batch, user_ids, counters)
+
+
+def stage_deleted_match(
+    db: Client,
+    batch: WriteBatch,
+    data: dict[str, Any],
+) -> None:
+    """Queue the removal of a deleted match from its players' summaries."""
+    user_ids = list(dict.fromkeys(data.get("participants") or []))
+    counters = {
+        uid: {path: -value for path, value in _match_counters(data, uid).items()}
+        for uid in user_ids
+    }
+    _stage_counter_changes(db, batch, user_ids, counters)
+
+
+def summary_to_stats(summary: dict[str, Any]) -> dict[str, Any]:
+    """Shape a summary like the stats dict the dashboard and profile render."""
+    wins, losses = summary.get("wins", 0), summary.get("losses", 0)
+    total = wins + losses
+    streak = summary.get("streak")
+    if not isinstance(streak, dict):
+        streak = {}
+    return {
+        "wins": wins,
+        "losses": losses,
+        "total_games": total,
+        "win_rate": (wins / total * 100) if total > 0 else 0,
+        "current_streak": streak.get("length", 0),
+        "streak_type": streak.get("type") or "N/A",
+        "singles": summary.get("singles") or {"wins": 0, "losses": 0},
+        "doubles": summary.get("doubles") or {"wins": 0, "losses": 0},
+        "points_for": summary.get("points_for", 0),
+        "points_against": summary.get("points_against", 0),
+    }
+
+
+def get_user_stats_summary(db: Client, user_id: str) -> dict[str, Any]:
+    """Return a user's stats from the summary, building it on first read."""
+    snap = get_summary_ref(db, user_id).get()
+    summary = snap.to_dict() if snap.exists else None
+    if not isinstance(summary, dict):
+        summary = _create_from_history(db, user_id)
+    return summary_to_stats(summary)
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
-if TYPE_CHECKING:
-    from google.cloud.firestore_v1.document import DocumentReference
+from pickaladder.core.match_record import MatchRecord
 
 
 def _get_ids_from_refs(refs: list[Any]) -> set[str]:
@@ -11,74 +10,27 @@ def _get_ids_from_refs(refs: list[Any]) -> set[str]:
     return {str(r.id if hasattr(r, "id") else r) for r in refs if r}
 
 
-def _extract_id_from_match_slot(
-    slot_ref: DocumentReference | None,
-    slot_data: dict[str, Any],
-    slot_id: str | None,
-) -> str:
-    """Extract ID from reference, dictionary data, or direct ID string."""
-    return str(
-        (slot_ref.id if slot_ref and hasattr(slot_ref, "id") else "")
-        or slot_data.get("uid")
-        or slot_id
-        or "",
-    )
-
-
-def _get_singles_ids(data: dict[str, Any]) -> tuple[set[str], set[str]]:
-    """Extract member IDs from a singles match."""
-    id1 = _extract_id_from_match_slot(
-        data.get("player1Ref"),
-        data.get("player_1_data", {}),
-        data.get("player1Id"),
-    )
-    id2 = _extract_id_from_match_slot(
-        data.get("player2Ref"),
-        data.get("player_2_data", {}),
-        data.get("player2Id"),
-    )
-    return {id1}, {id2}
-
-
 def _get_team_ids_from_match(data: dict[str, Any]) -> tuple[set[str], set[str]]:
     """Extract team 1 and team 2 member IDs from a match."""
-    if data.get("matchType") == "doubles":
-        return _get_ids_from_refs(data.get("team1", [])), _get_ids_from_refs(
-            data.get("team2", []),
-        )
-
-    return _get_singles_ids(data)
-
-
-def _evaluate_win_loss(score_a: int, score_b: int) -> tuple[bool, bool]:
-    """Helper to evaluate win/loss status based on scores."""
-    return (score_a > score_b), (score_a < score_b)
+    record = MatchRecord(data)
+    return set(record.team1), set(record.team2)
 
 
 def _get_user_match_won_lost(
-    match_data: dict[str, Any],
+    match_data: dict[str, Any] | MatchRecord,
     user_id: str,
 ) -> tuple[bool, bool]:
     """Determine if the user won or lost the match, including handling of draws."""
+    if isinstance(match_data, MatchRecord):
+        return match_data.won_lost(user_id)
+
     winners = match_data.get("winners")
     losers = match_data.get("losers")
 
     if winners is not None and losers is not None:
         return (user_id in winners), (user_id in losers)
 
-    p1_score = int(match_data.get("player1Score", 0))
-    p2_score = int(match_data.get("player2Score", 0))
-
-    if p1_score == p2_score:
-        return False, False
-
-    t1_ids, t2_ids = _get_team_ids_from_match(match_data)
-    if user_id in t1_ids:
-        return _evaluate_win_loss(p1_score, p2_score)
-    if user_id in t2_ids:
-        return _evaluate_win_loss(p2_score, p1_score)
-
-    return False, False
+    return MatchRecord(match_data).won_lost(user_id)
 
 
 def _get_user_match_result(
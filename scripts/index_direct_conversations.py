@@ -0,0 +1,87 @@
+"""Backfill the pair lookup of direct conversations created before it existed."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from pickaladder.messaging.repository import (  # noqa: E402
+    DIRECT_CONVERSATION_PARTICIPANTS,
+    DIRECT_LOOKUP_COLLECTION,
+    MessagingRepository,
+)
+
+
+def _load_credentials() -> credentials.Certificate | None:
+    """Load Firebase credentials from file or environment variable."""
+    cred_path = project_root / "firebase_credentials.json"
+    if cred_path.exists():
+        return credentials.Certificate(str(cred_path))
+
+    cred_json = os.environ.get("FIREBASE_CREDENTIALS_JSON")
+    if cred_json:
+        try:
+            return credentials.Certificate(json.loads(cred_json))
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def initialize_firebase() -> bool:
+    """Initializes the Firebase Admin SDK."""
+    if firebase_admin._apps:
+        return True
+    cred = _load_credentials()
+    if not cred:
+        return False
+    firebase_admin.initialize_app(cred)
+    return True
+
+
+def index_all(db: Any) -> int:
+    """Write the missing pair lookups and return how many were added.
+
+    When a pair has several legacy conversations, the first one seen is kept.
+    """
+    added = 0
+    for doc in db.collection(MessagingRepository.COLLECTION_NAME).stream():
+        data = doc.to_dict() or {}
+        parts = data.get("participants", [])
+        if (
+            len(parts) != DIRECT_CONVERSATION_PARTICIPANTS
+            or data.get("type") == "group_announcement"
+            or data.get("pairKey")
+        ):
+            continue
+        pair_key = MessagingRepository.direct_pair_key(*parts)
+        lookup_ref = db.collection(DIRECT_LOOKUP_COLLECTION).document(pair_key)
+        if lookup_ref.get().exists:
+            continue
+        lookup_ref.set({"conversationId": doc.id, "participants": sorted(parts)})
+        doc.reference.update({"pairKey": pair_key})
+        added += 1
+    return added
+
+
+def main() -> None:
+    """CLI entry point."""
+    if not initialize_firebase():
+        print("Error: Firebase credentials not found.")
+        sys.exit(1)
+
+    count = index_all(firestore.client())
+    print(f"Indexed {count} direct conversation(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import logging
+import random
 import sys
 import time
 import unittest.mock
@@ -20,6 +21,9 @@ THRESHOLDS = {
     "MatchService.record_match": 0.5,
     "Leaderboard.get_global": 0.1,  # Should be very fast when cached
     "Leaderboard.get_group": 0.1,  # Should be very fast when cached
+    "StandingAggregator.aggregate": 0.5,  # 200 players / 20k matches
+    "EloReplay.replay_ratings": 3.0,  # 2000 players / 100k matches
+    "LeaderboardEngine.build": 2.5,  # 200 players / 50k matches
 }
 
 
@@ -101,6 +105,98 @@ def benchmark_leaderboards(db):
     return hit_global, hit_group
 
 
+def benchmark_standing_aggregator(players=200, matches=20000):
+    from pickaladder.core.ranking.aggregator import StandingAggregator
+
+    # Close 11-9 games between random pairs produce large tied win buckets,
+    # which exercises every tie-break level.
+    rng = random.Random(42)
+    uids = [f"player_{i}" for i in range(players)]
+    match_list = []
+    for _ in range(matches):
+        p1, p2 = rng.sample(uids, 2)
+        s1, s2 = (11, 9) if rng.random() < 0.5 else (9, 11)
+        match_list.append(
+            {
+                "status": "COMPLETED",
+                "participants": [p1, p2],
+                "player1Score": s1,
+                "player2Score": s2,
+                "winnerId": p1 if s1 > s2 else p2,
+            },
+        )
+
+    start_time = time.time()
+    StandingAggregator.aggregate(uids, match_list)
+    end_time = time.time()
+    return end_time - start_time
+
+
+def benchmark_elo_replay(players=2000, matches=100000):
+    from datetime import datetime, timedelta, timezone
+    from types import SimpleNamespace
+
+    from pickaladder.match.services.elo_replay import ReplayTable, replay_ratings
+
+    rng = random.Random(42)
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    refs = [SimpleNamespace(id=f"player_{i}") for i in range(players)]
+    match_list = []
+    for i in range(matches):
+        p1, p2 = rng.sample(refs, 2)
+        match_list.append(
+            {
+                "player1Ref": p1,
+                "player2Ref": p2,
+                "winner": "team1" if rng.random() < 0.5 else "team2",
+                "matchDate": base + timedelta(minutes=i),
+            },
+        )
+
+    # Table build plus a full replay: everything but the Firestore round trips.
+    start_time = time.time()
+    replay_ratings(ReplayTable.from_matches(match_list))
+    end_time = time.time()
+    return end_time - start_time
+
+
+def benchmark_leaderboard_engine(players=200, matches=50000):
+    from datetime import datetime, timedelta, timezone
+    from types import SimpleNamespace
+
+    from pickaladder.group.services.leaderboard_engine import (
+        parse_matches,
+        run_leaderboard_engine,
+    )
+
+    # Half singles, half doubles, as a group's history would be stored.
+    rng = random.Random(42)
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    refs = [SimpleNamespace(id=f"player_{i}") for i in range(players)]
+    snaps = []
+    for i in range(matches):
+        if rng.random() < 0.5:
+            p1, p2 = rng.sample(refs, 2)
+            data = {"matchType": "singles", "player1Ref": p1, "player2Ref": p2}
+        else:
+            a, b, c, d = rng.sample(refs, 4)
+            data = {"matchType": "doubles", "team1": [a, b], "team2": [c, d]}
+        s1, s2 = (11, rng.randint(0, 9)) if rng.random() < 0.5 else (9, 11)
+        data.update(
+            player1Score=s1,
+            player2Score=s2,
+            matchDate=base + timedelta(minutes=i),
+        )
+        snaps.append(SimpleNamespace(id=f"match_{i}", to_dict=lambda d=data: d))
+    player_docs = [SimpleNamespace(id=r.id) for r in refs]
+
+    # Parsing every snapshot plus the engine pass, without the Firestore query.
+    start_time = time.time()
+    run_leaderboard_engine(parse_matches(snaps), player_docs)
+    end_time = time.time()
+    return end_time - start_time
+
+
 def main() -> None:
     # Patch mockfirestore to support FieldFilter etc.
     patch_mockfirestore()
@@ -137,6 +233,15 @@ def main() -> None:
             results["Leaderboard.get_global"] = hit_global
             results["Leaderboard.get_group"] = hit_group
 
+            logger.info("Benchmarking StandingAggregator (200 players, 20k matches)...")
+            results["StandingAggregator.aggregate"] = benchmark_standing_aggregator()
+
+            logger.info("Benchmarking ELO replay (2000 players, 100k matches)...")
+            results["EloReplay.replay_ratings"] = benchmark_elo_replay()
+
+            logger.info("Benchmarking leaderboard engine (200 players, 50k matches)...")
+            results["LeaderboardEngine.build"] = benchmark_leaderboard_engine()
+
             failed = False
             for name, duration in results.items():
                 threshold = THRESHOLDS.get(name)
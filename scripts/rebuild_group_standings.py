@@ -0,0 +1,83 @@
+"""Backfill or repair the per-group standings projection documents."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from pickaladder.group.services.standings import (  # noqa: E402
+    rebuild_group_standings,
+)
+
+
+def _load_credentials() -> credentials.Certificate | None:
+    """Load Firebase credentials from file or environment variable."""
+    cred_path = project_root / "firebase_credentials.json"
+    if cred_path.exists():
+        return credentials.Certificate(str(cred_path))
+
+    cred_json = os.environ.get("FIREBASE_CREDENTIALS_JSON")
+    if cred_json:
+        try:
+            return credentials.Certificate(json.loads(cred_json))
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def initialize_firebase() -> bool:
+    """Initializes the Firebase Admin SDK."""
+    if firebase_admin._apps:
+        return True
+    cred = _load_credentials()
+    if not cred:
+        return False
+    firebase_admin.initialize_app(cred)
+    return True
+
+
+def rebuild_all(db: Any, group_ids: list[str] | None = None) -> int:
+    """Rebuild the standings of the given groups, or of every group."""
+    if not group_ids:
+        group_ids = [doc.id for doc in db.collection("groups").stream()]
+
+    for group_id in group_ids:
+        doc = rebuild_group_standings(db, group_id)
+        print(
+            f"Rebuilt {group_id}: {doc['matchCount']} matches, "
+            f"{len(doc['players'])} players",
+        )
+    return len(group_ids)
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "group_ids",
+        nargs="*",
+        help="Groups to rebuild (defaults to all groups).",
+    )
+    args = parser.parse_args()
+
+    if not initialize_firebase():
+        print("Error: Firebase credentials not found.")
+        sys.exit(1)
+
+    count = rebuild_all(firestore.client(), args.group_ids)
+    print(f"Rebuilt standings for {count} group(s).")
+
+
+if __name__ == "__main__":
+    main()
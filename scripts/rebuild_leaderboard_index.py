@@ -0,0 +1,99 @@
+"""Backfill the global leaderboard index, its rank decay or Rising Stars buckets."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from pickaladder.match.services.leaderboard_index import (  # noqa: E402
+    LeaderboardIndexService,
+)
+from pickaladder.match.services.rank_decay import RankDecayService  # noqa: E402
+from pickaladder.match.services.record_service import (  # noqa: E402
+    MatchRecordService,
+)
+
+
+def _load_credentials() -> credentials.Certificate | None:
+    """Load Firebase credentials from file or environment variable."""
+    cred_path = project_root / "firebase_credentials.json"
+    if cred_path.exists():
+        return credentials.Certificate(str(cred_path))
+
+    cred_json = os.environ.get("FIREBASE_CREDENTIALS_JSON")
+    if cred_json:
+        try:
+            return credentials.Certificate(json.loads(cred_json))
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def initialize_firebase() -> bool:
+    """Initializes the Firebase Admin SDK."""
+    if firebase_admin._apps:
+        return True
+    cred = _load_credentials()
+    if not cred:
+        return False
+    firebase_admin.initialize_app(cred)
+    return True
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--decay-only",
+        action="store_true",
+        help="Only apply rank decay to users and their entries (periodic job).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Pages of users processed in parallel by --decay-only.",
+    )
+    parser.add_argument(
+        "--win-buckets",
+        action="store_true",
+        help="Recount the daily win buckets behind Rising Stars.",
+    )
+    args = parser.parse_args()
+
+    if not initialize_firebase():
+        print("Error: Firebase credentials not found.")
+        sys.exit(1)
+
+    db = firestore.client()
+    if args.win_buckets:
+        count = MatchRecordService.rebuild_win_buckets(db)
+        print(f"Rebuilt {count} daily win buckets.")
+    elif args.decay_only:
+        totals = RankDecayService.run(
+            db,
+            workers=args.workers,
+            progress=lambda scanned, updated: print(
+                f"  scanned {scanned} users, {updated} updated",
+            ),
+        )
+        print(
+            f"Updated decay for {totals['updated']} of {totals['scanned']} users.",
+        )
+    else:
+        count = LeaderboardIndexService.rebuild(db)
+        print(f"Indexed {count} players.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Replay match history and rewrite stale ELO ratings and win/loss counters."""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import sys
+from pathlib import Path
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from pickaladder.match.services.elo_replay import EloReplayService  # noqa: E402
+
+
+def _load_credentials() -> credentials.Certificate | None:
+    """Load Firebase credentials from file or environment variable."""
+    cred_path = project_root / "firebase_credentials.json"
+    if cred_path.exists():
+        return credentials.Certificate(str(cred_path))
+
+    cred_json = os.environ.get("FIREBASE_CREDENTIALS_JSON")
+    if cred_json:
+        try:
+            return credentials.Certificate(json.loads(cred_json))
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def initialize_firebase() -> bool:
+    """Initializes the Firebase Admin SDK."""
+    if firebase_admin._apps:
+        return True
+    cred = _load_credentials()
+    if not cred:
+        return False
+    firebase_admin.initialize_app(cred)
+    return True
+
+
+def _print_progress(done: int, total: int) -> None:
+    """Report write-back progress on one line."""
+    print(f"\rChecked {done}/{total} players and teams", end="", flush=True)
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--since",
+        type=datetime.date.fromisoformat,
+        help="Only rewrite ratings reachable from matches on or after YYYY-MM-DD.",
+    )
+    parser.add_argument(
+        "--pending",
+        action="store_true",
+        help="Run the replays queued by the app instead of a new one.",
+    )
+    parser.add_argument(
+        "seeds",
+        nargs="*",
+        help="User or team IDs whose change should be propagated (default: all).",
+    )
+    args = parser.parse_args()
+
+    if not initialize_firebase():
+        print("Error: Firebase credentials not found.")
+        sys.exit(1)
+
+    if args.pending:
+        count = EloReplayService.run_pending(firestore.client())
+        print(f"Ran {count} queued replays.")
+        return
+
+    since = None
+    if args.since:
+        since = datetime.datetime.combine(
+            args.since,
+            datetime.time.min,
+            tzinfo=datetime.timezone.utc,
+        )
+    count = EloReplayService.replay(
+        firestore.client(),
+        since=since,
+        seeds=args.seeds or None,
+        progress=_print_progress,
+    )
+    print(f"\nUpdated {count} documents.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Write daily group leaderboard snapshots (run once a day after midnight UTC)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+# Add project root to sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from pickaladder.group.services.leaderboard import (  # noqa: E402
+    backfill_group_snapshots,
+    take_daily_snapshot,
+)
+
+
+def _load_credentials() -> credentials.Certificate | None:
+    """Load Firebase credentials from file or environment variable."""
+    cred_path = project_root / "firebase_credentials.json"
+    if cred_path.exists():
+        return credentials.Certificate(str(cred_path))
+
+    cred_json = os.environ.get("FIREBASE_CREDENTIALS_JSON")
+    if cred_json:
+        try:
+            return credentials.Certificate(json.loads(cred_json))
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def initialize_firebase() -> bool:
+    """Initializes the Firebase Admin SDK."""
+    if firebase_admin._apps:
+        return True
+    cred = _load_credentials()
+    if not cred:
+        return False
+    firebase_admin.initialize_app(cred)
+    return True
+
+
+def snapshot_all(
+    db: Any,
+    group_ids: list[str] | None = None,
+    backfill: bool = False,
+) -> int:
+    """Snapshot the given groups, or every group, returning the docs written."""
+    if not group_ids:
+        group_ids = [doc.id for doc in db.collection("groups").stream()]
+
+    written = 0
+    for group_id in group_ids:
+        if backfill:
+            count = backfill_group_snapshots(db, group_id)
+            print(f"Backfilled {group_id}: {count} snapshots")
+            written += count
+        elif take_daily_snapshot(db, group_id) is not None:
+            written += 1
+        else:
+            print(f"Skipped {group_id}: no standings projection")
+    return written
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "group_ids",
+        nargs="*",
+        help="Groups to snapshot (defaults to all groups).",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Replay match history and write a snapshot for every match day.",
+    )
+    args = parser.parse_args()
+
+    if not initialize_firebase():
+        print("Error: Firebase credentials not found.")
+        sys.exit(1)
+
+    count = snapshot_all(firestore.client(), args.group_ids, args.backfill)
+    print(f"Wrote {count} leaderboard snapshot(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import pytest
 from mockfirestore import MockFirestore
 
 from pickaladder import create_app
+from pickaladder.group.services.match_cache import clear_group_match_cache
 from tests.mock_utils import MockFirestoreBuilder, patch_mockfirestore
 
 
@@ -29,6 +30,14 @@ def apply_global_patches(mock_db: MockFirestore) -> Iterator[None]:
         yield
 
 
+@pytest.fixture(autouse=True)
+def reset_group_match_cache() -> Iterator[None]:
+    """Keep parsed group histories from leaking between tests."""
+    clear_group_match_cache()
+    yield
+    clear_group_match_cache()
+
+
 @pytest.fixture
 def app() -> Iterator[Any]:
     """Create and configure a new app instance for each test."""
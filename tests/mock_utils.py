@@ -3,15 +3,60 @@
 from __future__ import annotations
 
 import unittest.mock
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any
 
-from mockfirestore import CollectionReference, Query
+from mockfirestore import CollectionReference, MockFirestore, Query
 from mockfirestore.document import DocumentReference
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
 
+def build_match(  # noqa: PLR0913
+    team1: str | list[str],
+    team2: str | list[str],
+    score1: int,
+    score2: int,
+    day: int = 0,
+    *,
+    base: datetime | None = None,
+    group_id: str | None = None,
+    db: Any = None,
+) -> dict[str, Any]:
+    """Build a recorded match payload between two sides of user IDs.
+
+    Sides given as single IDs make a singles match keyed by player IDs, and
+    by user references when ``db`` is given; lists make a doubles match. The
+    match is dated ``day`` days after ``base``, which defaults to now.
+    """
+    side1 = [team1] if isinstance(team1, str) else list(team1)
+    side2 = [team2] if isinstance(team2, str) else list(team2)
+    winners, losers = (side1, side2) if score1 > score2 else (side2, side1)
+    data: dict[str, Any] = {
+        "player1Score": score1,
+        "player2Score": score2,
+        "participants": side1 + side2,
+        "matchDate": (base or datetime.now(timezone.utc)) + timedelta(days=day),
+    }
+    if score1 != score2:
+        data.update(
+            winner="team1" if score1 > score2 else "team2",
+            winners=winners,
+            losers=losers,
+        )
+    if isinstance(team1, str) and isinstance(team2, str):
+        data.update(matchType="singles", player1Id=team1, player2Id=team2)
+        if db is not None:
+            data["player1Ref"] = db.collection("users").document(team1)
+            data["player2Ref"] = db.collection("users").document(team2)
+    else:
+        data.update(matchType="doubles", team1=side1, team2=side2)
+    if group_id:
+        data["groupId"] = group_id
+    return data
+
+
 class MockArrayUnion:
     def __init__(self, values: list[Any]) -> None:
         self.values = values
@@ -40,11 +85,11 @@ class MockBatch:
         self.updates: list[tuple[Any, str, Any]] = []
         self.commit = unittest.mock.MagicMock(side_effect=self._real_commit)
 
-    def update(self, ref: Any, data: Any) -> None:
+    def update(self, ref: Any, data: Any, option: Any = None) -> None:
         self.updates.append((ref, "UPDATE", data))
 
     def set(self, ref: Any, data: Any, merge: bool = False) -> None:
-        self.updates.append((ref, "SET", data))
+        self.updates.append((ref, "MERGE" if merge else "SET", data))
 
     def delete(self, ref: Any) -> None:
         self.updates.append((ref, "DELETE", None))
@@ -55,10 +100,29 @@ class MockBatch:
                 ref.delete()
             elif op == "SET":
                 ref.set(data)
+            elif op == "MERGE":
+                current = ref.get().to_dict() or {}
+                ref.set(_merge_fields(current, data))
             else:
                 ref.update(data)
 
 
+def _merge_fields(current: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+    """Merge nested fields into a document like ``set(merge=True)``."""
+    merged = dict(current)
+    for key, value in data.items():
+        existing = merged.get(key)
+        if isinstance(value, dict):
+            merged[key] = _merge_fields(
+                existing if isinstance(existing, dict) else {}, value
+            )
+        elif type(value).__name__ == "Increment":
+            merged[key] = (existing or 0) + value.value
+        else:
+            merged[key] = value
+    return merged
+
+
 def _apply_array_union(current_list: list[Any], values: list[Any]) -> list[Any]:
     """Apply union operation."""
     merged = list(current_list)
@@ -94,8 +158,30 @@ def _handle_sentinel_updates(
     return new_data
 
 
-def _patched_update(self: Any, data: dict[str, Any]) -> Any:
-    """Internal update method that handles sentinels."""
+def _resolve_increments(doc_ref: Any, data: dict[str, Any]) -> dict[str, Any]:
+    """Turn Increment sentinels into the values they produce.
+
+    mockfirestore rewrites a dotted increment as a nested map, which replaces
+    the sibling fields of that map.
+    """
+    current = doc_ref._orig_get().to_dict() or {}
+    resolved = dict(data)
+    for key, value in data.items():
+        if type(value).__name__ != "Increment":
+            continue
+        existing: Any = current
+        for part in key.split("."):
+            existing = existing.get(part) if isinstance(existing, dict) else None
+        resolved[key] = (existing or 0) + value.value
+    return resolved
+
+
+def _patched_update(self: Any, data: dict[str, Any], option: Any = None) -> Any:
+    """Internal update method that handles sentinels.
+
+    Preconditions in ``option`` are accepted and ignored.
+    """
+    data = _resolve_increments(self, data)
     sentinels = {
         k: v
         for k, v in data.items()
@@ -135,6 +221,12 @@ def _patched_compare_func(self: Any, op: str) -> Any:
     """Patched comparison function for Query."""
     if op == "array_contains":
         return lambda x, y: x is not None and y in x
+    if op == "array_contains_any":
+        return lambda x, y: x is not None and any(v in y for v in x)
+    if op in ("<", "<=", ">", ">="):
+        # Firestore leaves documents without the field out of range filters
+        compare = self._orig_compare_func(op)
+        return lambda x, y: x is not None and compare(x, y)
     return self._orig_compare_func(op)
 
 
@@ -150,6 +242,21 @@ def _doc_ref_hash_fn(self: Any) -> int:
     return hash(tuple(self._path))
 
 
+def _doc_ref_create(self: Any, data: dict[str, Any]) -> None:
+    """Create a document, failing like Firestore if it already exists."""
+    from google.api_core.exceptions import AlreadyExists
+
+    if self.get().exists:
+        msg = f"Document already exists: {self.id}"
+        raise AlreadyExists(msg)
+    self.set(data)
+
+
+def _patched_delete(self: Any, option: Any = None) -> None:
+    """Delete a document; preconditions in ``option`` are accepted and ignored."""
+    self._orig_delete()
+
+
 def _patched_doc_ref_get(self: Any, transaction: Any = None) -> Any:
     """Handle transaction argument in get."""
     return self._orig_get()
@@ -181,7 +288,7 @@ class MockFirestoreBuilder:
 
     @staticmethod
     def _patch_query_comparison() -> None:
-        """Patch Query._compare_func to handle array_contains safely."""
+        """Patch Query._compare_func to handle array membership safely."""
         if not hasattr(Query, "_orig_compare_func"):
             Query._orig_compare_func = Query._compare_func
             Query._compare_func = _patched_compare_func
@@ -207,6 +314,14 @@ class MockFirestoreBuilder:
         if not hasattr(DocumentReference, "_orig_update"):
             DocumentReference._orig_update = DocumentReference.update
             DocumentReference.update = _patched_update
+        if not hasattr(DocumentReference, "_orig_delete"):
+            DocumentReference._orig_delete = DocumentReference.delete
+            DocumentReference.delete = _patched_delete
+        if not hasattr(DocumentReference, "create"):
+            DocumentReference.create = _doc_ref_create
+        if not hasattr(MockFirestore, "write_option"):
+            # Preconditions are accepted and ignored by MockBatch
+            MockFirestore.write_option = lambda self, **kwargs: kwargs
 
     @staticmethod
     def patch_db_auth() -> unittest.mock.MagicMock:
@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import unittest
-from unittest.mock import MagicMock
+from typing import Any
+from unittest.mock import MagicMock, patch
 
+from mockfirestore import MockFirestore
+
+from pickaladder.core.activity import services
 from pickaladder.core.activity.services import ActivityService
 
 
@@ -65,5 +69,42 @@ class ActivityServiceTestCase(unittest.TestCase):
         mock_ref.update.assert_called_once()
 
 
+def test_feed_page_batches_actors_and_caches_first_page(
+    app: Any,
+    mock_db: MockFirestore,
+) -> None:
+    """Actors resolve in one get_all; logging an activity clears the first page."""
+    for uid in ("a", "b"):
+        mock_db.collection("users").document(uid).set({"username": uid.upper()})
+    for i, uid in enumerate(["a", "b", "a"]):
+        mock_db.collection("activities").document(f"act{i}").set(
+            {"userId": uid, "type": "MATCH_COMPLETED", "timestamp": i, "reactions": []},
+        )
+    get_all = mock_db.get_all
+    load = services._load_feed_page
+
+    with (
+        app.app_context(),
+        patch.object(mock_db, "get_all", side_effect=get_all) as get_all_spy,
+        patch.object(services, "_load_feed_page", side_effect=load) as load_spy,
+    ):
+        feed, cursor = ActivityService.get_feed_page(mock_db, limit=2)
+        assert [item["id"] for item in feed] == ["act2", "act1"]
+        assert feed[0]["user"]["username"] == "A"
+        assert cursor == "act1"
+
+        older, cursor = ActivityService.get_feed_page(mock_db, limit=2, cursor=cursor)
+        assert [item["id"] for item in older] == ["act0"]
+        assert cursor is None
+        assert get_all_spy.call_count == 1
+
+        ActivityService.get_feed_page(mock_db, limit=2)
+        assert load_spy.call_count == 2
+        with patch.object(services.firestore, "SERVER_TIMESTAMP", 3):
+            ActivityService.log_activity(mock_db, "b", "MATCH_COMPLETED", {})
+        ActivityService.get_feed_page(mock_db, limit=2)
+        assert load_spy.call_count == 3
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -33,6 +33,14 @@ class AnnouncementTestCase(unittest.TestCase):
                 "pickaladder.firestore",
                 new=self.mock_firestore_service,
             ),
+            "badges": patch(
+                "pickaladder.context_processors.get_badge_counts",
+                return_value={
+                    "friendRequests": 0,
+                    "tournamentInvites": 0,
+                    "unreadMessages": 0,
+                },
+            ),
         }
 
         self.mocks = {name: p.start() for name, p in patchers.items()}
@@ -48,32 +48,36 @@ class AnnouncementTestCase(unittest.TestCase):
         assert payload["unreadCount"]["m1"] == 0
 
     @patch(
-        "pickaladder.messaging.repository.MessagingRepository.get_user_conversations",
+        "pickaladder.messaging.repository.MessagingRepository.get_user_conversations_page",
     )
-    @patch("pickaladder.group.repository.GroupRepository.get_by_id")
-    @patch("pickaladder.user.services.UserService.get_user_by_id")
-    def test_get_inbox_with_announcements(
-        self,
-        mock_get_user,
-        mock_get_group,
-        mock_get_convs,
-    ) -> None:
+    def test_get_inbox_with_announcements(self, mock_get_page) -> None:
         """Test inbox display for announcements."""
-        mock_get_convs.return_value = [
-            {
-                "id": "ann1",
-                "type": "group_announcement",
-                "groupId": "group1",
-                "participants": ["u1", "u2"],
-                "unreadCount": {"u1": 1},
-            },
-        ]
-        mock_get_group.return_value = {"name": "Test Group"}
-
-        inbox = MessagingService.get_inbox(self.mock_db, "u1")
-
-        assert len(inbox) == 1
+        mock_get_page.return_value = (
+            [
+                {
+                    "id": "ann1",
+                    "type": "group_announcement",
+                    "groupId": "group1",
+                    "participants": ["u1", "u2"],
+                    "unreadCount": {"u1": 1},
+                },
+                {"id": "dm1", "participants": ["u1", "u3"]},
+            ],
+            "dm1",
+        )
+        group_snap = MagicMock(id="group1", exists=True)
+        group_snap.to_dict.return_value = {"name": "Test Group"}
+        user_snap = MagicMock(id="u3", exists=True)
+        user_snap.to_dict.return_value = {"username": "carol"}
+        self.mock_db.get_all.return_value = [group_snap, user_snap]
+
+        inbox, next_cursor = MessagingService.get_inbox(self.mock_db, "u1")
+
+        assert next_cursor == "dm1"
         assert inbox[0]["display_name"] == "Test Group (Announcements)"
+        assert inbox[1]["display_name"] == "carol"
+        # The groups and the users are resolved in one batched lookup
+        assert self.mock_db.get_all.call_count == 1
 
     @patch("pickaladder.messaging.repository.firestore.Increment")
     def test_add_message_multi_unread(self, mock_increment) -> None:
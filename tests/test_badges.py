@@ -0,0 +1,72 @@
+"""Tests for the per-user badge counters."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from mockfirestore import MockFirestore
+
+from pickaladder.user.services.badges import (
+    FRIEND_REQUESTS,
+    UNREAD_MESSAGES,
+    get_badge_counts,
+    get_badges_ref,
+    reconcile_badge_count,
+)
+from pickaladder.user.services.friendship import (
+    cancel_friend_request,
+    send_friend_request,
+)
+
+
+def _badge_deltas(batch: MagicMock) -> dict[str, dict[str, int]]:
+    """Collect the counter increments queued on a mocked batch by user."""
+    deltas: dict[str, dict[str, int]] = {}
+    for call in batch.set.call_args_list:
+        ref, data = call.args[0], call.args[1]
+        if ref._path[0] == "user_badges":
+            deltas[ref.id] = {field: value.value for field, value in data.items()}
+    return deltas
+
+
+def test_counts_are_rebuilt_once_and_memoized(app: Any, mock_db: MockFirestore) -> None:
+    """A missing document is rebuilt from its sources and read once per request."""
+    mock_db.collection("users").document("u1").collection("friends").document(
+        "u2",
+    ).set({"status": "pending", "initiator": False})
+    mock_db.collection("conversations").document("c1").set(
+        {"participants": ["u1", "u2"], "unreadCount": {"u1": 3}, "updatedAt": 1},
+    )
+
+    with app.app_context():
+        counts = get_badge_counts(mock_db, "u1")
+        assert counts[FRIEND_REQUESTS] == 1
+        assert counts[UNREAD_MESSAGES] == 3
+
+        get_badges_ref(mock_db, "u1").set({FRIEND_REQUESTS: -2})
+        assert get_badge_counts(mock_db, "u1") is counts
+
+        reconcile_badge_count(mock_db, "u1", FRIEND_REQUESTS, 0)
+        assert counts[FRIEND_REQUESTS] == 0
+    stored = get_badges_ref(mock_db, "u1").get().to_dict()
+    assert stored[FRIEND_REQUESTS] == 0
+
+
+def test_friend_request_write_paths_adjust_recipient(mock_db: MockFirestore) -> None:
+    """Sending counts once for the recipient; cancelling takes it back."""
+    batch = MagicMock()
+    mock_db.batch = lambda: batch  # type: ignore[method-assign]
+
+    assert send_friend_request(mock_db, "u1", "u2")
+    assert _badge_deltas(batch) == {"u2": {FRIEND_REQUESTS: 1}}
+
+    mock_db.collection("users").document("u2").collection("friends").document(
+        "u1",
+    ).set({"status": "pending", "initiator": False})
+    batch.reset_mock()
+    assert send_friend_request(mock_db, "u1", "u2")
+    assert _badge_deltas(batch) == {}
+
+    assert cancel_friend_request(mock_db, "u1", "u2")
+    assert _badge_deltas(batch) == {"u2": {FRIEND_REQUESTS: -1}}
@@ -194,11 +194,12 @@ class BestBudsTestCase(unittest.TestCase):
             "groupId": group_id,
             "matchDate": datetime.now(),
         }
-        (
-            mock_db.collection(
-                "matches",
-            ).where.return_value.order_by.return_value.limit.return_value.stream.return_value
-        ) = [match_doc] * 10
+        matches = mock_db.collection("matches").where.return_value
+        matches.stream.return_value = [match_doc] * 10
+        # The recent matches list runs its own bounded query
+        matches.order_by.return_value.limit.return_value.stream.return_value = [
+            match_doc
+        ] * 10
 
     def _setup_friends(self, mock_db: MagicMock, user_id: str) -> None:
         (
@@ -0,0 +1,93 @@
+"""Tests for background fan-out of group announcements."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from mockfirestore import MockFirestore
+
+from pickaladder.messaging.broadcast import BroadcastService
+from tests.mock_utils import MockBatch
+
+
+def test_broadcast_persists_then_delivers_in_chunks(mock_db: MockFirestore) -> None:
+    """The message is written up front; members are counted chunk by chunk."""
+    mock_db.batch = lambda: MockBatch(mock_db)  # type: ignore[method-assign]
+    members = ["owner", "m1", "m2", "m3"]
+    mock_db.collection("conversations").document("ann").set(
+        {"participants": members, "unreadCount": dict.fromkeys(members, 0)},
+    )
+    mock_db.collection("users").document("m1").set({"fcmToken": "t1"})
+    mock_db.collection("users").document("m3").set({"fcmToken": "t3"})
+
+    with patch.object(BroadcastService, "schedule") as schedule:
+        job_id = BroadcastService.post(mock_db, "ann", "owner", "Courts closed")
+
+    conv_ref = mock_db.collection("conversations").document("ann")
+    assert [m.id for m in conv_ref.collection("messages").stream()] == [job_id]
+    status = BroadcastService.get_status(mock_db, job_id)
+    assert (status["status"], status["total"], status["delivered"]) == ("queued", 3, 0)
+    schedule.assert_called_once_with(mock_db, job_id)
+
+    with (
+        patch("pickaladder.messaging.broadcast.BROADCAST_CHUNK_SIZE", 2),
+        patch(
+            "pickaladder.messaging.broadcast.NotificationService.send_multicast_now",
+            side_effect=lambda tokens, *args: len(tokens),
+        ) as send,
+        patch(
+            "pickaladder.messaging.repository.MessagingRepository.stage_unread",
+        ) as stage_unread,
+    ):
+        progress = BroadcastService.deliver(mock_db, job_id)
+
+    assert progress == {"delivered": 3, "notified": 2}
+    assert [c.args[3] for c in stage_unread.call_args_list] == [["m1", "m2"], ["m3"]]
+    assert send.call_count == 2
+    status = BroadcastService.get_status(mock_db, job_id)
+    assert (status["status"], status["delivered"], status["notified"]) == (
+        "done",
+        3,
+        2,
+    )
+
+
+def test_failed_broadcast_resumes_after_the_last_counted_chunk(
+    mock_db: MockFirestore,
+) -> None:
+    """A rerun counts each member once, starting where the failure stopped."""
+    mock_db.batch = lambda: MockBatch(mock_db)  # type: ignore[method-assign]
+    members = ["owner", "m1", "m2", "m3"]
+    mock_db.collection("conversations").document("ann").set(
+        {"participants": members, "unreadCount": dict.fromkeys(members, 0)},
+    )
+    with patch.object(BroadcastService, "schedule"):
+        job_id = BroadcastService.post(mock_db, "ann", "owner", "Courts closed")
+
+    sends: list[list[str]] = []
+
+    def _send(tokens: list[str], *_args: object) -> int:
+        sends.append(tokens)
+        if len(sends) == 2:  # noqa: PLR2004
+            raise RuntimeError("push service unavailable")
+        return 0
+
+    with (
+        patch("pickaladder.messaging.broadcast.BROADCAST_CHUNK_SIZE", 1),
+        patch(
+            "pickaladder.messaging.broadcast.NotificationService.send_multicast_now",
+            side_effect=_send,
+        ),
+    ):
+        with pytest.raises(RuntimeError):
+            BroadcastService.deliver(mock_db, job_id)
+        status = BroadcastService.get_status(mock_db, job_id)
+        assert (status["status"], status["delivered"]) == ("failed", 2)
+
+        assert BroadcastService.deliver(mock_db, job_id)["delivered"] == 3
+        assert BroadcastService.deliver(mock_db, job_id)["delivered"] == 3
+
+    assert len(sends) == 3
+    conv = mock_db.collection("conversations").document("ann").get().to_dict()
+    assert conv["unreadCount"] == {"owner": 0, "m1": 1, "m2": 1, "m3": 1}
@@ -0,0 +1,265 @@
+"""Tests for the batch ELO replay engine."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from google.api_core.exceptions import FailedPrecondition
+from mockfirestore import MockFirestore
+from mockfirestore.collection import CollectionReference
+
+from pickaladder.match.services import EloReplayService, MatchStatsCalculator
+from pickaladder.match.services.elo_replay import ReplayTable, replay_ratings
+from tests.mock_utils import MockBatch, build_match
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Scores giving each side the win
+SCORES = {"team1": (11, 5), "team2": (5, 11)}
+
+
+def test_replay_matches_incremental_updates(mock_db: MockFirestore) -> None:
+    """Replaying in date order reproduces the ratings written on record."""
+    history = [
+        ("a", "b", "team1"),
+        ("b", "c", "team1"),
+        ("a", "c", "team2"),
+        ("a", "b", "team2"),
+    ]
+    expected: dict[str, dict[str, Any]] = {}
+    for p1, p2, winner in history:
+        u1, u2 = MatchStatsCalculator.calculate_elo_updates(
+            winner,
+            expected.get(p1),
+            expected.get(p2),
+        )
+        for uid, upd in ((p1, u1), (p2, u2)):
+            expected[uid] = {"stats": {k.split(".")[1]: v for k, v in upd.items()}}
+
+    matches = [
+        build_match(p1, p2, *SCORES[w], day, base=BASE, db=mock_db)
+        for day, (p1, p2, w) in enumerate(history)
+    ]
+    table = ReplayTable.from_matches(reversed(matches))
+    elo, wins, losses, _ = replay_ratings(table)
+
+    for idx, (_, uid) in enumerate(table.keys):
+        stats = expected[uid]["stats"]
+        assert elo[idx] == pytest.approx(stats["elo"])
+        assert (wins[idx], losses[idx]) == (stats["wins"], stats["losses"])
+
+
+def test_seeded_replay_only_flags_reachable_players(mock_db: MockFirestore) -> None:
+    """A change spreads to later opponents but not to unrelated players."""
+    matches = [
+        build_match("a", "b", 11, 5, 0, base=BASE, db=mock_db),
+        build_match("c", "d", 11, 5, 1, base=BASE, db=mock_db),
+        build_match("b", "e", 11, 5, 2, base=BASE, db=mock_db),
+    ]
+    table = ReplayTable.from_matches(matches)
+    start = table.first_index_at(BASE + timedelta(days=1))
+    _, _, _, dirty = replay_ratings(table, start, seeds=["a"])
+
+    flagged = {uid for idx, (_, uid) in enumerate(table.keys) if dirty[idx]}
+    assert flagged == {"a"}
+
+    _, _, _, dirty = replay_ratings(table, 0, seeds=["a"])
+    flagged = {uid for idx, (_, uid) in enumerate(table.keys) if dirty[idx]}
+    assert flagged == {"a", "b", "e"}
+
+
+def test_replay_writes_back_changed_stats(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only entities whose stored stats differ are rewritten."""
+    monkeypatch.setattr(
+        CollectionReference,
+        "select",
+        lambda self, _fields: self,
+        raising=False,
+    )
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    users.document("a").set({"name": "A", "stats": {"wins": 1, "elo": 1216.0}})
+    users.document("b").set({"name": "B", "stats": {"losses": 1, "elo": 1184.0}})
+    users.document("c").set({"name": "C", "stats": {"elo": 1200.0}})
+    # The match was edited so that B won; stored ratings still show A winning.
+    mock_db.collection("matches").document("m1").set(
+        build_match("a", "b", 5, 11, 0, base=BASE, db=mock_db),
+    )
+
+    progress: list[tuple[int, int]] = []
+    updated = EloReplayService.replay(
+        mock_db,
+        since=BASE,
+        seeds=["a", "b"],
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert updated == 2
+    assert progress == [(2, 2)]
+    a = users.document("a").get().to_dict()["stats"]
+    assert (a["wins"], a["losses"], a["elo"]) == (0, 1, 1184.0)
+    assert users.document("c").get().to_dict()["stats"] == {"elo": 1200.0}
+
+
+def _history_db(mock_db: MockFirestore, monkeypatch: pytest.MonkeyPatch) -> list:
+    """Store a short history with checkpoints and return the replay's reads."""
+    monkeypatch.setattr(
+        CollectionReference,
+        "select",
+        lambda self, _fields: self,
+        raising=False,
+    )
+    mock_db.batch = lambda: MockBatch(mock_db)
+    for uid in "abcd":
+        mock_db.collection("users").document(uid).set({"name": uid, "stats": {}})
+    history = [("a", "b"), ("c", "d"), ("a", "c"), ("b", "d"), ("a", "d")]
+    for day, (p1, p2) in enumerate(history):
+        data = build_match(p1, p2, 11, 5, day, base=BASE, db=mock_db)
+        data["createdAt"] = data["matchDate"]
+        mock_db.collection("matches").document(f"m{day}").set(data)
+    EloReplayService.replay(mock_db)
+
+    reads: list = []
+    load_table = EloReplayService.load_table
+
+    def _spy(db: MockFirestore, since: datetime | None = None) -> ReplayTable:
+        reads.append(since)
+        return load_table(db, since)
+
+    monkeypatch.setattr(EloReplayService, "load_table", _spy)
+    return reads
+
+
+def _assert_matches_full_replay(mock_db: MockFirestore) -> None:
+    """Stored stats equal a replay of the whole remaining history."""
+    matches = [s.to_dict() for s in mock_db.collection("matches").stream()]
+    table = ReplayTable.from_matches(matches)
+    elo, wins, losses, _ = replay_ratings(table)
+    for idx, (_, uid) in enumerate(table.keys):
+        stats = mock_db.collection("users").document(uid).get().to_dict()["stats"]
+        assert stats.get("elo", 1200.0) == pytest.approx(elo[idx])
+        assert (stats.get("wins", 0), stats.get("losses", 0)) == (
+            wins[idx],
+            losses[idx],
+        )
+
+
+def test_replay_after_an_edit_reads_only_later_matches(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An edit is replayed from the checkpoints of the matches after it."""
+    reads = _history_db(mock_db, monkeypatch)
+    mock_db.collection("matches").document("m2").update({"winner": "team2"})
+
+    since = BASE + timedelta(days=2)
+    EloReplayService.replay(mock_db, since=since, seeds=["a", "c"])
+
+    assert reads == [since]
+    _assert_matches_full_replay(mock_db)
+    # The rewritten checkpoints let the next replay start from them too
+    mock_db.collection("matches").document("m3").update({"winner": "team2"})
+    since = BASE + timedelta(days=3)
+    EloReplayService.replay(mock_db, since=since, seeds=["b", "d"])
+    assert reads[-1] == since
+    _assert_matches_full_replay(mock_db)
+
+
+def test_replay_after_a_deletion_starts_from_the_removed_match(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Players of a deleted match restart from its own checkpoint."""
+    reads = _history_db(mock_db, monkeypatch)
+    ref = mock_db.collection("matches").document("m2")
+    removed = ref.get().to_dict()
+    ref.delete()
+
+    since = BASE + timedelta(days=2)
+    EloReplayService.replay(mock_db, since=since, seeds=["a", "c"], removed=removed)
+
+    assert reads == [since]
+    _assert_matches_full_replay(mock_db)
+
+
+def test_replay_runs_again_when_ratings_change_meanwhile(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A write lost to a concurrent rating update is replayed, not forced."""
+    reads = _history_db(mock_db, monkeypatch)
+    mock_db.collection("matches").document("m4").update({"winner": "team2"})
+    conflicts: list[bool] = []
+
+    class RacingBatch(MockBatch):
+        def _real_commit(self) -> None:
+            if not conflicts and any(
+                "stats.elo" in data for _, _, data in self.updates
+            ):
+                conflicts.append(True)
+                raise FailedPrecondition("user changed since it was read")
+            super()._real_commit()
+
+    mock_db.batch = lambda: RacingBatch(mock_db)
+    since = BASE + timedelta(days=4)
+    EloReplayService.replay(mock_db, since=since, seeds=["a", "d"])
+
+    assert conflicts == [True]
+    assert reads == [since, since]
+    _assert_matches_full_replay(mock_db)
+
+
+def test_replay_runs_again_when_a_match_is_recorded_meanwhile(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A match recorded after the history was read is not overwritten."""
+    reads = _history_db(mock_db, monkeypatch)
+    mock_db.collection("matches").document("m4").update({"winner": "team2"})
+    load_table = EloReplayService.load_table
+
+    def _record_after_load(db: MockFirestore, since: datetime | None = None) -> Any:
+        table = load_table(db, since)
+        if len(reads) == 1:
+            data = build_match("a", "b", 11, 5, 5, base=BASE, db=mock_db)
+            data["createdAt"] = datetime.now(timezone.utc)
+            mock_db.collection("matches").document("m5").set(data)
+        return table
+
+    monkeypatch.setattr(EloReplayService, "load_table", _record_after_load)
+    since = BASE + timedelta(days=4)
+    EloReplayService.replay(mock_db, since=since, seeds=["a", "d"])
+
+    assert reads[:2] == [since, since]
+    _assert_matches_full_replay(mock_db)
+
+
+def test_scheduled_replays_are_queued_not_run_inline(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Without an executor the request waits in the queue for the next drain."""
+    from pickaladder.extensions import executor
+
+    _history_db(mock_db, monkeypatch)
+
+    def _unavailable(*_args: Any) -> None:
+        raise RuntimeError
+
+    monkeypatch.setattr(executor, "run_async", _unavailable)
+    mock_db.collection("matches").document("m4").update({"winner": "team2"})
+    EloReplayService.schedule_replay(
+        mock_db, since=BASE + timedelta(days=4), seeds=["a", "d"]
+    )
+
+    a = mock_db.collection("users").document("a").get().to_dict()["stats"]
+    assert a["wins"] == 3  # noqa: PLR2004
+    assert len(list(mock_db.collection("elo_replays").stream())) == 1
+
+    assert EloReplayService.run_pending(mock_db) == 1
+    assert list(mock_db.collection("elo_replays").stream()) == []
+    _assert_matches_full_replay(mock_db)
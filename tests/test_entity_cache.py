@@ -0,0 +1,109 @@
+"""Tests for the request-scoped entity cache."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from mockfirestore import MockFirestore
+
+from pickaladder.core.entity_cache import get_entities, get_loader
+
+
+def test_entities_are_fetched_in_chunks_once_per_request(
+    app: Any,
+    mock_db: MockFirestore,
+) -> None:
+    """IDs resolve in chunked round trips; repeats and misses are not refetched."""
+    for uid in ("a", "b", "c"):
+        mock_db.collection("users").document(uid).set({"username": uid.upper()})
+    get_all = mock_db.get_all
+
+    with (
+        app.app_context(),
+        patch("pickaladder.core.entity_cache.ENTITY_GET_ALL_CHUNK", 2),
+        patch.object(mock_db, "get_all", side_effect=get_all) as spy,
+    ):
+        users = get_entities(mock_db, "users", ["a", "b", "a", "c", "gone", ""])
+        assert users == {
+            "a": {"username": "A", "id": "a"},
+            "b": {"username": "B", "id": "b"},
+            "c": {"username": "C", "id": "c"},
+        }
+        assert spy.call_count == 2
+
+        assert set(get_entities(mock_db, "users", ["c", "gone"])) == {"c"}
+        assert spy.call_count == 2
+
+
+def test_deferred_loads_coalesce_and_repositories_share_the_memo(
+    app: Any,
+    mock_db: MockFirestore,
+) -> None:
+    """Queued keys go out in one get_all; repository reads reuse the results."""
+    from pickaladder.group.repository import GroupRepository
+
+    mock_db.collection("users").document("u1").set({"username": "ann"})
+    mock_db.collection("groups").document("g1").set({"name": "Dinkers"})
+    get_all = mock_db.get_all
+
+    with (
+        app.app_context(),
+        patch.object(mock_db, "get_all", side_effect=get_all) as spy,
+    ):
+        loader = get_loader()
+        loader.defer(mock_db, "users", ["u1"])
+        assert loader.load(mock_db, "groups", "g1") == {"name": "Dinkers", "id": "g1"}
+        assert spy.call_count == 1
+
+        group = GroupRepository.get_by_id(mock_db, "g1")
+        assert group == {"name": "Dinkers", "id": "g1"}
+        group["name"] = "Changed"
+        assert loader.load(mock_db, "users", "u1") == {"username": "ann", "id": "u1"}
+        assert spy.call_count == 1
+
+        GroupRepository.update(mock_db, "g1", {"name": "Picklers"})
+        group = GroupRepository.get_by_id(mock_db, "g1")
+        assert group is not None
+        assert group["name"] == "Picklers"
+
+
+def test_threads_sharing_a_loader_fetch_each_document_once(
+    mock_db: MockFirestore,
+) -> None:
+    """A document another thread is fetching is waited for, not refetched."""
+    import threading
+
+    from pickaladder.core.entity_cache import DataLoader
+
+    mock_db.collection("users").document("a").set({"username": "A"})
+    loader = DataLoader()
+    ref = mock_db.collection("users").document("a")
+    started, release = threading.Event(), threading.Event()
+    reads: list[str] = []
+    get = type(ref).get
+
+    def slow_get(self: Any, *args: Any, **kwargs: Any) -> Any:
+        reads.append(self.id)
+        started.set()
+        release.wait(5)
+        return get(self, *args, **kwargs)
+
+    results: list[Any] = []
+    with patch.object(type(ref), "get", slow_get):
+        first = threading.Thread(
+            target=lambda: results.append(loader.load(mock_db, "users", "a")),
+        )
+        first.start()
+        started.wait(5)
+        second = threading.Thread(
+            target=lambda: results.append(loader.load(mock_db, "users", "a")),
+        )
+        second.start()
+        second.join(0.1)
+        release.set()
+        first.join(5)
+        second.join(5)
+
+    assert reads == ["a"]
+    assert results == [{"username": "A", "id": "a"}] * 2
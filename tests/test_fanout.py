@@ -0,0 +1,155 @@
+"""Tests for concurrent page section fan-out."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pickaladder.core.fanout import (
+    FanOut,
+    clear_section_latencies,
+    get_section_latencies,
+)
+from pickaladder.user.services.dashboard import (
+    _fetch_social_and_tournaments,
+    get_dashboard_data,
+)
+
+
+def test_sections_run_concurrently_and_degrade() -> None:
+    """Slow and failing sections fall back to placeholders; latency is kept."""
+    clear_section_latencies()
+    release = threading.Event()
+
+    def boom() -> None:
+        raise RuntimeError
+
+    sections = FanOut("page")
+    started = time.perf_counter()
+    sections.submit("slow", lambda: release.wait(5), placeholder="later", timeout=0.2)
+    sections.submit("broken", boom, placeholder=[])
+    sections.submit("fast", lambda: "ok", placeholder=None)
+    results = sections.collect()
+    release.set()
+
+    assert results == {"slow": "later", "broken": [], "fast": "ok"}
+    assert time.perf_counter() - started < 2
+    assert sorted(sections.degraded) == ["broken", "slow"]
+    assert 150 <= sections.timings["slow"] <= 1000
+    assert get_section_latencies()["page.fast"]["count"] == 1
+
+
+def test_dashboard_social_sections_are_independent() -> None:
+    """One failing dashboard list is rendered empty; the others still load."""
+    with (
+        patch(
+            "pickaladder.user.services.dashboard.get_user_friends",
+            return_value=[{"id": "f1"}],
+        ),
+        patch(
+            "pickaladder.user.services.dashboard.get_group_rankings",
+            side_effect=RuntimeError,
+        ),
+        patch("pickaladder.user.services.dashboard.get_user_pending_requests"),
+        patch("pickaladder.user.services.dashboard.get_top_groups"),
+        patch("pickaladder.user.services.dashboard.TeamService"),
+        patch("pickaladder.user.services.dashboard.get_pending_tournament_invites"),
+        patch("pickaladder.user.services.dashboard.get_active_tournaments"),
+        patch("pickaladder.user.services.dashboard.get_past_tournaments"),
+    ):
+        data = _fetch_social_and_tournaments(MagicMock(), "u1")
+
+    assert data["friends"] == [{"id": "f1"}]
+    assert data["group_rankings"] == []
+    assert set(data["section_timings"]) >= {"friends", "group_rankings"}
+
+
+def test_queued_sections_are_cancelled_and_pages_isolated(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A section still queued at its deadline never runs; other pages go on."""
+    monkeypatch.setattr("pickaladder.core.fanout.FANOUT_MAX_WORKERS", 1)
+    release = threading.Event()
+    calls: list[str] = []
+
+    busy = FanOut("busy-page")
+    busy.submit("blocker", lambda: release.wait(5), timeout=0.1)
+    busy.submit("queued", lambda: calls.append("queued"), timeout=0.1)
+    other = FanOut("other-page")
+    other.submit("fast", lambda: "ok")
+    try:
+        assert other.collect() == {"fast": "ok"}
+        assert busy.collect() == {"blocker": None, "queued": None}
+    finally:
+        release.set()
+    time.sleep(0.1)
+
+    assert sorted(busy.degraded) == ["blocker", "queued"]
+    assert calls == []
+
+
+def test_concurrent_requests_do_not_share_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Two builds of the same page never queue behind each other's sections."""
+    monkeypatch.setattr("pickaladder.core.fanout.FANOUT_MAX_WORKERS", 1)
+    release = threading.Event()
+
+    first = FanOut("dashboard")
+    first.submit("blocker", lambda: release.wait(5), timeout=0.1)
+    second = FanOut("dashboard")
+    second.submit("fast", lambda: "ok", timeout=0.1)
+    try:
+        assert second.collect() == {"fast": "ok"}
+        assert second.degraded == []
+    finally:
+        release.set()
+        first.collect()
+
+
+def test_sections_share_the_request_globals(app: Any) -> None:
+    """Sections see the request's g, so its data loader is reused."""
+    from flask import g
+
+    from pickaladder.core.entity_cache import get_loader
+
+    with app.app_context():
+        loader = get_loader()
+        g.marker = "request"
+        sections = FanOut("page")
+        sections.submit("loader", get_loader)
+        sections.submit("marker", lambda: g.get("marker"))
+        results = sections.collect()
+
+    assert results == {"loader": loader, "marker": "request"}
+
+
+def test_dashboard_skips_onboarding_without_the_user() -> None:
+    """Onboarding is not computed from the placeholder of a degraded section."""
+
+    def _social(*_args: Any) -> dict[str, Any]:
+        return {
+            "friends": [],
+            "group_rankings": [],
+            "section_timings": {},
+            "section_degraded": [],
+        }
+
+    with (
+        patch(
+            "pickaladder.user.services.dashboard._fetch_vanity_stats",
+            side_effect=RuntimeError,
+        ),
+        patch(
+            "pickaladder.user.services.dashboard._fetch_social_and_tournaments",
+            side_effect=_social,
+        ),
+    ):
+        data = get_dashboard_data(MagicMock(), "u1")
+
+    assert data["onboarding_progress"] is None
+    assert data["stats"]["total_games"] == 0
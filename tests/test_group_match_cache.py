@@ -0,0 +1,92 @@
+"""Tests for the per-group parsed match cache."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from mockfirestore import MockFirestore
+
+from pickaladder.group.services.match_cache import (
+    get_group_matches,
+    stage_version_bump,
+)
+from pickaladder.group.services.standings import get_group_standings
+from tests.mock_utils import MockBatch, build_match
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_history_is_parsed_once_per_version(mock_db: MockFirestore) -> None:
+    """Reads share one parsed history until the group's version moves."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    mock_db.collection("groups").document("g1").set({"name": "G"})
+    matches = mock_db.collection("matches")
+    matches.document("m2").set(
+        build_match("a", "b", 11, 4, 2, base=BASE, group_id="g1")
+    )
+    matches.document("m1").set(
+        build_match("b", "a", 11, 9, 1, base=BASE, group_id="g1")
+    )
+
+    records = get_group_matches(mock_db, "g1")
+    assert [rec.id for rec in records] == ["m1", "m2"]
+    assert records[0].team1 == {"b"}
+    assert (records[0].p1_score, records[0].p2_score) == (11, 9)
+    with pytest.raises(AttributeError):
+        records[0].p1_score = 0  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        records[0].data["player1Score"] = 0  # type: ignore[index]
+
+    matches.document("m3").set(
+        build_match("a", "b", 11, 2, 3, base=BASE, group_id="g1")
+    )
+    assert get_group_matches(mock_db, "g1") is records
+
+    batch = mock_db.batch()
+    stage_version_bump(mock_db, batch, "g1")
+    batch.commit()
+    assert [rec.id for rec in get_group_matches(mock_db, "g1")] == ["m1", "m2", "m3"]
+
+
+def test_merged_matches_are_reread_under_the_target(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Merging accounts moves the match IDs and retires the cached history."""
+    from pickaladder.match.services.elo_replay import EloReplayService
+    from pickaladder.user.services.merging import merge_users
+
+    monkeypatch.setattr(EloReplayService, "schedule_replay", lambda *a, **k: None)
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    for uid in ("ghost", "real", "b"):
+        users.document(uid).set({"name": uid})
+    mock_db.collection("groups").document("g1").set({"name": "G"})
+    mock_db.collection("matches").document("m1").set(
+        {
+            "groupId": "g1",
+            "player1Score": 11,
+            "player2Score": 4,
+            "matchDate": BASE,
+            "player1Ref": users.document("ghost"),
+            "player2Ref": users.document("b"),
+            "participants": ["ghost", "b"],
+            "winners": ["ghost"],
+            "winnerId": "ghost",
+            "player_1_data": {"uid": "ghost"},
+        },
+    )
+    assert get_group_matches(mock_db, "g1")[0].team1 == {"ghost"}
+
+    merge_users(mock_db, "ghost", "real")
+
+    data = mock_db.collection("matches").document("m1").get().to_dict()
+    assert data["participants"] == ["real", "b"]
+    assert (data["winners"], data["winnerId"]) == (["real"], "real")
+    assert data["player_1_data"]["uid"] == "real"
+    assert get_group_matches(mock_db, "g1")[0].team1 == {"real"}
+    standings = get_group_standings(mock_db, "g1")
+    assert standings is not None
+    assert set(standings) == {"real", "b"}
+    assert standings["real"]["wins"] == 1
@@ -0,0 +1,287 @@
+"""Tests for the incrementally maintained group standings projection."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from mockfirestore import MockFirestore
+
+from pickaladder.group.services.leaderboard import get_group_leaderboard
+from pickaladder.group.services.match_cache import stage_version_bump
+from pickaladder.group.services.standings import (
+    apply_match,
+    get_group_standings,
+    rebuild_group_standings,
+    replace_match,
+    stage_edited_match,
+    stage_recorded_match,
+    stage_removed_match,
+    update_edited_form,
+    update_recorded_form,
+    update_removed_form,
+)
+from pickaladder.user.services.activity import get_group_rankings
+from tests.mock_utils import MockBatch, build_match
+
+
+def test_apply_match_tracks_counters_form_and_streak() -> None:
+    """Recorded matches update counters, the newest-first form and the streak."""
+    players: dict[str, dict[str, Any]] = {}
+    apply_match(players, "m1", build_match("a", "b", 5, 11, group_id="g1"))
+    apply_match(players, "m2", build_match("a", "b", 11, 7, group_id="g1"))
+    apply_match(players, "m3", build_match("a", "b", 11, 9, group_id="g1"))
+
+    a = players["a"]
+    assert (a["wins"], a["losses"], a["games"]) == (2, 1, 3)
+    assert a["total_score"] == 27
+    assert [f["result"] for f in a["form"]] == ["win", "win", "loss"]
+    assert a["streak"] == 2
+    assert players["b"]["streak"] == 0
+
+
+def test_replace_match_swaps_result() -> None:
+    """Editing a score moves the result without double counting."""
+    players: dict[str, dict[str, Any]] = {}
+    old = build_match("a", "b", 11, 5, group_id="g1")
+    apply_match(players, "m1", old)
+    replace_match(players, "m1", old, {**old, "player1Score": 3})
+
+    assert (players["a"]["wins"], players["a"]["losses"]) == (0, 1)
+    assert (players["b"]["wins"], players["b"]["losses"]) == (1, 0)
+    assert players["a"]["total_score"] == 3
+    assert players["a"]["streak"] == 0
+    assert players["b"]["streak"] == 1
+    assert players["b"]["form"][0]["result"] == "win"
+
+
+def test_concurrent_matches_both_count(mock_db: MockFirestore) -> None:
+    """Matches staged from the same read add up instead of overwriting."""
+    mock_db.collection("matches").document("m1").set(
+        build_match("a", "b", 11, 4, -2, group_id="g1")
+    )
+    rebuild_group_standings(mock_db, "g1")
+
+    first, second = MockBatch(mock_db), MockBatch(mock_db)
+    stage_recorded_match(
+        mock_db, first, "g1", "m2", build_match("a", "b", 11, 7, -1, group_id="g1")
+    )
+    stage_recorded_match(
+        mock_db, second, "g1", "m3", build_match("c", "b", 11, 9, group_id="g1")
+    )
+    first.commit()
+    second.commit()
+    update_recorded_form(
+        mock_db, "g1", "m2", build_match("a", "b", 11, 7, -1, group_id="g1")
+    )
+    update_recorded_form(
+        mock_db, "g1", "m3", build_match("c", "b", 11, 9, group_id="g1")
+    )
+
+    doc = mock_db.collection("group_standings").document("g1").get().to_dict()
+    assert doc["matchCount"] == 3
+    players = doc["players"]
+    assert (players["a"]["wins"], players["a"]["games"]) == (2, 2)
+    assert (players["b"]["losses"], players["b"]["games"]) == (3, 3)
+    assert players["b"]["total_score"] == 4 + 7 + 9
+    assert [f["matchId"] for f in players["b"]["form"]] == ["m3", "m2", "m1"]
+    assert (players["c"]["wins"], players["c"]["streak"]) == (1, 1)
+
+    edit = MockBatch(mock_db)
+    old = build_match("c", "b", 11, 9, group_id="g1")
+    new = {**old, "player1Score": 5}
+    stage_edited_match(mock_db, edit, "g1", "m3", old_data=old, new_data=new)
+    edit.commit()
+    update_edited_form(mock_db, "g1", "m3", old, new)
+    players = get_group_standings(mock_db, "g1")
+    assert players is not None
+    assert (players["c"]["wins"], players["c"]["losses"]) == (0, 1)
+    assert (players["c"]["streak"], players["b"]["streak"]) == (0, 1)
+    assert (players["b"]["wins"], players["b"]["total_score"]) == (1, 20)
+    assert players["a"]["wins"] == 2
+
+
+def test_concurrent_first_matches_bootstrap_once(mock_db: MockFirestore) -> None:
+    """Two first matches both count; the projection is created only once."""
+    mock_db.collection("matches").document("m1").set(
+        build_match("a", "b", 11, 4, -2, group_id="g1")
+    )
+
+    from pickaladder.group.services import standings
+
+    read_players = standings._read_players
+    reads: list[bool] = []
+
+    def stale_first_read(snap: Any) -> Any:
+        # The second match also read the projection before it existed
+        reads.append(True)
+        return None if len(reads) == 1 else read_players(snap)
+
+    first, second = MockBatch(mock_db), MockBatch(mock_db)
+    stage_recorded_match(
+        mock_db, first, "g1", "m2", build_match("a", "b", 11, 7, -1, group_id="g1")
+    )
+    with patch.object(standings, "_read_players", stale_first_read):
+        stage_recorded_match(
+            mock_db, second, "g1", "m3", build_match("c", "b", 11, 9, group_id="g1")
+        )
+    first.commit()
+    second.commit()
+
+    doc = mock_db.collection("group_standings").document("g1").get().to_dict()
+    assert len(reads) == 2
+    assert doc["matchCount"] == 3
+    assert doc["players"]["b"]["games"] == 3
+    assert doc["players"]["c"]["wins"] == 1
+
+
+def test_form_update_retries_after_a_concurrent_write(
+    mock_db: MockFirestore,
+) -> None:
+    """A form write that loses the precondition race is read and applied again."""
+    from google.api_core.exceptions import FailedPrecondition
+    from mockfirestore.document import DocumentReference
+
+    mock_db.collection("matches").document("m1").set(
+        build_match("a", "b", 11, 4, -2, group_id="g1")
+    )
+    rebuild_group_standings(mock_db, "g1")
+    update = DocumentReference.update
+    races: list[str] = []
+
+    def racing_update(self: Any, data: dict[str, Any], option: Any = None) -> Any:
+        if option is not None and not races:
+            races.append(self.id)
+            # Another match lands its form first
+            update(self, {"players.b.form": [{"matchId": "mX", "result": "win"}]})
+            raise FailedPrecondition("standings changed since read")
+        return update(self, data, option)
+
+    with patch.object(DocumentReference, "update", racing_update):
+        update_recorded_form(
+            mock_db, "g1", "m2", build_match("a", "b", 11, 7, group_id="g1")
+        )
+
+    players = get_group_standings(mock_db, "g1")
+    assert players is not None
+    assert races == ["g1"]
+    assert [f["matchId"] for f in players["b"]["form"]] == ["m2", "mX"]
+
+
+def test_deleted_match_leaves_the_projection(mock_db: MockFirestore) -> None:
+    """Deleting a match removes its counters and replays the streaks."""
+    mock_db.collection("groups").document("g1").set({"matchesVersion": 0})
+    matches = {
+        "m1": build_match("a", "b", 11, 4, -2, group_id="g1"),
+        "m2": build_match("b", "a", 11, 6, -1, group_id="g1"),
+        "m3": build_match("a", "b", 11, 9, group_id="g1"),
+    }
+    for match_id, data in matches.items():
+        mock_db.collection("matches").document(match_id).set(data)
+    rebuild_group_standings(mock_db, "g1")
+
+    batch = MockBatch(mock_db)
+    batch.delete(mock_db.collection("matches").document("m2"))
+    stage_removed_match(mock_db, batch, "g1", "m2", matches["m2"])
+    stage_version_bump(mock_db, batch, "g1")
+    batch.commit()
+    update_removed_form(mock_db, "g1", matches["m2"])
+
+    doc = mock_db.collection("group_standings").document("g1").get().to_dict()
+    assert doc["matchCount"] == 2
+    a, b = doc["players"]["a"], doc["players"]["b"]
+    assert (a["wins"], a["losses"], a["games"], a["total_score"]) == (2, 0, 2, 22)
+    assert (b["wins"], b["losses"], b["total_score"]) == (0, 2, 13)
+    assert [f["matchId"] for f in a["form"]] == ["m3", "m1"]
+    assert (a["streak"], a["best_streak"], b["best_streak"]) == (2, 2, 0)
+
+
+def test_rebuild_and_leaderboard_read(mock_db: MockFirestore, app: Any) -> None:
+    """The rebuild matches a replay and the leaderboard reads the projection."""
+    for uid in ("a", "b"):
+        mock_db.collection("users").document(uid).set({"name": uid.upper()})
+    members = [mock_db.collection("users").document(uid) for uid in ("a", "b")]
+    mock_db.collection("groups").document("g1").set({"members": members})
+    mock_db.collection("matches").document("m1").set(
+        build_match("a", "b", 11, 4, -2, group_id="g1")
+    )
+    mock_db.collection("matches").document("m2").set(
+        build_match("a", "b", 11, 6, -1, group_id="g1")
+    )
+
+    doc = rebuild_group_standings(mock_db, "g1")
+    assert doc["matchCount"] == 2
+    standings = get_group_standings(mock_db, "g1")
+    assert standings is not None
+    assert standings["a"]["streak"] == 2
+
+    # Matches are no longer needed once the projection exists.
+    mock_db.collection("matches").document("m1").delete()
+    mock_db.collection("matches").document("m2").delete()
+
+    with app.app_context():
+        leaderboard = get_group_leaderboard.uncached("g1")
+
+    a = next(p for p in leaderboard if p["id"] == "a")
+    assert a["wins"] == 2
+    assert a["avg_score"] == 11
+    assert a["form"] == ["win", "win"]
+    assert a["streak"] == 2
+
+
+def test_group_rankings_read_every_projection_together(
+    mock_db: MockFirestore,
+    app: Any,
+) -> None:
+    """Dashboard ranks come from the projections, not per-group match scans."""
+    users = mock_db.collection("users")
+    for uid, elo in (("a", 1300), ("b", 1250), ("c", 1100)):
+        users.document(uid).set({"name": uid.upper(), "stats": {"elo": elo}})
+    groups = mock_db.collection("groups")
+    groups.document("g1").set(
+        {"name": "One", "members": [users.document("a"), users.document("b")]}
+    )
+    groups.document("g2").set(
+        {"name": "Two", "members": [users.document("b"), users.document("c")]}
+    )
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(build_match("a", "b", 11, 4, group_id="g1"))
+    matches.document("m2").set(build_match("b", "c", 11, 9, group_id="g2"))
+    rebuild_group_standings(mock_db, "g1")
+    rebuild_group_standings(mock_db, "g2")
+    matches.document("m1").delete()
+    matches.document("m2").delete()
+
+    with (
+        app.app_context(),
+        patch(
+            "pickaladder.group.services.leaderboard.get_group_leaderboard",
+        ) as per_group,
+    ):
+        rankings = {r["group_id"]: r for r in get_group_rankings(mock_db, "b")}
+
+    per_group.assert_not_called()
+    assert rankings["g1"]["rank"] == 2
+    assert rankings["g1"]["player_above"] == "A"
+    assert rankings["g1"]["points_to_overtake"] == 11 - 4
+    assert (rankings["g2"]["rank"], rankings["g2"]["points"]) == (1, 11)
+
+
+def test_group_rankings_order_by_points(mock_db: MockFirestore, app: Any) -> None:
+    """Dashboard ranks follow average score, like the points to overtake."""
+    users = mock_db.collection("users")
+    for uid, elo in (("a", 1100), ("b", 1300)):
+        users.document(uid).set({"name": uid.upper(), "stats": {"elo": elo}})
+    mock_db.collection("groups").document("g1").set(
+        {"name": "One", "members": [users.document("a"), users.document("b")]}
+    )
+    mock_db.collection("matches").document("m1").set(
+        build_match("a", "b", 11, 4, group_id="g1")
+    )
+    rebuild_group_standings(mock_db, "g1")
+
+    with app.app_context():
+        [ranking] = get_group_rankings(mock_db, "b")
+
+    assert ranking["rank"] == 2
+    assert ranking["points_to_overtake"] == 11 - 4
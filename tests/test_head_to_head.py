@@ -0,0 +1,153 @@
+"""Tests for the pairwise head-to-head index."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from mockfirestore import MockFirestore
+
+from pickaladder.core.constants import H2H_RECENT_MATCHES
+from pickaladder.group.services.stats import get_head_to_head_stats
+from pickaladder.match.services.head_to_head import HeadToHeadService
+from pickaladder.user.services.match_stats import get_h2h_stats
+from tests.mock_utils import MockBatch, build_match
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_pair_record_is_built_once_and_oriented(mock_db: MockFirestore) -> None:
+    """The first read replays history; both sides see their own record."""
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(build_match(["a", "c"], ["b", "d"], 11, 5, 0, base=BASE))
+    matches.document("m2").set(build_match(["b", "c"], ["a", "d"], 11, 9, 1, base=BASE))
+    matches.document("m3").set(build_match(["a", "b"], ["c", "d"], 11, 3, 2, base=BASE))
+
+    record = HeadToHeadService.get_record(mock_db, "b", "a")
+    assert (record["wins"], record["losses"], record["matches"]) == (1, 1, 2)
+    assert record["point_diff"] == -4
+    assert record["partnership_record"] == {"wins": 1, "losses": 0}
+    assert record["recent_match_ids"] == ["m2", "m1"]
+
+    for match_id in ("m1", "m2", "m3"):
+        matches.document(match_id).delete()
+    assert get_h2h_stats(mock_db, "a", "b") == {
+        "wins": 1,
+        "losses": 1,
+        "point_diff": 4,
+    }
+
+
+def test_recorded_and_edited_matches_update_pairs(mock_db: MockFirestore) -> None:
+    """Recording increments the global and group pairs; an edit swaps results."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    HeadToHeadService.get_record(mock_db, "a", "b")
+    match = build_match(["a", "c"], ["b", "d"], 11, 7, 0, base=BASE, group_id="g1")
+
+    # The match document is written by the same batch on record.
+    batch = mock_db.batch()
+    HeadToHeadService.stage_recorded_match(mock_db, batch, "m1", match)
+    batch.commit()
+    mock_db.collection("matches").document("m1").set(match)
+
+    record = HeadToHeadService.get_record(mock_db, "a", "b")
+    assert (record["wins"], record["point_diff"], record["last_match_id"]) == (
+        1,
+        4,
+        "m1",
+    )
+
+    edited = {**match, "player1Score": 8, "player2Score": 11}
+    batch = mock_db.batch()
+    HeadToHeadService.stage_edited_match(mock_db, batch, match, edited)
+    batch.commit()
+    mock_db.collection("matches").document("m1").set(edited)
+
+    assert HeadToHeadService.get_record(mock_db, "a", "b")["losses"] == 1
+    stats = get_head_to_head_stats("g1", "a", "b")
+    assert (stats["wins"], stats["losses"], stats["point_diff"]) == (0, 1, -3)
+    assert [m["id"] for m in stats["matches"]] == ["m1"]
+    assert stats["avg_points_scored"] == {"playerA": 8.0, "playerB": 11.0}
+
+
+def test_strangers_leave_no_pair_document(mock_db: MockFirestore) -> None:
+    """Reading a pair that never met returns zeros without storing them."""
+    record = HeadToHeadService.get_record(mock_db, "a", "b", "g1")
+
+    assert (record["wins"], record["losses"], record["matches"]) == (0, 0, 0)
+    assert not HeadToHeadService.pair_ref(mock_db, "a", "b", "g1").get().exists
+
+
+def test_group_rivalry_lists_every_meeting(mock_db: MockFirestore) -> None:
+    """The group view is not limited to the meetings the pair document keeps."""
+    meetings = H2H_RECENT_MATCHES + 5
+    matches = mock_db.collection("matches")
+    for day in range(meetings):
+        matches.document(f"m{day:02d}").set(
+            build_match(
+                ["a", "c"], ["b", "d"], 11, day % 11, day, base=BASE, group_id="g1"
+            ),
+        )
+    matches.document("partners").set(
+        build_match(["a", "b"], ["c", "d"], 11, 3, meetings, base=BASE, group_id="g1"),
+    )
+
+    stats = get_head_to_head_stats("g1", "a", "b")
+
+    assert stats["wins"] == meetings
+    assert len(stats["matches"]) == meetings
+    assert stats["matches"][0]["id"] == f"m{meetings - 1:02d}"
+
+
+def test_recording_builds_missing_pairs_and_keeps_the_latest_meeting(
+    mock_db: MockFirestore,
+) -> None:
+    """Missing pairs are built before the batch; backdated matches only count."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(build_match(["a", "c"], ["b", "d"], 11, 5, 5, base=BASE))
+    HeadToHeadService.get_record(mock_db, "a", "b")
+
+    backdated = build_match(["a", "c"], ["b", "d"], 4, 11, 1, base=BASE)
+    batch = mock_db.batch()
+    HeadToHeadService.stage_recorded_match(mock_db, batch, "m0", backdated)
+    batch.commit()
+
+    record = HeadToHeadService.get_record(mock_db, "a", "b")
+    assert (record["wins"], record["losses"]) == (1, 1)
+    assert record["last_match_id"] == "m1"
+    assert record["recent_match_ids"] == ["m1"]
+    # Pairs nobody had read are built from history, then incremented
+    partners = HeadToHeadService.pair_ref(mock_db, "a", "c").get().to_dict()
+    assert (partners["partner_matches"], partners["partner_wins"]) == (2, 1)
+
+
+def test_first_read_keeps_a_match_recorded_during_its_scan(
+    mock_db: MockFirestore,
+) -> None:
+    """A read whose history predates a recorded match does not overwrite it."""
+    from unittest.mock import patch
+
+    mock_db.batch = lambda: MockBatch(mock_db)
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(build_match("a", "b", 11, 5, 0, base=BASE))
+    scan = HeadToHeadService._scan_pair.__func__
+    scans: list[str] = []
+
+    def racing_scan(cls: Any, db: Any, a: str, b: str, group_id: Any) -> Any:
+        doc = scan(cls, db, a, b, group_id)
+        if not scans:
+            scans.append("read")
+            # A match is recorded after the first read scanned its history
+            late = build_match("a", "b", 3, 11, 1, base=BASE)
+            batch = mock_db.batch()
+            HeadToHeadService.stage_recorded_match(mock_db, batch, "m2", late)
+            batch.commit()
+            matches.document("m2").set(late)
+        return doc
+
+    with patch.object(HeadToHeadService, "_scan_pair", classmethod(racing_scan)):
+        record = HeadToHeadService.get_record(mock_db, "a", "b")
+
+    assert (record["wins"], record["losses"], record["matches"]) == (1, 1, 2)
+    assert record["recent_match_ids"] == ["m2", "m1"]
@@ -0,0 +1,61 @@
+"""Tests for the single-pass group leaderboard engine."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+from pickaladder.group.services.leaderboard_engine import (
+    parse_matches,
+    run_leaderboard_engine,
+)
+
+
+def _snap(p1: str, p2: str, s1: int, s2: int, days_ago: int | None) -> MagicMock:
+    """Build a singles match snapshot."""
+    data: dict[str, Any] = {
+        "matchType": "singles",
+        "player1Id": p1,
+        "player2Id": p2,
+        "player1Score": s1,
+        "player2Score": s2,
+    }
+    if days_ago is not None:
+        data["matchDate"] = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    snap = MagicMock()
+    snap.to_dict.return_value = data
+    return snap
+
+
+def _player(uid: str) -> MagicMock:
+    """Build a player snapshot."""
+    doc = MagicMock()
+    doc.id = uid
+    return doc
+
+
+def test_engine_builds_every_window_in_one_pass() -> None:
+    """Current, previous, streak and trend views come from the same walk."""
+    matches = [
+        _snap("a", "b", 11, 9, 1),
+        _snap("a", "b", 4, 11, 10),
+        _snap("a", "b", 11, 7, 2),
+        _snap("a", "b", 11, 3, None),
+    ]
+    windows = run_leaderboard_engine(
+        parse_matches(matches),
+        [_player("a"), _player("b")],
+        trend_players={"a": {"name": "A", "profilePictureUrl": None}},
+    )
+
+    a = windows["current"]["a"]
+    assert (a["wins"], a["losses"], a["games"]) == (3, 1, 4)
+    assert a["match_results"] == ["win", "win", "loss", "win"]
+    assert windows["previous"]["a"]["losses"] == 1
+    assert windows["previous"]["a"]["wins"] == 0
+    assert windows["streaks"] == {"a": 2, "b": 0}
+
+    trend = windows["trend"]
+    assert len(trend["labels"]) == 3
+    assert trend["datasets"][0]["data"] == [4.0, 7.5, 26 / 3]
@@ -0,0 +1,141 @@
+"""Tests for the materialized global leaderboard index."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from mockfirestore import MockFirestore
+
+from pickaladder.match.services import LeaderboardIndexService
+from tests.mock_utils import MockBatch
+
+
+def _index(db: MockFirestore, uid: str) -> dict | None:
+    """Read an index entry from the mock database."""
+    return db.collection("leaderboard_global").document(uid).get().to_dict()
+
+
+def test_build_entry_applies_decay_and_eligibility() -> None:
+    """Entries carry the decayed ELO and skip players without games."""
+    stale = datetime.now(timezone.utc) - timedelta(days=40)
+    entry = LeaderboardIndexService.build_entry(
+        {"stats": {"wins": 3, "losses": 1, "elo": 1300.0}, "last_match_date": stale},
+    )
+    assert entry is not None
+    assert entry["elo"] == 1300.0
+    assert entry["decayed_elo"] == 1250.0
+    assert entry["is_inactive"]
+    assert entry["win_percentage"] == 75.0
+
+    assert LeaderboardIndexService.build_entry({"stats": {}}) is None
+
+
+def test_rebuild_indexes_eligible_users(mock_db: MockFirestore) -> None:
+    """Rebuild indexes eligible users and prunes every other row."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    users.document("active").set(
+        {
+            "name": "Active",
+            "stats": {"wins": 2, "losses": 0, "elo": 1250.0},
+            "last_match_date": datetime.now(timezone.utc),
+        },
+    )
+    users.document("newbie").set({"name": "Newbie", "stats": {}})
+    index = mock_db.collection("leaderboard_global")
+    # Rows left behind by a deleted user and a user who is no longer eligible
+    index.document("merged").set({"decayed_elo": 1400.0})
+    index.document("newbie").set({"decayed_elo": 1200.0})
+
+    assert LeaderboardIndexService.rebuild(mock_db) == 1
+    indexed = {doc.id for doc in index.stream()}
+    assert indexed == {"active"}
+    assert _index(mock_db, "active")["decayed_elo"] == 1250.0
+
+
+def test_get_user_rank_counts_players_ahead() -> None:
+    """The viewer's rank comes from count aggregations, not a scan."""
+    db = MagicMock()
+    snap = db.collection.return_value.document.return_value.get.return_value
+    snap.exists = True
+    snap.to_dict.return_value = {
+        "decayed_elo": 1300.0,
+        "win_percentage": 50.0,
+        "games_played": 4,
+    }
+    higher, tied_better = MagicMock(value=6), MagicMock(value=2)
+    index = db.collection.return_value
+    index.where.return_value.count.return_value.get.return_value = [[higher]]
+    tied = index.where.return_value.where.return_value
+    tied.count.return_value.get.return_value = [[tied_better]]
+
+    rank = LeaderboardIndexService.get_user_rank(db, "u1")
+
+    assert rank is not None
+    assert rank["rank"] == 9
+    db.collection.return_value.stream.assert_not_called()
+
+
+def test_get_user_rank_breaks_elo_ties_like_the_board(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Equal ratings are ordered by win percentage, as on the leaderboard."""
+    from mockfirestore.query import Query
+
+    def _count(self: Query) -> MagicMock:
+        return MagicMock(get=lambda: [[MagicMock(value=len(list(self.stream())))]])
+
+    monkeypatch.setattr(Query, "count", _count, raising=False)
+    index = mock_db.collection("leaderboard_global")
+    for uid, elo, pct in (
+        ("top", 1300.0, 10.0),
+        ("tied_better", 1250.0, 80.0),
+        ("viewer", 1250.0, 60.0),
+        ("tied_same", 1250.0, 60.0),
+        ("tied_worse", 1250.0, 40.0),
+    ):
+        index.document(uid).set({"decayed_elo": elo, "win_percentage": pct})
+
+    ranks = {
+        uid: LeaderboardIndexService.get_user_rank(mock_db, uid)["rank"]
+        for uid in ("viewer", "tied_same", "tied_worse")
+    }
+    assert ranks == {"viewer": 3, "tied_same": 3, "tied_worse": 5}
+
+
+def test_removed_and_renamed_users_update_their_rows(
+    mock_db: MockFirestore,
+    app: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Deleted and merged users lose their row; a rename reaches the index."""
+    from pickaladder.admin.services import AdminService
+    from pickaladder.match.services.elo_replay import EloReplayService
+    from pickaladder.user.services.core import update_user_profile
+    from pickaladder.user.services.merging import merge_users
+
+    monkeypatch.setattr(EloReplayService, "schedule_replay", lambda *a, **k: None)
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    for uid in ("deleted", "ghost", "real"):
+        users.document(uid).set(
+            {
+                "name": uid,
+                "stats": {"wins": 2, "losses": 0, "elo": 1250.0},
+                "last_match_date": datetime.now(timezone.utc),
+            },
+        )
+    LeaderboardIndexService.rebuild(mock_db)
+
+    with app.app_context():
+        AdminService.delete_user_data(mock_db, "deleted")
+        merge_users(mock_db, "ghost", "real")
+        update_user_profile(mock_db, "real", {"name": "Real Name"})
+
+    indexed = {doc.id for doc in mock_db.collection("leaderboard_global").stream()}
+    assert indexed == {"real"}
+    assert _index(mock_db, "real")["name"] == "Real Name"
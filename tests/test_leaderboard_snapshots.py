@@ -0,0 +1,82 @@
+"""Tests for the persisted daily group leaderboard snapshots."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from mockfirestore import MockFirestore
+
+from pickaladder.group.services.leaderboard import (
+    backfill_group_snapshots,
+    get_group_leaderboard,
+    get_leaderboard_trend_data,
+    take_daily_snapshot,
+)
+from pickaladder.group.services.snapshots import days_ago_key, get_snapshot_as_of
+from pickaladder.group.services.standings import rebuild_group_standings
+from tests.mock_utils import MockBatch, build_match
+
+
+def _seed(db: MockFirestore) -> None:
+    """Create a two-member group with matches ten, nine and one day ago."""
+    db.batch = lambda: MockBatch(db)
+    db.collection("users").document("a").set({"name": "A", "stats": {"elo": 1300}})
+    db.collection("users").document("b").set({"name": "B", "stats": {"elo": 1200}})
+    members = [db.collection("users").document(uid) for uid in ("a", "b")]
+    db.collection("groups").document("g1").set({"members": members})
+    db.collection("matches").document("m1").set(
+        build_match("a", "b", 11, 4, -10, group_id="g1")
+    )
+    db.collection("matches").document("m2").set(
+        build_match("a", "b", 5, 11, -9, group_id="g1")
+    )
+    db.collection("matches").document("m3").set(
+        build_match("a", "b", 11, 9, -1, group_id="g1")
+    )
+
+
+def test_backfill_writes_one_snapshot_per_match_day(mock_db: MockFirestore) -> None:
+    """Each match day closes with the standings accumulated up to it."""
+    _seed(mock_db)
+
+    assert backfill_group_snapshots(mock_db, "g1") == 3
+
+    snap = get_snapshot_as_of(mock_db, "g1", days_ago_key(7))
+    assert snap is not None
+    assert snap["day"] == days_ago_key(9)
+    assert snap["matchCount"] == 2
+    assert snap["players"]["a"]["rank"] == 1
+    assert snap["players"]["a"]["avg_score"] == 8.0
+
+
+def test_trend_and_rank_change_read_snapshots(
+    mock_db: MockFirestore,
+    app: Any,
+) -> None:
+    """With snapshots in place no match is read for trend or rank change."""
+    _seed(mock_db)
+    backfill_group_snapshots(mock_db, "g1")
+    rebuild_group_standings(mock_db, "g1")
+    for match_id in ("m1", "m2", "m3"):
+        mock_db.collection("matches").document(match_id).delete()
+
+    with app.app_context():
+        trend = get_leaderboard_trend_data("g1")
+        leaderboard = get_group_leaderboard.uncached("g1")
+
+    assert trend["labels"] == [days_ago_key(d) for d in (10, 9, 1)]
+    a = next(ds for ds in trend["datasets"] if ds["id"] == "a")
+    assert a["data"] == [11.0, 8.0, 9.0]
+    assert [p["rank_change"] for p in leaderboard] == [0, 0]
+
+
+def test_take_daily_snapshot_needs_projection(mock_db: MockFirestore) -> None:
+    """Groups without a standings projection are skipped."""
+    _seed(mock_db)
+    assert take_daily_snapshot(mock_db, "g1") is None
+
+    rebuild_group_standings(mock_db, "g1")
+    doc = take_daily_snapshot(mock_db, "g1")
+    assert doc is not None
+    assert doc["day"] == days_ago_key(1)
+    assert doc["players"]["b"]["rank"] == 2
@@ -0,0 +1,61 @@
+"""Tests for the parse-once match record."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from pickaladder.core.match_record import MatchRecord
+
+
+def _ref(doc_id: str) -> SimpleNamespace:
+    """Return a stand-in for a Firestore document reference."""
+    return SimpleNamespace(id=doc_id)
+
+
+def test_doubles_sides_exclude_team_documents() -> None:
+    """Player references fill the sides; team documents are kept apart."""
+    record = MatchRecord(
+        {
+            "matchType": "doubles",
+            "team1": [_ref("a"), _ref("b")],
+            "team2": [_ref("c"), "d"],
+            "team1Ref": _ref("team_ab"),
+            "team2Id": "team_cd",
+            "team1Score": 7,
+            "team2Score": 11,
+        },
+        "m1",
+    )
+    assert (record.team1, record.team2) == ({"a", "b"}, {"c", "d"})
+    assert (record.team1_id, record.team2_id) == ("team_ab", "team_cd")
+    assert (record.p1_score, record.p2_score, record.winner_side) == (7, 11, 2)
+    assert record.won_lost("c") == (True, False)
+    assert record.won_lost("a") == (False, True)
+    assert record.side_of("z") == 0
+    with pytest.raises(AttributeError):
+        record.p1_score = 0  # type: ignore[misc]
+
+
+def test_singles_sources_and_stored_results() -> None:
+    """Legacy fields, flat participants and stored winners all resolve."""
+    legacy = MatchRecord(
+        {
+            "player1Id": "a",
+            "partnerId": "b",
+            "player2Ref": _ref("c"),
+            "winner": "team1",
+        },
+    )
+    assert (legacy.player1_id, legacy.team1) == ("a", {"a", "b"})
+    assert (legacy.player2_id, legacy.winner_side) == ("c", 1)
+
+    flat = MatchRecord({"participants": ["a", "b"], "winnerId": _ref("b")})
+    assert (flat.player1_id, flat.player2_id, flat.winner_id) == ("a", "b", "b")
+
+    stored = MatchRecord(
+        {"player1Id": "a", "player2Id": "b", "winners": ["b"], "losers": ["a"]},
+    )
+    assert stored.won_lost("b") == (True, False)
+    assert stored.team1 is MatchRecord({"player1Ref": _ref("a")}).team1
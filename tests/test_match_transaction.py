@@ -56,14 +56,14 @@ class MatchTransactionTestCase(unittest.TestCase):
         )
 
         # Verify snapshots were read via db.get_all
-        actual_args = db.get_all.call_args[0][0]
+        actual_args = db.get_all.call_args_list[0][0][0]
         self.assertCountEqual(actual_args, [p1_ref, p2_ref])
 
         # Verify match data updates
         assert match_data["winner"] == "team1"
 
         # Verify writes
-        batch.set.assert_called_with(match_ref, match_data)
+        batch.set.assert_any_call(match_ref, match_data)
 
         # Verify p1 updates (win)
         p1_call_args = batch.update.call_args_list[0]
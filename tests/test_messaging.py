@@ -17,7 +17,7 @@ class MessagingServiceTestCase(unittest.TestCase):
     @patch("pickaladder.messaging.services.MessagingRepository")
     def test_get_or_create_conversation_existing(self, mock_repo) -> None:
         """Test retrieving an existing conversation."""
-        mock_repo.find_direct_conversation.return_value = {"id": "conv123"}
+        mock_repo.get_or_create_direct_conversation.return_value = "conv123"
 
         cid = MessagingService.get_or_create_conversation(self.mock_db, "u1", "u2")
 
@@ -27,13 +27,14 @@ class MessagingServiceTestCase(unittest.TestCase):
     @patch("pickaladder.messaging.services.MessagingRepository")
     def test_get_or_create_conversation_new(self, mock_repo) -> None:
         """Test creating a new conversation."""
-        mock_repo.find_direct_conversation.return_value = None
-        mock_repo.create.return_value = "new_conv"
+        mock_repo.get_or_create_direct_conversation.return_value = "new_conv"
 
         cid = MessagingService.get_or_create_conversation(self.mock_db, "u1", "u2")
 
         assert cid == "new_conv"
-        mock_repo.create.assert_called_once()
+        payload = mock_repo.get_or_create_direct_conversation.call_args[0][3]
+        assert payload["participants"] == ["u1", "u2"]
+        assert payload["unreadCount"] == {"u1": 0, "u2": 0}
 
     @patch("pickaladder.messaging.services.MessagingRepository")
     def test_send_message(self, mock_repo) -> None:
@@ -54,6 +55,20 @@ class MessagingServiceTestCase(unittest.TestCase):
         MessagingService.mark_as_read(self.mock_db, "conv1", "u1")
         mock_repo.mark_as_read.assert_called_once_with(self.mock_db, "conv1", "u1")
 
+    @patch("pickaladder.messaging.services.MessagingRepository")
+    def test_total_unread_count_reads_counter(self, mock_repo) -> None:
+        """The unread total comes from the counter, not from every conversation."""
+        snap = self.mock_db.collection.return_value.document.return_value.get()
+        snap.exists = True
+        snap.to_dict.return_value = {
+            "friendRequests": 0,
+            "tournamentInvites": 0,
+            "unreadMessages": 7,
+        }
+
+        assert MessagingService.get_total_unread_count(self.mock_db, "u1") == 7
+        mock_repo.get_user_conversations.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+from mockfirestore import MockFirestore
+
 from pickaladder.messaging.repository import MessagingRepository
 
 
@@ -37,8 +39,9 @@ class TestMessagingRepository(unittest.TestCase):
         assert msg_id == "msg789"
 
         # Verify batch set for message
-        self.mock_batch.set.assert_called_once()
-        set_args = self.mock_batch.set.call_args[0]
+        # The message first, then the recipient's badge counter
+        assert self.mock_batch.set.call_count == 2
+        set_args = self.mock_batch.set.call_args_list[0][0]
         assert set_args[0] == mock_msg_ref
         assert set_args[1]["senderId"] == sender_id
         assert set_args[1]["content"] == "Hello"
@@ -56,12 +59,107 @@ class TestMessagingRepository(unittest.TestCase):
         conv_id = "conv123"
         user_id = "user1"
 
+        mock_conv_ref = MagicMock()
+        self.mock_db.collection.return_value.document.return_value = mock_conv_ref
+        mock_conv_ref.get.return_value.to_dict.return_value = {
+            "unreadCount": {user_id: 3},
+        }
+
+        mock_tx = self.mock_db.transaction.return_value
+
+        with patch(
+            "pickaladder.messaging.repository.firestore.transactional",
+            side_effect=lambda func: func,
+        ):
+            MessagingRepository.mark_as_read(self.mock_db, conv_id, user_id)
+
+        # The reset and the decrement of the user's total share a transaction
+        mock_tx.update.assert_called_once_with(
+            mock_conv_ref,
+            {f"unreadCount.{user_id}": 0},
+        )
+        badge_update = mock_tx.set.call_args[0][1]
+        assert badge_update["unreadMessages"].value == -3
+
+    def test_add_unread_counts_each_user_in_one_batch(self) -> None:
         mock_conv_ref = MagicMock()
         self.mock_db.collection.return_value.document.return_value = mock_conv_ref
 
-        MessagingRepository.mark_as_read(self.mock_db, conv_id, user_id)
-
-        mock_conv_ref.update.assert_called_once_with({f"unreadCount.{user_id}": 0})
+        MessagingRepository.add_unread(self.mock_db, "conv123", ["u1", "u2"])
+
+        updates = self.mock_batch.update.call_args[0][1]
+        assert set(updates) == {"unreadCount.u1", "unreadCount.u2"}
+        assert self.mock_batch.set.call_count == 2
+        self.mock_batch.commit.assert_called_once()
+
+
+def test_messages_page_newest_first_and_delta_after(mock_db: MockFirestore) -> None:
+    """History pages back from the newest; the delta returns only newer messages."""
+    messages = (
+        mock_db.collection("conversations")
+        .document("c1")
+        .collection(
+            "messages",
+        )
+    )
+    for i in range(5):
+        messages.document(f"m{i}").set({"content": str(i), "timestamp": i})
+
+    page, cursor = MessagingRepository.get_messages(mock_db, "c1", limit=2)
+    assert [m["id"] for m in page] == ["m4", "m3"]
+    page, cursor = MessagingRepository.get_messages(
+        mock_db,
+        "c1",
+        limit=2,
+        cursor=cursor,
+    )
+    assert [m["id"] for m in page] == ["m2", "m1"]
+    assert cursor == "m1"
+
+    newer = MessagingRepository.get_messages_after(mock_db, "c1", "m2")
+    assert [m["id"] for m in newer] == ["m3", "m4"]
+    assert MessagingRepository.get_messages_after(mock_db, "c1", "gone") == []
+
+
+def test_direct_conversation_is_keyed_by_pair(mock_db: MockFirestore) -> None:
+    """Either order of the pair finds one conversation; old ones get indexed."""
+    payload = {"participants": ["u1", "u2"], "lastMessage": ""}
+    conv_id = MessagingRepository.get_or_create_direct_conversation(
+        mock_db,
+        "u2",
+        "u1",
+        payload,
+    )
+    assert (
+        MessagingRepository.get_or_create_direct_conversation(
+            mock_db,
+            "u1",
+            "u2",
+            payload,
+        )
+        == conv_id
+    )
+    assert MessagingRepository.find_direct_conversation(mock_db, "u1", "u2")["id"] == (
+        conv_id
+    )
+    assert len(list(mock_db.collection("conversations").stream())) == 1
+
+    mock_db.collection("conversations").document("old").set(
+        {"participants": ["u1", "u3"]},
+    )
+    assert MessagingRepository.find_direct_conversation(mock_db, "u3", "u1") is None
+    assert (
+        MessagingRepository.get_or_create_direct_conversation(
+            mock_db,
+            "u3",
+            "u1",
+            payload,
+        )
+        == "old"
+    )
+    assert MessagingRepository.find_direct_conversation(mock_db, "u1", "u3")["id"] == (
+        "old"
+    )
 
 
 if __name__ == "__main__":
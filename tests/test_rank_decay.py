@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta, timezone
 
+from pickaladder.match.services.leaderboard_index import LeaderboardIndexService
 from pickaladder.match.services.record_service import MatchRecordService
 
 
@@ -53,3 +54,152 @@ def test_leaderboard_applies_decay(mock_db) -> None:
     assert u1["elo"] == STARTING_ELO  # type: ignore
     assert u2["elo"] < INACTIVE_ELO  # type: ignore
     assert u2["is_inactive"] is True  # type: ignore
+
+
+def test_decay_job_writes_only_changed_users(mock_db, monkeypatch) -> None:
+    """The job stores decay for users whose bucket moved and skips the rest."""
+    from mockfirestore.collection import CollectionReference
+
+    from pickaladder.match.services.rank_decay import RankDecayService
+    from tests.mock_utils import MockBatch
+
+    monkeypatch.setattr(
+        CollectionReference,
+        "select",
+        lambda self, _fields: self,
+        raising=False,
+    )
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    users.document("active").set(
+        {
+            "stats": {"elo": 1200.0, "wins": 5, "decayed_elo": 1200.0},
+            "is_inactive": False,
+            "last_match_date": datetime.now(timezone.utc),
+        },
+    )
+    users.document("idle").set(
+        {
+            "stats": {"elo": 1250.0, "wins": 5},
+            "last_match_date": datetime.now(timezone.utc) - timedelta(days=40),
+        },
+    )
+
+    progress: list[tuple[int, int]] = []
+    totals = RankDecayService.run(
+        mock_db,
+        workers=2,
+        progress=lambda scanned, updated: progress.append((scanned, updated)),
+    )
+
+    assert totals == {"scanned": 2, "updated": 1}
+    assert progress == [(2, 1)]
+    idle = users.document("idle").get().to_dict()
+    assert idle["is_inactive"] is True
+    assert idle["stats"]["decayed_elo"] == 1200.0
+    entry = mock_db.collection("leaderboard_global").document("idle").get()
+    assert entry.to_dict()["decayed_elo"] == 1200.0
+
+    # A second pass on the same day has nothing left to write.
+    assert RankDecayService.run(mock_db)["updated"] == 0
+    # Ranking reads the stored value rather than recomputing it.
+    row = MatchRecordService.build_leaderboard_stats(idle)
+    assert (row["elo"], row["is_inactive"]) == (1200.0, True)
+
+
+def test_decay_job_skips_users_changed_since_read(mock_db, monkeypatch) -> None:
+    """A user written after the page read keeps its data until the next pass."""
+    from google.api_core.exceptions import FailedPrecondition
+    from mockfirestore.collection import CollectionReference
+    from mockfirestore.document import DocumentReference
+
+    from pickaladder.match.services.rank_decay import RankDecayService
+    from tests.mock_utils import MockBatch
+
+    monkeypatch.setattr(
+        CollectionReference,
+        "select",
+        lambda self, _fields: self,
+        raising=False,
+    )
+
+    class RacingBatch(MockBatch):
+        def _real_commit(self) -> None:
+            raise FailedPrecondition("user changed since it was read")
+
+    mock_db.batch = lambda: RacingBatch(mock_db)
+    stale = datetime.now(timezone.utc) - timedelta(days=40)
+    users = mock_db.collection("users")
+    for uid in ("idle", "racing"):
+        users.document(uid).set(
+            {"stats": {"elo": 1250.0, "wins": 5}, "last_match_date": stale},
+        )
+
+    guarded_update = DocumentReference.update
+
+    def _update(self, data, option=None):
+        if option is not None and self.id == "racing":
+            raise FailedPrecondition("user changed since it was read")
+        return guarded_update(self, data, option)
+
+    monkeypatch.setattr(DocumentReference, "update", _update)
+    index_writes: list[str] = []
+    monkeypatch.setattr(
+        LeaderboardIndexService,
+        "write_user_entries",
+        lambda _db, rows: index_writes.extend(uid for uid, _ in rows),
+    )
+
+    assert RankDecayService.run(mock_db)["updated"] == 1
+    assert users.document("idle").get().to_dict()["is_inactive"] is True
+    assert "is_inactive" not in users.document("racing").get().to_dict()
+    assert index_writes == ["idle"]
+
+
+def test_decay_job_bounds_the_pages_it_holds(mock_db, monkeypatch) -> None:
+    """Reading stops while two pages per worker are still waiting to be written."""
+    import threading
+
+    from mockfirestore.collection import CollectionReference
+    from mockfirestore.query import Query
+
+    from pickaladder.match.services import rank_decay
+    from pickaladder.match.services.rank_decay import RankDecayService
+
+    monkeypatch.setattr(
+        CollectionReference,
+        "select",
+        lambda self, _fields: self,
+        raising=False,
+    )
+    monkeypatch.setattr(rank_decay, "FIRESTORE_BATCH_LIMIT", 1)
+    for i in range(12):
+        mock_db.collection("users").document(f"u{i:02d}").set({"stats": {}})
+
+    lock = threading.Lock()
+    held = {"now": 0, "max": 0}
+    release = threading.Event()
+
+    def _process(_db, page) -> int:
+        release.wait(5)
+        with lock:
+            held["now"] -= 1
+        return 0
+
+    monkeypatch.setattr(RankDecayService, "_process_page", staticmethod(_process))
+    query_stream = Query.stream
+
+    def _stream(self, *args, **kwargs):
+        page = list(query_stream(self, *args, **kwargs))
+        if page:
+            with lock:
+                held["now"] += 1
+                held["max"] = max(held["max"], held["now"])
+                if held["max"] >= 4:
+                    release.set()
+        return iter(page)
+
+    monkeypatch.setattr(Query, "stream", _stream)
+
+    assert RankDecayService.run(mock_db, workers=2)["scanned"] == 12
+    assert held["max"] == 4
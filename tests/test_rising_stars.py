@@ -4,9 +4,21 @@ from __future__ import annotations
 
 import datetime
 import unittest
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
+if TYPE_CHECKING:
+    from mockfirestore import MockFirestore
+
+from pickaladder.core.tiered_cache import RISING_STARS_TAG
 from pickaladder.match.services import MatchRecordService
+from pickaladder.match.services.record_service import (
+    WIN_BUCKET_SHARDS,
+    WIN_BUCKET_TOP_K,
+    WIN_BUCKET_TOPS_COLLECTION,
+    WIN_BUCKETS_COLLECTION,
+)
+from tests.mock_utils import MockBatch
 
 
 class TestRisingStars(unittest.TestCase):
@@ -113,6 +125,116 @@ class TestRisingStars(unittest.TestCase):
         assert args[1] == ">="
         assert isinstance(args[2], datetime.datetime)
 
+    def test_get_rising_stars_reads_the_window_ending_on_the_given_day(self) -> None:
+        """The window is the bucket day the result is cached under and 6 before."""
+        mock_db = MagicMock()
+        mock_db.get_all.return_value = []
+
+        MatchRecordService.get_rising_stars(mock_db, today="2024-05-08")
+
+        doc_ids = [
+            c.args[0] for c in mock_db.collection.return_value.document.call_args_list
+        ]
+        days = sorted({doc_id.split("_")[0] for doc_id in doc_ids})
+        assert days == [f"2024-05-0{d}" for d in range(2, 9)]
+
+    @patch("pickaladder.match.services.record_service.invalidate_tags")
+    def test_window_matches_drop_cached_rising_stars(
+        self,
+        mock_invalidate: MagicMock,
+    ) -> None:
+        """Matches of any window day, today included, drop the cached result."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        MatchRecordService.forget_rising_stars(
+            {"matchDate": now - datetime.timedelta(days=10)},
+            {},
+        )
+        mock_invalidate.assert_not_called()
+
+        MatchRecordService.forget_rising_stars({"matchDate": now})
+        mock_invalidate.assert_called_once_with(RISING_STARS_TAG)
+
+    def test_stage_win_buckets_increments_winners(self) -> None:
+        """Recording a match queues an increment on its day's bucket."""
+        mock_db = MagicMock()
+        batch = MagicMock()
+        match_date = datetime.datetime(2024, 5, 1, 23, tzinfo=datetime.timezone.utc)
+
+        MatchRecordService.stage_win_buckets(
+            mock_db,
+            batch,
+            {"winners": ["u1", "u2"], "matchDate": match_date},
+        )
+
+        shard_call, top_call = mock_db.collection.return_value.document.call_args_list
+        day, shard = shard_call.args[0].split("_")
+        assert day == "2024-05-01"
+        assert 0 <= int(shard) < WIN_BUCKET_SHARDS
+        bucket_set, top_set = batch.set.call_args_list
+        assert bucket_set.args[1]["day"] == "2024-05-01"
+        assert set(bucket_set.args[1]["wins"]) == {"u1", "u2"}
+        assert bucket_set.kwargs == {"merge": True}
+        # The match is backdated, so the day's compacted top is redone
+        assert top_call.args == ("2024-05-01",)
+        assert top_set.args[1] == {"day": "2024-05-01", "stale": True}
+
+
+def _bucket(db: MockFirestore, day: str, shard: int, wins: dict[str, int]) -> None:
+    db.collection(WIN_BUCKETS_COLLECTION).document(f"{day}_{shard}").set(
+        {"day": day, "wins": wins},
+    )
+
+
+def test_rising_stars_sum_today_and_compact_older_days(
+    mock_db: MockFirestore,
+) -> None:
+    """Today's wins count, and older days are read from their compacted top."""
+    for uid in ("u1", "u2"):
+        mock_db.collection("users").document(uid).set({"username": uid})
+    _bucket(mock_db, "2024-05-08", 0, {"u1": 2})
+    _bucket(mock_db, "2024-05-08", 3, {"u1": 1, "u2": 1})
+    _bucket(mock_db, "2024-05-03", 1, {"u2": 3})
+    _bucket(mock_db, "2024-05-03", 2, {"u2": 1})
+    _bucket(mock_db, "2024-05-01", 0, {"u2": 9})
+
+    stars = MatchRecordService.get_rising_stars(mock_db, today="2024-05-08")
+
+    assert [(s["id"], s["weekly_wins"]) for s in stars] == [("u2", 5), ("u1", 3)]
+    tops = mock_db.collection(WIN_BUCKET_TOPS_COLLECTION)
+    top = tops.document("2024-05-03").get().to_dict()
+    assert (top["top"], top["stale"]) == ({"u2": 4}, False)
+    # Days without shards are not compacted
+    assert not tops.document("2024-05-04").get().exists
+
+    # A backdated match marks the top stale, so the next read redoes it
+    batch = MockBatch(mock_db)
+    MatchRecordService.stage_win_buckets(
+        mock_db,
+        batch,
+        {
+            "winners": ["u1"],
+            "matchDate": datetime.datetime(2024, 5, 3, tzinfo=datetime.timezone.utc),
+        },
+    )
+    batch.commit()
+    stars = MatchRecordService.get_rising_stars(mock_db, today="2024-05-08")
+
+    assert [(s["id"], s["weekly_wins"]) for s in stars] == [("u2", 5), ("u1", 4)]
+    assert tops.document("2024-05-03").get().to_dict()["top"] == {"u2": 4, "u1": 1}
+
+
+def test_compacted_days_keep_only_the_top_counts(mock_db: MockFirestore) -> None:
+    """An older day stores its top counts instead of every winner."""
+    _bucket(mock_db, "2024-05-05", 0, {f"u{i}": i + 1 for i in range(60)})
+
+    MatchRecordService.get_rising_stars(mock_db, today="2024-05-08")
+
+    doc = mock_db.collection(WIN_BUCKET_TOPS_COLLECTION).document("2024-05-05")
+    top = doc.get().to_dict()["top"]
+    assert len(top) == WIN_BUCKET_TOP_K
+    assert min(top.values()) == 60 - WIN_BUCKET_TOP_K + 1
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for the cached group rivalry matrix."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from mockfirestore import MockFirestore
+
+from pickaladder.group.services.match_cache import stage_version_bump
+from pickaladder.group.services.rivalry_matrix import get_rivalry_matrix, lookup_pair
+from tests.mock_utils import MockBatch, build_match
+
+
+def test_matrix_is_built_once_per_group_version(
+    app: Any, mock_db: MockFirestore
+) -> None:
+    """One pass fills every pair; a version bump is needed to see new matches."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    for uid in ("a", "b", "c"):
+        users.document(uid).set({"name": uid.upper()})
+    mock_db.collection("groups").document("rivals").set(
+        {"members": [users.document(uid) for uid in ("a", "b", "c")]},
+    )
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(
+        build_match(["a", "b"], ["c", "d"], 11, 6, group_id="rivals")
+    )
+    matches.document("m2").set(
+        build_match(["a", "c"], ["b", "d"], 9, 11, group_id="rivals")
+    )
+
+    with app.app_context():
+        matrix = get_rivalry_matrix("rivals")
+        assert matrix is not None
+        assert [p["id"] for p in matrix["players"]] == ["a", "b", "c", "d"]
+        assert lookup_pair(matrix, "a", "c") == {
+            "wins": 1,
+            "losses": 0,
+            "matches": 1,
+            "point_diff": 5,
+            "partnership_record": {"wins": 0, "losses": 1},
+        }
+        assert lookup_pair(matrix, "b", "a")["losses"] == 0
+        assert lookup_pair(matrix, "a", "b")["partnership_record"]["wins"] == 1
+
+        matches.document("m3").set(build_match(["c"], ["a"], 11, 2, group_id="rivals"))
+        assert get_rivalry_matrix("rivals")["wins"][2][0] == 0
+
+        batch = mock_db.batch()
+        stage_version_bump(mock_db, batch, "rivals")
+        batch.commit()
+        refreshed = get_rivalry_matrix("rivals")
+        assert (refreshed["version"], refreshed["wins"][2][0]) == (1, 1)
+        assert get_rivalry_matrix("missing") is None
@@ -24,7 +24,7 @@ def test_complete_session_lifecycle(mock_db, mock_db_write) -> None:
             def __init__(self) -> None:
                 self.ops = []  # type: ignore
 
-            def set(self, ref, data) -> None:
+            def set(self, ref, data, merge=False) -> None:
                 self.ops.append(("set", ref, data))
 
             def update(self, ref, data) -> None:
@@ -158,6 +158,32 @@ class StandingAggregatorTestCase(unittest.TestCase):
 
         assert standings[3]["uid"] == "p4"
 
+    def test_three_way_cycle_broken_by_pd(self) -> None:
+        """Test a rock-paper-scissors tie falls through H2H to point diff."""
+
+        def match(winner: str, loser: str, score: int) -> dict:
+            return {
+                "status": "COMPLETED",
+                "winnerId": winner,
+                "participants": [winner, loser],
+                "player1Score": 11,
+                "player2Score": score,
+            }
+
+        # Everyone is 1-1 with one H2H win, so PD decides: p1 +3, p3 0, p2 -3.
+        matches = [
+            match("p1", "p2", 2),
+            match("p2", "p3", 5),
+            match("p3", "p1", 5),
+            # Pending games must not count.
+            {**match("p2", "p1", 0), "status": "PENDING"},
+        ]
+
+        standings = StandingAggregator.aggregate(["p1", "p2", "p3"], matches)
+
+        assert [s["uid"] for s in standings] == ["p1", "p3", "p2"]
+        assert all(s["tie_break_reason"] == "PD" for s in standings)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,142 @@
+"""Tests for the persistent streak counters."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from mockfirestore import MockFirestore
+
+from pickaladder.match.services.streaks import (
+    StreakService,
+    advance_streak,
+    streak_from_results,
+)
+from pickaladder.teams.services import TeamService
+from tests.mock_utils import MockBatch
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _match(winner: str, loser: str, day: int) -> dict[str, Any]:
+    """Build a decided singles match between two user IDs."""
+    return {
+        "matchType": "singles",
+        "participants": [winner, loser],
+        "winners": [winner],
+        "losers": [loser],
+        "winner": "team1",
+        "matchDate": BASE + timedelta(days=day),
+    }
+
+
+def test_advance_streak_tracks_runs_and_best() -> None:
+    """Runs extend on the same result, reset on a change, and keep the best."""
+    state = None
+    for won in (True, True, True, False, True):
+        state = advance_streak(state, won)
+    assert state == {"type": "W", "length": 1, "best": 3}
+    assert advance_streak(state, False) == {"type": "L", "length": 1, "best": 3}
+    assert streak_from_results([False, False, True], best=1) == {
+        "type": "L",
+        "length": 2,
+        "best": 1,
+    }
+
+
+def test_stage_match_advances_users_and_teams(mock_db: MockFirestore) -> None:
+    """Recording a match moves every participant's and team's stored streak."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    teams = mock_db.collection("teams")
+    users.document("a").set({"stats": {"streak": {"type": "W", "length": 2}}})
+    users.document("b").set({"stats": {}})
+    teams.document("t1").set({"stats": {}})
+    teams.document("t2").set({"stats": {"streak": {"type": "W", "length": 4}}})
+    snaps = {
+        s.id: s
+        for s in (
+            users.document("a").get(),
+            users.document("b").get(),
+            teams.document("t1").get(),
+            teams.document("t2").get(),
+        )
+    }
+
+    batch = mock_db.batch()
+    StreakService.stage_match(
+        mock_db,
+        batch,
+        {**_match("a", "b", 0), "team1Id": "t1", "team2Id": "t2"},
+        snaps,
+    )
+    batch.commit()
+
+    streak = users.document("a").get().to_dict()["stats"]["streak"]
+    assert streak == {"type": "W", "length": 3, "best": 3}
+    assert users.document("b").get().to_dict()["stats"]["streak"]["type"] == "L"
+    assert teams.document("t2").get().to_dict()["stats"]["streak"] == {
+        "type": "L",
+        "length": 1,
+        "best": 0,
+    }
+
+
+def test_recompute_rebuilds_from_recent_matches(mock_db: MockFirestore) -> None:
+    """An edit re-derives the streak from the latest matches only."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    users.document("a").set(
+        {"stats": {"streak": {"type": "W", "length": 3, "best": 5}}},
+    )
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(_match("a", "b", 0))
+    matches.document("m2").set(_match("b", "a", 1))
+    matches.document("m3").set(_match("a", "b", 2))
+
+    assert StreakService.recompute(mock_db, ["a"]) == 1
+    streak = users.document("a").get().to_dict()["stats"]["streak"]
+    assert streak == {"type": "W", "length": 1, "best": 5}
+    assert StreakService.recompute(mock_db, ["a"]) == 0
+
+
+def test_team_stats_prefer_stored_streak() -> None:
+    """The team dashboard reads the stored streak instead of its matches."""
+    team = {"stats": {"wins": 3, "streak": {"type": "W", "length": 3, "best": 3}}}
+    losing_match = {"team1Id": "t1", "winner": "team2"}
+
+    stats = TeamService._calculate_team_stats("t1", team, [losing_match])
+    assert (stats["streak"], stats["streak_type"]) == (3, "W")
+
+
+def test_merge_recomputes_the_target_streak(
+    mock_db: MockFirestore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The merged account's streak covers the matches moved from the source."""
+    from pickaladder.match.services.elo_replay import EloReplayService
+    from pickaladder.user.services.merging import merge_users
+
+    monkeypatch.setattr(EloReplayService, "schedule_replay", lambda *a, **k: None)
+    mock_db.batch = lambda: MockBatch(mock_db)
+    users = mock_db.collection("users")
+    users.document("ghost").set({"name": "ghost"})
+    users.document("real").set(
+        {"stats": {"streak": {"type": "L", "length": 1, "best": 1}}},
+    )
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(_match("b", "real", 0))
+    for day in (1, 2):
+        matches.document(f"m{day + 1}").set(
+            {
+                **_match("ghost", "b", day),
+                "player1Ref": users.document("ghost"),
+                "player2Ref": users.document("b"),
+            },
+        )
+
+    merge_users(mock_db, "ghost", "real")
+
+    streak = users.document("real").get().to_dict()["stats"]["streak"]
+    assert streak == {"type": "W", "length": 2, "best": 2}
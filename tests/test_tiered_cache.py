@@ -0,0 +1,142 @@
+"""Tests for the two-tier cache and its tag-based invalidation."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from flask_caching.backends.base import BaseCache
+from flask_caching.backends.simplecache import SimpleCache
+
+from pickaladder.core.tiered_cache import (
+    RANKINGS_TAG,
+    TieredCache,
+    group_tag,
+    invalidate_tags,
+    tagged,
+    tournament_tag,
+    user_tag,
+)
+from pickaladder.extensions import cache
+
+
+def _assert_workers_share_invalidation(shared: BaseCache) -> None:
+    """Two workers over one shared backend see each other's invalidations."""
+    worker_a = TieredCache(shared, local_trust=0)
+    worker_b = TieredCache(shared, local_trust=0)
+
+    worker_a.set("board", ["alice"], tags=[group_tag("g1")])
+    worker_a.set("profile", {"name": "Bob"}, tags=[group_tag("g2")])
+    assert worker_b.get("board") == ["alice"]
+    assert worker_b.get("profile") == {"name": "Bob"}
+
+    # Worker B now answers from its local copies until they are invalidated
+    worker_a.invalidate_tags(group_tag("g1"))
+    assert worker_b.get("board") is None
+    assert worker_b.get("profile") == {"name": "Bob"}
+
+    worker_a.delete("profile")
+    assert worker_b.get("profile") is None
+    assert shared.get("tag-version:key:profile") is None
+
+
+def test_invalidation_reaches_every_worker() -> None:
+    """Local copies are dropped once a tag or key changes in another worker."""
+    _assert_workers_share_invalidation(SimpleCache())
+
+
+def test_invalidation_reaches_every_worker_over_redis() -> None:
+    """The same holds with a Redis backend shared by the workers."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from flask_caching.backends.rediscache import RedisCache
+
+    _assert_workers_share_invalidation(RedisCache(host=fakeredis.FakeRedis()))
+
+
+def test_local_copies_are_trusted_for_a_short_window() -> None:
+    """Within the trust window local hits skip the shared backend entirely."""
+    shared = SimpleCache()
+    worker_a = TieredCache(shared, local_trust=60)
+    worker_b = TieredCache(shared, local_trust=60)
+    worker_a.set("board", ["alice"], timeout=30, tags=[group_tag("g1")])
+    assert worker_b.get("board") == ["alice"]
+
+    worker_b.shared = SimpleCache()
+    assert worker_b.get("board") == ["alice"]
+
+    # The worker that invalidates drops its own copies at once
+    worker_a.invalidate_tags(group_tag("g1"))
+    assert worker_a.get("board") is None
+
+
+def test_local_tier_is_bounded_and_returns_copies() -> None:
+    """The LRU keeps the most recent entries; callers cannot mutate entries."""
+    shared = SimpleCache()
+    tiered = TieredCache(shared, local_size=2)
+    for key in ("a", "b", "c"):
+        tiered.set(key, [key])
+
+    assert list(tiered._local) == ["b", "c"]
+    tiered.get("a")
+    assert list(tiered._local) == ["c", "a"]
+
+    tiered.get("a").append("mutated")
+    assert tiered.get("a") == ["a"]
+
+
+def test_tagged_memoize_is_invalidated_by_tag(app: Any) -> None:
+    """A tagged memoized call recomputes once its tag is invalidated."""
+    calls: list[str] = []
+
+    @tagged(lambda group_id: [group_tag(group_id)])
+    @cache.memoize(timeout=60)
+    def standings(group_id: str) -> list[str]:
+        calls.append(group_id)
+        # A write landing mid-computation must not let this result be served
+        if len(calls) == 2:  # noqa: PLR2004
+            invalidate_tags(group_tag(group_id))
+        return [group_id, str(len(calls))]
+
+    with app.app_context():
+        assert isinstance(cache.cache, TieredCache)
+        assert standings("g1") == ["g1", "1"]
+        assert standings("g1") == ["g1", "1"]
+        assert standings("g2") == ["g2", "2"]
+        assert standings("g2") == ["g2", "3"]
+
+        invalidate_tags(group_tag("g1"), group_tag("g3"))
+        assert standings("g1") == ["g1", "4"]
+        # Another group's entry survives the invalidation of the first
+        assert standings("g2") == ["g2", "3"]
+        assert calls == ["g1", "g2", "g2", "g1"]
+
+
+def test_match_writes_invalidate_rankings_groups_tournaments_and_users(
+    app: Any,
+) -> None:
+    """The shared invalidation helper drops every view the matches feed."""
+    from pickaladder.match.services import MatchCommandService
+
+    with app.app_context():
+        cache.cache.set("top", ["alice"], tags=[RANKINGS_TAG])
+        cache.cache.set("g1", ["g1"], tags=[group_tag("g1")])
+        cache.cache.set("g2", ["g2"], tags=[group_tag("g2")])
+        cache.cache.set("g3", ["g3"], tags=[group_tag("g3")])
+        cache.cache.set("t1", ["t1"], tags=[tournament_tag("t1")])
+        cache.cache.set("t2", ["t2"], tags=[tournament_tag("t2")])
+        cache.cache.set("u1", ["u1"], tags=[user_tag("u1")])
+        cache.cache.set("u3", ["u3"], tags=[user_tag("u3")])
+
+        MatchCommandService.invalidate_cached_views(
+            {"groupId": "g1", "participants": ["u1", "u2"]},
+            {"groupId": "g2", "tournamentId": "t1"},
+            {},
+        )
+        assert cache.get("top") is None
+        assert cache.get("g1") is None
+        assert cache.get("g2") is None
+        assert cache.get("g3") == ["g3"]
+        assert cache.get("t1") is None
+        assert cache.get("t2") == ["t2"]
+        assert cache.get("u1") is None
+        assert cache.get("u3") == ["u3"]
@@ -0,0 +1,96 @@
+"""Tests for the per-user stats summary projection."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+from mockfirestore import MockFirestore
+
+from pickaladder.user.services.stats_summary import (
+    get_summary_ref,
+    get_user_stats_summary,
+    stage_edited_match,
+    stage_recorded_match,
+)
+from tests.mock_utils import MockBatch, build_match
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_summary_is_built_from_history_on_first_read(mock_db: MockFirestore) -> None:
+    """A missing summary is replayed once and then served from its document."""
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(build_match("a", "b", 11, 5, 0, base=BASE))
+    matches.document("m2").set(build_match("b", "a", 11, 9, 1, base=BASE))
+    matches.document("m3").set(build_match("a", "b", 11, 7, 2, base=BASE))
+
+    stats = get_user_stats_summary(mock_db, "a")
+
+    assert (stats["wins"], stats["losses"], stats["total_games"]) == (2, 1, 3)
+    assert stats["singles"] == {"wins": 2, "losses": 1}
+    assert (stats["points_for"], stats["points_against"]) == (31, 23)
+    assert (stats["current_streak"], stats["streak_type"]) == (1, "W")
+    assert get_summary_ref(mock_db, "a").get().exists
+
+    matches.document("m1").delete()
+    assert get_user_stats_summary(mock_db, "a")["wins"] == 2
+
+
+def test_record_and_edit_update_counters(mock_db: MockFirestore) -> None:
+    """Recording increments the summary; an edit swaps the old result out."""
+    mock_db.batch = lambda: MockBatch(mock_db)
+    get_user_stats_summary(mock_db, "a")
+    match = build_match("a", "b", 11, 4, 0, base=BASE)
+
+    batch = mock_db.batch()
+    stage_recorded_match(mock_db, batch, match)
+    batch.commit()
+
+    a = get_summary_ref(mock_db, "a").get().to_dict()
+    assert (a["wins"], a["points_for"], a["streak"]["length"]) == (1, 11, 1)
+    # "b" had no summary, so it was built from history plus this match.
+    b = get_summary_ref(mock_db, "b").get().to_dict()
+    assert (b["losses"], b["points_against"]) == (1, 11)
+
+    batch = mock_db.batch()
+    stage_edited_match(
+        mock_db, batch, match, build_match("a", "b", 9, 11, 0, base=BASE)
+    )
+    batch.commit()
+
+    a = get_summary_ref(mock_db, "a").get().to_dict()
+    assert (a["wins"], a["losses"], a["points_for"]) == (0, 1, 9)
+    assert a["singles"] == {"wins": 0, "losses": 1}
+
+
+def test_first_read_keeps_a_match_recorded_during_its_scan(
+    mock_db: MockFirestore,
+) -> None:
+    """A read whose history predates a recorded match does not overwrite it."""
+    from pickaladder.user.services import stats_summary
+
+    mock_db.batch = lambda: MockBatch(mock_db)
+    matches = mock_db.collection("matches")
+    matches.document("m1").set(build_match("a", "b", 11, 5, 0, base=BASE))
+    scan = stats_summary._scan_user_matches
+    scans: list[str] = []
+
+    def racing_scan(db: Any, user_id: str) -> dict[str, Any]:
+        summary = scan(db, user_id)
+        if not scans:
+            scans.append(user_id)
+            # A match is recorded after the first read scanned its history
+            late = build_match("a", "b", 3, 11, 1, base=BASE)
+            batch = mock_db.batch()
+            stage_recorded_match(mock_db, batch, late)
+            batch.commit()
+            matches.document("m2").set(late)
+        return summary
+
+    with patch.object(stats_summary, "_scan_user_matches", racing_scan):
+        stats = get_user_stats_summary(mock_db, "a")
+
+    assert (stats["wins"], stats["losses"], stats["total_games"]) == (1, 1, 2)
+    assert (stats["current_streak"], stats["streak_type"]) == (1, "L")